@@ -6,10 +6,12 @@ Interface commune pour tous les harness de tests
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import json
+import time
 
 # Type aliases for strict typing
 MetricValue = Union[str, int, float, bool]
@@ -47,6 +49,10 @@ AgentCallback = Callable[[str], str]
 BenchmarkReport = Dict[str, Union[str, int, float, bool, List[MetricDict]]]
 
 
+def _task_passed(results: List[BenchmarkResult]) -> bool:
+    return any(result.passed for result in results)
+
+
 class BenchmarkHarness(ABC):
     """Harness de base pour les benchmarks"""
 
@@ -84,6 +90,10 @@ class BenchmarkHarness(ABC):
         num_tasks: Optional[int] = None,
         k: int = 1,
         verbose: bool = False,
+        workers: int = 1,
+        shard: Optional[Tuple[int, int]] = None,
+        checkpoint_path: Optional[str] = None,
+        task_timeout: Optional[float] = None,
     ) -> BenchmarkReport:
         """
         Executer le benchmark complet
@@ -93,56 +103,122 @@ class BenchmarkHarness(ABC):
             num_tasks: Nombre de taches a executer (None = toutes)
             k: Nombre de generations par tache pour le calcul de pass@k
             verbose: Afficher les details
+            workers: Appels agent en vol simultanement (1 = sequentiel)
+            shard: (i, n) pour n'executer que le shard i sur n (voir eval.parallel)
+            checkpoint_path: Journal JSONL des taches terminees; les taches
+                deja presentes ne sont pas reexecutees
+            task_timeout: Delai maximal par tache en secondes (k generations incluses)
 
         Returns:
-            Dict avec metriques et resultats
+            Dict avec metriques et resultats (ordre des taches, quel que soit workers)
         """
+        from eval.parallel import BenchmarkCheckpoint, select_shard
+
         tasks = self.load_tasks()
 
         if num_tasks:
             tasks = tasks[:num_tasks]
+        if shard is not None:
+            tasks = select_shard(tasks, shard, key=lambda task: task.id)
 
-        results: List[BenchmarkResult] = []
-        passed_at_k = 0
+        checkpoint = BenchmarkCheckpoint(checkpoint_path) if checkpoint_path else None
+        completed = checkpoint.load() if checkpoint else {}
+        task_results: Dict[str, List[BenchmarkResult]] = {
+            task.id: completed[task.id] for task in tasks if task.id in completed
+        }
+        pending = [task for task in tasks if task.id not in task_results]
         total = len(tasks)
 
         print(f"Running {self.name} with {total} tasks (pass@{k})...")
+        if task_results:
+            print(f"  Resuming: {len(task_results)} tasks already in checkpoint")
 
-        for i, task in enumerate(tasks, 1):
-            if verbose:
-                print(f"  [{i}/{total}] Task: {task.id}")
-
-            task_passed = False
-            task_results: List[BenchmarkResult] = []
-
-            for _ in range(k):
-                # Appeler l'agent
-                start_time = datetime.now()
-                try:
-                    response = agent_callback(task.prompt)
-                except Exception as e:
-                    response = f"ERROR: {str(e)}"
-
-                latency_ms = (datetime.now() - start_time).total_seconds() * 1000
+        def run_one(task: BenchmarkTask) -> List[BenchmarkResult]:
+            results = self._run_task(task, agent_callback, k, task_timeout)
+            if checkpoint:
+                checkpoint.record(task.id, results)
+            return results
 
-                # Evaluer
-                result = self.evaluate(task, response)
-                result.latency_ms = latency_ms
-                task_results.append(result)
-
-                if result.passed:
-                    task_passed = True
-                    break  # Exit early once we have a passing solution
+        def report_progress(task: BenchmarkTask, results: List[BenchmarkResult]) -> None:
+            if verbose:
+                done = len(task_results)
+                status = "PASS (at least one of" if _task_passed(results) else "FAIL (none of"
+                print(f"  [{done}/{total}] Task: {task.id}")
+                print(f"    {status} {k})")
+
+        if workers <= 1:
+            for task in pending:
+                task_results[task.id] = run_one(task)
+                report_progress(task, task_results[task.id])
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="benchmark") as pool:
+                futures = {pool.submit(run_one, task): task for task in pending}
+                for future in as_completed(futures):
+                    task = futures[future]
+                    task_results[task.id] = future.result()
+                    report_progress(task, task_results[task.id])
+
+        report = self._build_report([task_results[task.id] for task in tasks], k)
+        if shard is not None:
+            report["shard"] = f"{shard[0]}/{shard[1]}"
 
-            results.extend(task_results)
+        print(f"\n {self.name} complete:")
+        print(f"  Pass@{k}: {report['passed_at_k']}/{total} ({report[f'pass_at_{k}']*100:.1f}%)")
+        print(f"  Avg Latency: {report['avg_latency_ms']:.0f}ms")
 
-            if task_passed:
-                passed_at_k += 1
+        return report
 
-            if verbose and task_passed:
-                print(f"    PASS (at least one of {k})")
-            elif verbose and not task_passed:
-                print(f"    FAIL (none of {k} passed)")
+    def _run_task(
+        self,
+        task: BenchmarkTask,
+        agent_callback: AgentCallback,
+        k: int,
+        task_timeout: Optional[float] = None,
+    ) -> List[BenchmarkResult]:
+        """Jusqu'a k generations pour une tache (arret au premier succes ou au delai)"""
+        from eval.parallel import TaskTimeoutError, call_with_timeout
+
+        deadline = time.monotonic() + task_timeout if task_timeout is not None else None
+        task_results: List[BenchmarkResult] = []
+
+        for _ in range(k):
+            # Appeler l'agent
+            start_time = datetime.now()
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            try:
+                response = call_with_timeout(lambda: agent_callback(task.prompt), remaining)
+            except TaskTimeoutError:
+                task_results.append(
+                    BenchmarkResult(
+                        task_id=task.id,
+                        passed=False,
+                        response="",
+                        ground_truth=task.ground_truth,
+                        error=f"Task timed out after {task_timeout}s",
+                        latency_ms=(datetime.now() - start_time).total_seconds() * 1000,
+                    )
+                )
+                break
+            except Exception as e:
+                response = f"ERROR: {str(e)}"
+
+            latency_ms = (datetime.now() - start_time).total_seconds() * 1000
+
+            # Evaluer
+            result = self.evaluate(task, response)
+            result.latency_ms = latency_ms
+            task_results.append(result)
+
+            if result.passed:
+                break  # Exit early once we have a passing solution
+
+        return task_results
+
+    def _build_report(self, task_results: List[List[BenchmarkResult]], k: int) -> BenchmarkReport:
+        """Rapport a partir des resultats groupes par tache (dans l'ordre des taches)"""
+        results = [result for group in task_results for result in group]
+        total = len(task_results)
+        passed_at_k = sum(1 for group in task_results if _task_passed(group))
 
         # Calculer les metriques
         pass_at_k_rate = passed_at_k / total if total > 0 else 0.0
@@ -169,12 +245,45 @@ class BenchmarkHarness(ABC):
                 for r in results
             ],
         }
+        return report
 
-        print(f"\n {self.name} complete:")
-        print(f"  Pass@{k}: {passed_at_k}/{total} ({pass_at_k_rate*100:.1f}%)")
-        print(f"  Avg Latency: {avg_latency:.0f}ms")
+    def merge_reports(self, reports: List[BenchmarkReport]) -> BenchmarkReport:
+        """
+        Fusionner des rapports de shards en un rapport unique
 
-        return report
+        Les resultats sont remis dans l'ordre de ``load_tasks``; le rapport
+        obtenu est celui d'une execution sequentielle des memes taches.
+
+        Raises:
+            ValueError: Si les rapports n'ont pas le meme k ou se recouvrent
+        """
+        ks = {report["k"] for report in reports}
+        if len(ks) != 1:
+            raise ValueError(f"Cannot merge reports with different k: {sorted(ks)}")
+        k = ks.pop()
+
+        grouped: Dict[str, List[BenchmarkResult]] = {}
+        for report in reports:
+            seen_in_report = set()
+            for entry in report["results"]:
+                task_id = entry["task_id"]
+                if task_id in grouped and task_id not in seen_in_report:
+                    raise ValueError(f"Task {task_id} appears in several reports")
+                seen_in_report.add(task_id)
+                grouped.setdefault(task_id, []).append(
+                    BenchmarkResult(
+                        task_id=task_id,
+                        passed=entry["passed"],
+                        response="",
+                        ground_truth="",
+                        error=entry["error"] or None,
+                        latency_ms=entry["latency_ms"],
+                    )
+                )
+
+        order = {task.id: i for i, task in enumerate(self.load_tasks())}
+        task_ids = sorted(grouped, key=lambda task_id: order.get(task_id, len(order)))
+        return self._build_report([grouped[task_id] for task_id in task_ids], k)
 
     def save_report(self, report: BenchmarkReport, output_dir: str = "eval/reports") -> None:
         """Sauvegarder le rapport d'evaluation"""
@@ -0,0 +1,348 @@
+"""
+Execution isolee et parallele des programmes candidats (HumanEval, MBPP)
+
+Chaque programme (solution generee + tests) s'execute hors du processus
+d'evaluation, dans les workers du sandbox (tools/sandbox_pool.py): rlimits
+CPU/memoire/fichiers, reseau coupe (namespace reseau en local lorsque
+``unshare`` est disponible, ``--network none`` sous Docker). Les programmes
+sont envoyes par lots a chaque worker, qui les execute dans des processus
+forkes: le demarrage de l'interpreteur est paye une fois par worker et non
+une fois par programme. Plusieurs workers traitent des lots en parallele.
+
+pass@k est calcule avec l'estimateur non biaise de Chen et al. (2021):
+n echantillons par tache dont c corrects -> 1 - C(n-c, k) / C(n, k).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+import uuid
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from eval.base import (
+    AgentCallback,
+    BenchmarkHarness,
+    BenchmarkReport,
+    BenchmarkResult,
+    BenchmarkTask,
+)
+from tools.sandbox_pool import (
+    SandboxPool,
+    SandboxPoolConfig,
+    SandboxWorker,
+    docker_worker_command,
+    local_worker_command,
+)
+
+
+def estimate_pass_at_k(num_samples: int, num_correct: int, k: int) -> float:
+    """
+    Estimateur non biaise de pass@k pour une tache
+
+    Args:
+        num_samples: Echantillons generes (n)
+        num_correct: Echantillons corrects (c)
+        k: Budget de tentatives (k <= n)
+
+    Returns:
+        Probabilite qu'au moins un de k echantillons tires parmi n soit correct
+    """
+    if k > num_samples:
+        raise ValueError(f"k={k} exceeds the number of samples ({num_samples})")
+    if num_samples - num_correct < k:
+        return 1.0
+    # Produit equivalent a 1 - C(n-c, k) / C(n, k), sans grands coefficients
+    failure = 1.0
+    for i in range(num_samples - num_correct + 1, num_samples + 1):
+        failure *= 1.0 - k / i
+    return 1.0 - failure
+
+
+@dataclass
+class ProgramResult:
+    """Resultat de l'execution d'un programme candidat"""
+
+    passed: bool
+    error: Optional[str] = None
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
+
+
+def _error_summary(stderr: str) -> str:
+    """Derniere ligne non vide de la sortie d'erreur (type et message de l'exception)"""
+    lines = [line for line in stderr.strip().splitlines() if line.strip()]
+    return lines[-1] if lines else "Program failed"
+
+
+class ProgramExecutor:
+    """
+    Pool de workers isoles executant des programmes par lots
+
+    Le backend ``local`` (defaut sans la CLI docker) convient aux CI; le
+    backend ``docker`` execute les lots dans des conteneurs verrouilles.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: int = 16,
+        timeout: float = 10.0,
+        memory_mb: int = 512,
+        backend: Optional[str] = None,
+        image: str = "python:3.12-slim",
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.backend = backend or ("docker" if shutil.which("docker") else "local")
+
+        if self.backend == "local":
+
+            def factory() -> SandboxWorker:
+                return SandboxWorker(local_worker_command(memory_mb))
+
+        elif self.backend == "docker":
+
+            def factory() -> SandboxWorker:
+                name = f"filagent-eval-{uuid.uuid4().hex[:12]}"
+                return SandboxWorker(
+                    docker_worker_command(image, memory_mb, 100000, 100000, name),
+                    cleanup_command=["docker", "rm", "-f", name],
+                )
+
+        else:
+            raise ValueError(f"Unknown execution backend: {self.backend}")
+
+        self.pool = SandboxPool(
+            factory,
+            SandboxPoolConfig(
+                size=self.workers,
+                min_warm=0,
+                max_runs_per_worker=10000,
+                acquire_timeout=max(60.0, timeout * batch_size),
+            ),
+            name=f"eval-{self.backend}",
+        )
+
+    def _run_batch(self, programs: Sequence[str]) -> List[ProgramResult]:
+        runs = self.pool.run_batch([(code, self.timeout) for code in programs])
+        results = []
+        for run in runs:
+            if run.timed_out:
+                error: Optional[str] = f"Timed out after {self.timeout}s"
+            elif run.exit_code < 0:
+                error = f"Killed by signal {-run.exit_code} (resource limit)"
+            elif run.exit_code != 0:
+                error = _error_summary(run.stderr)
+            else:
+                error = None
+            results.append(
+                ProgramResult(
+                    passed=error is None,
+                    error=error,
+                    timed_out=run.timed_out,
+                    elapsed_ms=run.elapsed * 1000,
+                )
+            )
+        return results
+
+    def run(self, programs: Sequence[str]) -> List[ProgramResult]:
+        """
+        Executer les programmes (un programme reussit s'il termine avec le code 0)
+
+        Returns:
+            Resultats dans l'ordre des programmes
+
+        Raises:
+            SandboxPoolError: pas de worker disponible ou worker defaillant; une
+                panne du sandbox n'est pas comptee comme un echec des programmes
+        """
+        batches = [
+            programs[i : i + self.batch_size] for i in range(0, len(programs), self.batch_size)
+        ]
+        if len(batches) <= 1:
+            return [result for batch in batches for result in self._run_batch(batch)]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="eval-exec") as pool:
+            return [result for batch in pool.map(self._run_batch, batches) for result in batch]
+
+    def close(self) -> None:
+        """Arreter les workers"""
+        self.pool.shutdown()
+
+    def __enter__(self) -> "ProgramExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def run_programs(
+    programs: Sequence[str], executor: Optional[ProgramExecutor] = None
+) -> Dict[str, object]:
+    """
+    Executer des programmes et mesurer le debit
+
+    Returns:
+        Dict avec results (ProgramResult), programs, elapsed_seconds et
+        programs_per_second
+    """
+    owned = executor is None
+    executor = executor or ProgramExecutor()
+    started = time.monotonic()
+    try:
+        results = executor.run(programs)
+    finally:
+        if owned:
+            executor.close()
+    elapsed = time.monotonic() - started
+    return {
+        "results": results,
+        "programs": len(programs),
+        "elapsed_seconds": elapsed,
+        "programs_per_second": len(programs) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+class CodeGenerationHarness(BenchmarkHarness):
+    """
+    Harness des benchmarks de generation de code (programme = solution + tests)
+
+    Les sous-classes fournissent ``build_program``; l'execution passe par un
+    ProgramExecutor partage, cree au premier besoin.
+    """
+
+    def __init__(self, name: str, description: str) -> None:
+        super().__init__(name, description)
+        self._executor: Optional[ProgramExecutor] = None
+
+    @abstractmethod
+    def build_program(self, task: BenchmarkTask, response: str) -> str:
+        """Programme complet a executer: solution candidate suivie des tests"""
+
+    @property
+    def executor(self) -> ProgramExecutor:
+        if self._executor is None:
+            self._executor = ProgramExecutor()
+        return self._executor
+
+    @executor.setter
+    def executor(self, executor: ProgramExecutor) -> None:
+        self._executor = executor
+
+    def _to_result(
+        self, task: BenchmarkTask, response: str, program_result: ProgramResult
+    ) -> BenchmarkResult:
+        return BenchmarkResult(
+            task_id=task.id,
+            passed=program_result.passed,
+            response=response,
+            ground_truth=task.ground_truth,
+            error=program_result.error,
+            metadata={
+                "execution_ms": program_result.elapsed_ms,
+                "timed_out": program_result.timed_out,
+            },
+        )
+
+    def evaluate(self, task: BenchmarkTask, response: str) -> BenchmarkResult:
+        program_result = self.executor.run([self.build_program(task, response)])[0]
+        return self._to_result(task, response, program_result)
+
+    def evaluate_samples(
+        self,
+        agent_callback: AgentCallback,
+        num_tasks: Optional[int] = None,
+        num_samples: int = 1,
+        ks: Sequence[int] = (1,),
+        generation_workers: int = 1,
+    ) -> BenchmarkReport:
+        """
+        Generer ``num_samples`` solutions par tache, les executer en lots et
+        calculer pass@k (estimateur non biaise) pour chaque k de ``ks``
+
+        Args:
+            agent_callback: Fonction callback agent
+            num_tasks: Nombre de taches (None = toutes)
+            num_samples: Echantillons par tache (n >= max(ks))
+            ks: Valeurs de k rapportees
+            generation_workers: Appels agent simultanes
+
+        Returns:
+            Rapport avec pass_at_{k}, debit d'execution (programs_per_second)
+            et resultats par echantillon
+        """
+        if max(ks) > num_samples:
+            raise ValueError(f"num_samples={num_samples} must be >= max(ks)={max(ks)}")
+
+        tasks = self.load_tasks()
+        if num_tasks:
+            tasks = tasks[:num_tasks]
+        samples = [(task, sample) for task in tasks for sample in range(num_samples)]
+
+        print(f"Running {self.name} with {len(tasks)} tasks x {num_samples} samples...")
+
+        def generate(item):
+            try:
+                return agent_callback(item[0].prompt)
+            except Exception as e:
+                return f"ERROR: {str(e)}"
+
+        with ThreadPoolExecutor(max_workers=max(1, generation_workers)) as pool:
+            responses = list(pool.map(generate, samples))
+
+        execution = run_programs(
+            [self.build_program(task, response) for (task, _), response in zip(samples, responses)],
+            self.executor,
+        )
+        results = [
+            self._to_result(task, response, program_result)
+            for (task, _), response, program_result in zip(samples, responses, execution["results"])
+        ]
+
+        correct: Dict[str, int] = {task.id: 0 for task in tasks}
+        for result in results:
+            correct[result.task_id] += int(result.passed)
+
+        report: BenchmarkReport = {
+            "benchmark": self.name,
+            "timestamp": datetime.now().isoformat(),
+            "total_tasks": len(tasks),
+            "num_samples": num_samples,
+            "programs": execution["programs"],
+            "execution_seconds": execution["elapsed_seconds"],
+            "programs_per_second": execution["programs_per_second"],
+        }
+        for k in ks:
+            report[f"pass_at_{k}"] = (
+                sum(estimate_pass_at_k(num_samples, c, k) for c in correct.values()) / len(tasks)
+                if tasks
+                else 0.0
+            )
+        report["results"] = [
+            {
+                "task_id": r.task_id,
+                "passed": r.passed,
+                "execution_ms": r.metadata["execution_ms"],
+                "error": r.error if r.error is not None else "",
+            }
+            for r in results
+        ]
+
+        print(f"\n {self.name} complete:")
+        for k in ks:
+            print(f"  Pass@{k}: {report[f'pass_at_{k}']*100:.1f}%")
+        print(f"  Throughput: {execution['programs_per_second']:.1f} programs/s")
+
+        return report
+
+    def close(self) -> None:
+        """Arreter les workers d'execution"""
+        if self._executor is not None:
+            self._executor.close()
+            self._executor = None
@@ -2,11 +2,11 @@ import os
 from typing import List
 from datasets import load_dataset, load_from_disk
 from filelock import FileLock
-from eval.base import BenchmarkHarness, BenchmarkTask, BenchmarkResult
-from tools.python_sandbox import PythonSandboxTool
+from eval.base import BenchmarkTask
+from eval.execution import CodeGenerationHarness
 
 
-class HumanEvalHarness(BenchmarkHarness):
+class HumanEvalHarness(CodeGenerationHarness):
     def __init__(self):
         super().__init__("HumanEval", "HumanEval benchmark for code generation")
         self.dataset_path = "eval/benchmarks/humaneval"
@@ -36,29 +36,9 @@ class HumanEvalHarness(BenchmarkHarness):
             )
         return tasks
 
-    def evaluate(self, task: BenchmarkTask, response: str) -> BenchmarkResult:
-        full_code = f"{task.prompt}\n{response}\n{task.metadata['test']}"
-
-        # Create a new sandbox with modified dangerous_patterns to allow imports
-        # This is necessary for tests to run properly
-        safe_patterns = [
-            "eval(",
-            "exec(",
-            "open(",
-            "file(",
-            "os.system",
-            "subprocess",
-            "pickle",
-        ]
-        sandbox = PythonSandboxTool(dangerous_patterns=safe_patterns)
-
-        result = sandbox.execute({"code": full_code})
-
-        return BenchmarkResult(
-            task_id=task.id,
-            passed=result.status == "SUCCESS",
-            response=response,
-            ground_truth=task.ground_truth,
-            error=result.error,
-            metadata=result.metadata,
+    def build_program(self, task: BenchmarkTask, response: str) -> str:
+        # Les tests HumanEval definissent check(candidate) sans l'appeler
+        return (
+            f"{task.prompt}\n{response}\n{task.metadata['test']}\n"
+            f"check({task.metadata['entry_point']})\n"
         )
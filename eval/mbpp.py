@@ -2,11 +2,11 @@ import os
 from typing import List
 from datasets import load_dataset, load_from_disk
 from filelock import FileLock
-from eval.base import BenchmarkHarness, BenchmarkTask, BenchmarkResult
-from tools.python_sandbox import PythonSandboxTool
+from eval.base import BenchmarkTask
+from eval.execution import CodeGenerationHarness
 
 
-class MBPPHarness(BenchmarkHarness):
+class MBPPHarness(CodeGenerationHarness):
     def __init__(self):
         super().__init__("MBPP", "MBPP benchmark for code generation")
         self.dataset_path = "eval/benchmarks/mbpp"
@@ -36,33 +36,6 @@ class MBPPHarness(BenchmarkHarness):
             )
         return tasks
 
-    def evaluate(self, task: BenchmarkTask, response: str) -> BenchmarkResult:
-        full_code = (
-            f"{task.metadata['test_setup_code']}\n"
-            f"{response}\n"
-            f"{'\\n'.join(task.metadata['test_list'])}\n"
-        )
-
-        # Create a new sandbox with modified dangerous_patterns to allow imports
-        # This is necessary for tests to run properly
-        safe_patterns = [
-            "eval(",
-            "exec(",
-            "open(",
-            "file(",
-            "os.system",
-            "subprocess",
-            "pickle",
-        ]
-        sandbox = PythonSandboxTool(dangerous_patterns=safe_patterns)
-
-        result = sandbox.execute({"code": full_code})
-
-        return BenchmarkResult(
-            task_id=task.id,
-            passed=result.status == "SUCCESS",
-            response=response,
-            ground_truth=task.ground_truth,
-            error=result.error,
-            metadata=result.metadata,
-        )
+    def build_program(self, task: BenchmarkTask, response: str) -> str:
+        tests = "\n".join(task.metadata["test_list"])
+        return f"{task.metadata['test_setup_code']}\n{response}\n{tests}\n"
@@ -0,0 +1,126 @@
+"""
+Execution parallele des benchmarks: sharding, points de reprise, delais
+
+- Sharding deterministe: ``--shard i/n`` repartit les taches selon un hash
+  stable de leur identifiant (independant de l'ordre et du nombre de taches)
+- Points de reprise: chaque tache terminee est ajoutee a un fichier JSONL;
+  une execution relancee saute les taches deja presentes
+- Delai par tache: l'appel agent est borne; au-dela la tache echoue et le
+  worker passe a la suivante (l'appel en cours se termine en arriere-plan)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import zlib
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from eval.base import BenchmarkResult
+
+T = TypeVar("T")
+
+
+class TaskTimeoutError(Exception):
+    """Appel agent au-dela du delai de la tache"""
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Lire une specification ``i/n`` (0 <= i < n)
+
+    Raises:
+        ValueError: Si la specification est invalide
+    """
+    index, sep, count = spec.partition("/")
+    try:
+        shard_index, shard_count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/n") from None
+    if not sep or shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard '{spec}', expected 0 <= i < n")
+    return shard_index, shard_count
+
+
+def shard_of(task_id: str, shard_count: int) -> int:
+    """Shard d'une tache (CRC32 de l'identifiant, stable entre processus)"""
+    return zlib.crc32(task_id.encode("utf-8")) % shard_count
+
+
+def select_shard(items: Sequence[T], shard: Tuple[int, int], key: Callable[[T], str]) -> List[T]:
+    """Elements du shard ``(i, n)``, dans leur ordre d'origine"""
+    shard_index, shard_count = shard
+    return [item for item in items if shard_of(key(item), shard_count) == shard_index]
+
+
+def call_with_timeout(func: Callable[[], T], timeout: Optional[float]) -> T:
+    """
+    Executer ``func`` avec un delai
+
+    Sans delai, l'appel est direct. Sinon il tourne dans un thread demon:
+    au-dela du delai, TaskTimeoutError est levee et le resultat est ignore.
+    """
+    if timeout is None:
+        return func()
+    if timeout <= 0:
+        raise TaskTimeoutError()
+
+    outcome: Dict[str, object] = {}
+
+    def target() -> None:
+        try:
+            outcome["value"] = func()
+        except BaseException as e:  # Relaye a l'appelant
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, name="benchmark-task", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TaskTimeoutError()
+    if "error" in outcome:
+        raise outcome["error"]  # type: ignore[misc]
+    return outcome["value"]  # type: ignore[return-value]
+
+
+class BenchmarkCheckpoint:
+    """
+    Journal JSONL des taches terminees (une ligne par tache, ajout seul)
+
+    Une ligne tronquee (arret brutal pendant l'ecriture) est ignoree a la
+    relecture: la tache correspondante est simplement reexecutee.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, List[BenchmarkResult]]:
+        """Resultats des taches deja terminees, par identifiant"""
+        completed: Dict[str, List[BenchmarkResult]] = {}
+        if not self.path.exists():
+            return completed
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    completed[entry["task_id"]] = [
+                        BenchmarkResult(**result) for result in entry["results"]
+                    ]
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return completed
+
+    def record(self, task_id: str, results: List[BenchmarkResult]) -> None:
+        """Ajouter une tache terminee (ecrite et videe immediatement)"""
+        line = json.dumps(
+            {"task_id": task_id, "results": [asdict(result) for result in results]},
+            default=str,
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
@@ -12,6 +12,9 @@ Usage:
     python eval/runner.py --benchmark humaneval
     python eval/runner.py --benchmark humaneval,mbpp
     python eval/runner.py --custom-only
+    python eval/runner.py --benchmark humaneval --workers 8 --task-timeout 120
+    python eval/runner.py --benchmark humaneval --shard 0/4 --checkpoint-dir eval/runs
+    python eval/runner.py --benchmark humaneval --merge eval/reports/humaneval_*.json
 """
 
 from __future__ import annotations
@@ -21,7 +24,7 @@ import json
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Type, Union
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
 
 # Import benchmarks
 from eval.humaneval import HumanEvalHarness
@@ -31,6 +34,8 @@ from eval.benchmarks.custom.compliance.harness import ComplianceHarness
 from eval.benchmarks.custom.htn_planning.harness import HTNPlanningHarness
 from eval.benchmarks.custom.tool_orchestration.harness import ToolOrchestrationHarness
 from eval.base import BenchmarkHarness, BenchmarkReport
+from eval.execution import CodeGenerationHarness
+from eval.parallel import parse_shard
 
 # Import config
 from runtime.config import get_config
@@ -85,6 +90,11 @@ class BenchmarkRunner:
         num_tasks: Optional[int] = None,
         k: int = 1,
         verbose: bool = False,
+        workers: int = 1,
+        shard: Optional[Tuple[int, int]] = None,
+        checkpoint_dir: Optional[str] = None,
+        task_timeout: Optional[float] = None,
+        num_samples: Optional[int] = None,
     ) -> BenchmarkResults:
         """
         Executer un benchmark specifique
@@ -95,6 +105,12 @@ class BenchmarkRunner:
             num_tasks: Nombre de taches (None = toutes)
             k: pass@k parametre
             verbose: Mode verbose
+            workers: Appels agent en vol simultanement
+            shard: (i, n) pour n'executer qu'un shard des taches
+            checkpoint_dir: Repertoire des points de reprise (reprise des taches terminees)
+            task_timeout: Delai maximal par tache en secondes
+            num_samples: Benchmarks de code: n echantillons par tache et pass@k
+                non biaise (au lieu de k tentatives avec arret au premier succes)
 
         Returns:
             Resultats du benchmark
@@ -110,10 +126,33 @@ class BenchmarkRunner:
         HarnessClass = self.benchmarks[benchmark_name]
         harness = HarnessClass()
 
+        checkpoint_path = None
+        if checkpoint_dir:
+            suffix = f"_shard{shard[0]}of{shard[1]}" if shard else ""
+            checkpoint_path = str(Path(checkpoint_dir) / f"{benchmark_name}{suffix}.jsonl")
+
         # Run benchmark
         try:
-            results: BenchmarkReport = harness.run_benchmark(
-                agent_callback=agent_callback, num_tasks=num_tasks, k=k, verbose=verbose
+            if num_samples and isinstance(harness, CodeGenerationHarness):
+                results: BenchmarkReport = harness.evaluate_samples(
+                    agent_callback=agent_callback,
+                    num_tasks=num_tasks,
+                    num_samples=num_samples,
+                    ks=sorted({1, k}),
+                    generation_workers=workers,
+                )
+                harness.save_report(results, str(self.reports_dir))
+                return dict(results)
+
+            results = harness.run_benchmark(
+                agent_callback=agent_callback,
+                num_tasks=num_tasks,
+                k=k,
+                verbose=verbose,
+                workers=workers,
+                shard=shard,
+                checkpoint_path=checkpoint_path,
+                task_timeout=task_timeout,
             )
 
             # Save report
@@ -128,6 +167,36 @@ class BenchmarkRunner:
 
             traceback.print_exc()
             return {"benchmark": benchmark_name, "error": str(e), "success": False}
+        finally:
+            if isinstance(harness, CodeGenerationHarness):
+                harness.close()
+
+    def merge_shard_reports(self, benchmark_name: str, report_paths: List[str]) -> BenchmarkResults:
+        """
+        Fusionner les rapports des shards d'un benchmark
+
+        Le rapport fusionne (identique a une execution sequentielle) est sauvegarde
+        dans reports_dir.
+
+        Args:
+            benchmark_name: Nom du benchmark
+            report_paths: Rapports JSON produits par chaque shard
+
+        Returns:
+            Rapport fusionne
+        """
+        if benchmark_name not in self.benchmarks:
+            raise ValueError(f"Unknown benchmark: {benchmark_name}")
+
+        reports = []
+        for path in report_paths:
+            with open(path) as f:
+                reports.append(json.load(f))
+
+        harness = self.benchmarks[benchmark_name]()
+        merged = harness.merge_reports(reports)
+        harness.save_report(merged, str(self.reports_dir))
+        return dict(merged)
 
     def run_all_benchmarks(
         self,
@@ -135,6 +204,9 @@ class BenchmarkRunner:
         num_tasks_per_benchmark: Optional[int] = None,
         skip_benchmarks: Optional[List[str]] = None,
         verbose: bool = False,
+        workers: int = 1,
+        checkpoint_dir: Optional[str] = None,
+        task_timeout: Optional[float] = None,
     ) -> AggregateReport:
         """
         Executer tous les benchmarks
@@ -144,6 +216,9 @@ class BenchmarkRunner:
             num_tasks_per_benchmark: Limiter le nombre de taches
             skip_benchmarks: Benchmarks a ignorer
             verbose: Mode verbose
+            workers: Appels agent en vol simultanement
+            checkpoint_dir: Repertoire des points de reprise
+            task_timeout: Delai maximal par tache en secondes
 
         Returns:
             Resultats agreges de tous les benchmarks
@@ -165,6 +240,9 @@ class BenchmarkRunner:
                 agent_callback=agent_callback,
                 num_tasks=num_tasks_per_benchmark,
                 verbose=verbose,
+                workers=workers,
+                checkpoint_dir=checkpoint_dir,
+                task_timeout=task_timeout,
             )
 
             all_results[benchmark_name] = results
@@ -178,7 +256,12 @@ class BenchmarkRunner:
         return aggregate_report
 
     def run_custom_benchmarks(
-        self, agent_callback: AgentCallback, verbose: bool = False
+        self,
+        agent_callback: AgentCallback,
+        verbose: bool = False,
+        workers: int = 1,
+        checkpoint_dir: Optional[str] = None,
+        task_timeout: Optional[float] = None,
     ) -> AggregateReport:
         """
         Executer uniquement les benchmarks custom FilAgent
@@ -186,6 +269,9 @@ class BenchmarkRunner:
         Args:
             agent_callback: Fonction callback agent
             verbose: Mode verbose
+            workers: Appels agent en vol simultanement
+            checkpoint_dir: Repertoire des points de reprise
+            task_timeout: Delai maximal par tache en secondes
 
         Returns:
             Resultats des benchmarks custom
@@ -199,7 +285,12 @@ class BenchmarkRunner:
 
         for benchmark_name in custom_benchmarks:
             results = self.run_benchmark(
-                benchmark_name=benchmark_name, agent_callback=agent_callback, verbose=verbose
+                benchmark_name=benchmark_name,
+                agent_callback=agent_callback,
+                verbose=verbose,
+                workers=workers,
+                checkpoint_dir=checkpoint_dir,
+                task_timeout=task_timeout,
             )
             all_results[benchmark_name] = results
 
@@ -400,13 +491,15 @@ def create_agent_callback() -> AgentCallback:
     # Import agent
     try:
         from runtime.agent import Agent
+        from runtime.inference_scheduler import Priority, inference_priority
 
         agent = Agent()
 
         def callback(prompt: str) -> str:
-            """Agent callback"""
+            """Agent callback (priorité d'inférence 'eval', derrière les conversations)"""
             try:
-                result = agent.run(prompt)
+                with inference_priority(Priority.EVAL):
+                    result = agent.run(prompt)
                 if isinstance(result, dict):
                     response = result.get("response", "")
                     return str(response) if response is not None else ""
@@ -455,11 +548,59 @@ def main() -> None:
 
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
 
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Concurrent agent calls (default: 1)"
+    )
+
+    parser.add_argument(
+        "--shard",
+        type=str,
+        default=None,
+        help="Run only shard i of n (format i/n, deterministic by task id)",
+    )
+
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=None,
+        help="Record finished tasks here and skip them when resuming",
+    )
+
+    parser.add_argument(
+        "--task-timeout", type=float, default=None, help="Per-task timeout in seconds"
+    )
+
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=None,
+        help="Code benchmarks: samples per task for unbiased pass@1 and pass@k",
+    )
+
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        default=None,
+        metavar="REPORT",
+        help="Merge shard reports of --benchmark instead of running it",
+    )
+
     args = parser.parse_args()
 
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
+
     # Create runner
     runner = BenchmarkRunner()
 
+    if args.merge:
+        if not args.benchmark or "," in args.benchmark:
+            parser.error("--merge requires a single --benchmark")
+        runner.merge_shard_reports(args.benchmark.strip(), args.merge)
+        return
+
     # Create agent callback
     agent_callback = create_agent_callback()
 
@@ -469,10 +610,19 @@ def main() -> None:
             agent_callback=agent_callback,
             num_tasks_per_benchmark=args.num_tasks,
             verbose=args.verbose,
+            workers=args.workers,
+            checkpoint_dir=args.checkpoint_dir,
+            task_timeout=args.task_timeout,
         )
 
     elif args.custom_only:
-        runner.run_custom_benchmarks(agent_callback=agent_callback, verbose=args.verbose)
+        runner.run_custom_benchmarks(
+            agent_callback=agent_callback,
+            verbose=args.verbose,
+            workers=args.workers,
+            checkpoint_dir=args.checkpoint_dir,
+            task_timeout=args.task_timeout,
+        )
 
     elif args.benchmark:
         benchmarks = [b.strip() for b in args.benchmark.split(",")]
@@ -483,6 +633,11 @@ def main() -> None:
                 num_tasks=args.num_tasks,
                 k=args.k,
                 verbose=args.verbose,
+                workers=args.workers,
+                shard=shard,
+                checkpoint_dir=args.checkpoint_dir,
+                task_timeout=args.task_timeout,
+                num_samples=args.samples,
             )
 
     else:
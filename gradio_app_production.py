@@ -39,18 +39,20 @@ IntentDict = Dict[str, Union[str, float, bool]]
 ToolMapping = Dict[str, List[str]]
 
 import gradio as gr
-import pandas as pd
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from dotenv import load_dotenv
 
-# Importation des outils
-from tools.document_analyzer_pme import DocumentAnalyzerPME
-from tools.python_sandbox import PythonSandboxTool
-from tools.file_reader import FileReaderTool
-from tools.calculator import CalculatorTool
+# Outils construits au premier usage (Docker SDK, pandas, pypdf, docx ne sont
+# pas importés au démarrage de l'interface)
+from runtime.utils.lazy import lazy_import
 from tools.base import ToolStatus
+from tools.catalog import CALCULATOR, DOCUMENT_ANALYZER_PME, FILE_READER, PYTHON_SANDBOX
+from tools.lazy import LazyTool
+
+# pandas: aperçus Excel et exports uniquement
+pd = lazy_import("pandas")
 
 # Charger les variables d'environnement (.env) - IMPORTANT pour les API keys
 load_dotenv()
@@ -1290,11 +1292,11 @@ class TaxCalculatorTool:
 class DocumentAnalyzerTool:
     """Outil d'analyse de documents PME - REAL IMPLEMENTATION"""
 
-    real_tool: DocumentAnalyzerPME
+    real_tool: LazyTool
 
     def __init__(self) -> None:
         """Initialiser avec le vrai outil d'analyse"""
-        self.real_tool = DocumentAnalyzerPME()
+        self.real_tool = LazyTool(DOCUMENT_ANALYZER_PME)
         logger.info("DocumentAnalyzerTool initialise avec vrai backend")
 
     async def execute(  # noqa: C901
@@ -3100,7 +3102,7 @@ Traitement 100% local et securise""",
         # ========== CALCULATEUR MATHEMATIQUE EVENT HANDLERS ==========
 
         # Initialiser l'outil calculateur
-        calculator_tool = CalculatorTool()
+        calculator_tool = LazyTool(CALCULATOR)
 
         def handle_calculator(expression: str) -> str:
             """Handler pour le calculateur mathematique"""
@@ -3157,7 +3159,7 @@ Traitement 100% local et securise""",
         # ========== SANDBOX PYTHON EVENT HANDLERS ==========
 
         # Initialiser l'outil sandbox
-        sandbox_tool = PythonSandboxTool()
+        sandbox_tool = LazyTool(PYTHON_SANDBOX)
 
         def handle_sandbox(code: str) -> Tuple[str, str]:
             """Handler pour le sandbox Python"""
@@ -3235,7 +3237,7 @@ Traitement 100% local et securise""",
         # ========== LECTEUR DE FICHIERS EVENT HANDLERS ==========
 
         # Initialiser l'outil lecteur
-        file_reader_tool = FileReaderTool()
+        file_reader_tool = LazyTool(FILE_READER)
 
         def handle_file_read(file_path: str) -> Tuple[str, str]:
             """Handler pour le lecteur de fichiers"""
@@ -14,7 +14,7 @@ import logging
 import traceback
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Set, TextIO, Tuple, Union
 from datetime import datetime
 
 # Type Aliases for strict typing
@@ -31,6 +31,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Délai par défaut d'un appel d'outil (BaseTool.timeout_seconds le remplace)
+DEFAULT_TOOL_TIMEOUT = 30.0
+
+# Outil FilAgent (ToolRegistry) dont chaque outil MCP reprend les limites
+MCP_TOOL_BACKENDS: Dict[str, str] = {
+    "analyze_document": "document_analyzer_pme",
+    "calculate_taxes_quebec": "math_calculator",
+}
+
 # Ajout du répertoire au path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -55,6 +64,7 @@ class FilAgentMCPServer:
         self.compliance_enabled = True
         self.config = None
         self.tool_registry = {}
+        self._tool_semaphores: Dict[str, asyncio.Semaphore] = {}
         logger.info("Initialisation du serveur MCP FilAgent")
 
     async def initialize(self) -> MCPResponse:
@@ -64,11 +74,11 @@ class FilAgentMCPServer:
             try:
                 from runtime.agent import get_agent
                 from runtime.config import get_config
-                from tools.registry import get_tool_registry
+                from tools.registry import get_registry
 
                 self.agent = get_agent()
                 self.config = get_config()
-                self.tool_registry = get_tool_registry()
+                self.tool_registry = get_registry()
                 logger.info("Composants FilAgent chargés avec succès")
             except ImportError as e:
                 logger.warning(f"Mode standalone - composants non disponibles: {e}")
@@ -233,15 +243,56 @@ class FilAgentMCPServer:
             logger.error(traceback.format_exc())
             return {"error": {"code": -32603, "message": str(e)}}
 
+    def _tool_limits(self, name: str) -> Tuple[Optional[int], float]:
+        """Limite de concurrence et délai déclarés par l'outil FilAgent (BaseTool)"""
+        tool = None
+        backend = MCP_TOOL_BACKENDS.get(name)
+        if backend is not None and hasattr(self.tool_registry, "get"):
+            try:
+                tool = self.tool_registry.get(backend)
+            except Exception:
+                tool = None
+        max_concurrency = getattr(tool, "max_concurrency", None)
+        timeout = getattr(tool, "timeout_seconds", None)
+        return (
+            max_concurrency if isinstance(max_concurrency, int) and max_concurrency > 0 else None,
+            (
+                float(timeout)
+                if isinstance(timeout, (int, float)) and timeout > 0
+                else DEFAULT_TOOL_TIMEOUT
+            ),
+        )
+
     async def _execute_tool(self, name: str, arguments: ToolArguments) -> ToolResult:
         """
         Exécute un outil avec traçabilité complète
+
+        L'outil tourne dans un thread (la boucle continue de servir les
+        autres requêtes), borné par sa limite de concurrence et son délai.
+        Après un délai dépassé, le thread continue: sa place n'est rendue
+        qu'à la fin réelle de l'appel.
         """
         logger.info(f"Exécution outil: {name}")
 
         # Logging de conformité
         self._log_tool_execution(name, arguments)
 
+        max_concurrency, timeout = self._tool_limits(name)
+        semaphore = None
+        if max_concurrency is not None:
+            semaphore = self._tool_semaphores.setdefault(name, asyncio.Semaphore(max_concurrency))
+            await semaphore.acquire()
+
+        worker = asyncio.ensure_future(asyncio.to_thread(self._run_tool, name, arguments))
+        if semaphore is not None:
+            worker.add_done_callback(lambda _: semaphore.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(worker), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Outil {name}: délai de {timeout:g}s dépassé") from None
+
+    def _run_tool(self, name: str, arguments: ToolArguments) -> ToolResult:
+        """Implémentation des outils MCP (appelée hors de la boucle d'événements)"""
         if name == "analyze_document":
             content = str(arguments.get("content", ""))
             framework = str(arguments.get("framework", "Loi25"))
@@ -341,6 +392,65 @@ Format requis pour déclaration gouvernementale.""",
         }
         logger.info(f"Audit log: {json.dumps(log_entry)}")
 
+    async def respond(self, message: MCPRequest) -> MCPResponse:
+        """Traite une requête et complète l'enveloppe JSON-RPC"""
+        response = await self.handle_request(message)
+
+        # Ajouter jsonrpc version si nécessaire
+        if "jsonrpc" not in response:
+            response["jsonrpc"] = "2.0"
+        if "id" in message:
+            response["id"] = message["id"]
+        return response
+
+    async def respond_batch(self, messages: List[MCPRequest]) -> List[MCPResponse]:
+        """
+        Traite un lot JSON-RPC
+
+        Les requêtes du lot (ex. plusieurs tools/call indépendants) sont
+        exécutées en parallèle; les réponses gardent l'ordre du lot.
+        """
+        return list(await asyncio.gather(*(self.respond(message) for message in messages)))
+
+    async def _process_line(self, line: bytes, writer: TextIO, write_lock: asyncio.Lock) -> None:
+        """Traite une ligne reçue et écrit sa réponse"""
+        try:
+            # Décoder et parser le JSON
+            message = json.loads(line.decode().strip())
+            logger.debug(f"Message reçu: {message}")
+
+            # Traiter la requête (ou le lot)
+            if isinstance(message, list):
+                response: Union[MCPResponse, List[MCPResponse]] = await self.respond_batch(message)
+            else:
+                response = await self.respond(message)
+            response_str = json.dumps(response) + "\n"
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Erreur JSON: {e}")
+            error_response = {
+                "jsonrpc": "2.0",
+                "error": {"code": -32700, "message": "Parse error"},
+                "id": None,
+            }
+            response_str = json.dumps(error_response) + "\n"
+
+        except Exception as e:
+            logger.error(f"Erreur inattendue: {e}")
+            logger.error(traceback.format_exc())
+            error_response = {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": "Internal error"},
+                "id": None,
+            }
+            response_str = json.dumps(error_response) + "\n"
+
+        # Envoyer la réponse (une ligne entière à la fois)
+        async with write_lock:
+            writer.write(response_str)
+            writer.flush()
+        logger.debug(f"Réponse envoyée: {response_str[:100]}...")
+
     async def run(self) -> None:
         """Boucle principale du serveur MCP"""
         logger.info("Démarrage du serveur MCP FilAgent...")
@@ -356,54 +466,25 @@ Format requis pour déclaration gouvernementale.""",
         await asyncio.get_event_loop().connect_read_pipe(lambda: protocol, sys.stdin)
 
         writer = sys.stdout
+        write_lock = asyncio.Lock()
+
+        # Chaque requête est traitée dans sa propre tâche: un outil lent ne
+        # bloque pas les suivantes (les réponses portent l'id de la requête)
+        pending: Set[asyncio.Task] = set()
 
         while True:
-            try:
-                # Lire une ligne depuis stdin
-                line = await reader.readline()
-                if not line:
-                    logger.info("Fin de l'entrée, arrêt du serveur")
-                    break
-
-                # Décoder et parser le JSON
-                message = json.loads(line.decode().strip())
-                logger.debug(f"Message reçu: {message}")
-
-                # Traiter la requête
-                response = await self.handle_request(message)
-
-                # Ajouter jsonrpc version si nécessaire
-                if "jsonrpc" not in response:
-                    response["jsonrpc"] = "2.0"
-                if "id" in message:
-                    response["id"] = message["id"]
-
-                # Envoyer la réponse
-                response_str = json.dumps(response) + "\n"
-                writer.write(response_str)
-                writer.flush()
-                logger.debug(f"Réponse envoyée: {response_str[:100]}...")
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Erreur JSON: {e}")
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32700, "message": "Parse error"},
-                    "id": None,
-                }
-                writer.write(json.dumps(error_response) + "\n")
-                writer.flush()
-
-            except Exception as e:
-                logger.error(f"Erreur inattendue: {e}")
-                logger.error(traceback.format_exc())
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32603, "message": "Internal error"},
-                    "id": None,
-                }
-                writer.write(json.dumps(error_response) + "\n")
-                writer.flush()
+            # Lire une ligne depuis stdin
+            line = await reader.readline()
+            if not line:
+                logger.info("Fin de l'entrée, arrêt du serveur")
+                break
+
+            task = asyncio.create_task(self._process_line(line, writer, write_lock))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending)
 
 
 def main() -> None:
@@ -26,28 +26,27 @@ from pathlib import Path
 import numpy as np
 from pydantic import BaseModel, Field, ConfigDict
 
-try:
-    import faiss
-
-    FAISS_AVAILABLE = True
-except ImportError:
-    FAISS_AVAILABLE = False
+from runtime.utils.lazy import lazy_import, module_available
+
+# Heavy dependencies are imported on first use so that importing this module
+# (and runtime.agent) does not pull in torch/FAISS/pandas; the flags only
+# locate the packages
+FAISS_AVAILABLE = module_available("faiss")
+if FAISS_AVAILABLE:
+    faiss = lazy_import("faiss")
+else:
     print("Warning: FAISS not installed. Semantic cache will not work.")
 
-try:
-    from sentence_transformers import SentenceTransformer
-
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+if SENTENCE_TRANSFORMERS_AVAILABLE:
+    SentenceTransformer = lazy_import("sentence_transformers", "SentenceTransformer")
+else:
     print("Warning: sentence-transformers not installed. Semantic cache will not work.")
 
-try:
-    import pandas as pd
-
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+PANDAS_AVAILABLE = module_available("pandas")
+if PANDAS_AVAILABLE:
+    pd = lazy_import("pandas")
+else:
     pd = None
     print("Warning: pandas not installed. Cache persistence will not work.")
 
@@ -14,8 +14,12 @@ from __future__ import annotations
 
 import re
 import hashlib
+import json
+import os
+import threading
 import time
-from typing import Dict, List, Optional, Set, Union
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Set, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
@@ -39,6 +43,8 @@ __all__ = [
     "ExecutionAuditResult",
     "DecisionRecord",
     "ComplianceError",
+    "CompiledRuleset",
+    "AuditLogBuffer",
     "ComplianceGuardian",
 ]
 
@@ -200,6 +206,147 @@ class ComplianceError(Exception):
 
 
 
+# Types de PII connus, pour categoriser les detections dans les metriques
+PII_PATTERN_TYPES: Dict[str, str] = {
+    r"\b\d{3}-\d{2}-\d{4}\b": "ssn",
+    r"\b[A-Z]{2}\d{6}\b": "health_insurance",
+    r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b": "email",
+}
+
+# Intervalle minimal entre deux verifications de modification du fichier de regles
+RULES_RELOAD_CHECK_INTERVAL = 1.0
+
+# Taille du cache des resultats d'analyse de requetes (par hash de requete)
+QUERY_SCAN_CACHE_SIZE = 256
+
+# Capacite par defaut du tampon d'audit en memoire
+DEFAULT_AUDIT_BUFFER_SIZE = 10000
+DEFAULT_AUDIT_SPILL_DIR = "logs/compliance"
+
+
+# Resultat d'analyse d'une requete: (patterns interdits declenches, PII trouves, types PII)
+QueryScan = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+
+class CompiledRuleset:
+    """
+    Regles de validation compilees une seule fois
+
+    Les regex de ``forbidden_patterns`` et ``pii_patterns`` sont compilees,
+    et les listes d'outils converties en ensembles. Une empreinte des regles
+    sources permet de detecter toute modification (rechargement du YAML ou
+    modification en place de ``ComplianceGuardian.rules``).
+    """
+
+    def __init__(self, rules: RulesDict) -> None:
+        self.fingerprint = self.compute_fingerprint(rules)
+        validation_rules = rules.get("validation", {})
+        execution_rules = rules.get("execution", {})
+
+        self.forbidden_patterns: List[Tuple[str, Pattern[str]]] = [
+            (pattern, re.compile(pattern))
+            for pattern in self._as_list(validation_rules.get("forbidden_patterns"))
+            if isinstance(pattern, str)
+        ]
+        self.pii_patterns: List[Tuple[str, Pattern[str], str]] = [
+            (pattern, re.compile(pattern), PII_PATTERN_TYPES.get(pattern, "unknown"))
+            for pattern in self._as_list(validation_rules.get("pii_patterns"))
+            if isinstance(pattern, str)
+        ]
+
+        forbidden_tools = execution_rules.get("forbidden_tools", [])
+        self.forbidden_tools: Optional[Set[str]] = (
+            set(str(t) for t in forbidden_tools) if isinstance(forbidden_tools, list) else None
+        )
+        require_approval = execution_rules.get("require_approval_for", [])
+        self.require_approval: Optional[Set[str]] = (
+            set(str(t) for t in require_approval) if isinstance(require_approval, list) else None
+        )
+
+    @staticmethod
+    def _as_list(value: object) -> List[object]:
+        return value if isinstance(value, list) else []
+
+    @staticmethod
+    def compute_fingerprint(rules: RulesDict) -> Tuple[object, ...]:
+        """Empreinte peu couteuse des regles compilees (sans regex)."""
+        validation_rules = rules.get("validation", {})
+        execution_rules = rules.get("execution", {})
+
+        def _freeze(value: object) -> object:
+            return tuple(value) if isinstance(value, list) else value
+
+        return (
+            _freeze(validation_rules.get("forbidden_patterns")),
+            _freeze(validation_rules.get("pii_patterns")),
+            _freeze(execution_rules.get("forbidden_tools")),
+            _freeze(execution_rules.get("require_approval_for")),
+        )
+
+    def scan_query(self, query: str) -> QueryScan:
+        """Appliquer les patterns interdits et PII a une requete."""
+        triggered = tuple(
+            pattern
+            for pattern, regex in self.forbidden_patterns
+            # Un match suivi de "@" fait partie d'une adresse courriel, pas d'un secret
+            if any(
+                match.end() >= len(query) or query[match.end()] != "@"
+                for match in regex.finditer(query)
+            )
+        )
+
+        pii_found: List[str] = []
+        pii_types: List[str] = []
+        for _, regex, pii_type in self.pii_patterns:
+            matches = regex.findall(query)
+            if matches:
+                pii_found.extend(matches)
+                pii_types.append(pii_type)
+
+        return triggered, tuple(pii_found), tuple(pii_types)
+
+
+class AuditLogBuffer(list):
+    """
+    Journal d'audit en memoire, borne
+
+    Se comporte comme une liste. Lorsque la capacite est atteinte, la moitie
+    la plus ancienne des entrees est deversee en JSONL sur disque
+    (``<spill_dir>/compliance-audit-YYYY-MM-DD.jsonl``) puis retiree de la
+    memoire: aucune entree n'est perdue et le cout reste amorti O(1).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_AUDIT_BUFFER_SIZE, spill_dir: Optional[str] = None):
+        super().__init__()
+        self.capacity = max(2, capacity)
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spilled_count = 0
+        self._lock = threading.Lock()
+
+    def append(self, entry: AuditEntryDict) -> None:  # type: ignore[override]
+        with self._lock:
+            super().append(entry)
+            if len(self) >= self.capacity:
+                self._spill(len(self) // 2)
+
+    def _spill(self, count: int) -> None:
+        """Deverser les ``count`` entrees les plus anciennes sur disque."""
+        oldest = self[:count]
+        if self.spill_dir is not None:
+            try:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                spill_file = self.spill_dir / (
+                    f"compliance-audit-{datetime.utcnow().strftime('%Y-%m-%d')}.jsonl"
+                )
+                with open(spill_file, "a", encoding="utf-8") as f:
+                    for entry in oldest:
+                        f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            except OSError as e:
+                print(f"[WARN] Failed to spill compliance audit log: {e}")
+        del self[:count]
+        self.spilled_count += count
+
+
 class ComplianceGuardian:
     """
     Gardien de conformite pour FilAgent
@@ -219,8 +366,20 @@ class ComplianceGuardian:
             config_path: Chemin vers le fichier compliance_rules.yaml
         """
         self.config_path = config_path or "config/compliance_rules.yaml"
+        self._rules_mtime = self._get_rules_mtime()
+        self._last_reload_check = time.monotonic()
         self.rules = self._load_rules()
-        self.audit_log: List[AuditEntryDict] = []
+
+        self._ruleset: Optional[CompiledRuleset] = None
+        self._scan_cache: "OrderedDict[str, QueryScan]" = OrderedDict()
+        self._scan_lock = threading.Lock()  # validate_query est appele depuis le pool de workers
+
+        audit_rules = self.rules.get("audit", {})
+        buffer_size = audit_rules.get("buffer_size", DEFAULT_AUDIT_BUFFER_SIZE)
+        self.audit_log: AuditLogBuffer = AuditLogBuffer(
+            capacity=buffer_size if isinstance(buffer_size, int) else DEFAULT_AUDIT_BUFFER_SIZE,
+            spill_dir=str(audit_rules.get("spill_dir", DEFAULT_AUDIT_SPILL_DIR)),
+        )
 
         # Initialize metrics collector
         if METRICS_AVAILABLE:
@@ -245,6 +404,60 @@ class ComplianceGuardian:
                 return loaded_rules
             return self._get_default_rules()
 
+    def _get_rules_mtime(self) -> Optional[float]:
+        """Date de modification du fichier de regles (None s'il n'existe pas)."""
+        try:
+            return os.stat(self.config_path).st_mtime
+        except OSError:
+            return None
+
+    def _maybe_reload_rules(self) -> None:
+        """Recharger les regles si le fichier YAML a change (verification throttlee)."""
+        now = time.monotonic()
+        if now - self._last_reload_check < RULES_RELOAD_CHECK_INTERVAL:
+            return
+        self._last_reload_check = now
+
+        mtime = self._get_rules_mtime()
+        if mtime != self._rules_mtime:
+            self._rules_mtime = mtime
+            self.rules = self._load_rules()
+
+    @property
+    def ruleset(self) -> CompiledRuleset:
+        """
+        Regles compilees, recompilees si les regles sources ont change
+
+        Verifie au plus une fois par seconde si compliance_rules.yaml a ete
+        modifie sur disque (rechargement a chaud).
+        """
+        self._maybe_reload_rules()
+        ruleset = self._ruleset
+        if ruleset is None or ruleset.fingerprint != CompiledRuleset.compute_fingerprint(
+            self.rules
+        ):
+            ruleset = CompiledRuleset(self.rules)
+            self._ruleset = ruleset
+            with self._scan_lock:
+                self._scan_cache.clear()
+        return ruleset
+
+    def _scan_query(self, ruleset: CompiledRuleset, query: str, query_hash: str) -> QueryScan:
+        """Analyser une requete, avec cache LRU par hash de requete (thread-safe)."""
+        with self._scan_lock:
+            cached = self._scan_cache.get(query_hash)
+            if cached is not None:
+                self._scan_cache.move_to_end(query_hash)
+                return cached
+
+        # Analyse hors verrou: deux threads peuvent analyser la meme requete
+        scan = ruleset.scan_query(query)
+        with self._scan_lock:
+            self._scan_cache[query_hash] = scan
+            if len(self._scan_cache) > QUERY_SCAN_CACHE_SIZE:
+                self._scan_cache.popitem(last=False)
+        return scan
+
     def _get_default_rules(self) -> RulesDict:
         """Retourner les regles de conformite par defaut"""
         return {
@@ -322,49 +535,23 @@ class ComplianceGuardian:
                     reason="max_length_exceeded", risk_level="MEDIUM", user_id=user_id
                 )
 
-        # Verifier les patterns interdits
-        forbidden_patterns = validation_rules.get("forbidden_patterns", [])
-        # Map patterns to their types for reliable categorization
-        pii_pattern_types = {
-            r"\b\d{3}-\d{2}-\d{4}\b": "ssn",
-            r"\b[A-Z]{2}\d{6}\b": "health_insurance",
-            r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b": "email",
-        }
-        if isinstance(forbidden_patterns, list):
-            for pattern in forbidden_patterns:
-                if isinstance(pattern, str):
-                    pattern_triggered = any(
-                        match.end() >= len(query) or query[match.end()] != "@"
-                        for match in re.finditer(pattern, query)
-                    )
-
-                    if pattern_triggered:
-                        is_valid = False
-                        errors_list.append(f"Query contains forbidden pattern: {pattern}")
-                        # Record rejection metric
-                        if self.metrics:
-                            user_id = str(context.get("user_id", "anonymous"))
-                            self.metrics.record_compliance_rejection(
-                                reason="forbidden_pattern", risk_level="HIGH", user_id=user_id
-                            )
-                            # Record as suspicious pattern for security monitoring
-                            self.metrics.record_suspicious_pattern(
-                                pattern_type="forbidden_keyword", action_taken="blocked"
-                            )
-
-        # Detecter les PII
-        pii_patterns = validation_rules.get("pii_patterns", [])
-        pii_found: List[str] = []
-        pii_types_detected: List[str] = []
-        if isinstance(pii_patterns, list):
-            for pattern in pii_patterns:
-                if isinstance(pattern, str):
-                    matches = re.findall(pattern, query)
-                    if matches:
-                        pii_found.extend(matches)
-                        # Determine PII type using mapping
-                        pii_type = pii_pattern_types.get(pattern, "unknown")
-                        pii_types_detected.append(pii_type)
+        # Verifier les patterns interdits et detecter les PII (regles compilees)
+        triggered_patterns, pii_found, pii_types_detected = self._scan_query(
+            self.ruleset, query, metadata.query_hash or ""
+        )
+        for pattern in triggered_patterns:
+            is_valid = False
+            errors_list.append(f"Query contains forbidden pattern: {pattern}")
+            # Record rejection metric
+            if self.metrics:
+                user_id = str(context.get("user_id", "anonymous"))
+                self.metrics.record_compliance_rejection(
+                    reason="forbidden_pattern", risk_level="HIGH", user_id=user_id
+                )
+                # Record as suspicious pattern for security monitoring
+                self.metrics.record_suspicious_pattern(
+                    pattern_type="forbidden_keyword", action_taken="blocked"
+                )
 
         if pii_found:
             warnings_list.append(
@@ -466,20 +653,18 @@ class ComplianceGuardian:
             is_valid = False
             errors_list.append(f"Plan uses {len(tools_used)} tools, exceeds maximum of {max_tools}")
 
+        ruleset = self.ruleset
+
         # Verifier les outils interdits
-        forbidden_tools_list = execution_rules.get("forbidden_tools", [])
-        if isinstance(forbidden_tools_list, list):
-            forbidden_tools: Set[str] = set(str(t) for t in forbidden_tools_list)
-            used_forbidden = forbidden_tools.intersection(tools_used)
+        if ruleset.forbidden_tools is not None:
+            used_forbidden = ruleset.forbidden_tools.intersection(tools_used)
             if used_forbidden:
                 is_valid = False
                 errors_list.append(f"Plan uses forbidden tools: {', '.join(used_forbidden)}")
 
         # Verifier les outils necessitant approbation
-        require_approval_list = execution_rules.get("require_approval_for", [])
-        if isinstance(require_approval_list, list):
-            require_approval: Set[str] = set(str(t) for t in require_approval_list)
-            needs_approval = require_approval.intersection(tools_used)
+        if ruleset.require_approval is not None:
+            needs_approval = ruleset.require_approval.intersection(tools_used)
             if needs_approval:
                 warnings_list.append(
                     f"Plan uses tools requiring approval: {', '.join(needs_approval)}"
@@ -698,12 +883,12 @@ class ComplianceGuardian:
         self.audit_log.append(audit_entry)
 
     def get_audit_log(self) -> List[AuditEntryDict]:
-        """Recuperer le log d'audit"""
+        """Recuperer le log d'audit (entrees encore en memoire)"""
         return self.audit_log
 
     def clear_audit_log(self) -> None:
         """Effacer le log d'audit (pour tests)"""
-        self.audit_log = []
+        self.audit_log.clear()
 
     def validate_task(
         self, task: TaskDict, context: Optional[ContextDict] = None
@@ -732,42 +917,31 @@ class ComplianceGuardian:
         task_params = task.get("parameters", {}) or task.get("arguments", {})
         task_params_dict = task_params if isinstance(task_params, dict) else {}
 
+        ruleset = self.ruleset
+
         # Verifier les outils interdits
-        execution_rules = self.rules.get("execution", {})
-        forbidden_tools_list = execution_rules.get("forbidden_tools", [])
-        if isinstance(forbidden_tools_list, list):
-            forbidden_tools: Set[str] = set(str(t) for t in forbidden_tools_list)
-            if action in forbidden_tools:
-                violations.append(f"Task uses forbidden tool: {action}")
-                risk_level = "CRITICAL"
+        if ruleset.forbidden_tools is not None and action in ruleset.forbidden_tools:
+            violations.append(f"Task uses forbidden tool: {action}")
+            risk_level = "CRITICAL"
 
         # Verifier les outils necessitant approbation
-        require_approval_list = execution_rules.get("require_approval_for", [])
-        if isinstance(require_approval_list, list):
-            require_approval: Set[str] = set(str(t) for t in require_approval_list)
-            if action in require_approval:
-                warnings.append(f"Task uses tool requiring approval: {action}")
-                risk_level = "HIGH"
+        if ruleset.require_approval is not None and action in ruleset.require_approval:
+            warnings.append(f"Task uses tool requiring approval: {action}")
+            risk_level = "HIGH"
 
         # Verifier les patterns dangereux dans les parametres
         params_str = str(task_params_dict)
-        validation_rules = self.rules.get("validation", {})
-        forbidden_patterns = validation_rules.get("forbidden_patterns", [])
-        if isinstance(forbidden_patterns, list):
-            for pattern in forbidden_patterns:
-                if isinstance(pattern, str) and re.search(pattern, params_str):
-                    violations.append(f"Task parameters contain forbidden pattern: {pattern}")
-                    risk_level = "HIGH"
+        for pattern, regex in ruleset.forbidden_patterns:
+            if regex.search(params_str):
+                violations.append(f"Task parameters contain forbidden pattern: {pattern}")
+                risk_level = "HIGH"
 
         # Verifier les patterns PII
-        pii_patterns = validation_rules.get("pii_patterns", [])
         pii_found: List[str] = []
-        if isinstance(pii_patterns, list):
-            for pattern in pii_patterns:
-                if isinstance(pattern, str):
-                    matches = re.findall(pattern, params_str)
-                    if matches:
-                        pii_found.extend(matches)
+        for _, regex, _ in ruleset.pii_patterns:
+            matches = regex.findall(params_str)
+            if matches:
+                pii_found.extend(matches)
 
         if pii_found:
             warnings.append(f"Task parameters contain potential PII: {len(pii_found)} instance(s)")
@@ -4,12 +4,14 @@ Task Executor - Execution de plans HTN avec parallelisation
 Implemente:
 - Execution sequentielle et parallele de taches
 - Gestion des dependances via tri topologique
+- Ordonnancement par file de taches pretes (sans barriere par niveau)
 - Recovery gracieux sur echec
 - Tracabilite complete (conformite Loi 25, RGPD)
 
 Strategies d'execution:
 - Sequential: Une tache a la fois (securitaire)
-- Parallel: Taches independantes en parallele (performance)
+- Parallel: Chaque tache soumise des que sa derniere dependance termine,
+  par priorite puis longueur du chemin critique (performance)
 - Adaptive: Hybride selon disponibilite ressources
 
 Conformite:
@@ -24,7 +26,10 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, Future, wait
+import contextvars
+import heapq
+import logging
 import traceback
 import time
 
@@ -40,6 +45,8 @@ ActionFunc = Callable[[Dict[str, object]], TaskResult]
 ActionRegistry = Dict[str, ActionFunc]
 MetadataDict = Dict[str, Union[str, int, float, bool, Dict[str, object], List[object]]]
 
+_logger = logging.getLogger(__name__)
+
 
 class ExecutionStrategy(str, Enum):
     """Strategies d'execution"""
@@ -358,42 +365,56 @@ class TaskExecutor:
         """
         Execution parallele (taches independantes en parallele)
 
+        Ordonnancement par file de taches pretes: le degre entrant de chaque
+        tache est decremente a la fin de chacune de ses dependances, et la
+        tache est soumise des qu'il atteint zero (pas de barriere par niveau:
+        une tache lente ne bloque que ses dependants). Au plus max_workers
+        taches sont en cours; les taches pretes sont choisies par priorite
+        puis par longueur du chemin critique restant.
+
         Avantages: Rapide, exploite concurrence
         Limitations: Plus complexe, necessite thread-safety
         """
         task_results: Dict[str, TaskResult] = {}
         errors: Dict[str, str] = {}
 
-        # Identifier les niveaux de parallelisation
-        levels = graph.get_parallelizable_tasks()
+        order = {task.task_id: index for index, task in enumerate(graph.topological_sort())}
+        critical_path = self._critical_path_lengths(graph, order)
+        in_degree = {tid: len(deps) for tid, deps in graph.reverse_adjacency.items()}
+        ready: List[tuple] = []
 
-        # Executer niveau par niveau
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            for level_tasks in levels:
-                # Soumettre toutes les taches du niveau
-                futures: Dict[Future[TaskResult], Task] = {}
-
-                for task in level_tasks:
-                    # Verifier dependances
-                    if not self._check_dependencies(task, graph):
-                        task.update_status(TaskStatus.SKIPPED, "Dependency failed")
-                        continue
+        def push(task_id: str) -> None:
+            task = graph.tasks[task_id]
+            heapq.heappush(
+                ready, (-task.priority.value, -critical_path[task_id], order[task_id], task_id)
+            )
+
+        for task_id, degree in in_degree.items():
+            if degree == 0:
+                push(task_id)
 
-                    # Soumettre a l'executeur
+        running: Dict[Future[TaskResult], Task] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while ready or running:
+                # Soumettre les taches pretes dans la limite des workers
+                while ready and len(running) < self.max_workers:
+                    task = graph.tasks[heapq.heappop(ready)[3]]
+                    if task.status not in (TaskStatus.PENDING, TaskStatus.READY):
+                        continue  # Sautee par propagation d'echec
                     task.update_status(TaskStatus.RUNNING)
-                    future = executor.submit(self._execute_task, task)
-                    futures[future] = task
+                    # Propager les contextvars (priorite d'inference HTN, trace) au worker
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, self._execute_task, task)] = task
 
-                # Attendre la completion du niveau
-                for future in as_completed(futures):
-                    task = futures[future]
+                if not running:
+                    continue
 
-                    try:
-                        result = future.result(timeout=self.timeout)
-                        task.set_result(result)
-                        task.update_status(TaskStatus.COMPLETED)
-                        task_results[task.task_id] = result
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
 
+                    try:
+                        result = future.result()
                     except Exception as e:
                         error_msg = f"{type(e).__name__}: {str(e)}"
                         task.update_status(TaskStatus.FAILED, error_msg)
@@ -401,12 +422,47 @@ class TaskExecutor:
 
                         # Propager l'echec
                         self._propagate_failure(task, graph)
+                        continue
+
+                    task.set_result(result)
+                    task.update_status(TaskStatus.COMPLETED)
+                    task_results[task.task_id] = result
+
+                    # Liberer les dependants dont c'etait la derniere dependance
+                    for dependent_id in graph.adjacency_list.get(task.task_id, []):
+                        in_degree[dependent_id] -= 1
+                        if in_degree[dependent_id] == 0:
+                            push(dependent_id)
 
         return {
             "task_results": task_results,
             "errors": errors,
         }
 
+    @staticmethod
+    def _critical_path_lengths(graph: TaskGraph, order: Dict[str, int]) -> Dict[str, float]:
+        """
+        Longueur du plus long chemin de chaque tache jusqu'a une feuille
+
+        Le cout d'une tache est metadata["estimated_duration_ms"] si le
+        planificateur l'a renseigne, 1 sinon (chemin critique en nombre de
+        taches).
+
+        Args:
+            graph: Graphe de taches
+            order: Rang de chaque tache dans un tri topologique
+
+        Returns:
+            Longueur du chemin critique restant par task_id
+        """
+        lengths: Dict[str, float] = {}
+        for task_id in sorted(order, key=order.__getitem__, reverse=True):
+            estimate = graph.tasks[task_id].metadata.get("estimated_duration_ms", 1)
+            cost = float(estimate) if isinstance(estimate, (int, float)) else 1.0
+            successors = graph.adjacency_list.get(task_id, [])
+            lengths[task_id] = cost + max((lengths[s] for s in successors), default=0.0)
+        return lengths
+
     def _execute_adaptive(
         self, graph: TaskGraph, metadata: MetadataDict
     ) -> Dict[str, Union[Dict[str, TaskResult], Dict[str, str]]]:
@@ -484,26 +540,9 @@ class TaskExecutor:
         Propage l'echec d'une tache a ses dependants
 
         Marque toutes les taches qui dependent de failed_task comme SKIPPED
+        (parcours des listes d'adjacence: O(dependants + arcs sortants))
         """
-        # Trouver tous les dependants (BFS)
-        to_skip: List[Task] = []
-        queue: List[str] = [failed_task.task_id]
-        visited: set[str] = set()
-
-        while queue:
-            current_id = queue.pop(0)
-            if current_id in visited:
-                continue
-            visited.add(current_id)
-
-            # Trouver les taches qui dependent de current
-            for task in graph.tasks.values():
-                if current_id in task.depends_on and task.task_id not in visited:
-                    to_skip.append(task)
-                    queue.append(task.task_id)
-
-        # Marquer comme sautees
-        for task in to_skip:
+        for task in graph.get_descendants(failed_task.task_id):
             if task.status == TaskStatus.PENDING:
                 task.update_status(TaskStatus.SKIPPED, f"Dependency {failed_task.task_id} failed")
 
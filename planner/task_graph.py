@@ -8,15 +8,20 @@ Implémente:
 - Sérialisation pour traçabilité (conformité Loi 25)
 
 Complexité:
-- Construction: O(V + E) où V=tâches, E=dépendances
-- Détection de cycles: O(V + E) via DFS
-- Tri topologique: O(V + E)
+- Construction: O(V + E) où V=tâches, E=dépendances (détection de cycle
+  incrémentale: seul le sous-graphe atteignable depuis la nouvelle tâche
+  est parcouru)
+- Détection de cycles (graphe complet): O(V + E) via DFS itératif
+- Tri topologique: O((V + E) log V) via tas de priorité
+- Niveaux de parallélisation: calculés à l'ajout, groupes mis en cache
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Dict, Optional, Union
 from datetime import datetime, timezone
+import heapq
 import uuid
 
 # Types stricts pour les tâches HTN
@@ -158,6 +163,8 @@ class TaskGraph:
         self.tasks: Dict[str, Task] = {}  # task_id -> Task
         self.adjacency_list: Dict[str, List[str]] = {}  # task_id -> [dependent_task_ids]
         self.reverse_adjacency: Dict[str, List[str]] = {}  # task_id -> [dependency_task_ids]
+        self._task_level: Dict[str, int] = {}  # task_id -> niveau de parallélisation
+        self._levels: Optional[List[List[Task]]] = None  # Cache de get_parallelizable_tasks
 
     def add_task(self, task: Task) -> None:
         """
@@ -190,8 +197,9 @@ class TaskGraph:
         for dep_id in task.depends_on:
             self.adjacency_list[dep_id].append(task.task_id)
 
-        # Vérifier l'absence de cycles après ajout
-        if self._has_cycle():
+        # Vérifier l'absence de cycles après ajout (seuls les nouveaux arcs
+        # dep -> tâche peuvent en créer un, qui passe alors par la tâche)
+        if self._creates_cycle(task.task_id):
             # Rollback
             del self.tasks[task.task_id]
             del self.adjacency_list[task.task_id]
@@ -201,11 +209,45 @@ class TaskGraph:
 
             raise TaskDecompositionError(f"Adding task {task.task_id} would create a cycle")
 
+        # Niveau = max(niveaux des dépendances) + 1
+        self._task_level[task.task_id] = 1 + max(
+            (self._task_level[dep_id] for dep_id in task.depends_on), default=-1
+        )
+        self._levels = None
+
+    def _creates_cycle(self, task_id: str) -> bool:
+        """
+        Détecte un cycle passant par task_id
+
+        Parcourt uniquement les tâches atteignables depuis task_id: il y a un
+        cycle si task_id est atteignable depuis l'un de ses dépendants. Pour
+        une tâche qui vient d'être ajoutée (sans dépendants), le coût est O(1).
+
+        Args:
+            task_id: Tâche dont les arcs entrants viennent d'être ajoutés
+
+        Returns:
+            True si cycle détecté, False sinon
+        """
+        stack = list(self.adjacency_list.get(task_id, []))
+        visited = set()
+
+        while stack:
+            node = stack.pop()
+            if node == task_id:
+                return True
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.extend(self.adjacency_list.get(node, []))
+
+        return False
+
     def _has_cycle(self) -> bool:
         """
-        Détecte les cycles via DFS
+        Détecte les cycles dans tout le graphe via DFS itératif
 
-        Complexité: O(V + E)
+        Complexité: O(V + E), sans limite de profondeur de récursion
 
         Returns:
             True si cycle détecté, False sinon
@@ -213,33 +255,62 @@ class TaskGraph:
         visited = set()
         rec_stack = set()
 
-        def dfs(node: str) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
+        for root in self.tasks:
+            if root in visited:
+                continue
+
+            visited.add(root)
+            rec_stack.add(root)
+            stack = [(root, iter(self.adjacency_list.get(root, [])))]
 
-            for neighbor in self.adjacency_list.get(node, []):
-                if neighbor not in visited:
-                    if dfs(neighbor):
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if neighbor in rec_stack:
                         return True
-                elif neighbor in rec_stack:
-                    return True
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        rec_stack.add(neighbor)
+                        stack.append((neighbor, iter(self.adjacency_list.get(neighbor, []))))
+                        break
+                else:
+                    rec_stack.remove(node)
+                    stack.pop()
 
-            rec_stack.remove(node)
-            return False
+        return False
 
-        for node in self.tasks.keys():
-            if node not in visited:
-                if dfs(node):
-                    return True
+    def get_descendants(self, task_id: str) -> List[Task]:
+        """
+        Retourne toutes les tâches qui dépendent (transitivement) de task_id
 
-        return False
+        Parcours en largeur des listes d'adjacence: O(descendants + arcs sortants).
+
+        Args:
+            task_id: Tâche de départ (exclue du résultat)
+
+        Returns:
+            Tâches dépendantes, dans l'ordre du parcours en largeur
+        """
+        descendants = []
+        visited = {task_id}
+        queue = deque([task_id])
+
+        while queue:
+            for dependent_id in self.adjacency_list.get(queue.popleft(), []):
+                if dependent_id not in visited:
+                    visited.add(dependent_id)
+                    descendants.append(self.tasks[dependent_id])
+                    queue.append(dependent_id)
+
+        return descendants
 
     def topological_sort(self) -> List[Task]:
         """
         Tri topologique pour ordonnancement d'exécution
 
-        Utilise l'algorithme de Kahn (BFS-based)
-        Complexité: O(V + E)
+        Utilise l'algorithme de Kahn avec un tas: parmi les tâches prêtes, la
+        plus prioritaire d'abord, puis la première devenue prête.
+        Complexité: O((V + E) log V)
 
         Returns:
             Liste de tâches dans l'ordre d'exécution
@@ -248,21 +319,27 @@ class TaskGraph:
             TaskDecompositionError: Si le graphe contient un cycle
         """
         in_degree = {task_id: len(deps) for task_id, deps in self.reverse_adjacency.items()}
-        queue = [task_id for task_id, degree in in_degree.items() if degree == 0]
+        # Entrées (-priorité, rang d'arrivée, task_id): CRITICAL > HIGH > NORMAL > LOW > OPTIONAL
+        queue = [
+            (-self.tasks[task_id].priority.value, rank, task_id)
+            for rank, task_id in enumerate(tid for tid, degree in in_degree.items() if degree == 0)
+        ]
+        heapq.heapify(queue)
+        rank = len(queue)
         sorted_tasks = []
 
         while queue:
-            # Trier par priorité (CRITICAL > HIGH > NORMAL > LOW > OPTIONAL)
-            queue.sort(key=lambda tid: self.tasks[tid].priority.value, reverse=True)
-
-            task_id = queue.pop(0)
+            task_id = heapq.heappop(queue)[2]
             sorted_tasks.append(self.tasks[task_id])
 
             # Réduire le degré des dépendants
             for dependent_id in self.adjacency_list.get(task_id, []):
                 in_degree[dependent_id] -= 1
                 if in_degree[dependent_id] == 0:
-                    queue.append(dependent_id)
+                    heapq.heappush(
+                        queue, (-self.tasks[dependent_id].priority.value, rank, dependent_id)
+                    )
+                    rank += 1
 
         if len(sorted_tasks) != len(self.tasks):
             raise TaskDecompositionError("Graph contains a cycle - topological sort impossible")
@@ -303,28 +380,20 @@ class TaskGraph:
         """
         Identifie les groupes de tâches exécutables en parallèle
 
+        Les niveaux sont calculés à l'ajout des tâches; les groupes (ordonnés
+        comme le tri topologique) sont mis en cache jusqu'au prochain add_task.
+
         Returns:
             Liste de listes de tâches (chaque sous-liste = groupe parallèle)
         """
-        sorted_tasks = self.topological_sort()
-        levels: List[List[Task]] = []
-        task_level: Dict[str, int] = {}
-
-        for task in sorted_tasks:
-            # Le niveau d'une tâche = max(niveaux de ses dépendances) + 1
-            if not task.depends_on:
-                level = 0
-            else:
-                level = max(task_level[dep_id] for dep_id in task.depends_on) + 1
-
-            task_level[task.task_id] = level
-
-            # Ajouter au groupe de niveau
-            while len(levels) <= level:
-                levels.append([])
-            levels[level].append(task)
-
-        return levels
+        if self._levels is None:
+            depth = max(self._task_level.values(), default=-1) + 1
+            levels: List[List[Task]] = [[] for _ in range(depth)]
+            for task in self.topological_sort():
+                levels[self._task_level[task.task_id]].append(task)
+            self._levels = levels
+
+        return [list(level) for level in self._levels]
 
     def to_dict(
         self,
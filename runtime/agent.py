@@ -8,13 +8,14 @@ REFACTORED: Now uses Clean Architecture with dependency injection
 from __future__ import annotations
 
 import hashlib
+import threading
 import time
 import logging
 from typing import TYPE_CHECKING, List, Dict, Optional, Union, Callable, cast
 from datetime import datetime
 
 from .config import get_config, AgentConfig
-from .model_interface import GenerationConfig, init_model as _init_model
+from .model_interface import GenerationConfig, GenerationResult, init_model as _init_model
 from memory.episodic import add_message, get_messages
 from tools.registry import get_registry, ToolRegistry
 from tools.base import ToolResult, BaseTool
@@ -97,8 +98,12 @@ from planner.task_graph import TaskStatus
 # Import NEW architecture components
 from architecture.router import StrategyRouter, ExecutionStrategy as RouterExecutionStrategy
 from runtime.tool_executor import ToolExecutor, ToolCall
-from runtime.tool_parser import ToolParser
-from runtime.context_builder import ContextBuilder
+from runtime.tool_parser import ToolParser, StreamingToolCallFilter
+from runtime.context_builder import ContextBuilder, PromptContext
+from runtime.config import ContextBudgetConfig
+from runtime.token_budget import TokenBudgeter, TokenCounter
+from runtime.inference_scheduler import Priority, inference_priority
+from runtime.stage_timer import StageTimer, get_stage_timer
 
 # Import semantic cache manager
 try:
@@ -147,6 +152,7 @@ class Agent:
         tool_parser: Optional[ToolParser] = None,
         context_builder: Optional[ContextBuilder] = None,
         compliance_guardian: Optional[ComplianceGuardian] = None,
+        stage_timer: Optional[StageTimer] = None,
     ) -> None:
         """
         Initialize Agent with dependency injection.
@@ -162,6 +168,7 @@ class Agent:
             tool_parser: Tool parser (created if None)
             context_builder: Context builder (created if None)
             compliance_guardian: Compliance guardian (created based on config)
+            stage_timer: Stage timer (global one if None, see runtime/stage_timer.py)
         """
         # Core configuration
         self.config = config or get_config()
@@ -243,6 +250,10 @@ class Agent:
         else:
             self.context_builder = context_builder
 
+        # Budget de tokens (créé pour le modèle courant, voir _get_token_budgeter)
+        self._token_budgeter: Optional[TokenBudgeter] = None
+        self._token_budgeter_model: Optional[object] = None
+
         # Initialize metrics collector
         if METRICS_AVAILABLE:
             self.metrics = get_agent_metrics()
@@ -255,6 +266,9 @@ class Agent:
         else:
             self.tracer = get_tracer()  # No-op tracer
 
+        # Spans et histogrammes par étape (no-op si profiling.stage_timers est désactivé)
+        self.stage_timer = stage_timer or get_stage_timer()
+
         # S'assurer que les middlewares reflètent les éventuels patches actifs
         self._refresh_middlewares()
 
@@ -316,6 +330,16 @@ class Agent:
         model_config = {
             "context_size": self.config.model.context_size,
             "n_gpu_layers": self.config.model.n_gpu_layers,
+            "prefix_cache_states": self.config.model.prefix_cache_states,
+            "prefix_cache_max_mb": self.config.model.prefix_cache_max_mb,
+            "replicas": self.config.model.replicas,
+            "request_timeout": self.config.model.request_timeout,
+            "hedge_after": self.config.model.hedge_after_seconds,
+            "max_connections": self.config.model.max_connections,
+            "rate_limit_state_dir": self.config.model.rate_limit_state_dir,
+            "record_path": self.config.model.record_path,
+            "replay_latency": self.config.model.replay_latency,
+            "replay_seed": self.config.model.replay_seed,
         }
 
         self.model = init_model(
@@ -407,13 +431,21 @@ class Agent:
         return VerificationLevel.STRICT
 
     def chat(
-        self, message: str, conversation_id: str, task_id: Optional[str] = None
+        self,
+        message: str,
+        conversation_id: str,
+        task_id: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, ChatResponseValue]:
         """
         Analyser un message utilisateur et orchestrer la réponse de l'agent.
 
         REFACTORED: Now uses Router component for strategy decision.
         NEW: Checks semantic cache before routing to reduce inference costs.
+
+        Args:
+            on_token: Callback recevant le texte visible au fil de la génération
+                (mode simple uniquement; les appels d'outils ne sont pas relayés)
         """
 
         # Métriques: compter requête totale
@@ -425,8 +457,9 @@ class Agent:
         cache_result = None
         if CACHE_AVAILABLE:
             try:
-                cache_manager = get_cache_manager()
-                cache_result = cache_manager.get(message)
+                with self.stage_timer.stage("cache_lookup"):
+                    cache_manager = get_cache_manager()
+                    cache_result = cache_manager.get(message)
 
                 if cache_result:
                     # Cache hit! Return cached response immediately
@@ -453,18 +486,19 @@ class Agent:
 
                     # Store user message in episodic memory
                     try:
-                        add_message(
-                            conversation_id=conversation_id,
-                            role="user",
-                            content=message,
-                            task_id=task_id,
-                        )
-                        add_message(
-                            conversation_id=conversation_id,
-                            role="assistant",
-                            content=cache_result["response"]["response_text"],
-                            task_id=task_id,
-                        )
+                        with self.stage_timer.stage("episodic_write"):
+                            add_message(
+                                conversation_id=conversation_id,
+                                role="user",
+                                content=message,
+                                task_id=task_id,
+                            )
+                            add_message(
+                                conversation_id=conversation_id,
+                                role="assistant",
+                                content=cache_result["response"]["response_text"],
+                                task_id=task_id,
+                            )
                     except Exception as e:
                         _init_logger.warning("Failed to persist cached messages: %s", e)
 
@@ -478,36 +512,39 @@ class Agent:
                 cache_result = None
 
         # NOUVEAU: Use Router component for strategy decision
-        routing_decision = self.router.route(message)
+        with self.stage_timer.stage("routing"):
+            routing_decision = self.router.route(message)
 
         if routing_decision.strategy == RouterExecutionStrategy.HTN:
             # Métriques: requête HTN
             metrics.htn_requests_total.labels(strategy="auto", status="requested").inc()
-            result = self._run_with_htn(message, conversation_id, task_id)
+            with inference_priority(Priority.HTN):
+                result = self._run_with_htn(message, conversation_id, task_id)
         else:
             # Mode simple (pas de métriques HTN pour les requêtes simples)
-            result = self._run_simple(message, conversation_id, task_id)
+            result = self._run_simple(message, conversation_id, task_id, on_token=on_token)
 
         # NEW: Store successful response in cache
         if CACHE_AVAILABLE and result.get("response"):
             try:
-                cache_manager = get_cache_manager()
-                cache_manager.store(
-                    query=message,
-                    response_text=result["response"],
-                    conversation_id=conversation_id,
-                    task_id=task_id,
-                    tools_used=result.get("tools_used", []),
-                    usage=result.get("usage", {}),
-                    iterations=result.get("iterations", 1),
-                    metadata={
-                        "strategy": (
-                            routing_decision.strategy.value
-                            if hasattr(routing_decision.strategy, "value")
-                            else str(routing_decision.strategy)
-                        )
-                    },
-                )
+                with self.stage_timer.stage("cache_store"):
+                    cache_manager = get_cache_manager()
+                    cache_manager.store(
+                        query=message,
+                        response_text=result["response"],
+                        conversation_id=conversation_id,
+                        task_id=task_id,
+                        tools_used=result.get("tools_used", []),
+                        usage=result.get("usage", {}),
+                        iterations=result.get("iterations", 1),
+                        metadata={
+                            "strategy": (
+                                routing_decision.strategy.value
+                                if hasattr(routing_decision.strategy, "value")
+                                else str(routing_decision.strategy)
+                            )
+                        },
+                    )
                 _init_logger.debug("Response cached for future queries")
             except Exception as e:
                 _init_logger.warning("Failed to cache response: %s", e)
@@ -556,13 +593,14 @@ class Agent:
         # Logger le début de la conversation HTN
         if self.logger:
             try:
-                self.logger.log_event(
-                    actor="agent.core",
-                    event="conversation.start.htn",
-                    level="INFO",
-                    conversation_id=conversation_id,
-                    task_id=task_id,
-                )
+                with self.stage_timer.stage("logging"):
+                    self.logger.log_event(
+                        actor="agent.core",
+                        event="conversation.start.htn",
+                        level="INFO",
+                        conversation_id=conversation_id,
+                        task_id=task_id,
+                    )
             except Exception as e:
                 _init_logger.warning("Failed to log conversation.start.htn event: %s", e)
 
@@ -580,38 +618,41 @@ class Agent:
         if task_id is not None:
             plan_context["task_id"] = task_id
 
-        plan_result = self.planner.plan(
-            query=user_query,
-            strategy=strategy,
-            context=plan_context,
-        )
+        with self.stage_timer.stage("planning"):
+            plan_result = self.planner.plan(
+                query=user_query,
+                strategy=strategy,
+                context=plan_context,
+            )
 
         # Log decision record (conformité Loi 25)
         if self.dr_manager:
             try:
-                prompt_hash = hashlib.sha256(user_query.encode("utf-8")).hexdigest()
-                self.dr_manager.create_dr(
-                    actor="agent.core",
-                    task_id=task_id or conversation_id,
-                    decision="planning",
-                    prompt_hash=prompt_hash,
-                    tools_used=[],
-                    alternatives_considered=["simple_execution"],
-                    constraints={
-                        "strategy": strategy.value,
-                        "max_depth": self.planner.max_depth,
-                    },
-                    expected_risk=["planning_error:low", "execution_error:medium"],
-                    reasoning_markers=[f"plan_confidence:{plan_result.confidence}"],
-                )
+                with self.stage_timer.stage("dr_signing"):
+                    prompt_hash = hashlib.sha256(user_query.encode("utf-8")).hexdigest()
+                    self.dr_manager.create_dr(
+                        actor="agent.core",
+                        task_id=task_id or conversation_id,
+                        decision="planning",
+                        prompt_hash=prompt_hash,
+                        tools_used=[],
+                        alternatives_considered=["simple_execution"],
+                        constraints={
+                            "strategy": strategy.value,
+                            "max_depth": self.planner.max_depth,
+                        },
+                        expected_risk=["planning_error:low", "execution_error:medium"],
+                        reasoning_markers=[f"plan_confidence:{plan_result.confidence}"],
+                    )
             except Exception as e:
                 _init_logger.warning("Failed to create decision record for planning: %s", e)
 
         # 2. Exécuter
-        exec_result = self.executor.execute(
-            graph=plan_result.graph,
-            context=plan_context,
-        )
+        with self.stage_timer.stage("htn_execution"):
+            exec_result = self.executor.execute(
+                graph=plan_result.graph,
+                context=plan_context,
+            )
 
         # 3. Vérifier
         verif_config = getattr(self.config, "htn_verification", None)
@@ -620,17 +661,19 @@ class Agent:
             if verif_config
             else VerificationLevel.STRICT
         )
-        verifications = self.verifier.verify_graph_results(
-            graph=plan_result.graph,
-            level=verif_level,
-        )
+        with self.stage_timer.stage("verification"):
+            verifications = self.verifier.verify_graph_results(
+                graph=plan_result.graph,
+                level=verif_level,
+            )
 
         # 4. Construire la réponse
         if exec_result.success:
             # Toutes les tâches critiques réussies
-            response = self._format_htn_response(
-                plan_result, exec_result, verifications, conversation_id, task_id
-            )
+            with self.stage_timer.stage("response_format"):
+                response = self._format_htn_response(
+                    plan_result, exec_result, verifications, conversation_id, task_id
+                )
         else:
             # Échec critique: fallback sur mode simple
             _init_logger.warning("HTN execution failed, falling back to simple mode")
@@ -643,7 +686,11 @@ class Agent:
         return response
 
     def _run_simple(
-        self, message: str, conversation_id: str, task_id: Optional[str] = None
+        self,
+        message: str,
+        conversation_id: str,
+        task_id: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, ChatResponseValue]:
         """Exécution en mode simple (ancien comportement sans HTN)"""
 
@@ -667,7 +714,8 @@ class Agent:
                         "task_id": task_id or "",
                         "user_id": conversation_id,  # Utiliser conversation_id comme proxy pour user_id
                     }
-                    self.compliance_guardian.validate_query(message, validation_context)
+                    with self.stage_timer.stage("compliance_audit"):
+                        self.compliance_guardian.validate_query(message, validation_context)
             except Exception as e:
                 # En mode strict, propager l'erreur
                 cg_config = getattr(self.config, "compliance_guardian", None)
@@ -688,35 +736,43 @@ class Agent:
         # Logger le début de la conversation (avec fallback)
         if self.logger:
             try:
-                self.logger.log_event(
-                    actor="agent.core",
-                    event="conversation.start",
-                    level="INFO",
-                    conversation_id=conversation_id,
-                    task_id=task_id,
-                )
+                with self.stage_timer.stage("logging"):
+                    self.logger.log_event(
+                        actor="agent.core",
+                        event="conversation.start",
+                        level="INFO",
+                        conversation_id=conversation_id,
+                        task_id=task_id,
+                    )
             except Exception as e:
                 _init_logger.warning("Failed to log conversation.start event: %s", e)
 
         # Enregistrer le message utilisateur en mémoire persistante
         try:
-            add_message(
-                conversation_id=conversation_id,
-                role="user",
-                content=message,
-                task_id=task_id,
-            )
+            with self.stage_timer.stage("episodic_write"):
+                add_message(
+                    conversation_id=conversation_id,
+                    role="user",
+                    content=message,
+                    task_id=task_id,
+                )
         except Exception as e:
             _init_logger.warning("Failed to persist user message: %s", e)
 
         try:
-            history = get_messages(conversation_id)
+            with self.stage_timer.stage("episodic_read"):
+                history = get_messages(conversation_id)
         except Exception as e:
             _init_logger.warning("Failed to load conversation history: %s", e)
             history = []
         trimmed_history = history[:-1] if history else history
+        token_budgeter = self._get_token_budgeter()
         # REFACTORED: Use ContextBuilder
-        context = self.context_builder.build_context(trimmed_history, conversation_id, task_id)
+        with self.stage_timer.stage("context_build"):
+            context = PromptContext(
+                self.context_builder.build_context(trimmed_history, conversation_id, task_id)
+            )
+        tool_result_blocks: List[str] = []
 
         max_iterations = 10
         iterations = 0
@@ -743,26 +799,60 @@ class Agent:
                 repetition_penalty=self.config.generation.repetition_penalty,
             )
 
-            # REFACTORED: Use ContextBuilder
-            full_prompt = self.context_builder.compose_prompt(context, current_message)
-            current_prompt_hash = self.context_builder.compute_prompt_hash(
-                context,
-                current_message,
-                conversation_id,
-                task_id,
-            )
-
             # REFACTORED: Use ContextBuilder for system prompt
-            system_prompt = self.context_builder.build_system_prompt(self.tool_registry)
+            with self.stage_timer.stage("system_prompt"):
+                system_prompt = self.context_builder.build_system_prompt(self.tool_registry)
+
+            # Faire tenir prompt système, historique et résultats d'outils dans n_ctx
+            with self.stage_timer.stage("context_build"):
+                prompt_message = current_message
+                if token_budgeter is not None:
+                    allocation = token_budgeter.allocate(
+                        system_prompt=system_prompt,
+                        message=current_message,
+                        history=trimmed_history,
+                        tool_results=tool_result_blocks,
+                    )
+                    system_prompt = allocation.system_prompt
+                    prompt_message = allocation.message
+                    history_context = self.context_builder.build_context(
+                        allocation.history,
+                        conversation_id,
+                        task_id,
+                        max_messages=len(allocation.history),
+                    )
+                    # Segments inchangés depuis l'itération précédente: hash réutilisé
+                    context = self.context_builder.build_tool_context(
+                        history_context, allocation.tool_results, reuse=context
+                    )
+
+                # REFACTORED: Use ContextBuilder
+                full_prompt = self.context_builder.compose_prompt(context, prompt_message)
+                current_prompt_hash = self.context_builder.compute_prompt_hash(
+                    context,
+                    prompt_message,
+                    conversation_id,
+                    task_id,
+                )
 
             # Track generation start time for metrics
             generation_start_time = time.time()
 
-            generation_result = self.model.generate(
-                prompt=full_prompt,
-                config=generation_config,
-                system_prompt=system_prompt,
-            )
+            with self.stage_timer.stage("generation", iteration=iterations):
+                if on_token is None:
+                    generation_result = self.model.generate(
+                        prompt=full_prompt,
+                        config=generation_config,
+                        system_prompt=system_prompt,
+                    )
+                else:
+                    generation_result = self._generate_streaming(
+                        full_prompt,
+                        generation_config,
+                        system_prompt,
+                        on_token,
+                        generation_start_time,
+                    )
             end_time = datetime.now().isoformat()
 
             # Record generation duration metric
@@ -777,28 +867,34 @@ class Agent:
             response_text = generation_result.text.strip()
 
             # REFACTORED: Use ToolParser
-            parsing_result = self.tool_parser.parse(generation_result, response_text)
+            with self.stage_timer.stage("tool_parsing"):
+                parsing_result = self.tool_parser.parse(generation_result, response_text)
             tool_calls: List[ToolCall] = parsing_result.tool_calls
             if tool_calls:
                 # REFACTORED: Use ToolExecutor for batch execution
-                execution_results = self.tool_executor.execute_batch(
-                    tool_calls,
-                    conversation_id,
-                    task_id,
-                )
+                with self.stage_timer.stage("tool_execution", tool_calls=len(tool_calls)):
+                    execution_results = self.tool_executor.execute_batch(
+                        tool_calls,
+                        conversation_id,
+                        task_id,
+                    )
 
-                # Track tool names for decision records
-                for result in execution_results:
-                    tools_used.append(result.tool_name)
+                    # Track tool names for decision records
+                    for result in execution_results:
+                        tools_used.append(result.tool_name)
 
-                # REFACTORED: Use ToolExecutor to format results
-                formatted_results = self.tool_executor.format_results(execution_results)
+                    # REFACTORED: Use ToolExecutor to format results
+                    formatted_results = self.tool_executor.format_results(execution_results)
 
                 # REFACTORED: Use ContextBuilder to inject results
-                context = self.context_builder.format_tool_results_for_context(
-                    context, formatted_results
-                )
-                current_message = self.context_builder.create_followup_message(formatted_results)
+                with self.stage_timer.stage("context_build"):
+                    tool_result_blocks.append(formatted_results)
+                    context = self.context_builder.format_tool_results_for_context(
+                        context, formatted_results
+                    )
+                    current_message = self.context_builder.create_followup_message(
+                        formatted_results
+                    )
                 continue
 
             final_response = response_text
@@ -816,12 +912,13 @@ class Agent:
             )
 
         try:
-            add_message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=final_response,
-                task_id=task_id,
-            )
+            with self.stage_timer.stage("episodic_write"):
+                add_message(
+                    conversation_id=conversation_id,
+                    role="assistant",
+                    content=final_response,
+                    task_id=task_id,
+                )
         except Exception as e:
             _init_logger.warning("Failed to persist assistant message: %s", e)
 
@@ -834,32 +931,34 @@ class Agent:
 
         if self.logger:
             try:
-                self.logger.log_generation(
-                    conversation_id=conversation_id,
-                    task_id=task_id,
-                    prompt_hash=prompt_hash_for_logging,
-                    response_hash=response_hash,
-                    tokens_used=usage["total_tokens"],
-                )
+                with self.stage_timer.stage("logging"):
+                    self.logger.log_generation(
+                        conversation_id=conversation_id,
+                        task_id=task_id,
+                        prompt_hash=prompt_hash_for_logging,
+                        response_hash=response_hash,
+                        tokens_used=usage["total_tokens"],
+                    )
             except Exception as e:
                 _init_logger.warning("Failed to log generation: %s", e)
 
         if self.tracker:
             try:
-                self.tracker.track_generation(
-                    agent_id="agent:llmagenta",
-                    agent_version=self.config.version,
-                    task_id=task_id or conversation_id,
-                    prompt_hash=prompt_hash_for_logging,
-                    response_hash=response_hash,
-                    start_time=start_time,
-                    end_time=end_time,
-                    metadata={
-                        "iterations": iterations,
-                        "tools_used": unique_tools,
-                        "usage": usage,
-                    },
-                )
+                with self.stage_timer.stage("provenance"):
+                    self.tracker.track_generation(
+                        agent_id="agent:llmagenta",
+                        agent_version=self.config.version,
+                        task_id=task_id or conversation_id,
+                        prompt_hash=prompt_hash_for_logging,
+                        response_hash=response_hash,
+                        start_time=start_time,
+                        end_time=end_time,
+                        metadata={
+                            "iterations": iterations,
+                            "tools_used": unique_tools,
+                            "usage": usage,
+                        },
+                    )
             except Exception as e:
                 _init_logger.warning("Failed to track generation: %s", e)
 
@@ -871,22 +970,23 @@ class Agent:
             )
         ):
             try:
-                dr = self.dr_manager.create_dr(
-                    actor="agent.core",
-                    task_id=task_id or conversation_id,
-                    decision=(
-                        "generate_response_with_tools" if unique_tools else "generate_response"
-                    ),
-                    prompt_hash=prompt_hash_for_logging,
-                    tools_used=unique_tools,
-                    reasoning_markers=[f"iterations:{iterations}"],
-                    alternatives_considered=["do_nothing", "ask_clarification"],
-                    constraints={
-                        "max_tokens": self.config.generation.max_tokens,
-                        "temperature": self.config.generation.temperature,
-                    },
-                    expected_risk=["hallucination:medium", "tool_execution:low"],
-                )
+                with self.stage_timer.stage("dr_signing"):
+                    dr = self.dr_manager.create_dr(
+                        actor="agent.core",
+                        task_id=task_id or conversation_id,
+                        decision=(
+                            "generate_response_with_tools" if unique_tools else "generate_response"
+                        ),
+                        prompt_hash=prompt_hash_for_logging,
+                        tools_used=unique_tools,
+                        reasoning_markers=[f"iterations:{iterations}"],
+                        alternatives_considered=["do_nothing", "ask_clarification"],
+                        constraints={
+                            "max_tokens": self.config.generation.max_tokens,
+                            "temperature": self.config.generation.temperature,
+                        },
+                        expected_risk=["hallucination:medium", "tool_execution:low"],
+                    )
 
                 if self.logger:
                     try:
@@ -938,7 +1038,8 @@ class Agent:
                         "conversation_id": conversation_id,
                         "task_id": task_id or "",
                     }
-                    self.compliance_guardian.audit_execution(exec_result_audit, audit_context)
+                    with self.stage_timer.stage("compliance_audit"):
+                        self.compliance_guardian.audit_execution(exec_result_audit, audit_context)
 
                 # Générer Decision Record
                 if cg_config and cg_config.auto_generate_dr:
@@ -955,26 +1056,28 @@ class Agent:
                         "conversation_id": conversation_id,
                         "task_id": task_id or "",
                     }
-                    self.compliance_guardian.generate_decision_record(
-                        decision_type="simple_execution",
-                        query=message,
-                        plan=dr_plan,
-                        execution_result=exec_result_dr,
-                        context=dr_context,
-                    )
+                    with self.stage_timer.stage("compliance_audit"):
+                        self.compliance_guardian.generate_decision_record(
+                            decision_type="simple_execution",
+                            query=message,
+                            plan=dr_plan,
+                            execution_result=exec_result_dr,
+                            context=dr_context,
+                        )
             except Exception as e:
                 _init_logger.warning("Compliance audit/DR generation warning: %s", e)
 
         if self.logger:
             try:
-                self.logger.log_event(
-                    actor="agent.core",
-                    event="conversation.end",
-                    level="INFO",
-                    conversation_id=conversation_id,
-                    task_id=task_id,
-                    metadata={"iterations": iterations},
-                )
+                with self.stage_timer.stage("logging"):
+                    self.logger.log_event(
+                        actor="agent.core",
+                        event="conversation.end",
+                        level="INFO",
+                        conversation_id=conversation_id,
+                        task_id=task_id,
+                        metadata={"iterations": iterations},
+                    )
             except Exception as e:
                 _init_logger.warning("Failed to log conversation.end event: %s", e)
 
@@ -987,6 +1090,72 @@ class Agent:
             "usage": usage,
         }
 
+    def _get_token_budgeter(self) -> Optional[TokenBudgeter]:
+        """
+        Budget de tokens pour le modèle courant (None si désactivé)
+
+        Le compteur utilise le tokenizer du backend; il est recréé quand le
+        modèle change pour ne pas réutiliser des comptes d'un autre tokenizer.
+        """
+        budget_config = getattr(self.config, "context_budget", None)
+        if self.model is None or not isinstance(budget_config, ContextBudgetConfig):
+            return None
+        if not budget_config.enabled:
+            return None
+
+        if self._token_budgeter is None or self._token_budgeter_model is not self.model:
+            self._token_budgeter = TokenBudgeter(
+                counter=TokenCounter(getattr(self.model, "count_tokens", None)),
+                context_window=self.config.model.context_size,
+                reserved_output_tokens=self.config.generation.max_tokens,
+                tool_share=budget_config.tool_share,
+                semantic_share=budget_config.semantic_share,
+                safety_margin=budget_config.safety_margin,
+            )
+            self._token_budgeter_model = self.model
+        return self._token_budgeter
+
+    def _generate_streaming(
+        self,
+        prompt: str,
+        config: GenerationConfig,
+        system_prompt: str,
+        on_token: Callable[[str], None],
+        start_time: float,
+    ) -> GenerationResult:
+        """
+        Générer en streaming: relayer le texte visible, retenir les appels d'outils
+
+        Returns:
+            GenerationResult complet (porté par le dernier fragment du flux)
+        """
+        stream_filter = StreamingToolCallFilter()
+        result: Optional[GenerationResult] = None
+        first_token = True
+
+        for chunk in self.model.generate_stream(
+            prompt=prompt, config=config, system_prompt=system_prompt
+        ):
+            if chunk.result is not None:
+                result = chunk.result
+            if not chunk.text:
+                continue
+            if first_token:
+                first_token = False
+                if self.metrics:
+                    self.metrics.record_time_to_first_token(time.time() - start_time)
+            visible = stream_filter.feed(chunk.text)
+            if visible:
+                on_token(visible)
+
+        tail = stream_filter.flush()
+        if tail:
+            on_token(tail)
+
+        if result is None:
+            raise RuntimeError("Model stream ended without a final result")
+        return result
+
     # =============================================================================
     # DEPRECATED METHODS - Kept for backward compatibility, delegate to components
     # =============================================================================
@@ -1289,17 +1458,31 @@ class AgentManager:
 
     def __init__(self) -> None:
         self.agent: Optional[Agent] = None
+        # Les requêtes /chat arrivent en parallèle depuis le pool de workers:
+        # un seul thread crée l'agent et charge le modèle
+        self._lock = threading.Lock()
 
     def get_agent(self) -> Agent:
-        """Récupérer ou créer l'instance de l'agent"""
-        if self.agent is None:
-            self.agent = Agent()
-            self.agent.initialize_model()
+        """Récupérer ou créer l'instance de l'agent (double vérification sous verrou)"""
+        agent = self.agent
+        if agent is None:
+            with self._lock:
+                agent = self.agent
+                if agent is None:
+                    agent = Agent()
+                    agent.initialize_model()
+                    # Publier l'agent seulement une fois le modèle chargé
+                    self.agent = agent
+        return agent
+
+    def get_loaded_agent(self) -> Optional[Agent]:
+        """Retourner l'agent s'il est déjà créé, sans déclencher le chargement"""
         return self.agent
 
     def reload_agent(self) -> Agent:
         """Recharger l'agent (utile pour les tests)"""
-        self.agent = None
+        with self._lock:
+            self.agent = None
         return self.get_agent()
 
 
@@ -1312,6 +1495,11 @@ def get_agent() -> Agent:
     return _agent_manager.get_agent()
 
 
+def get_loaded_agent() -> Optional[Agent]:
+    """Récupérer l'instance de l'agent si elle est déjà chargée (None sinon)"""
+    return _agent_manager.get_loaded_agent()
+
+
 def init_model(
     backend: str, model_path: str, config: Dict[str, Union[str, int, bool]]
 ) -> ModelInterface:
@@ -43,6 +43,22 @@ class ModelConfig(BaseModel):
     backend: str = "llama.cpp"
     context_size: int = 4096
     n_gpu_layers: int = 35
+    # Cache d'états llama.cpp par préfixe de prompt (0 = désactivé)
+    prefix_cache_states: int = Field(default=4, ge=0)
+    prefix_cache_max_mb: int = Field(default=2048, ge=1)
+    # Ordonnanceur d'inférence llama.cpp: nombre d'instances servant les requêtes
+    replicas: int = Field(default=1, ge=1)
+    # Backends distants (OpenAI, Perplexity): timeout, hedging et pool HTTP partagé
+    request_timeout: float = Field(default=60.0, gt=0)
+    hedge_after_seconds: Optional[float] = Field(default=None, gt=0)
+    max_connections: int = Field(default=20, ge=1)
+    # Répertoire d'état partagé du rate limiter entre workers uvicorn (None = par processus)
+    rate_limit_state_dir: Optional[str] = None
+    # Enregistrement des générations pour le backend "replay" (None = désactivé)
+    record_path: Optional[str] = None
+    # Backend "replay": latence simulée (none, recorded, empirical, fixed:<ms>, ...) et graine
+    replay_latency: str = "none"
+    replay_seed: int = 0
 
 
 class MemoryConfig(BaseModel):
@@ -82,6 +98,39 @@ class AgentRuntimeSettings(BaseModel):
     timeout: int = 300
 
 
+class ContextBudgetConfig(BaseModel):
+    """Budget de tokens de la fenêtre de contexte (boucle de raisonnement)"""
+
+    enabled: bool = True
+    tool_share: float = Field(default=0.5, gt=0, le=1)
+    semantic_share: float = Field(default=0.5, gt=0, le=1)
+    safety_margin: int = Field(default=32, ge=0)
+
+
+class ServerConfig(BaseModel):
+    """Configuration du serveur API (concurrence de /chat)"""
+
+    max_concurrent_requests: int = Field(default=4, ge=1)
+    max_queued_requests: int = Field(default=16, ge=0)
+
+
+class StartupConfig(BaseModel):
+    """Budgets de démarrage à froid (ms, interpréteur neuf) par point d'entrée"""
+
+    budgets_ms: dict[str, float] = Field(
+        default_factory=lambda: {"server": 3000.0, "mcp_server": 1500.0, "gradio": 10000.0}
+    )
+
+
+class ProfilingConfig(BaseModel):
+    """Instrumentation des étapes de l'agent et profilage à la demande (/debug/profile)"""
+
+    stage_timers: bool = False
+    max_profile_seconds: float = Field(default=60.0, gt=0)
+    sample_interval_ms: float = Field(default=5.0, gt=0)
+    admin_token_env: str = "FILAGENT_ADMIN_TOKEN"
+
+
 class HTNPlanningConfig(BaseModel):
     """Configuration de planification HTN"""
 
@@ -133,6 +182,10 @@ class AgentConfig(BaseModel):
     logging: LoggingConfig = LoggingConfig()
     compliance: ComplianceConfig = ComplianceConfig()
     runtime_settings: AgentRuntimeSettings = AgentRuntimeSettings()
+    server: ServerConfig = ServerConfig()
+    context_budget: ContextBudgetConfig = ContextBudgetConfig()
+    startup: StartupConfig = StartupConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
     htn_planning: Optional[HTNPlanningConfig] = None
     htn_execution: Optional[HTNExecutionConfig] = None
     htn_verification: Optional[HTNVerificationConfig] = None
@@ -165,6 +218,10 @@ class AgentConfig(BaseModel):
         memory_data = raw_config.get("memory", {})
         logging_data = raw_config.get("logging", {})
         compliance_data = raw_config.get("compliance", {})
+        server_data = raw_config.get("server", {})
+        context_budget_data = raw_config.get("context_budget", {})
+        startup_data = raw_config.get("startup", {})
+        profiling_data = raw_config.get("profiling", {})
         compliance_guardian_data = raw_config.get("compliance_guardian", {})
         htn_planning_data = raw_config.get("htn_planning", {})
         htn_execution_data = raw_config.get("htn_execution", {})
@@ -234,6 +291,10 @@ class AgentConfig(BaseModel):
             logging=LoggingConfig(**logging_data),
             compliance=ComplianceConfig(**compliance_data),
             runtime_settings=runtime_settings,
+            server=ServerConfig(**server_data),
+            context_budget=ContextBudgetConfig(**context_budget_data),
+            startup=StartupConfig(**startup_data),
+            profiling=ProfilingConfig(**profiling_data),
             htn_planning=htn_planning_config,
             htn_execution=htn_execution_config,
             htn_verification=htn_verification_config,
@@ -274,6 +335,7 @@ class AgentConfig(BaseModel):
             "memory": memory_dict,
             "logging": self.logging.model_dump(),
             "compliance": self.compliance.model_dump(),
+            "server": self.server.model_dump(),
         }
 
         # Add optional HTN configurations if they exist
@@ -319,6 +381,7 @@ class AgentConfig(BaseModel):
             },
             "logging": self.logging.model_dump(),
             "compliance": self.compliance.model_dump(),
+            "server": self.server.model_dump(),
         }
 
         # Add optional HTN configurations if present
@@ -7,7 +7,7 @@ from the execution logic.
 
 Key Principles:
 1. Single Responsibility: ONLY builds context and prompts
-2. Stateless: No instance state, pure functions
+2. Stateless: No conversation state (only caches of rendered prompts)
 3. Configurable: Templates can be injected
 4. Type Safety: Clear input/output contracts
 5. Template-based: Uses Jinja2 templates for maintainability
@@ -15,7 +15,9 @@ Key Principles:
 
 import json
 import hashlib
-from typing import List, Dict, Optional, Any
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Tuple
 
 from pydantic import BaseModel
 
@@ -30,6 +32,97 @@ class Message(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+SYSTEM_PROMPT_CACHE_SIZE = 32
+TOOL_RESULTS_HEADER = "\n\n[Résultats des outils]\n"
+
+
+def _json_str_body(text: str) -> str:
+    """JSON-escaped string without the surrounding quotes (as in json.dumps)"""
+    return json.dumps(text, ensure_ascii=False)[1:-1]
+
+
+class PromptContext:
+    """
+    Conversation context as a list of appended segments.
+
+    Appending a segment neither copies the accumulated text nor rehashes
+    it: a streaming SHA-256 over the serialized payload prefix
+    ``{"context": "<escaped segments...`` is kept per segment and copied to
+    finish a digest. Digests are identical to
+    ``ContextBuilder.compute_prompt_hash`` on the equivalent string (JSON
+    escaping is per character, and ``"context"`` is the first sorted key).
+    """
+
+    _PAYLOAD_PREFIX = b'{"context": "'
+
+    def __init__(self, text: str = "") -> None:
+        self._segments: List[str] = []
+        self._hashers = [hashlib.sha256(self._PAYLOAD_PREFIX)]
+        self._text: Optional[str] = ""
+        if text:
+            self.append(text)
+
+    @property
+    def segments(self) -> List[str]:
+        return list(self._segments)
+
+    def append(self, segment: str) -> "PromptContext":
+        """Append a segment (O(len(segment)))"""
+        if segment:
+            hasher = self._hashers[-1].copy()
+            hasher.update(_json_str_body(segment).encode("utf-8"))
+            self._segments.append(segment)
+            self._hashers.append(hasher)
+            self._text = None
+        return self
+
+    def assign(self, segments: List[str]) -> "PromptContext":
+        """
+        Replace the content, keeping the longest common prefix of segments
+
+        Only the segments after the first difference are re-hashed.
+        """
+        segments = [segment for segment in segments if segment]
+        common = 0
+        for current, new in zip(self._segments, segments):
+            if current is not new and current != new:
+                break
+            common += 1
+        if common < len(self._segments):
+            del self._segments[common:]
+            del self._hashers[common + 1 :]
+            self._text = None
+        for segment in segments[common:]:
+            self.append(segment)
+        return self
+
+    def digest(self, message: str, conversation_id: str, task_id: Optional[str] = None) -> str:
+        """SHA-256 of the prompt payload (see ContextBuilder.compute_prompt_hash)"""
+        hasher = self._hashers[-1].copy()
+        suffix = (
+            '", "conversation_id": '
+            + json.dumps(conversation_id, ensure_ascii=False)
+            + ', "message": '
+            + json.dumps(message, ensure_ascii=False)
+            + ', "task_id": '
+            + json.dumps(task_id, ensure_ascii=False)
+            + "}"
+        )
+        hasher.update(suffix.encode("utf-8"))
+        return hasher.hexdigest()
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._segments)
+        return self._text
+
+    def __len__(self) -> int:
+        return len(str(self))
+
+    def __bool__(self) -> bool:
+        return bool(self._segments)
+
+
 class ContextBuilder:
     """
     Builds conversation context and prompts for LLM.
@@ -68,11 +161,18 @@ class ContextBuilder:
         else:
             self.template_loader = template_loader
 
+        # Rendered system prompts, keyed by (registry version, template
+        # revision, semantic context hash), and per-tool description lines
+        self._system_prompt_cache: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+        self._tool_line_cache: Dict[str, Tuple[Any, str]] = {}
+        self._cache_lock = threading.Lock()
+
     def build_context(
         self,
         history: List[Dict[str, Any]],
         conversation_id: str,
         task_id: Optional[str] = None,
+        max_messages: Optional[int] = None,
     ) -> str:
         """
         Build conversation context from history.
@@ -81,12 +181,15 @@ class ContextBuilder:
             history: List of message dictionaries
             conversation_id: Conversation identifier
             task_id: Optional task identifier
+            max_messages: Override of max_history_messages (e.g. when the
+                history was already selected by a TokenBudgeter)
 
         Returns:
             Formatted context string
         """
         # Take only recent messages
-        recent_messages = history[-self.max_history_messages :] if history else []
+        limit = self.max_history_messages if max_messages is None else max_messages
+        recent_messages = history[-limit:] if history and limit > 0 else []
 
         context_messages = []
         for msg in recent_messages:
@@ -101,18 +204,18 @@ class ContextBuilder:
 
         return "\n".join(context_messages)
 
-    def compose_prompt(self, context: str, message: str) -> str:
+    def compose_prompt(self, context: "str | PromptContext", message: str) -> str:
         """
         Compose final prompt from context and current message.
 
         Args:
-            context: Pre-built context string
+            context: Pre-built context (string or PromptContext)
             message: Current user message
 
         Returns:
             Complete prompt for LLM
         """
-        context = context.strip()
+        context = str(context).strip()
         message = message.strip()
         assistant_header = "Assistant:"
 
@@ -123,7 +226,7 @@ class ContextBuilder:
 
     def compute_prompt_hash(
         self,
-        context: str,
+        context: "str | PromptContext",
         message: str,
         conversation_id: str,
         task_id: Optional[str] = None,
@@ -132,7 +235,7 @@ class ContextBuilder:
         Compute stable hash for prompt reproducibility.
 
         Args:
-            context: Conversation context
+            context: Conversation context (a PromptContext is hashed incrementally)
             message: Current message
             conversation_id: Conversation identifier
             task_id: Optional task identifier
@@ -140,6 +243,9 @@ class ContextBuilder:
         Returns:
             SHA256 hash of prompt components
         """
+        if isinstance(context, PromptContext):
+            return context.digest(message, conversation_id, task_id)
+
         payload = {
             "conversation_id": conversation_id,
             "task_id": task_id,
@@ -214,18 +320,26 @@ class ContextBuilder:
 
         Returns:
             Complete system prompt
+
+        The rendered prompt is cached while the registry version
+        (``ToolRegistry.register``/``reload_registry``) and the template
+        revision (``TemplateLoader.reload_templates``/``switch_version``) are
+        unchanged. Registries or loaders without a version are never cached.
         """
-        tools = tool_registry.list_all()
-        tool_descriptions = []
+        cache_key = self._system_prompt_cache_key(tool_registry, semantic_context)
+        if cache_key is not None:
+            with self._cache_lock:
+                cached = self._system_prompt_cache.get(cache_key)
+                if cached is not None:
+                    self._system_prompt_cache.move_to_end(cache_key)
+                    return cached
 
-        for tool_name, tool in tools.items():
-            schema = tool.get_schema()
-            tool_descriptions.append(
-                f"- {tool_name}: {schema['description']}\n  Paramètres: {json.dumps(schema['parameters'])}"
+        tools = tool_registry.list_all()
+        with self._cache_lock:
+            tools_section = "\n".join(
+                self._describe_tool(tool_name, tool) for tool_name, tool in tools.items()
             )
 
-        tools_section = "\n".join(tool_descriptions)
-
         # Render template with variables
         try:
             prompt = self.template_loader.render(
@@ -239,7 +353,45 @@ class ContextBuilder:
             print(f"Warning: Failed to load template, using fallback: {e}")
             prompt = self._build_system_prompt_fallback(tools_section, semantic_context)
 
-        return prompt.strip()
+        prompt = prompt.strip()
+        if cache_key is not None:
+            with self._cache_lock:
+                self._system_prompt_cache[cache_key] = prompt
+                while len(self._system_prompt_cache) > SYSTEM_PROMPT_CACHE_SIZE:
+                    self._system_prompt_cache.popitem(last=False)
+        return prompt
+
+    def _system_prompt_cache_key(
+        self, tool_registry: Any, semantic_context: Optional[str]
+    ) -> Optional[Tuple[Any, ...]]:
+        """Cache key for a system prompt, or None when it cannot be versioned"""
+        registry_version = getattr(tool_registry, "version", None)
+        template_revision = getattr(self.template_loader, "revision", None)
+        if not isinstance(registry_version, int) or not isinstance(template_revision, int):
+            return None
+        semantic_hash = (
+            hashlib.sha256(semantic_context.encode("utf-8")).hexdigest() if semantic_context else ""
+        )
+        return (registry_version, template_revision, semantic_hash)
+
+    def _describe_tool(self, tool_name: str, tool: Any) -> str:
+        """
+        Tool description line (name, description, JSON parameters)
+
+        Lines are precomputed once per tool instance: re-registering a tool
+        under the same name replaces the line.
+        """
+        cached = self._tool_line_cache.get(tool_name)
+        if cached is not None and cached[0] is tool:
+            return cached[1]
+        line = self._format_tool_line(tool_name, tool)
+        self._tool_line_cache[tool_name] = (tool, line)
+        return line
+
+    @staticmethod
+    def _format_tool_line(tool_name: str, tool: Any) -> str:
+        schema = tool.get_schema()
+        return f"- {tool_name}: {schema['description']}\n  Paramètres: {json.dumps(schema['parameters'])}"
 
     def _build_system_prompt_fallback(
         self, tools_section: str, semantic_context: Optional[str] = None
@@ -298,21 +450,54 @@ Réponds toujours de manière professionnelle, concrète et utile pour un propri
 
     def format_tool_results_for_context(
         self,
-        context: str,
+        context: "str | PromptContext",
         tool_results_formatted: str,
-    ) -> str:
+    ) -> "str | PromptContext":
         """
         Inject tool results into context.
 
         Args:
-            context: Existing context
+            context: Existing context (a PromptContext is appended to in place)
             tool_results_formatted: Formatted tool results string
 
         Returns:
             Updated context with tool results
         """
+        if isinstance(context, PromptContext):
+            return context.append(self._tool_results_segment(bool(context), tool_results_formatted))
         return f"{context}\n\n[Résultats des outils]\n{tool_results_formatted}".strip()
 
+    def build_tool_context(
+        self,
+        context: str,
+        tool_results: List[str],
+        reuse: Optional[PromptContext] = None,
+    ) -> PromptContext:
+        """
+        Context followed by tool result blocks, as a PromptContext.
+
+        Args:
+            context: Conversation context string
+            tool_results: Formatted tool result blocks, in order
+            reuse: Previous PromptContext whose common prefix is kept
+
+        Returns:
+            PromptContext equal to chaining format_tool_results_for_context()
+        """
+        segments = [context]
+        has_text = bool(context)
+        for block in tool_results:
+            segment = self._tool_results_segment(has_text, block)
+            has_text = has_text or bool(segment)
+            segments.append(segment)
+        return (reuse if reuse is not None else PromptContext()).assign(segments)
+
+    @staticmethod
+    def _tool_results_segment(has_text: bool, tool_results_formatted: str) -> str:
+        """Segment appended by format_tool_results_for_context (same stripping)"""
+        segment = f"{TOOL_RESULTS_HEADER}{tool_results_formatted}".rstrip()
+        return segment if has_text else segment.lstrip()
+
     def create_followup_message(
         self,
         tool_results_formatted: str,
@@ -0,0 +1,372 @@
+"""
+Ordonnanceur d'inférence locale (llama.cpp)
+
+Une instance ``Llama`` n'est pas thread-safe: des appels concurrents depuis
+les workers du serveur corrompent son KV cache ou se sérialisent au hasard.
+Cet ordonnanceur place chaque génération dans une file par classe de
+priorité et la distribue en continu sur un pool de répliques du modèle:
+dès qu'une réplique se libère, elle prend la requête suivante (pas
+d'attente de lot complet), ce qui tient sur CPU seul.
+
+Classes de priorité (pondération par défaut):
+
+- ``interactive`` (8): conversations /chat
+- ``htn`` (4): sous-tâches de planification HTN
+- ``eval`` (1): campagnes de benchmarks
+
+Le partage est équitable et pondéré (stride scheduling): une classe de
+poids 8 obtient 8 fois plus de créneaux qu'une classe de poids 1 quand
+les deux ont du travail, sans jamais affamer la plus faible.
+
+La priorité est portée par une contextvar (``inference_priority``), donc
+propagée aux threads du pool de workers du serveur.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+from runtime.metrics import get_agent_metrics
+from runtime.model_interface import (
+    GenerationConfig,
+    GenerationResult,
+    ModelInterface,
+    StreamChunk,
+)
+
+
+class Priority(str, Enum):
+    """Classe de priorité d'une requête d'inférence"""
+
+    INTERACTIVE = "interactive"
+    HTN = "htn"
+    EVAL = "eval"
+
+
+DEFAULT_PRIORITY_WEIGHTS: Dict[Priority, int] = {
+    Priority.INTERACTIVE: 8,
+    Priority.HTN: 4,
+    Priority.EVAL: 1,
+}
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "inference_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    """Priorité d'inférence du contexte courant"""
+    return _current_priority.get()
+
+
+@contextmanager
+def inference_priority(priority: Priority) -> Iterator[None]:
+    """Exécuter un bloc avec une priorité d'inférence donnée"""
+    token = _current_priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+@dataclass
+class _InferenceRequest:
+    """Requête en file"""
+
+    run: Callable[[ModelInterface], object]
+    priority: Priority
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class InferenceScheduler:
+    """
+    File d'inférence à priorités pondérées servie par un pool de répliques
+
+    Chaque réplique a son thread dédié: une réplique n'exécute jamais deux
+    générations à la fois.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[ModelInterface],
+        weights: Optional[Dict[Priority, int]] = None,
+    ) -> None:
+        """
+        Initialiser l'ordonnanceur
+
+        Args:
+            replicas: Instances de modèle déjà chargées
+            weights: Poids par classe de priorité (défaut: DEFAULT_PRIORITY_WEIGHTS)
+        """
+        if not replicas:
+            raise ValueError("InferenceScheduler needs at least one replica")
+
+        self.replicas: List[ModelInterface] = list(replicas)
+        self.weights: Dict[Priority, int] = dict(DEFAULT_PRIORITY_WEIGHTS)
+        for priority, weight in (weights or {}).items():
+            if weight < 1:
+                raise ValueError(f"Weight for {priority} must be >= 1")
+            self.weights[Priority(priority)] = weight
+
+        self._queues: Dict[Priority, Deque[_InferenceRequest]] = {p: deque() for p in Priority}
+        self._pass: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._cond = threading.Condition()
+        self._busy = 0
+        self._closed = False
+        self._metrics = get_agent_metrics()
+
+        # Statistiques
+        self.completed: Dict[Priority, int] = {p: 0 for p in Priority}
+        self.tokens_generated = 0
+        self.busy_seconds = 0.0
+
+        self._threads = [
+            threading.Thread(
+                target=self._serve, args=(replica,), name=f"inference-{index}", daemon=True
+            )
+            for index, replica in enumerate(self.replicas)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # ------------------------------------------------------------------ file
+
+    def _publish(self) -> None:
+        self._metrics.set_inference_scheduler_state(
+            queue_depths={p.value: len(q) for p, q in self._queues.items()},
+            occupancy=self._busy / len(self.replicas),
+        )
+
+    def _next_request(self) -> Optional[_InferenceRequest]:
+        """Choisir la classe non vide au plus petit 'pass' (appelé sous verrou)"""
+        candidates = [p for p in Priority if self._queues[p]]
+        if not candidates:
+            return None
+        priority = min(candidates, key=lambda p: self._pass[p])  # égalité: ordre de l'enum
+        self._pass[priority] += 1.0 / self.weights[priority]
+        return self._queues[priority].popleft()
+
+    def submit(
+        self, run: Callable[[ModelInterface], object], priority: Optional[Priority] = None
+    ) -> Future:
+        """
+        Mettre en file un appel exécuté sur la première réplique libre
+
+        Args:
+            run: Fonction recevant la réplique
+            priority: Classe de priorité (défaut: priorité du contexte courant)
+
+        Returns:
+            Future du résultat de ``run``
+        """
+        request = _InferenceRequest(run=run, priority=Priority(priority or current_priority()))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("InferenceScheduler is shut down")
+            active = [self._pass[p] for p in Priority if self._queues[p]]
+            if not self._queues[request.priority] and active:
+                # Une classe inactive reprend au niveau des classes actives (pas de rattrapage)
+                self._pass[request.priority] = max(self._pass[request.priority], min(active))
+            self._queues[request.priority].append(request)
+            self._publish()
+            self._cond.notify()
+        return request.future
+
+    def _serve(self, replica: ModelInterface) -> None:
+        """Boucle d'une réplique: prendre la requête suivante dès qu'elle est libre"""
+        while True:
+            with self._cond:
+                request = self._next_request()
+                while request is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    request = self._next_request()
+                self._busy += 1
+                self._publish()
+
+            self._metrics.record_inference_queue_wait(
+                priority=request.priority.value,
+                wait_seconds=time.monotonic() - request.enqueued_at,
+            )
+            started = time.monotonic()
+            try:
+                if request.future.set_running_or_notify_cancel():
+                    try:
+                        request.future.set_result(request.run(replica))
+                    except BaseException as e:
+                        request.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._busy -= 1
+                    self.completed[request.priority] += 1
+                    self.busy_seconds += time.monotonic() - started
+                    self._publish()
+
+    # ------------------------------------------------------------ génération
+
+    def _record_result(self, result: GenerationResult, elapsed: float) -> None:
+        with self._cond:
+            self.tokens_generated += result.tokens_generated
+        if elapsed > 0 and result.tokens_generated:
+            self._metrics.record_inference_throughput(result.tokens_generated / elapsed)
+
+    def generate(
+        self,
+        prompt: str,
+        config: GenerationConfig,
+        system_prompt: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> GenerationResult:
+        """Générer sur la première réplique libre (bloquant)"""
+
+        def run(replica: ModelInterface) -> GenerationResult:
+            started = time.monotonic()
+            result = replica.generate(prompt, config, system_prompt=system_prompt)
+            self._record_result(result, time.monotonic() - started)
+            return result
+
+        return self.submit(run, priority).result()
+
+    def generate_stream(
+        self,
+        prompt: str,
+        config: GenerationConfig,
+        system_prompt: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> Iterator[StreamChunk]:
+        """
+        Générer en streaming: la réplique pousse les fragments dans une file
+
+        Si le consommateur abandonne le flux (client SSE déconnecté), la
+        requête encore en file est ignorée et une génération en cours
+        s'arrête au fragment suivant: la réplique est libérée.
+        """
+        chunks: "queue.Queue[Optional[StreamChunk]]" = queue.Queue()
+        abandoned = threading.Event()
+
+        def run(replica: ModelInterface) -> None:
+            if abandoned.is_set():
+                return
+            started = time.monotonic()
+            stream = replica.generate_stream(prompt, config, system_prompt=system_prompt)
+            try:
+                for chunk in stream:
+                    if abandoned.is_set():
+                        break
+                    if chunk.result is not None:
+                        self._record_result(chunk.result, time.monotonic() - started)
+                    chunks.put(chunk)
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+                chunks.put(None)
+
+        future = self.submit(run, priority)
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                yield chunk
+            future.result()  # Propager une éventuelle exception de la réplique
+        finally:
+            abandoned.set()
+            future.cancel()
+
+    # ---------------------------------------------------------------- état
+
+    def stats(self) -> Dict[str, object]:
+        """Profondeur des files, occupation et débit cumulé"""
+        with self._cond:
+            return {
+                "replicas": len(self.replicas),
+                "busy": self._busy,
+                "occupancy": self._busy / len(self.replicas),
+                "queued": {p.value: len(q) for p, q in self._queues.items()},
+                "completed": {p.value: n for p, n in self.completed.items()},
+                "tokens_generated": self.tokens_generated,
+                "tokens_per_second": (
+                    self.tokens_generated / self.busy_seconds if self.busy_seconds else 0.0
+                ),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Refuser les nouvelles requêtes, terminer la file puis arrêter les threads"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class ScheduledModel(ModelInterface):
+    """
+    ModelInterface qui route chaque génération via un InferenceScheduler
+
+    Remplace l'instance unique partagée: l'agent et le planificateur
+    continuent d'appeler ``generate``/``generate_stream`` sans changement.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[ModelInterface],
+        weights: Optional[Dict[Priority, int]] = None,
+    ) -> None:
+        self.replicas: List[ModelInterface] = list(replicas)
+        self._weights = weights
+        self.scheduler: Optional[InferenceScheduler] = None
+
+    def load(self, model_path: str, config: Dict) -> bool:
+        """Charger chaque réplique puis démarrer l'ordonnanceur"""
+        if not all(replica.load(model_path, config) for replica in self.replicas):
+            return False
+        self.scheduler = InferenceScheduler(self.replicas, self._weights)
+        return True
+
+    def _require_scheduler(self) -> InferenceScheduler:
+        if self.scheduler is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        return self.scheduler
+
+    def generate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        """Générer via l'ordonnanceur (priorité du contexte courant)"""
+        return self._require_scheduler().generate(prompt, config, system_prompt=system_prompt)
+
+    def generate_stream(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> Iterator[StreamChunk]:
+        """Générer en streaming via l'ordonnanceur"""
+        return self._require_scheduler().generate_stream(
+            prompt, config, system_prompt=system_prompt
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """Compter les tokens (tokenizer identique sur toutes les répliques)"""
+        return self.replicas[0].count_tokens(text)
+
+    def unload(self):
+        """Arrêter l'ordonnanceur et décharger les répliques"""
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+            self.scheduler = None
+        for replica in self.replicas:
+            replica.unload()
+
+    def is_loaded(self) -> bool:
+        """Vérifier que l'ordonnanceur tourne et que les répliques sont chargées"""
+        return self.scheduler is not None and all(r.is_loaded() for r in self.replicas)
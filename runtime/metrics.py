@@ -17,7 +17,7 @@ Usage:
     metrics.record_tool_execution(tool_name="calculator", duration_seconds=0.05)
 """
 
-from typing import Optional
+from typing import Dict, Optional
 
 # Try to import prometheus_client, but make it optional
 try:
@@ -209,6 +209,98 @@ class AgentMetrics:
             buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
         )
 
+        # Histogram: Agent loop stage duration (runtime/stage_timer.py)
+        self.filagent_agent_stage_seconds = Histogram(
+            "filagent_agent_stage_seconds",
+            "Time spent in each stage of the agent loop",
+            ["stage"],  # stage: routing, generation, tool_execution, logging, ...
+            buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0],
+        )
+
+        # Histogram: Time to first streamed token
+        self.filagent_time_to_first_token_seconds = Histogram(
+            "filagent_time_to_first_token_seconds",
+            "Time between generation start and the first streamed token",
+            buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0],
+        )
+
+        # Counter: llama.cpp prompt prefix cache lookups
+        self.filagent_prefix_cache_lookups_total = Counter(
+            "filagent_prefix_cache_lookups_total",
+            "Prompt prefix state cache lookups",
+            ["result"],  # result: hit, miss
+        )
+
+        # Counter: Prompt tokens not re-evaluated thanks to the prefix cache
+        self.filagent_prefix_cache_tokens_reused_total = Counter(
+            "filagent_prefix_cache_tokens_reused_total",
+            "Prompt tokens reused from a cached llama state",
+        )
+
+        # Counter: Estimated prompt evaluation time saved
+        self.filagent_prompt_eval_seconds_saved_total = Counter(
+            "filagent_prompt_eval_seconds_saved_total",
+            "Estimated prompt evaluation time saved by the prefix cache",
+        )
+
+        # === Local Inference Scheduler Metrics ===
+
+        # Histogram: Time a generation waited for a model replica
+        self.filagent_inference_queue_wait_seconds = Histogram(
+            "filagent_inference_queue_wait_seconds",
+            "Time between enqueueing a generation and a replica picking it up",
+            ["priority"],  # priority: interactive, htn, eval
+            buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0],
+        )
+
+        # Gauge: Generations waiting per priority class
+        self.filagent_inference_queue_depth = Gauge(
+            "filagent_inference_queue_depth",
+            "Generations waiting for a model replica",
+            ["priority"],
+        )
+
+        # Gauge: Fraction of model replicas currently generating
+        self.filagent_inference_batch_occupancy = Gauge(
+            "filagent_inference_batch_occupancy",
+            "Fraction of model replicas busy (0-1)",
+        )
+
+        # Histogram: Generation throughput per request
+        self.filagent_inference_tokens_per_second = Histogram(
+            "filagent_inference_tokens_per_second",
+            "Completion tokens per second for a scheduled generation",
+            buckets=[1, 2, 5, 10, 20, 50, 100, 200],
+        )
+
+        # === API Server Metrics ===
+
+        # Gauge: Requests executing on the agent worker pool
+        self.filagent_requests_in_flight = Gauge(
+            "filagent_requests_in_flight",
+            "Number of requests currently executing on the agent worker pool",
+        )
+
+        # Gauge: Requests waiting for a worker
+        self.filagent_request_queue_depth = Gauge(
+            "filagent_request_queue_depth",
+            "Number of admitted requests waiting for an agent worker",
+        )
+
+        # Histogram: Time spent waiting for a worker
+        self.filagent_request_queue_wait_seconds = Histogram(
+            "filagent_request_queue_wait_seconds",
+            "Time between request admission and start of execution",
+            buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0],
+        )
+
+        # Counter: Requests rejected by admission control
+        self.filagent_request_rejected_total = Counter(
+            "filagent_request_rejected_total",
+            "Total number of requests rejected by the worker pool",
+            ["reason"],  # reason: overload, timeout
+        )
+
         # === Info Metrics ===
 
         # Info: Runtime configuration
@@ -420,6 +512,139 @@ class AgentMetrics:
 
         self.filagent_generation_duration_seconds.observe(duration_seconds)
 
+    def record_stage_duration(
+        self,
+        stage: str,
+        duration_seconds: float,
+    ):
+        """
+        Record the duration of an agent loop stage.
+
+        Args:
+            stage: Stage name (see runtime.stage_timer.STAGES)
+            duration_seconds: Stage duration
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_agent_stage_seconds.labels(stage=stage).observe(duration_seconds)
+
+    def record_time_to_first_token(
+        self,
+        duration_seconds: float,
+    ):
+        """
+        Record time to first token for a streamed generation.
+
+        Args:
+            duration_seconds: Delay between generation start and first token
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_time_to_first_token_seconds.observe(duration_seconds)
+
+    def record_prefix_cache_lookup(
+        self,
+        hit: bool,
+        tokens_reused: int = 0,
+        seconds_saved: float = 0.0,
+    ):
+        """
+        Record a llama.cpp prompt prefix cache lookup.
+
+        Args:
+            hit: Whether a cached prefix was reused
+            tokens_reused: Prompt tokens not re-evaluated
+            seconds_saved: Estimated prompt evaluation time saved
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_prefix_cache_lookups_total.labels(result="hit" if hit else "miss").inc()
+        if tokens_reused:
+            self.filagent_prefix_cache_tokens_reused_total.inc(tokens_reused)
+        if seconds_saved:
+            self.filagent_prompt_eval_seconds_saved_total.inc(seconds_saved)
+
+    def record_inference_queue_wait(self, priority: str, wait_seconds: float):
+        """
+        Record how long a generation waited for a model replica.
+
+        Args:
+            priority: Priority class (interactive, htn, eval)
+            wait_seconds: Time spent in the scheduler queue
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_inference_queue_wait_seconds.labels(priority=priority).observe(wait_seconds)
+
+    def set_inference_scheduler_state(self, queue_depths: Dict[str, int], occupancy: float):
+        """
+        Publish the inference scheduler queues and replica occupancy.
+
+        Args:
+            queue_depths: Waiting generations per priority class
+            occupancy: Fraction of replicas busy (0-1)
+        """
+        if not self.enabled:
+            return
+
+        for priority, depth in queue_depths.items():
+            self.filagent_inference_queue_depth.labels(priority=priority).set(depth)
+        self.filagent_inference_batch_occupancy.set(occupancy)
+
+    def record_inference_throughput(self, tokens_per_second: float):
+        """
+        Record the throughput of a scheduled generation.
+
+        Args:
+            tokens_per_second: Completion tokens per second
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_inference_tokens_per_second.observe(tokens_per_second)
+
+    def set_request_pool_state(self, in_flight: int, queue_depth: int):
+        """
+        Publish the agent worker pool occupancy.
+
+        Args:
+            in_flight: Requests currently executing
+            queue_depth: Requests waiting for a worker
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_requests_in_flight.set(in_flight)
+        self.filagent_request_queue_depth.set(queue_depth)
+
+    def record_request_queue_wait(self, wait_seconds: float):
+        """
+        Record how long a request waited for a worker.
+
+        Args:
+            wait_seconds: Time between admission and start of execution
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_request_queue_wait_seconds.observe(wait_seconds)
+
+    def record_request_rejected(self, reason: str):
+        """
+        Record a request rejected by admission control.
+
+        Args:
+            reason: Rejection reason (overload, timeout)
+        """
+        if not self.enabled:
+            return
+
+        self.filagent_request_rejected_total.labels(reason=reason).inc()
+
     def set_active_conversations(self, count: int):
         """
         Set number of active conversations.
@@ -14,6 +14,8 @@ import threading
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
+from .keystore import FileKeyStore, KeyStore, KeyStoreError
+
 # Type aliases for strict typing
 DRConstraintValue = Union[str, int, float, bool, None]
 DRConstraints = Dict[str, DRConstraintValue]
@@ -57,6 +59,7 @@ class DecisionRecord:
         self.decision = decision
         self.constraints = constraints or {}
         self.expected_risk = expected_risk or []
+        self.key_id: Optional[str] = None  # Cle de signature (epoque du trousseau)
         self.signature: Optional[str] = None
 
     def _generate_dr_id(self) -> str:
@@ -83,13 +86,17 @@ class DecisionRecord:
             "expected_risk": self.expected_risk,
         }
 
+        if self.key_id:
+            data["key_id"] = self.key_id
         if self.signature:
             data["signature"] = self.signature
 
         return data
 
-    def sign(self, private_key: ed25519.Ed25519PrivateKey) -> None:
-        """Signer le DR avec une cle privee EdDSA"""
+    def sign(self, private_key: ed25519.Ed25519PrivateKey, key_id: Optional[str] = None) -> None:
+        """Signer le DR avec une cle privee EdDSA (key_id est couvert par la signature)"""
+        if key_id is not None:
+            self.key_id = key_id
         # Creer un dictionnaire sans signature
         data = self.to_dict()
         data.pop("signature", None)
@@ -124,45 +131,41 @@ class DecisionRecord:
 class DRManager:
     """Gestionnaire de Decision Records"""
 
-    def __init__(self, output_dir: str = "logs/decisions") -> None:
+    def __init__(
+        self, output_dir: str = "logs/decisions", key_store: Optional[KeyStore] = None
+    ) -> None:
         self.dr_dir = Path(output_dir)
         self.dr_dir.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
 
-        # Cles EdDSA (generer une nouvelle paire au demarrage)
-        self.private_key, self.public_key = self._generate_keypair()
-        self._save_keys()
-
-    def _generate_keypair(self) -> tuple[ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey]:
-        """Generer une paire de cles EdDSA"""
-        private_key = ed25519.Ed25519PrivateKey.generate()
-        public_key = private_key.public_key()
-        return private_key, public_key
-
-    def _save_keys(self) -> None:
-        """Sauvegarder les cles (en production, utiliser un vault)"""
-        # Sauvegarder la cle privee (chiffree en production)
-        private_pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
+        # Cles EdDSA chargees depuis le trousseau (creees a la premiere
+        # signature si le trousseau est vide), pas regenerees au demarrage
+        self.key_store = key_store if key_store is not None else FileKeyStore()
 
-        key_file = Path("provenance/signatures/private_key.pem")
-        key_file.parent.mkdir(parents=True, exist_ok=True)
+    @property
+    def key_id(self) -> str:
+        """Identifiant de la cle de signature active"""
+        return self.key_store.active_key_id
 
-        with open(key_file, "wb") as f:
-            f.write(private_pem)
+    @property
+    def private_key(self) -> ed25519.Ed25519PrivateKey:
+        return self.key_store.signing_key()[1]
 
-        # Sauvegarder la cle publique
-        public_pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo,
-        )
+    @property
+    def public_key(self) -> ed25519.Ed25519PublicKey:
+        return self.key_store.public_key(self.key_id)
 
-        public_key_file = Path("provenance/signatures/public_key.pem")
-        with open(public_key_file, "wb") as f:
-            f.write(public_pem)
+    def rotate_keys(self) -> str:
+        """Passer a une nouvelle epoque de cle; les DR existants restent verifiables"""
+        return self.key_store.rotate().key_id
+
+    def verify_dr(self, dr: DecisionRecord) -> bool:
+        """Verifier un DR avec la cle de son epoque (key_id)"""
+        try:
+            public_key = self.key_store.public_key(dr.key_id or self.key_id)
+        except KeyStoreError:
+            return False
+        return dr.verify(public_key)
 
     def create_dr(
         self,
@@ -198,8 +201,9 @@ class DRManager:
             reasoning_markers=reasoning_markers,
         )
 
-        # Signer
-        dr.sign(self.private_key)
+        # Signer avec la cle active (key_id inscrit dans le DR)
+        key_id, private_key = self.key_store.signing_key()
+        dr.sign(private_key, key_id=key_id)
 
         # Sauvegarder
         self.save_dr(dr)
@@ -248,8 +252,9 @@ class DRManager:
 
         # Signer le record
         record_bytes = json.dumps(record, sort_keys=True).encode("utf-8")
-        signature_bytes = self.private_key.sign(record_bytes)
-        public_key_bytes = self.public_key.public_bytes(
+        key_id, private_key = self.key_store.signing_key()
+        signature_bytes = private_key.sign(record_bytes)
+        public_key_bytes = private_key.public_key().public_bytes(
             encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw
         )
 
@@ -258,6 +263,7 @@ class DRManager:
             "algorithm": "EdDSA",
             "signature": base64.b64encode(signature_bytes).decode("utf-8"),
             "public_key": base64.b64encode(public_key_bytes).decode("utf-8"),
+            "key_id": key_id,
         }
 
         # Sauvegarder
@@ -312,11 +318,77 @@ class DRManager:
         )
         dr.dr_id = data.get("dr_id", "")
         dr.timestamp = data.get("ts", "")
+        dr.key_id = data.get("key_id")
         dr.signature = data.get("signature")
 
         return dr
 
 
+def verify_record_data(data: Dict, key_store: KeyStore) -> Optional[str]:
+    """
+    Verifier la signature d'un DR serialise (format create_dr ou create_record)
+
+    Returns:
+        None si la signature est valide, sinon la raison de l'echec
+    """
+    import base64
+
+    unsigned = {key: value for key, value in data.items() if key != "signature"}
+    signature = data.get("signature")
+    try:
+        if isinstance(signature, str) and signature.startswith("ed25519:"):
+            key_id = data.get("key_id")
+            signature_bytes = bytes.fromhex(signature[len("ed25519:") :])
+        elif isinstance(signature, dict):
+            key_id = signature.get("key_id")
+            signature_bytes = base64.b64decode(signature.get("signature", ""))
+        else:
+            return "unsigned"
+    except ValueError:
+        return "malformed signature"
+    if not key_id:
+        return "no key_id (signed before the key store)"
+
+    try:
+        public_key = key_store.public_key(key_id)
+    except KeyStoreError:
+        return f"unknown key {key_id}"
+    try:
+        public_key.verify(signature_bytes, json.dumps(unsigned, sort_keys=True).encode("utf-8"))
+    except Exception:
+        return "invalid signature"
+    return None
+
+
+# Trousseaux (cles publiques en cache) par repertoire, un par processus verificateur
+_verification_stores: Dict[str, FileKeyStore] = {}
+
+
+def verify_dr_files(paths: List[str], key_dir: str) -> Dict:
+    """
+    Verifier un lot de fichiers DR (unite de travail de la verification parallele)
+
+    Returns:
+        Dict avec le nombre de DR verifies et la liste (chemin, raison) des echecs
+    """
+    key_store = _verification_stores.get(key_dir)
+    if key_store is None:
+        key_store = _verification_stores.setdefault(key_dir, FileKeyStore(key_dir))
+
+    failures = []
+    for path in paths:
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            failures.append((path, f"unreadable: {e}"))
+            continue
+        reason = verify_record_data(data, key_store) if isinstance(data, dict) else "not a DR"
+        if reason is not None:
+            failures.append((path, reason))
+    return {"checked": len(paths), "failures": failures}
+
+
 # Instance globale
 _dr_manager: Optional[DRManager] = None
 
@@ -329,8 +401,10 @@ def get_dr_manager() -> DRManager:
     return _dr_manager
 
 
-def init_dr_manager(output_dir: str = "logs/decisions") -> DRManager:
+def init_dr_manager(
+    output_dir: str = "logs/decisions", key_store: Optional[KeyStore] = None
+) -> DRManager:
     """Initialiser le DR manager"""
     global _dr_manager
-    _dr_manager = DRManager(output_dir)
+    _dr_manager = DRManager(output_dir, key_store=key_store)
     return _dr_manager
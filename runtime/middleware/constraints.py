@@ -1,20 +1,186 @@
 """
 Middleware de contraintes et validation des sorties
 Guardrails avec regex, JSONSchema, et blocklist
+
+Les guardrails sont compilés une seule fois (regex, automate de mots-clés,
+validateurs JSONSchema) puis évalués sur une vue du texte partagée par
+toutes les règles: le texte n'est mis en minuscules et parsé en JSON
+qu'une seule fois par validation.
 """
 
 from __future__ import annotations
 
 import re
 import json
-from typing import Dict, List, Optional, Union
-from jsonschema import validate, ValidationError
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Pattern, Set, Union
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
 
 # Type aliases for strict typing
 JsonPrimitive = Union[str, int, float, bool, None]
 JsonValue = Union[JsonPrimitive, List["JsonValue"], Dict[str, "JsonValue"]]
 JsonSchemaType = Dict[str, JsonValue]
 
+# Au-delà de ce nombre de mots-clés, l'automate Aho-Corasick (un seul passage
+# sur le texte) devient plus rapide que des recherches `in` successives.
+AHO_CORASICK_MIN_KEYWORDS = 200
+
+# Taille maximale du cache de validateurs JSONSchema compilés
+SCHEMA_VALIDATOR_CACHE_SIZE = 128
+
+_schema_validator_cache: "OrderedDict[str, object]" = OrderedDict()
+
+
+def get_schema_validator(schema: JsonSchemaType):
+    """
+    Retourner un validateur JSONSchema compilé (mis en cache).
+
+    jsonschema.validate() revérifie le métaschéma et reconstruit un
+    validateur à chaque appel; ici le travail est fait une fois par schéma.
+
+    Raises:
+        jsonschema.SchemaError: si le schéma lui-même est invalide
+    """
+    key = json.dumps(schema, sort_keys=True, default=str)
+    validator = _schema_validator_cache.get(key)
+    if validator is not None:
+        _schema_validator_cache.move_to_end(key)
+        return validator
+
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    validator = validator_cls(schema)
+
+    _schema_validator_cache[key] = validator
+    if len(_schema_validator_cache) > SCHEMA_VALIDATOR_CACHE_SIZE:
+        _schema_validator_cache.popitem(last=False)
+    return validator
+
+
+def _first_schema_error(validator, data: JsonValue) -> Optional[ValidationError]:
+    """Même erreur que jsonschema.validate() (la plus pertinente), ou None."""
+    from jsonschema.exceptions import best_match
+
+    return best_match(validator.iter_errors(data))
+
+
+class KeywordMatcher:
+    """
+    Recherche insensible à la casse d'un ensemble de mots-clés.
+
+    Les mots-clés sont compilés une fois. Pour de grandes listes, un automate
+    Aho-Corasick trouve toutes les occurrences en un seul passage sur le texte;
+    pour les petites listes, les recherches `in` (implémentées en C) restent
+    plus rapides.
+    """
+
+    def __init__(self, keywords: List[str]) -> None:
+        self.keywords = list(keywords)
+        self._lowered = [kw.lower() for kw in self.keywords]
+        self._use_automaton = len(self.keywords) >= AHO_CORASICK_MIN_KEYWORDS
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        if self._use_automaton:
+            self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        """Construire le trie et les liens d'échec (BFS)."""
+        goto, fail, output = self._goto, self._fail, self._output
+
+        for index, keyword in enumerate(self._lowered):
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    goto.append({})
+                    fail.append(0)
+                    output.append([])
+                    nxt = len(goto) - 1
+                    goto[state][char] = nxt
+                state = nxt
+            output[state].append(index)
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[nxt] = goto[fallback].get(char, 0) if state else 0
+                output[nxt] = output[nxt] + output[fail[nxt]]
+
+    def find_all(self, lowered_text: str) -> Set[int]:
+        """
+        Indices des mots-clés présents dans le texte.
+
+        Args:
+            lowered_text: Texte déjà mis en minuscules
+        """
+        if not self._use_automaton:
+            return {i for i, kw in enumerate(self._lowered) if kw in lowered_text}
+
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        state = 0
+        for char in lowered_text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def find_first(self, lowered_text: str) -> Optional[str]:
+        """Premier mot-clé (dans l'ordre de la liste) présent dans le texte."""
+        if not self._use_automaton:
+            for keyword, lowered in zip(self.keywords, self._lowered):
+                if lowered in lowered_text:
+                    return keyword
+            return None
+
+        found = self.find_all(lowered_text)
+        return self.keywords[min(found)] if found else None
+
+
+_UNPARSED = object()
+
+
+class _TextView:
+    """Texte à valider avec ses formes dérivées calculées une seule fois."""
+
+    __slots__ = ("text", "_lower", "_json", "_json_error")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._lower: Optional[str] = None
+        self._json: object = _UNPARSED
+        self._json_error: Optional[json.JSONDecodeError] = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    def json(self) -> JsonValue:
+        """Parser le texte en JSON (une seule fois, erreur mémorisée)."""
+        if self._json is _UNPARSED:
+            try:
+                self._json = json.loads(self.text)
+            except json.JSONDecodeError as e:
+                self._json = None
+                self._json_error = e
+        if self._json_error is not None:
+            raise self._json_error
+        return self._json
+
 
 class Guardrail:
     """Guardrail pour valider/blocker des sorties"""
@@ -26,22 +192,33 @@ class Guardrail:
         schema: Optional[JsonSchemaType] = None,
         blocklist: Optional[List[str]] = None,
         allowedlist: Optional[List[str]] = None,
+        max_length: Optional[int] = None,
     ) -> None:
         """
         Creer un guardrail
 
+        Les règles sont compilées ici; modifier les attributs après la
+        construction n'a pas d'effet sur la validation.
+
         Args:
             name: Nom du guardrail
             pattern: Regex pattern (optionnel)
             schema: JSONSchema (optionnel)
             blocklist: Liste de mots-cles interdits
             allowedlist: Liste de valeurs autorisees
+            max_length: Longueur maximale du texte en caracteres (optionnel)
         """
         self.name = name
         self.pattern = pattern
         self.schema = schema
         self.blocklist = blocklist or []
         self.allowedlist = allowedlist or []
+        self.max_length = max_length
+
+        self._compiled_pattern: Optional[Pattern[str]] = re.compile(pattern) if pattern else None
+        self._blocklist_matcher = KeywordMatcher(self.blocklist) if self.blocklist else None
+        self._allowed_lower = [value.lower() for value in self.allowedlist]
+        self._schema_validator = get_schema_validator(schema) if schema else None
 
     def validate(self, text: str) -> tuple[bool, Optional[str]]:
         """
@@ -50,41 +227,50 @@ class Guardrail:
         Returns:
             (is_valid, error_message)
         """
+        return self._evaluate(_TextView(text))
+
+    def _evaluate(self, view: _TextView) -> tuple[bool, Optional[str]]:
+        """Valider une vue de texte partagée entre plusieurs guardrails."""
+        text = view.text
+
         # Verifier blocklist
-        for blockword in self.blocklist:
-            if blockword.lower() in text.lower():
+        if self._blocklist_matcher is not None:
+            blockword = self._blocklist_matcher.find_first(view.lower)
+            if blockword is not None:
                 return False, f"Blocked keyword detected: {blockword}"
 
         # Verifier allowedlist
-        if self.allowedlist:
+        if self._allowed_lower:
             # Check if text contains at least one allowed value
-            text_lower = text.lower().strip()
-            found_allowed = False
-            for allowed_value in self.allowedlist:
-                if allowed_value.lower() == text_lower or allowed_value.lower() in text_lower:
-                    found_allowed = True
-                    break
-            if not found_allowed:
+            text_lower = view.lower.strip()
+            if not any(allowed in text_lower for allowed in self._allowed_lower):
                 return (
                     False,
                     f"Value not in allowedlist. Allowed values: {', '.join(self.allowedlist)}",
                 )
 
+        # Verifier longueur maximale (O(1))
+        if self.max_length is not None and len(text) > self.max_length:
+            return (
+                False,
+                f"Length {len(text)} exceeds maximum of {self.max_length} characters",
+            )
+
         # Verifier regex
-        if self.pattern:
-            if not re.search(self.pattern, text):
+        if self._compiled_pattern is not None:
+            if not self._compiled_pattern.search(text):
                 return False, f"Pattern validation failed for {self.name}"
 
         # Verifier JSONSchema
-        if self.schema:
+        if self._schema_validator is not None:
             try:
                 # Essayer de parser JSON
-                data = json.loads(text)
-                validate(data, self.schema)
+                data = view.json()
             except json.JSONDecodeError:
                 return False, "Invalid JSON format"
-            except ValidationError as e:
-                return False, f"JSONSchema validation failed: {e.message}"
+            error = _first_schema_error(self._schema_validator, data)
+            if error is not None:
+                return False, f"JSONSchema validation failed: {error.message}"
 
         return True, None
 
@@ -134,14 +320,10 @@ class ConstraintsEngine:
         max_response = guardrails_config.get("max_response_length")
 
         if max_prompt and isinstance(max_prompt, int):
-            self.guardrails.append(
-                Guardrail(name="max_prompt_length", pattern=rf".{{0,{max_prompt}}}")
-            )
+            self.guardrails.append(Guardrail(name="max_prompt_length", max_length=max_prompt))
 
         if max_response and isinstance(max_response, int):
-            self.guardrails.append(
-                Guardrail(name="max_response_length", pattern=rf".{{0,{max_response}}}")
-            )
+            self.guardrails.append(Guardrail(name="max_response_length", max_length=max_response))
 
     def validate_output(self, text: str) -> tuple[bool, List[str]]:
         """
@@ -154,9 +336,10 @@ class ConstraintsEngine:
             (is_valid, list_of_errors)
         """
         errors: List[str] = []
+        view = _TextView(text)
 
         for guardrail in self.guardrails:
-            is_valid, error = guardrail.validate(text)
+            is_valid, error = guardrail._evaluate(view)
             if not is_valid and error:
                 errors.append(f"[{guardrail.name}] {error}")
 
@@ -179,12 +362,13 @@ class ConstraintsEngine:
         """
         try:
             data = json.loads(text)
-            validate(data, schema)
-            return True, None
         except json.JSONDecodeError as e:
             return False, f"Invalid JSON: {e}"
-        except ValidationError as e:
-            return False, f"Schema validation failed: {e.message}"
+
+        error = _first_schema_error(get_schema_validator(schema), data)
+        if error is not None:
+            return False, f"Schema validation failed: {error.message}"
+        return True, None
 
 
 # Instance globale
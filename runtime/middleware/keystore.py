@@ -0,0 +1,309 @@
+"""
+Magasin de clés de signature des Decision Records
+
+Les clés Ed25519 sont chargées depuis le magasin au lieu d'être régénérées à
+chaque démarrage. Chaque rotation ouvre une nouvelle époque; la clé est
+identifiée par un ``key_id`` (empreinte de la clé publique) inscrit dans les
+DR qu'elle signe, si bien qu'un DR reste vérifiable après rotation. Les clés
+publiques chargées sont gardées en cache pour la vérification en masse. La
+clé active est relue quand le trousseau change (rotation faite par un autre
+processus partageant le magasin).
+
+Backends:
+- FileKeyStore: répertoire local (``provenance/signatures/``); la clé privée
+  est chiffrée si une phrase de passe est fournie (ou définie dans
+  FILAGENT_DR_KEY_PASSPHRASE)
+- MemoryKeyStore: clés en mémoire (tests, outils)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: pas de verrou inter-processus
+    FCNTL_AVAILABLE = False
+
+KEY_PASSPHRASE_ENV = "FILAGENT_DR_KEY_PASSPHRASE"
+DEFAULT_KEY_DIR = "provenance/signatures"
+
+
+class KeyStoreError(Exception):
+    """Clé introuvable ou illisible"""
+
+
+@dataclass(frozen=True)
+class KeyInfo:
+    """Métadonnées d'une clé du trousseau"""
+
+    key_id: str
+    epoch: int
+    created_at: str
+
+
+def key_id_for(public_key: ed25519.Ed25519PublicKey) -> str:
+    """Identifiant stable d'une clé: empreinte SHA-256 de la clé publique brute"""
+    raw = public_key.public_bytes(
+        encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw
+    )
+    return f"ed25519-{hashlib.sha256(raw).hexdigest()[:16]}"
+
+
+class KeyStore(ABC):
+    """
+    Trousseau de clés de signature (clé active + clés des époques passées)
+
+    Les sous-classes fournissent le stockage (``_read_keyring``,
+    ``_write_key``, ...); la sélection de la clé active, la rotation et le
+    cache des clés publiques sont communs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._active: Optional[Tuple[str, ed25519.Ed25519PrivateKey]] = None
+        self._active_version: Optional[object] = None
+        self._public_keys: Dict[str, ed25519.Ed25519PublicKey] = {}
+
+    # Stockage (à fournir par les backends)
+
+    @abstractmethod
+    def _read_keyring(self) -> Tuple[Optional[str], List[KeyInfo]]:
+        """(key_id actif ou None si le trousseau est vide, clés par époque)"""
+
+    @abstractmethod
+    def _write_keyring(self, active_key_id: str, keys: List[KeyInfo]) -> None:
+        """Remplacer le trousseau (clé active et liste des époques)"""
+
+    @abstractmethod
+    def _read_private_key(self, key_id: str) -> ed25519.Ed25519PrivateKey:
+        """Clé privée d'une époque (KeyStoreError si introuvable ou illisible)"""
+
+    @abstractmethod
+    def _read_public_key(self, key_id: str) -> ed25519.Ed25519PublicKey:
+        """Clé publique d'une époque (KeyStoreError si introuvable ou illisible)"""
+
+    @abstractmethod
+    def _write_key(self, key_id: str, private_key: ed25519.Ed25519PrivateKey) -> None:
+        """Enregistrer la paire de clés d'une nouvelle époque"""
+
+    def _keyring_version(self) -> Optional[object]:
+        """Marqueur changeant à chaque écriture du trousseau par un autre processus"""
+        return None
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Section critique entre processus partageant le magasin"""
+        yield
+
+    # API
+
+    def keys(self) -> List[KeyInfo]:
+        """Clés connues, de la plus ancienne à la plus récente"""
+        return self._read_keyring()[1]
+
+    def signing_key(self) -> Tuple[str, ed25519.Ed25519PrivateKey]:
+        """(key_id, clé privée) de l'époque active; créée si le trousseau est vide"""
+        active = self._active
+        if active is not None and self._active_version == self._keyring_version():
+            return active
+        with self._lock:
+            if self._active is None or self._active_version != self._keyring_version():
+                with self._exclusive():
+                    active_key_id, _ = self._read_keyring()
+                    if active_key_id is None:
+                        active_key_id = self._create_key().key_id
+                    version = self._keyring_version()
+                private_key = self._read_private_key(active_key_id)
+                self._public_keys[active_key_id] = private_key.public_key()
+                self._active = (active_key_id, private_key)
+                self._active_version = version
+            return self._active
+
+    @property
+    def active_key_id(self) -> str:
+        return self.signing_key()[0]
+
+    def public_key(self, key_id: str) -> ed25519.Ed25519PublicKey:
+        """Clé publique d'une époque (mise en cache)"""
+        public_key = self._public_keys.get(key_id)
+        if public_key is None:
+            public_key = self._read_public_key(key_id)
+            self._public_keys[key_id] = public_key
+        return public_key
+
+    def rotate(self) -> KeyInfo:
+        """Ouvrir une nouvelle époque: les DR suivants sont signés par une nouvelle clé"""
+        with self._lock:
+            with self._exclusive():
+                info = self._create_key()
+            self._active = None
+        return info
+
+    def _create_key(self) -> KeyInfo:
+        _, keys = self._read_keyring()
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        info = KeyInfo(
+            key_id=key_id_for(private_key.public_key()),
+            epoch=keys[-1].epoch + 1 if keys else 0,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        self._write_key(info.key_id, private_key)
+        self._write_keyring(info.key_id, keys + [info])
+        return info
+
+
+class MemoryKeyStore(KeyStore):
+    """Trousseau en mémoire (rien n'est écrit sur disque)"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._private_keys: Dict[str, ed25519.Ed25519PrivateKey] = {}
+        self._keyring: Tuple[Optional[str], List[KeyInfo]] = (None, [])
+
+    def _read_keyring(self) -> Tuple[Optional[str], List[KeyInfo]]:
+        return self._keyring[0], list(self._keyring[1])
+
+    def _write_keyring(self, active_key_id: str, keys: List[KeyInfo]) -> None:
+        self._keyring = (active_key_id, list(keys))
+
+    def _read_private_key(self, key_id: str) -> ed25519.Ed25519PrivateKey:
+        try:
+            return self._private_keys[key_id]
+        except KeyError:
+            raise KeyStoreError(f"Unknown signing key: {key_id}") from None
+
+    def _read_public_key(self, key_id: str) -> ed25519.Ed25519PublicKey:
+        return self._read_private_key(key_id).public_key()
+
+    def _write_key(self, key_id: str, private_key: ed25519.Ed25519PrivateKey) -> None:
+        self._private_keys[key_id] = private_key
+
+
+class FileKeyStore(KeyStore):
+    """
+    Trousseau sur disque
+
+    Fichiers du répertoire:
+    - keyring.json: clé active et liste des époques
+    - <key_id>.key.pem: clé privée PKCS8 (0600, chiffrée si phrase de passe)
+    - <key_id>.pub.pem: clé publique (seule lue pour la vérification)
+
+    keyring.json est remplacé atomiquement à chaque rotation: son inode et sa
+    date de modification servent de version pour relire la clé active.
+    """
+
+    KEYRING_FILE = "keyring.json"
+
+    def __init__(self, directory: str = DEFAULT_KEY_DIR, passphrase: Optional[str] = None) -> None:
+        super().__init__()
+        self.directory = Path(directory)
+        if passphrase is None:
+            passphrase = os.environ.get(KEY_PASSPHRASE_ENV) or None
+        self._passphrase = passphrase.encode("utf-8") if passphrase else None
+
+    @property
+    def encrypted(self) -> bool:
+        return self._passphrase is not None
+
+    def _key_path(self, key_id: str, suffix: str) -> Path:
+        return self.directory / f"{key_id}.{suffix}.pem"
+
+    def _keyring_version(self) -> Optional[object]:
+        try:
+            stat = (self.directory / self.KEYRING_FILE).stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_keyring(self) -> Tuple[Optional[str], List[KeyInfo]]:
+        path = self.directory / self.KEYRING_FILE
+        if not path.exists():
+            return None, []
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return data.get("active"), [KeyInfo(**key) for key in data.get("keys", [])]
+        except (OSError, ValueError, TypeError) as e:
+            raise KeyStoreError(f"Unreadable keyring {path}: {e}") from e
+
+    def _write_keyring(self, active_key_id: str, keys: List[KeyInfo]) -> None:
+        payload = {"active": active_key_id, "keys": [asdict(key) for key in keys]}
+        self._write_atomic(
+            self.directory / self.KEYRING_FILE, json.dumps(payload, indent=2).encode("utf-8")
+        )
+
+    def _read_private_key(self, key_id: str) -> ed25519.Ed25519PrivateKey:
+        path = self._key_path(key_id, "key")
+        try:
+            private_key = serialization.load_pem_private_key(
+                path.read_bytes(), password=self._passphrase
+            )
+        except (OSError, ValueError, TypeError) as e:
+            raise KeyStoreError(f"Cannot load signing key {key_id}: {e}") from e
+        if not isinstance(private_key, ed25519.Ed25519PrivateKey):
+            raise KeyStoreError(f"Signing key {key_id} is not an Ed25519 key")
+        return private_key
+
+    def _read_public_key(self, key_id: str) -> ed25519.Ed25519PublicKey:
+        path = self._key_path(key_id, "pub")
+        try:
+            public_key = serialization.load_pem_public_key(path.read_bytes())
+        except (OSError, ValueError) as e:
+            raise KeyStoreError(f"Unknown verification key {key_id}: {e}") from e
+        if not isinstance(public_key, ed25519.Ed25519PublicKey):
+            raise KeyStoreError(f"Verification key {key_id} is not an Ed25519 key")
+        return public_key
+
+    def _write_key(self, key_id: str, private_key: ed25519.Ed25519PrivateKey) -> None:
+        encryption = (
+            serialization.BestAvailableEncryption(self._passphrase)
+            if self._passphrase
+            else serialization.NoEncryption()
+        )
+        private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=encryption,
+        )
+        public_pem = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self._write_atomic(self._key_path(key_id, "key"), private_pem, mode=0o600)
+        self._write_atomic(self._key_path(key_id, "pub"), public_pem)
+
+    def _write_atomic(self, path: Path, data: bytes, mode: int = 0o644) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        # Deux processus qui démarrent ensemble ne doivent pas créer deux clés actives
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self.directory / ".keyring.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
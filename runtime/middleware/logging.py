@@ -176,8 +176,9 @@ class EventLogger:
         task_id: Optional[str] = None,
         success: bool = True,
         output: Optional[str] = None,
+        cached: bool = False,
     ) -> None:
-        """Enregistrer un appel d'outil"""
+        """Enregistrer un appel d'outil (cached: résultat servi par le cache)"""
         # Hasher les arguments sensibles
         input_hash = hashlib.sha256(str(arguments).encode()).hexdigest()
         output_hash: Optional[str] = None
@@ -190,6 +191,8 @@ class EventLogger:
             "output_hash": f"sha256:{output_hash}" if output_hash else None,
             "success": success,
         }
+        if cached:
+            metadata["cached"] = True
 
         self.log_event(
             actor=f"tool.{tool_name}",
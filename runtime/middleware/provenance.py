@@ -270,10 +270,14 @@ class ProvenanceTracker:
         task_id: str,
         start_time: str,
         end_time: str,
+        cached: bool = False,
     ) -> ProvJsonDocument:
         """
         Tracer l'execution d'un outil
 
+        Args:
+            cached: Sortie servie par le cache de resultats (pas de nouvelle execution)
+
         Returns:
             Dict PROV-JSON
         """
@@ -288,9 +292,10 @@ class ProvenanceTracker:
         builder.add_entity(
             input_id, f"Tool input: {tool_name}", {"hash": f"sha256:{tool_input_hash}"}
         )
-        builder.add_entity(
-            output_id, f"Tool output: {tool_name}", {"hash": f"sha256:{tool_output_hash}"}
-        )
+        output_attributes: ProvAttributes = {"hash": f"sha256:{tool_output_hash}"}
+        if cached:
+            output_attributes["cached"] = True
+        builder.add_entity(output_id, f"Tool output: {tool_name}", output_attributes)
 
         # Activite
         builder.add_activity(activity_id, start_time, end_time)
@@ -10,16 +10,21 @@ Standards Applied:
 - Atomic writes (tempfile + shutil.move)
 - Audit-first corrupt file recovery
 - Pydantic V2 with field_validator
+- Per-thread counter shards, persisted by a background snapshotter
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import shutil
 import tempfile
+import threading
+import time
+import weakref
 from datetime import datetime, date
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, Field, StrictInt, field_validator
 
@@ -28,13 +33,28 @@ __all__ = [
     "SessionStats",
     "GlobalMiddlewareMetrics",
     "MiddlewareStatsManager",
+    "COMPONENT_ATTR_MAP",
     "get_stats_manager",
+    "init_stats_manager",
     "reset_stats_manager",
 ]
 
 
 # --- CONFIGURATION ---
 STATS_FILE = Path("data/middleware_stats.json")
+SNAPSHOT_INTERVAL_SECONDS = 5.0
+
+# Composant middleware -> champ de DailyMiddlewareStats
+COMPONENT_ATTR_MAP: Dict[str, str] = {
+    "logging": "logging_ops",
+    "audit": "audit_ops",
+    "provenance": "provenance_ops",
+    "retention": "retention_ops",
+    "rbac": "rbac_checks",
+    "pii": "pii_scans",
+    "worm": "worm_writes",
+    "constraints": "constraints_checks",
+}
 
 
 # --- PYDANTIC V2 MODELS (Strictly Typed) ---
@@ -98,7 +118,14 @@ class GlobalMiddlewareMetrics(BaseModel):
         return v
 
 
-# --- STATS MANAGER (Atomic Persistence) ---
+# --- STATS MANAGER (Sharded Counters + Atomic Snapshots) ---
+
+# Clé de compteur: (jour ISO, composant, is_error)
+_CounterKey = Tuple[str, str, bool]
+_Shard = Dict[_CounterKey, int]
+
+# Gestionnaires vivants, vidés sur disque à l'arrêt du processus
+_live_managers: "weakref.WeakSet[MiddlewareStatsManager]" = weakref.WeakSet()
 
 
 class MiddlewareStatsManager:
@@ -106,22 +133,60 @@ class MiddlewareStatsManager:
     Gestionnaire de métriques middleware avec persistance atomique.
 
     Features:
+    - record_operation() se limite à incrémenter un compteur en mémoire
+      (un shard par thread, donc sans verrou sur le chemin chaud)
+    - Snapshot périodique par un thread d'arrière-plan, et à l'arrêt
     - Atomic writes (tempfile + shutil.move) to prevent corruption
+    - Historique compact: un enregistrement par jour, champs nuls omis
     - Corrupt file recovery (rename to .corrupt.{timestamp}.json)
     - Singleton pattern via get_stats_manager()
     - Loi 25/PIPEDA compliant (JSON serializable for audit)
     """
 
-    def __init__(self, storage_path: Path = STATS_FILE):
+    def __init__(
+        self,
+        storage_path: Path = STATS_FILE,
+        snapshot_interval: Optional[float] = SNAPSHOT_INTERVAL_SECONDS,
+    ):
         """
         Initialise le gestionnaire de statistiques.
 
         Args:
             storage_path: Chemin vers le fichier de persistance JSON.
+            snapshot_interval: Période (secondes) du snapshot en arrière-plan.
+                None ou 0 désactive le thread; seuls snapshot()/close()
+                écrivent alors sur disque.
         """
         self.storage_path = storage_path
         self.session = SessionStats()
-        self.data = self._load_or_init()
+        self.snapshot_interval = snapshot_interval
+
+        loaded = self._load_or_init()
+        self._version = loaded.version
+        self._base_updated = loaded.last_updated
+        self._base: Dict[str, Dict[str, int]] = {
+            day: stats.model_dump(exclude={"date_ref"}) for day, stats in loaded.history.items()
+        }
+
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, _Shard]] = []
+        self._shards_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+
+        self._last_op_ts: Optional[float] = None
+        self._persisted_ts: Optional[float] = None
+
+        self._stop_event = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        if snapshot_interval:
+            self._snapshot_thread = threading.Thread(
+                target=self._snapshot_loop,
+                name="middleware-stats-snapshot",
+                daemon=True,
+            )
+            self._snapshot_thread.start()
+
+        _live_managers.add(self)
 
     def _load_or_init(self) -> GlobalMiddlewareMetrics:
         """
@@ -146,51 +211,137 @@ class MiddlewareStatsManager:
             print(f"[WARN] Stats corrupted. Moved to {backup_path}. Error: {e}")
             return GlobalMiddlewareMetrics()
 
+    # --- Hot path ---
+
+    def _get_shard(self) -> _Shard:
+        """Crée et enregistre le shard de compteurs du thread courant."""
+        shard: _Shard = {}
+        self._local.shard = shard
+        with self._shards_lock:
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
     def record_operation(
-        self, component: str, is_error: bool = False, persist: bool = True
+        self, component: str, is_error: bool = False, persist: bool = False
     ) -> None:
         """
         Enregistre une opération pour un composant middleware.
 
+        Le coût est celui d'un incrément de compteur: la persistance est
+        assurée par le snapshot périodique (voir snapshot()).
+
         Args:
             component: Nom du composant (logging, audit, provenance, etc.)
             is_error: True si l'opération a échoué
-            persist: True pour persister immédiatement (défaut)
+            persist: True pour forcer un snapshot immédiat sur disque
         """
-        today_key = date.today().isoformat()
-
-        # Création du bucket journalier si nécessaire
-        if today_key not in self.data.history:
-            self.data.history[today_key] = DailyMiddlewareStats(date_ref=today_key)
-
-        daily = self.data.history[today_key]
-
-        # Mise à jour des compteurs globaux
-        daily.total_operations += 1
-        if is_error:
-            daily.total_errors += 1
-
-        # Mise à jour du compteur spécifique au composant
-        component_attr_map = {
-            "logging": "logging_ops",
-            "audit": "audit_ops",
-            "provenance": "provenance_ops",
-            "retention": "retention_ops",
-            "rbac": "rbac_checks",
-            "pii": "pii_scans",
-            "worm": "worm_writes",
-            "constraints": "constraints_checks",
-        }
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._get_shard()
+        key = (date.today().isoformat(), component, is_error)
+        shard[key] = shard.get(key, 0) + 1
+        self._last_op_ts = time.time()
 
-        attr = component_attr_map.get(component)
-        if attr and hasattr(daily, attr):
-            current_value = getattr(daily, attr)
-            setattr(daily, attr, current_value + 1)
+        if persist:
+            self.snapshot()
+
+    # --- Aggregation ---
+
+    @staticmethod
+    def _fold(counts: Dict[str, Dict[str, int]], shard: _Shard) -> None:
+        """Ajoute les compteurs d'un shard à un agrégat {jour: {champ: valeur}}."""
+        for (day, component, is_error), value in shard.items():
+            daily = counts.setdefault(day, {})
+            daily["total_operations"] = daily.get("total_operations", 0) + value
+            if is_error:
+                daily["total_errors"] = daily.get("total_errors", 0) + value
+            attr = COMPONENT_ATTR_MAP.get(component)
+            if attr:
+                daily[attr] = daily.get(attr, 0) + value
+
+    def _collect_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Agrège l'historique persisté et les shards de tous les threads.
 
-        self.data.last_updated = datetime.now()
+        Les shards des threads terminés sont intégrés à la base puis
+        libérés: plus personne ne peut y écrire.
+        """
+        with self._shards_lock:
+            live: List[Tuple[threading.Thread, _Shard]] = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._fold(self._base, shard)
+            self._shards = live
+            # dict.copy() est atomique sous le GIL: lecture cohérente du shard
+            snapshots = [shard.copy() for _, shard in live]
+            counts = {day: dict(values) for day, values in self._base.items()}
+
+        for shard in snapshots:
+            self._fold(counts, shard)
+        return counts
+
+    @property
+    def last_updated(self) -> datetime:
+        """Horodatage de la dernière opération enregistrée (ou chargée)."""
+        if self._last_op_ts is None:
+            return self._base_updated
+        return datetime.fromtimestamp(self._last_op_ts)
+
+    @property
+    def data(self) -> GlobalMiddlewareMetrics:
+        """Vue agrégée courante (historique persisté + compteurs en mémoire)."""
+        counts = self._collect_counts()
+        return GlobalMiddlewareMetrics(
+            last_updated=self.last_updated,
+            version=self._version,
+            history={
+                day: DailyMiddlewareStats(date_ref=day, **values)
+                for day, values in sorted(counts.items())
+            },
+        )
 
-        if persist:
+    def _daily_stats(self, day: str) -> DailyMiddlewareStats:
+        """Retourne les statistiques agrégées d'une journée."""
+        values = self._collect_counts().get(day, {})
+        return DailyMiddlewareStats(date_ref=day, **values)
+
+    # --- Persistence ---
+
+    def snapshot(self) -> bool:
+        """
+        Écrit l'état agrégé sur disque si des opérations ont eu lieu
+        depuis le dernier snapshot.
+
+        Returns:
+            True si un fichier a été écrit.
+        """
+        with self._snapshot_lock:
+            last_op = self._last_op_ts
+            if last_op is None or last_op == self._persisted_ts:
+                return False
             self._persist()
+            self._persisted_ts = last_op
+            return True
+
+    def _serialize(self) -> str:
+        """
+        Sérialisation compacte: champs à zéro omis, pas d'indentation.
+
+        Reste lisible par GlobalMiddlewareMetrics (valeurs par défaut à 0).
+        """
+        metrics = self.data
+        payload = {
+            "last_updated": metrics.last_updated.isoformat(),
+            "version": metrics.version,
+            "history": {
+                day: stats.model_dump(exclude_defaults=True)
+                for day, stats in metrics.history.items()
+            },
+        }
+        return json.dumps(payload, separators=(",", ":"))
 
     def _persist(self) -> None:
         """
@@ -208,9 +359,7 @@ class MiddlewareStatsManager:
         )
 
         try:
-            # Sérialisation Pydantic V2
-            json_str = self.data.model_dump_json(indent=2)
-            temp_file.write(json_str)
+            temp_file.write(self._serialize())
             temp_file.flush()
             temp_file.close()
 
@@ -221,6 +370,26 @@ class MiddlewareStatsManager:
             Path(temp_file.name).unlink(missing_ok=True)
             raise RuntimeError(f"Critical: Failed to persist middleware stats. {e}")
 
+    def _snapshot_loop(self) -> None:
+        """Boucle du thread de snapshot périodique."""
+        while not self._stop_event.wait(self.snapshot_interval):
+            try:
+                self.snapshot()
+            except RuntimeError as e:
+                print(f"[WARN] {e}")
+
+    def close(self) -> None:
+        """Arrête le thread de snapshot et écrit un dernier snapshot."""
+        self._stop_event.set()
+        thread = self._snapshot_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._snapshot_thread = None
+        self.snapshot()
+        _live_managers.discard(self)
+
+    # --- Reporting ---
+
     def get_summary(self) -> Dict[str, Any]:
         """
         Retourne un résumé pour l'API/Dashboard.
@@ -229,14 +398,15 @@ class MiddlewareStatsManager:
             Dict avec status, session uptime, stats du jour, et historique.
         """
         today = date.today().isoformat()
-        today_stats = self.data.history.get(today, DailyMiddlewareStats(date_ref=today))
+        counts = self._collect_counts()
+        today_stats = DailyMiddlewareStats(date_ref=today, **counts.get(today, {}))
 
         return {
             "status": "healthy",
-            "last_updated": self.data.last_updated.isoformat(),
+            "last_updated": self.last_updated.isoformat(),
             "session_uptime": (datetime.now() - self.session.start_time).total_seconds(),
             "today": today_stats.model_dump(),
-            "days_tracked": len(self.data.history),
+            "days_tracked": len(counts),
         }
 
     def get_component_stats(self, component: str) -> Dict[str, Any]:
@@ -249,21 +419,9 @@ class MiddlewareStatsManager:
         Returns:
             Dict avec le nom du composant et ses métriques.
         """
-        today = date.today().isoformat()
-        today_stats = self.data.history.get(today, DailyMiddlewareStats(date_ref=today))
-
-        component_attr_map = {
-            "logging": "logging_ops",
-            "audit": "audit_ops",
-            "provenance": "provenance_ops",
-            "retention": "retention_ops",
-            "rbac": "rbac_checks",
-            "pii": "pii_scans",
-            "worm": "worm_writes",
-            "constraints": "constraints_checks",
-        }
+        today_stats = self._daily_stats(date.today().isoformat())
 
-        attr = component_attr_map.get(component, f"{component}_ops")
+        attr = COMPONENT_ATTR_MAP.get(component, f"{component}_ops")
         ops_count = getattr(today_stats, attr, 0) if hasattr(today_stats, attr) else 0
 
         return {
@@ -274,6 +432,16 @@ class MiddlewareStatsManager:
         }
 
 
+@atexit.register
+def _flush_on_exit() -> None:
+    """Dernier snapshot de chaque gestionnaire vivant à l'arrêt du processus."""
+    for manager in list(_live_managers):
+        try:
+            manager.close()
+        except Exception as e:  # pragma: no cover - best effort à l'arrêt
+            print(f"[WARN] Failed to flush middleware stats on exit: {e}")
+
+
 # --- SINGLETON PATTERN ---
 
 _stats_manager: Optional[MiddlewareStatsManager] = None
@@ -309,6 +477,8 @@ def init_stats_manager(storage_path: Path = STATS_FILE) -> MiddlewareStatsManage
         Nouvelle instance de MiddlewareStatsManager.
     """
     global _stats_manager
+    if _stats_manager is not None:
+        _stats_manager.close()
     _stats_manager = MiddlewareStatsManager(storage_path=storage_path)
     return _stats_manager
 
@@ -318,4 +488,6 @@ def reset_stats_manager() -> None:
     Réinitialise le singleton pour les tests.
     """
     global _stats_manager
+    if _stats_manager is not None:
+        _stats_manager.close()
     _stats_manager = None
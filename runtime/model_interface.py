@@ -4,9 +4,15 @@ Supporte llama.cpp et vLLM (optionnel)
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional
 from dataclasses import dataclass
 from pathlib import Path
+import asyncio
+import time
+import weakref
+
+from runtime.prefix_cache import PrefixStateCache, common_prefix_length
+from runtime.token_budget import get_fallback_tokenizer
 
 # Charger les variables d'environnement (.env) pour les API keys
 try:
@@ -23,6 +29,7 @@ __all__ = [
     "ModelFactory",
     "GenerationConfig",
     "GenerationResult",
+    "StreamChunk",
     "get_model",
     "init_model",
 ]
@@ -53,6 +60,54 @@ class GenerationResult:
     citations: Optional[List[str]] = None  # URLs des sources (Perplexity)
 
 
+@dataclass
+class StreamChunk:
+    """Fragment de génération en streaming"""
+
+    text: str  # Texte incrémental (vide pour le fragment final)
+    result: Optional[GenerationResult] = None  # Renseigné uniquement sur le dernier fragment
+
+
+def _stream_chat_completion(stream) -> Iterator[StreamChunk]:
+    """Convertir un flux chat.completions (API compatible OpenAI) en StreamChunk"""
+    pieces: List[str] = []
+    finish_reason = "stop"
+    usage = None
+    citations = None
+    deltas = 0
+
+    for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if getattr(chunk, "citations", None):
+            citations = chunk.citations
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        text = getattr(choice.delta, "content", None)
+        if text:
+            deltas += 1
+            pieces.append(text)
+            yield StreamChunk(text=text)
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+
+    # Sans usage dans le flux, chaque delta compte approximativement pour un token
+    prompt_tokens = usage.prompt_tokens if usage else 0
+    completion_tokens = usage.completion_tokens if usage else deltas
+    yield StreamChunk(
+        text="",
+        result=GenerationResult(
+            text="".join(pieces).strip(),
+            finish_reason=finish_reason,
+            tokens_generated=completion_tokens,
+            prompt_tokens=prompt_tokens,
+            total_tokens=usage.total_tokens if usage else prompt_tokens + completion_tokens,
+            citations=citations,
+        ),
+    )
+
+
 class ModelInterface(ABC):
     """Interface abstraite pour les modèles LLM"""
 
@@ -66,6 +121,41 @@ class ModelInterface(ABC):
     ) -> GenerationResult:
         """Générer du texte à partir d'un prompt"""
 
+    def generate_stream(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> Iterator[StreamChunk]:
+        """
+        Générer du texte fragment par fragment
+
+        Le dernier fragment porte le GenerationResult complet (texte, tokens).
+        Implémentation par défaut pour les backends sans streaming: un seul
+        fragment contenant toute la réponse.
+        """
+        result = self.generate(prompt, config, system_prompt=system_prompt)
+        if result.text:
+            yield StreamChunk(text=result.text)
+        yield StreamChunk(text="", result=result)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Compter les tokens de ``text``
+
+        Implémentation par défaut: tiktoken si disponible, sinon estimation
+        locale. Les backends qui exposent leur tokenizer la remplacent.
+        """
+        return get_fallback_tokenizer()(text)
+
+    async def agenerate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        """
+        Générer sans bloquer la boucle d'événements
+
+        Implémentation par défaut: generate() dans un thread. Les backends
+        distants la remplacent par un client HTTP asynchrone.
+        """
+        return await asyncio.to_thread(self.generate, prompt, config, system_prompt=system_prompt)
+
     @abstractmethod
     def unload(self):
         """Décharger le modèle de la mémoire"""
@@ -85,6 +175,7 @@ class LlamaCppInterface(ModelInterface):
     def __init__(self):
         self.model = None
         self._loaded: bool = False
+        self.prefix_cache: Optional[PrefixStateCache] = None
 
     def load(self, model_path: str, config: Dict) -> bool:
         """Charger un modèle GGUF"""
@@ -118,6 +209,14 @@ class LlamaCppInterface(ModelInterface):
                 verbose=False,
             )
 
+            # Cache d'états par préfixe (prompt système, tours précédents)
+            prefix_cache_states = config.get("prefix_cache_states", 4)
+            if prefix_cache_states:
+                self.prefix_cache = PrefixStateCache(
+                    max_states=prefix_cache_states,
+                    max_bytes=config.get("prefix_cache_max_mb", 2048) * 1024 * 1024,
+                )
+
             self._loaded = True
             print(f"✓ Model loaded from {model_path}")
             return True
@@ -152,6 +251,7 @@ class LlamaCppInterface(ModelInterface):
                 }
 
         self.model = MockModel()
+        self.prefix_cache = None  # Le mock n'a pas d'état KV
         self._loaded = True
         print("⚠ Using mock model (fallback mode)")
 
@@ -170,8 +270,9 @@ class LlamaCppInterface(ModelInterface):
             full_prompt = prompt
 
         try:
-            # Estimer les tokens du prompt (approximation)
-            prompt_tokens = len(full_prompt.split())
+            prompt_tokens = self.count_tokens(full_prompt)
+
+            self._restore_prefix_state(full_prompt, system_prompt)
 
             # Générer avec llama.cpp (SANS streaming)
             response = self.model(
@@ -187,6 +288,8 @@ class LlamaCppInterface(ModelInterface):
                 stream=False,  # ✨ IMPORTANT: Générer toute la réponse d'un coup
             )
 
+            self._save_prefix_state()
+
             # Extraire le texte généré
             generated_text = response["choices"][0]["text"]
 
@@ -196,6 +299,7 @@ class LlamaCppInterface(ModelInterface):
             # Tokens
             tokens_generated = response["usage"]["completion_tokens"]
             total_tokens = response["usage"]["total_tokens"]
+            prompt_tokens = response["usage"].get("prompt_tokens", prompt_tokens)
 
             return GenerationResult(
                 text=generated_text.strip(),
@@ -216,12 +320,141 @@ class LlamaCppInterface(ModelInterface):
                 total_tokens=prompt_tokens,
             )
 
+    def generate_stream(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> Iterator[StreamChunk]:
+        """Générer du texte token par token (llama.cpp stream=True)"""
+        if not self.is_loaded():
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        prompt_tokens = self.count_tokens(full_prompt)
+        pieces: List[str] = []
+        finish_reason = "stop"
+        tokens_generated = 0
+        total_tokens = None
+
+        try:
+            self._restore_prefix_state(full_prompt, system_prompt)
+            response = self.model(
+                full_prompt,
+                temperature=config.temperature,
+                top_p=config.top_p,
+                top_k=config.top_k,
+                repeat_penalty=config.repetition_penalty,
+                max_tokens=config.max_tokens,
+                seed=config.seed,
+                stop=["</s>", "\n\n\n"],
+                echo=False,
+                stream=True,
+            )
+            # Le modèle mock (mode repli) ne streame pas: réponse complète unique
+            if isinstance(response, dict):
+                response = [response]
+
+            for chunk in response:
+                choice = chunk["choices"][0]
+                text = choice.get("text", "")
+                if text:
+                    tokens_generated += 1  # llama.cpp émet un token par fragment
+                    pieces.append(text)
+                    yield StreamChunk(text=text)
+                if choice.get("finish_reason"):
+                    finish_reason = choice["finish_reason"]
+                usage = chunk.get("usage")
+                if usage:
+                    tokens_generated = usage.get("completion_tokens", tokens_generated)
+                    total_tokens = usage.get("total_tokens")
+
+            self._save_prefix_state()
+
+        except Exception as e:
+            print(f"⚠ Streaming generation failed: {e}")
+            yield StreamChunk(
+                text="",
+                result=GenerationResult(
+                    text=f"[Error] Generation failed: {str(e)}. Please check your model configuration.",
+                    finish_reason="error",
+                    tokens_generated=0,
+                    prompt_tokens=prompt_tokens,
+                    total_tokens=prompt_tokens,
+                ),
+            )
+            return
+
+        yield StreamChunk(
+            text="",
+            result=GenerationResult(
+                text="".join(pieces).strip(),
+                finish_reason=finish_reason,
+                tokens_generated=tokens_generated,
+                prompt_tokens=prompt_tokens,
+                total_tokens=total_tokens or prompt_tokens + tokens_generated,
+            ),
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """Compter les tokens avec le tokenizer du modèle GGUF"""
+        tokenize = getattr(self.model, "tokenize", None)
+        if tokenize is None:  # Modèle mock
+            return super().count_tokens(text)
+        return len(tokenize(text.encode("utf-8")))
+
+    def _restore_prefix_state(self, full_prompt: str, system_prompt: Optional[str]) -> None:
+        """
+        Restaurer l'état llama partageant le plus long préfixe avec le prompt
+
+        llama.cpp réutilise ensuite les tokens déjà évalués et n'évalue que le
+        suffixe. Au premier passage d'un prompt système, son préfixe est évalué
+        et sauvegardé pour les requêtes suivantes.
+        """
+        cache = self.prefix_cache
+        if cache is None:
+            return
+        try:
+            tokens = self.model.tokenize(full_prompt.encode("utf-8"))
+            state, reused = cache.lookup(tokens)
+            # input_ids est un tampon de n_ctx: seuls n_tokens ont été évalués
+            evaluated = self.model.input_ids[: self.model.n_tokens]
+            live = common_prefix_length(evaluated, tokens)
+            if state is not None and reused > live:
+                self.model.load_state(state)
+            reused = max(reused, live)
+
+            if reused == 0 and system_prompt:
+                prefix = self.model.tokenize(f"{system_prompt}\n\n".encode("utf-8"))
+                prefix_length = common_prefix_length(prefix, tokens)
+                # Garder au moins un token à évaluer pour obtenir des logits
+                prefix_length = min(prefix_length, len(tokens) - 1)
+                if prefix_length > 0:
+                    start = time.perf_counter()
+                    self.model.reset()
+                    self.model.eval(tokens[:prefix_length])
+                    cache.observe_eval(prefix_length, time.perf_counter() - start)
+                    cache.store(self.model.save_state())
+
+            cache.record_lookup(reused)
+        except Exception as e:
+            print(f"⚠ Prefix cache disabled: {e}")
+            self.prefix_cache = None
+
+    def _save_prefix_state(self) -> None:
+        """Sauvegarder l'état après génération (prompt + complétion)"""
+        if self.prefix_cache is None:
+            return
+        try:
+            self.prefix_cache.store(self.model.save_state())
+        except Exception as e:
+            print(f"⚠ Prefix cache disabled: {e}")
+            self.prefix_cache = None
+
     def unload(self):
         """Décharger le modèle"""
         if self.model:
             # llama.cpp Python ne nécessite pas de déchargement explicite
             # mais on peut marquer comme déchargé
             self.model = None
+            self.prefix_cache = None
             self._loaded = False
             print("Model unloaded")
 
@@ -230,7 +463,109 @@ class LlamaCppInterface(ModelInterface):
         return self._loaded
 
 
-class PerplexityInterface(ModelInterface):
+class _AsyncChatCompletionsMixin:
+    """
+    agenerate() pour les API compatibles chat.completions (OpenAI, Perplexity)
+
+    - client HTTP partagé (keep-alive, HTTP/2 si h2 est installé)
+    - attente non bloquante du rate limiter
+    - timeout par requête et hedging optionnel: si la réponse tarde au-delà
+      de ``hedge_after`` secondes, une seconde requête identique est lancée
+      et la première réponse reçue l'emporte
+    """
+
+    client: object
+    _rate_limiter: object
+
+    def _configure_async(self, config: Dict) -> None:
+        """Lire les réglages réseau (timeout, hedging, taille du pool)"""
+        self.request_timeout = float(config.get("request_timeout", 60.0))
+        self.hedge_after = config.get("hedge_after")
+        self.max_connections = int(config.get("max_connections", 20))
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _async_client(self):
+        """Client AsyncOpenAI de la boucle courante, adossé au pool partagé"""
+        from openai import AsyncOpenAI
+        from runtime.utils.http_pool import get_async_http_client
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=self.client.api_key,
+                base_url=str(self.client.base_url),
+                http_client=get_async_http_client(
+                    timeout=self.request_timeout, max_connections=self.max_connections
+                ),
+                timeout=self.request_timeout,
+                max_retries=0,  # Les reprises passent par le rate limiter
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def _hedged(self, make_call):
+        """Exécuter make_call(), doublé après ``hedge_after`` s sans réponse"""
+        if not self.hedge_after:
+            return await make_call()
+
+        first = asyncio.ensure_future(make_call())
+        done, _ = await asyncio.wait({first}, timeout=float(self.hedge_after))
+        if done:
+            return first.result()
+
+        pending = {first, asyncio.ensure_future(make_call())}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    async def agenerate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        """Générer via le client HTTP asynchrone partagé"""
+        if not self.is_loaded():
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        kwargs = self._completion_kwargs(messages, config)
+
+        try:
+            client = self._async_client()
+
+            async def api_call():
+                return await client.chat.completions.create(**kwargs)
+
+            async def make_call():
+                if self._rate_limiter:
+                    return await self._rate_limiter.aexecute_with_backoff(
+                        api_call, key=self._rate_key
+                    )
+                return await api_call()
+
+            response = await self._hedged(make_call)
+            return GenerationResult(
+                text=(response.choices[0].message.content or "").strip(),
+                finish_reason=response.choices[0].finish_reason,
+                tokens_generated=response.usage.completion_tokens,
+                prompt_tokens=response.usage.prompt_tokens,
+                total_tokens=response.usage.total_tokens,
+                citations=getattr(response, "citations", None) or None,
+            )
+        except Exception as e:
+            return self._error_result(e)
+
+
+class PerplexityInterface(_AsyncChatCompletionsMixin, ModelInterface):
     """
     Interface pour Perplexity API (compatible OpenAI)
 
@@ -251,6 +586,7 @@ class PerplexityInterface(ModelInterface):
         self.model_name = None
         self._loaded: bool = False
         self._rate_limiter = None
+        self._rate_key = "default"
 
     def load(self, model_path: str, config: Dict) -> bool:
         """
@@ -274,14 +610,20 @@ class PerplexityInterface(ModelInterface):
                 return False
 
             # Initialiser le client OpenAI avec base URL Perplexity
-            self.client = OpenAI(api_key=api_key, base_url="https://api.perplexity.ai")
+            base_url = config.get("base_url", "https://api.perplexity.ai")
+            self.client = OpenAI(api_key=api_key, base_url=base_url)
+            self._configure_async(config)
 
             # Initialize rate limiter for API protection
-            from runtime.utils.rate_limiter import get_rate_limiter
+            from runtime.utils.rate_limiter import api_key_fingerprint, get_rate_limiter
 
             self._rate_limiter = get_rate_limiter(
-                requests_per_minute=10, requests_per_hour=500  # Conservative limit
+                requests_per_minute=10,
+                requests_per_hour=500,  # Conservative limit
+                name="perplexity",
+                shared_state_dir=config.get("rate_limit_state_dir"),
             )
+            self._rate_key = api_key_fingerprint(api_key)
 
             # Sauvegarder le nom du modèle
             self.model_name = model_path
@@ -323,17 +665,12 @@ class PerplexityInterface(ModelInterface):
             # Appel API Perplexity with rate limiting
             def api_call():
                 return self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    temperature=config.temperature,
-                    top_p=config.top_p,
-                    max_tokens=config.max_tokens,
-                    # Perplexity ne supporte pas tous les paramètres
+                    **self._completion_kwargs(messages, config)
                 )
 
             # Use rate limiter if available, otherwise direct call
             if self._rate_limiter:
-                response = self._rate_limiter.execute_with_backoff(api_call)
+                response = self._rate_limiter.execute_with_backoff(api_call, key=self._rate_key)
             else:
                 response = api_call()
 
@@ -361,39 +698,78 @@ class PerplexityInterface(ModelInterface):
             )
 
         except Exception as e:
-            # Sanitize error message to prevent leaking sensitive information
-            error_str = str(e).lower()
+            return self._error_result(e)
+
+    def generate_stream(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> Iterator[StreamChunk]:
+        """Générer du texte en streaming avec Perplexity API"""
+        if not self.is_loaded():
+            raise RuntimeError("Perplexity client not loaded. Call load() first.")
 
-            # Check for sensitive patterns and provide safe error messages
-            # Order matters: check more specific patterns first
-            if "rate" in error_str and "limit" in error_str:
-                safe_error = "Rate limit exceeded. Please wait before retrying."
-                print("⚠ Perplexity generation failed: Rate limit exceeded")
-            elif "timeout" in error_str or "connection" in error_str:
-                safe_error = "Connection error. Please check your network."
-                print("⚠ Perplexity generation failed: Connection error")
-            elif "model" in error_str or "not found" in error_str:
-                safe_error = "Model not available. Please check the model name."
-                print("⚠ Perplexity generation failed: Model error")
-            elif any(
-                sensitive in error_str for sensitive in ["api", "key", "token", "secret", "auth"]
-            ):
-                safe_error = (
-                    "Authentication or authorization error. Please verify your API credentials."
+        try:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            def api_call():
+                return self.client.chat.completions.create(
+                    **self._completion_kwargs(messages, config), stream=True
                 )
-                print("⚠ Perplexity generation failed: Authentication error")
+
+            if self._rate_limiter:
+                stream = self._rate_limiter.execute_with_backoff(api_call, key=self._rate_key)
             else:
-                # Generic error without exposing details
-                safe_error = "API request failed. Please try again."
-                print("⚠ Perplexity generation failed: Request error")
+                stream = api_call()
 
-            return GenerationResult(
-                text=f"[Error] {safe_error}",
-                finish_reason="error",
-                tokens_generated=0,
-                prompt_tokens=0,
-                total_tokens=0,
-            )
+            yield from _stream_chat_completion(stream)
+
+        except Exception as e:
+            yield StreamChunk(text="", result=self._error_result(e))
+
+    def _completion_kwargs(self, messages: List[Dict], config: GenerationConfig) -> Dict:
+        """Paramètres chat.completions (Perplexity ne supporte pas tous les paramètres)"""
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": config.temperature,
+            "top_p": config.top_p,
+            "max_tokens": config.max_tokens,
+        }
+
+    def _error_result(self, e: Exception) -> GenerationResult:
+        """Résultat d'erreur sans information sensible"""
+        return GenerationResult(
+            text=f"[Error] {self._safe_error_message(e)}",
+            finish_reason="error",
+            tokens_generated=0,
+            prompt_tokens=0,
+            total_tokens=0,
+        )
+
+    @staticmethod
+    def _safe_error_message(e: Exception) -> str:
+        """Message d'erreur sans information sensible (clé API, etc.)"""
+        error_str = str(e).lower()
+
+        # Check for sensitive patterns and provide safe error messages
+        # Order matters: check more specific patterns first
+        if "rate" in error_str and "limit" in error_str:
+            print("⚠ Perplexity generation failed: Rate limit exceeded")
+            return "Rate limit exceeded. Please wait before retrying."
+        if "timeout" in error_str or "connection" in error_str:
+            print("⚠ Perplexity generation failed: Connection error")
+            return "Connection error. Please check your network."
+        if "model" in error_str or "not found" in error_str:
+            print("⚠ Perplexity generation failed: Model error")
+            return "Model not available. Please check the model name."
+        if any(sensitive in error_str for sensitive in ["api", "key", "token", "secret", "auth"]):
+            print("⚠ Perplexity generation failed: Authentication error")
+            return "Authentication or authorization error. Please verify your API credentials."
+        # Generic error without exposing details
+        print("⚠ Perplexity generation failed: Request error")
+        return "API request failed. Please try again."
 
     def unload(self):
         """Décharger le client (cleanup)"""
@@ -407,7 +783,7 @@ class PerplexityInterface(ModelInterface):
         return self._loaded
 
 
-class OpenAIInterface(ModelInterface):
+class OpenAIInterface(_AsyncChatCompletionsMixin, ModelInterface):
     """
     Interface pour OpenAI API
 
@@ -427,6 +803,7 @@ class OpenAIInterface(ModelInterface):
         self.model_name = None
         self._loaded: bool = False
         self._rate_limiter = None
+        self._rate_key = "default"
 
     def load(self, model_path: str, config: Dict) -> bool:
         """
@@ -449,15 +826,23 @@ class OpenAIInterface(ModelInterface):
                 print("✗ OPENAI_API_KEY not found in environment or config")
                 return False
 
-            # Initialiser le client OpenAI
-            self.client = OpenAI(api_key=api_key)
+            # Initialiser le client OpenAI (base_url configurable: proxy, serveur compatible)
+            if config.get("base_url"):
+                self.client = OpenAI(api_key=api_key, base_url=config["base_url"])
+            else:
+                self.client = OpenAI(api_key=api_key)
+            self._configure_async(config)
 
             # Initialize rate limiter for API protection
-            from runtime.utils.rate_limiter import get_rate_limiter
+            from runtime.utils.rate_limiter import api_key_fingerprint, get_rate_limiter
 
             self._rate_limiter = get_rate_limiter(
-                requests_per_minute=60, requests_per_hour=3000  # OpenAI has higher limits
+                requests_per_minute=60,
+                requests_per_hour=3000,  # OpenAI has higher limits
+                name="openai",
+                shared_state_dir=config.get("rate_limit_state_dir"),
             )
+            self._rate_key = api_key_fingerprint(api_key)
 
             # Sauvegarder le nom du modèle
             self.model_name = model_path
@@ -497,18 +882,12 @@ class OpenAIInterface(ModelInterface):
             # Appel API OpenAI with rate limiting
             def api_call():
                 return self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    temperature=config.temperature,
-                    max_tokens=config.max_tokens,
-                    top_p=config.top_p,
-                    frequency_penalty=config.repetition_penalty,
-                    seed=config.seed if config.seed else None,
+                    **self._completion_kwargs(messages, config)
                 )
 
             # Use rate limiter if available, otherwise direct call
             if self._rate_limiter:
-                response = self._rate_limiter.execute_with_backoff(api_call)
+                response = self._rate_limiter.execute_with_backoff(api_call, key=self._rate_key)
             else:
                 response = api_call()
 
@@ -533,13 +912,69 @@ class OpenAIInterface(ModelInterface):
             )
 
         except Exception as e:
-            print(f"⚠ OpenAI generation failed: {e}")
-            return GenerationResult(
-                text=f"[Error] Generation failed. Please check your configuration.",
-                finish_reason="error",
-                tokens_generated=0,
-                prompt_tokens=0,
-                total_tokens=0,
+            return self._error_result(e)
+
+    def _completion_kwargs(self, messages: List[Dict], config: GenerationConfig) -> Dict:
+        """Paramètres chat.completions"""
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "top_p": config.top_p,
+            "frequency_penalty": config.repetition_penalty,
+            "seed": config.seed if config.seed else None,
+        }
+
+    def _error_result(self, e: Exception) -> GenerationResult:
+        """Résultat d'erreur générique"""
+        print(f"⚠ OpenAI generation failed: {e}")
+        return GenerationResult(
+            text="[Error] Generation failed. Please check your configuration.",
+            finish_reason="error",
+            tokens_generated=0,
+            prompt_tokens=0,
+            total_tokens=0,
+        )
+
+    def generate_stream(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> Iterator[StreamChunk]:
+        """Générer du texte en streaming avec OpenAI"""
+        if not self.is_loaded():
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        try:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            def api_call():
+                return self.client.chat.completions.create(
+                    **self._completion_kwargs(messages, config),
+                    stream=True,
+                    stream_options={"include_usage": True},  # usage dans le dernier fragment
+                )
+
+            if self._rate_limiter:
+                stream = self._rate_limiter.execute_with_backoff(api_call, key=self._rate_key)
+            else:
+                stream = api_call()
+
+            yield from _stream_chat_completion(stream)
+
+        except Exception as e:
+            print(f"⚠ OpenAI streaming failed: {e}")
+            yield StreamChunk(
+                text="",
+                result=GenerationResult(
+                    text="[Error] Generation failed. Please check your configuration.",
+                    finish_reason="error",
+                    tokens_generated=0,
+                    prompt_tokens=0,
+                    total_tokens=0,
+                ),
             )
 
     def unload(self):
@@ -563,7 +998,7 @@ class ModelFactory:
         Créer une instance de modèle selon le backend
 
         Args:
-            backend: "llama.cpp", "perplexity", "openai", ou "vllm"
+            backend: "llama.cpp", "perplexity", "openai", "replay" ou "vllm"
 
         Returns:
             Instance de ModelInterface
@@ -574,12 +1009,17 @@ class ModelFactory:
             return PerplexityInterface()
         elif backend == "openai":
             return OpenAIInterface()
+        elif backend == "replay":
+            from runtime.model_replay import ReplayInterface
+
+            return ReplayInterface()
         elif backend == "vllm":
             # TODO: Implémenter VLLMInterface quand nécessaire
             raise NotImplementedError("vLLM backend not yet implemented")
         else:
             raise ValueError(
-                f"Unknown backend: {backend}. Supported: llama.cpp, perplexity, openai, vllm"
+                f"Unknown backend: {backend}. "
+                "Supported: llama.cpp, perplexity, openai, replay, vllm"
             )
 
 
@@ -595,9 +1035,41 @@ def get_model() -> ModelInterface:
 
 
 def init_model(backend: str, model_path: str, config: Dict) -> ModelInterface:
-    """Initialiser le modèle global"""
+    """
+    Initialiser le modèle global
+
+    Pour llama.cpp, le modèle est servi par un ordonnanceur d'inférence
+    (``config["replicas"]`` instances, 1 par défaut) afin qu'aucune instance
+    ``Llama`` ne soit appelée par deux threads à la fois.
+
+    Si ``config["record_path"]`` est défini, chaque génération est enregistrée
+    dans ce fichier pour être rejouée par le backend ``replay``.
+    """
     global _model_instance
-    _model_instance = ModelFactory.create(backend)
+    from runtime.inference_scheduler import ScheduledModel
+
+    if isinstance(_model_instance, ScheduledModel) and _model_instance.scheduler is not None:
+        _model_instance.scheduler.shutdown(wait=False)
+
+    create: Callable[[str], ModelInterface] = ModelFactory.create
+    if config.get("record_path"):
+        from runtime.model_replay import ModelRecorder, RecordingInterface
+
+        recorder = ModelRecorder(config["record_path"])
+
+        def make_recording_model(name: str) -> ModelInterface:
+            return RecordingInterface(ModelFactory.create(name), recorder)
+
+        create = make_recording_model
+
+    if backend == "llama.cpp":
+        replicas = max(1, int(config.get("replicas", 1)))
+        _model_instance = ScheduledModel(
+            [create(backend) for _ in range(replicas)],
+            weights=config.get("priority_weights"),
+        )
+    else:
+        _model_instance = create(backend)
 
     # Charger le modèle
     success = _model_instance.load(model_path, config)
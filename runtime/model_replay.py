@@ -0,0 +1,276 @@
+"""
+Enregistrement et rejeu des générations du modèle
+
+Mesurer le coût propre du framework (boucle agent, planificateur,
+middlewares) exige un modèle sans réseau ni GPU, mais dont les réponses sont
+réalistes. Pendant une exécution réelle, RecordingInterface enregistre chaque
+génération (empreinte du prompt -> texte, tool_calls, tokens, latence) dans
+un fichier compact; ReplayInterface (backend ``replay``) rejoue ensuite ces
+générations, avec une latence simulée optionnelle.
+
+Format: JSON-lignes (compressé gzip si le nom se termine par ``.gz``); une
+première ligne d'en-tête puis une ligne par génération. Les prompts ne sont
+pas stockés, seulement leur empreinte SHA-256 (prompt système + prompt). Un
+même prompt enregistré plusieurs fois est rejoué dans l'ordre d'origine, en
+boucle.
+
+Latence simulée (``replay_latency``):
+- ``none``: aucune (défaut)
+- ``recorded``: latence enregistrée de chaque génération
+- ``empirical``: tirage parmi toutes les latences enregistrées
+- ``fixed:<ms>``, ``normal:<moyenne_ms>:<écart_type_ms>``,
+  ``lognormal:<médiane_ms>:<sigma>``: distributions paramétriques
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional
+
+from runtime.model_interface import (
+    GenerationConfig,
+    GenerationResult,
+    ModelInterface,
+    StreamChunk,
+)
+
+REPLAY_FORMAT_VERSION = 1
+LATENCY_MODES = ("none", "recorded", "empirical", "fixed", "normal", "lognormal")
+
+
+class ReplayMissError(RuntimeError):
+    """Aucune génération enregistrée pour ce prompt"""
+
+
+def prompt_key(prompt: str, system_prompt: Optional[str] = None) -> str:
+    """Empreinte d'un appel (prompt système + prompt)"""
+    payload = json.dumps([system_prompt or "", prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _open_text(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ModelRecorder:
+    """Fichier d'enregistrement partagé (thread-safe) entre les instances enregistrées"""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Chaque session d'enregistrement écrit un nouveau fichier
+        self._file = _open_text(self.path, "w")
+        self._file.write(json.dumps({"version": REPLAY_FORMAT_VERSION}) + "\n")
+        self._file.flush()
+        self.count = 0
+
+    def record(self, key: str, result: GenerationResult, latency_ms: float) -> None:
+        entry = {
+            "key": key,
+            "text": result.text,
+            "finish_reason": result.finish_reason,
+            "tokens_generated": result.tokens_generated,
+            "prompt_tokens": result.prompt_tokens,
+            "total_tokens": result.total_tokens,
+            "latency_ms": round(latency_ms, 3),
+        }
+        if result.tool_calls:
+            entry["tool_calls"] = result.tool_calls
+        if result.citations:
+            entry["citations"] = result.citations
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class RecordingInterface(ModelInterface):
+    """Backend réel dont chaque génération est enregistrée pour le rejeu"""
+
+    def __init__(self, model: ModelInterface, recorder: ModelRecorder) -> None:
+        self.model = model
+        self.recorder = recorder
+
+    def load(self, model_path: str, config: Dict) -> bool:
+        return self.model.load(model_path, config)
+
+    def generate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        started = time.perf_counter()
+        result = self.model.generate(prompt, config, system_prompt=system_prompt)
+        self._record(prompt, system_prompt, result, started)
+        return result
+
+    def generate_stream(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> Iterator[StreamChunk]:
+        started = time.perf_counter()
+        for chunk in self.model.generate_stream(prompt, config, system_prompt=system_prompt):
+            if chunk.result is not None:
+                self._record(prompt, system_prompt, chunk.result, started)
+            yield chunk
+
+    async def agenerate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        started = time.perf_counter()
+        result = await self.model.agenerate(prompt, config, system_prompt=system_prompt)
+        self._record(prompt, system_prompt, result, started)
+        return result
+
+    def _record(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        result: GenerationResult,
+        started: float,
+    ) -> None:
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.recorder.record(prompt_key(prompt, system_prompt), result, latency_ms)
+
+    def count_tokens(self, text: str) -> int:
+        return self.model.count_tokens(text)
+
+    def unload(self):
+        self.model.unload()
+        self.recorder.close()
+
+    def is_loaded(self) -> bool:
+        return self.model.is_loaded()
+
+
+class ReplayInterface(ModelInterface):
+    """
+    Backend ``replay``: rejoue les générations d'un fichier d'enregistrement
+
+    ``model_path`` est le fichier enregistré. Options de ``config``:
+    ``replay_latency`` (voir le module) et ``replay_seed`` (tirages de latence).
+    Un prompt absent de l'enregistrement lève ReplayMissError.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, List[Dict]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._latencies: List[float] = []
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+        self._latency_mode = "none"
+        self._latency_params: List[float] = []
+        self._loaded = False
+
+    def load(self, model_path: str, config: Dict) -> bool:
+        """Charger l'enregistrement ``model_path``"""
+        path = Path(model_path)
+        entries: Dict[str, List[Dict]] = {}
+        with _open_text(path, "r") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") != REPLAY_FORMAT_VERSION:
+                raise ValueError(f"Unsupported replay file {path}: {header}")
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries.setdefault(entry["key"], []).append(entry)
+
+        self._entries = entries
+        self._cursors = {}
+        self._latencies = [e["latency_ms"] for group in entries.values() for e in group]
+        self._latency_mode, self._latency_params = self._parse_latency(
+            config.get("replay_latency") or "none"
+        )
+        self._random = random.Random(config.get("replay_seed", 0))
+        self._loaded = True
+        print(f"✓ Replay model loaded from {path} ({len(self._latencies)} generations)")
+        return True
+
+    @staticmethod
+    def _parse_latency(spec: str):
+        mode, *params = spec.split(":")
+        expected = {"fixed": 1, "normal": 2, "lognormal": 2}.get(mode, 0)
+        if mode not in LATENCY_MODES or len(params) != expected:
+            raise ValueError(
+                f"Invalid replay_latency '{spec}'. Expected one of: none, recorded, "
+                "empirical, fixed:<ms>, normal:<mean_ms>:<std_ms>, lognormal:<median_ms>:<sigma>"
+            )
+        return mode, [float(param) for param in params]
+
+    def _next_entry(self, prompt: str, system_prompt: Optional[str]) -> Dict:
+        if not self._loaded:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        key = prompt_key(prompt, system_prompt)
+        group = self._entries.get(key)
+        if not group:
+            raise ReplayMissError(f"No recorded generation for prompt {key}")
+        with self._lock:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+        return group[cursor % len(group)]
+
+    def _latency_seconds(self, entry: Dict) -> float:
+        mode, params = self._latency_mode, self._latency_params
+        with self._lock:
+            if mode == "recorded":
+                latency_ms = entry["latency_ms"]
+            elif mode == "empirical" and self._latencies:
+                latency_ms = self._random.choice(self._latencies)
+            elif mode == "fixed":
+                latency_ms = params[0]
+            elif mode == "normal":
+                latency_ms = self._random.gauss(params[0], params[1])
+            elif mode == "lognormal":
+                latency_ms = params[0] * self._random.lognormvariate(0.0, params[1])
+            else:
+                latency_ms = 0.0
+        return max(0.0, latency_ms) / 1000
+
+    @staticmethod
+    def _to_result(entry: Dict) -> GenerationResult:
+        return GenerationResult(
+            text=entry["text"],
+            finish_reason=entry["finish_reason"],
+            tokens_generated=entry["tokens_generated"],
+            prompt_tokens=entry["prompt_tokens"],
+            total_tokens=entry["total_tokens"],
+            tool_calls=entry.get("tool_calls"),
+            citations=entry.get("citations"),
+        )
+
+    def generate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        entry = self._next_entry(prompt, system_prompt)
+        delay = self._latency_seconds(entry)
+        if delay:
+            time.sleep(delay)
+        return self._to_result(entry)
+
+    async def agenerate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        entry = self._next_entry(prompt, system_prompt)
+        delay = self._latency_seconds(entry)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._to_result(entry)
+
+    def unload(self):
+        self._entries = {}
+        self._cursors = {}
+        self._loaded = False
+
+    def is_loaded(self) -> bool:
+        return self._loaded
@@ -0,0 +1,161 @@
+"""
+Cache d'états llama.cpp par préfixe de prompt
+
+Chaque itération de la boucle de raisonnement resoumet le même long préfixe
+(prompt système avec le catalogue d'outils, puis l'historique). Sans cache,
+llama.cpp réévalue tous ces tokens à chaque appel. Ce module conserve en RAM,
+dans un LRU borné (nombre d'états et octets), les états llama (KV cache +
+tokens évalués):
+
+- après l'évaluation du prompt système
+- après chaque génération (prompt + complétion)
+
+Avant une génération, l'état qui partage le plus long préfixe de tokens avec
+le nouveau prompt est restauré; llama.cpp n'évalue alors que le suffixe.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from runtime.metrics import get_agent_metrics
+
+TokenKey = Tuple[int, ...]
+
+DEFAULT_MAX_STATES = 4
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def common_prefix_length(a: Sequence[int], b: Sequence[int]) -> int:
+    """Nombre de tokens initiaux identiques entre deux séquences"""
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+class PrefixStateCache:
+    """
+    LRU d'états llama (``Llama.save_state()``) indexés par leurs tokens
+
+    Thread-safe. Les états sont opaques: seuls ``input_ids``, ``n_tokens`` et
+    ``llama_state_size`` sont lus.
+    """
+
+    def __init__(
+        self, max_states: int = DEFAULT_MAX_STATES, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        if max_states < 1:
+            raise ValueError("max_states must be >= 1")
+        self.max_states = max_states
+        self.max_bytes = max_bytes
+
+        self._states: "OrderedDict[TokenKey, object]" = OrderedDict()
+        self._sizes: Dict[TokenKey, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        # Statistiques
+        self.hits = 0
+        self.misses = 0
+        self.tokens_reused = 0
+        self.seconds_saved = 0.0
+        self._seconds_per_token: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @staticmethod
+    def _key(state) -> TokenKey:
+        ids = state.input_ids[: state.n_tokens]
+        return tuple(int(t) for t in ids)
+
+    def lookup(self, tokens: Sequence[int]) -> Tuple[Optional[object], int]:
+        """
+        Trouver l'état partageant le plus long préfixe avec ``tokens``
+
+        Returns:
+            (état, longueur du préfixe commun), ou (None, 0)
+        """
+        with self._lock:
+            best_key: Optional[TokenKey] = None
+            best_length = 0
+            for key in self._states:
+                length = common_prefix_length(key, tokens)
+                if length > best_length:
+                    best_key, best_length = key, length
+            if best_key is None:
+                return None, 0
+            self._states.move_to_end(best_key)
+            return self._states[best_key], best_length
+
+    def store(self, state) -> None:
+        """Ajouter un état (remplace celui de mêmes tokens), puis évincer le LRU"""
+        key = self._key(state)
+        if not key:
+            return
+        size = int(getattr(state, "llama_state_size", 0) or 0)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._states:
+                self._total_bytes -= self._sizes[key]
+            self._states[key] = state
+            self._states.move_to_end(key)
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            while len(self._states) > self.max_states or self._total_bytes > self.max_bytes:
+                evicted, _ = self._states.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(evicted)
+
+    def observe_eval(self, n_tokens: int, seconds: float) -> None:
+        """Mesurer le coût d'évaluation par token (moyenne glissante)"""
+        if n_tokens <= 0:
+            return
+        per_token = seconds / n_tokens
+        with self._lock:
+            if self._seconds_per_token is None:
+                self._seconds_per_token = per_token
+            else:
+                self._seconds_per_token = 0.8 * self._seconds_per_token + 0.2 * per_token
+
+    def record_lookup(self, tokens_reused: int) -> None:
+        """Comptabiliser un accès (hit si au moins un token est réutilisé)"""
+        seconds = tokens_reused * (self._seconds_per_token or 0.0)
+        with self._lock:
+            if tokens_reused > 0:
+                self.hits += 1
+                self.tokens_reused += tokens_reused
+                self.seconds_saved += seconds
+            else:
+                self.misses += 1
+        get_agent_metrics().record_prefix_cache_lookup(
+            hit=tokens_reused > 0, tokens_reused=tokens_reused, seconds_saved=seconds
+        )
+
+    def clear(self) -> None:
+        """Vider le cache (les statistiques sont conservées)"""
+        with self._lock:
+            self._states.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Taux de hit, tokens réutilisés et temps d'évaluation économisé estimé"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "states": len(self._states),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "tokens_reused": self.tokens_reused,
+                "prompt_eval_seconds_saved": self.seconds_saved,
+            }
@@ -0,0 +1,110 @@
+"""
+Profileur par échantillonnage (piles de tous les threads)
+
+Un thread échantillonne ``sys._current_frames()`` à intervalle fixe pendant
+la durée demandée et agrège les piles au format « collapsed stacks »
+(une ligne ``thread;fonction (fichier:ligne);... nombre`` par pile), lu
+directement par flamegraph.pl, speedscope ou inferno. Aucune dépendance,
+aucun hook de trace: le processus profilé n'est ralenti que par la copie
+des piles à chaque échantillon.
+
+Utilisé par l'endpoint d'administration GET /debug/profile?seconds=N.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+class ProfilerBusyError(RuntimeError):
+    """Un profilage est déjà en cours"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame, thread_name: str) -> str:
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    # Racine d'abord; ";" sépare les cadres dans le format collapsed
+    return ";".join(label.replace(";", ":") for label in reversed(labels))
+
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage des piles Python
+
+    Args:
+        interval: Intervalle d'échantillonnage (secondes)
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def sample(self, seconds: float) -> Dict[str, int]:
+        """
+        Échantillonner les piles pendant ``seconds`` (thread appelant exclu)
+
+        Returns:
+            Nombre d'échantillons par pile (format collapsed)
+
+        Raises:
+            ProfilerBusyError: si un autre profilage est en cours
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            stacks: Counter = Counter()
+            own_id = threading.get_ident()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    stacks[_collapse(frame, names.get(thread_id, f"thread-{thread_id}"))] += 1
+                time.sleep(self.interval)
+            return dict(stacks)
+        finally:
+            self._lock.release()
+
+    def profile(self, seconds: float) -> str:
+        """Profil collapsed-stack de ``seconds`` secondes"""
+        return format_collapsed(self.sample(seconds))
+
+
+def format_collapsed(stacks: Dict[str, int]) -> str:
+    """Lignes ``pile nombre``, piles les plus fréquentes d'abord"""
+    ordered = sorted(stacks.items(), key=lambda item: (-item[1], item[0]))
+    return "".join(f"{stack} {count}\n" for stack, count in ordered)
+
+
+# Instance globale
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """Récupérer le profileur global (intervalle ``profiling.sample_interval_ms``)"""
+    global _profiler
+    if _profiler is None:
+        from runtime.config import get_config
+
+        profiling = getattr(get_config(), "profiling", None)
+        interval_ms = profiling.sample_interval_ms if profiling else 5.0
+        _profiler = SamplingProfiler(interval=interval_ms / 1000)
+    return _profiler
+
+
+def reset_profiler() -> None:
+    """Réinitialiser le profileur global (principalement pour les tests)"""
+    global _profiler
+    _profiler = None
@@ -8,18 +8,25 @@ from dotenv import load_dotenv
 
 load_dotenv()  # Load .env file at startup
 
-from fastapi import FastAPI, HTTPException, Path as FastAPIPath, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Path as FastAPIPath, BackgroundTasks, Header, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import AsyncIterator, Callable, List, Optional
 from datetime import datetime
 from pathlib import Path
 import yaml
 import traceback
 import re
 import uuid
+import asyncio
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
 from .config import get_config
-from .agent import get_agent
+from .agent import get_agent, get_loaded_agent
 from memory.episodic import get_messages, get_connection
 from memory.analytics import (
     add_interaction_log,
@@ -28,6 +35,9 @@ from memory.analytics import (
 )
 from .middleware.logging import get_logger
 from .middleware.worm import get_worm_logger
+from .metrics import get_agent_metrics
+from .utils.worker_pool import get_worker_pool, PoolOverloadedError, PoolTimeoutError
+from .profiler import ProfilerBusyError, get_profiler
 
 # Import Prometheus metrics (optionnel)
 try:
@@ -49,6 +59,15 @@ except ImportError:
         return {}
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Cycle de vie de l'application: fermer les clients HTTP mutualisés à l'arrêt"""
+    yield
+    from .utils.http_pool import aclose_http_clients  # httpx hors du démarrage à froid
+
+    await aclose_http_clients()
+
+
 app = FastAPI(
     title="FilAgent API",
     version="0.1.0",
@@ -56,6 +75,7 @@ app = FastAPI(
     openapi_url="/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configuration
@@ -99,6 +119,7 @@ class ChatRequest(BaseModel):
     model: Optional[str] = Field(None, max_length=256)
     temperature: Optional[float] = Field(None, ge=0.0, le=2.0)
     max_tokens: Optional[int] = Field(None, ge=1, le=10000)
+    stream: bool = False  # Server-Sent Events (chat.completion.chunk)
 
     @field_validator("conversation_id")
     @classmethod
@@ -193,9 +214,10 @@ async def health():
         "logging": False,
     }
 
-    # Vérifier le modèle
+    # Vérifier le modèle sans le charger: le chargement bloquerait la boucle
+    # d'événements, il a lieu au premier /chat sur le pool de workers
     try:
-        agent = get_agent()
+        agent = get_loaded_agent()
         model = getattr(agent, "model", None)
         components["model"] = bool(model and getattr(model, "is_loaded", lambda: False)())
     except Exception:
@@ -228,22 +250,200 @@ async def health():
     }
 
 
-@app.post("/chat")
-async def chat(request: ChatRequest):
+STUB_RESPONSE = "[stub] Agent indisponible. Réponse factice pour tests de contrat."
+
+
+def _run_agent_chat(
+    message: str,
+    conversation_id: str,
+    task_id: Optional[str],
+    on_token: Optional[Callable[[str], None]] = None,
+) -> Optional[dict]:
     """
-    Endpoint principal pour les conversations avec l'agent
+    Exécuter un tour de conversation (bloquant) sur un thread du pool.
+
+    Returns:
+        Résultat de agent.chat(), ou None si l'agent est indisponible
     """
+    # Récupérer l'agent (mode repli si indisponible); le premier appel charge le modèle
     try:
-        # Récupérer l'agent (mode repli si indisponible)
-        agent = None
+        agent = get_agent()
+    except Exception:
+        return None
+    if agent is None:
+        return None
+    if on_token is not None:
+        return agent.chat(
+            message=message, conversation_id=conversation_id, task_id=task_id, on_token=on_token
+        )
+    return agent.chat(message=message, conversation_id=conversation_id, task_id=task_id)
+
+
+def _resolve_result(result: Optional[dict]) -> tuple:
+    """Extraire (contenu, usage) du résultat de l'agent, avec repli stub."""
+    if result is None:
+        # Mode stub pour conserver la conformité API en environnement sans modèle
+        return STUB_RESPONSE, {"prompt_tokens": 0, "completion_tokens": 1, "total_tokens": 1}
+    usage = result.get("usage", {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0})
+    return result["response"], {
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0),
+    }
+
+
+def _trace_headers() -> dict:
+    """Header X-Trace-ID via OpenTelemetry, sinon via le logger."""
+    headers = {}
+
+    # Try OpenTelemetry trace context first
+    if TELEMETRY_AVAILABLE:
+        trace_ctx = get_trace_context()
+        if trace_ctx.get("trace_id"):
+            headers["X-Trace-ID"] = trace_ctx["trace_id"]
+
+    # Fallback to logger trace_id
+    if not headers:
         try:
-            agent = get_agent()
+            logger = get_logger()
+            trace_id = getattr(logger, "current_trace_id", None)
+            if trace_id:
+                headers["X-Trace-ID"] = trace_id
         except Exception:
-            agent = None
+            pass
+    return headers
+
+
+def _sse_event(payload) -> str:
+    """Formater un événement Server-Sent Events."""
+    data = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+    return f"data: {data}\n\n"
+
+
+class StreamCancelledError(Exception):
+    """Flux SSE abandonné (client déconnecté ou délai dépassé): la génération s'arrête."""
+
+
+def _start_chat_stream(message: str, conversation_id: str, task_id: Optional[str]):
+    """
+    Lancer l'agent en streaming sur le pool et renvoyer la réponse SSE.
+
+    L'admission se fait avant l'envoi des en-têtes: une surcharge lève
+    PoolOverloadedError et reste une réponse 429 classique. Si le flux est
+    abandonné (déconnexion du client, délai dépassé), le prochain token lève
+    StreamCancelledError dans le worker, ce qui interrompt la génération et
+    libère la place dans le pool.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def on_token(text: str) -> None:
+        if cancelled.is_set():
+            raise StreamCancelledError(f"Stream {conversation_id} abandoned")
+        loop.call_soon_threadsafe(queue.put_nowait, text)
+
+    def on_done(done: asyncio.Future) -> None:
+        # Un flux abandonné ne lit jamais le résultat: marquer l'exception comme consommée
+        if not done.cancelled():
+            done.exception()
+        # Appelé après les tokens déjà planifiés par le worker (ordre FIFO de la boucle)
+        queue.put_nowait(None)
+
+    pool = get_worker_pool()
+    pool_future = pool.submit(_run_agent_chat, message, conversation_id, task_id, on_token)
+    future = asyncio.wrap_future(pool_future)
+    future.add_done_callback(on_done)
+
+    model_name = getattr(getattr(config, "model", None), "name", "unknown")
+    created = int(datetime.now().timestamp())
+
+    def chunk(delta: dict, finish_reason: Optional[str] = None, **extra) -> dict:
+        return {
+            "id": conversation_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model_name,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            "conversation_id": conversation_id,
+            **extra,
+        }
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in stream_events():
+                yield event
+        finally:
+            # Fin normale, délai dépassé ou générateur fermé par une déconnexion:
+            # arrêter l'agent (ou l'appel encore en file) pour libérer le pool
+            cancelled.set()
+            pool_future.cancel()
+
+    async def stream_events() -> AsyncIterator[str]:
+        timeout = pool.default_timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        streamed = False
+        yield _sse_event(chunk({"role": "assistant"}))
+
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                text = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                get_agent_metrics().record_request_rejected(reason="timeout")
+                yield _sse_event(
+                    chunk(
+                        {"content": f"[timeout] Agent did not respond within {timeout:g}s"},
+                        finish_reason="error",
+                    )
+                )
+                yield _sse_event("[DONE]")
+                return
+            if text is None:
+                break
+            streamed = True
+            yield _sse_event(chunk({"content": text}))
+
+        try:
+            response_content, usage = _resolve_result(future.result())
+            finish_reason = "stop"
+        except Exception:
+            print("Exception in chat stream:")
+            print(traceback.format_exc())
+            response_content, usage = "[stub-error] An internal error has occurred.", {
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0,
+            }
+            finish_reason = "error"
+            streamed = False
+
+        # HTN, cache ou mode stub: aucune génération incrémentale, envoyer la réponse entière
+        if not streamed:
+            yield _sse_event(chunk({"content": response_content}))
+        yield _sse_event(chunk({}, finish_reason=finish_reason, usage=usage))
+        yield _sse_event("[DONE]")
 
-        # Générer un conversation_id unique avec UUID (évite les collisions)
-        conversation_id = request.conversation_id or f"conv-{uuid.uuid4().hex[:16]}"
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **_trace_headers()}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
 
+
+@app.post("/chat")
+async def chat(request: ChatRequest):
+    """
+    Endpoint principal pour les conversations avec l'agent
+
+    L'exécution de l'agent (bloquante) est déléguée au pool de workers borné:
+    la boucle d'événements reste libre pour /health et /metrics. Une surcharge
+    est rejetée explicitement (429) et un dépassement de délai renvoie 504.
+
+    Avec ``stream: true``, la réponse est un flux SSE de ``chat.completion.chunk``
+    (format OpenAI) terminé par ``data: [DONE]``.
+    """
+    # Générer un conversation_id unique avec UUID (évite les collisions)
+    conversation_id = request.conversation_id or f"conv-{uuid.uuid4().hex[:16]}"
+
+    try:
         # Trouver le dernier message utilisateur
         user_messages = [msg for msg in request.messages if msg.role == "user"]
         if not user_messages:
@@ -251,18 +451,13 @@ async def chat(request: ChatRequest):
 
         last_user_message = user_messages[-1].content
 
-        if agent is not None:
-            result = agent.chat(
-                message=last_user_message, conversation_id=conversation_id, task_id=request.task_id
-            )
-            response_content = result["response"]
-            usage = result.get(
-                "usage", {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-            )
-        else:
-            # Mode stub pour conserver la conformité API en environnement sans modèle
-            response_content = "[stub] Agent indisponible. Réponse factice pour tests de contrat."
-            usage = {"prompt_tokens": 0, "completion_tokens": 1, "total_tokens": 1}
+        if request.stream:
+            return _start_chat_stream(last_user_message, conversation_id, request.task_id)
+
+        result = await get_worker_pool().run(
+            _run_agent_chat, last_user_message, conversation_id, request.task_id
+        )
+        response_content, usage = _resolve_result(result)
 
         response = {
             "id": conversation_id,
@@ -276,33 +471,25 @@ async def chat(request: ChatRequest):
                     "finish_reason": "stop",
                 }
             ],
-            "usage": {
-                "prompt_tokens": usage.get("prompt_tokens", 0),
-                "completion_tokens": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0),
-            },
+            "usage": usage,
             "conversation_id": conversation_id,
         }
         # Ajouter un header X-Trace-ID si disponible via logger ou OpenTelemetry
-        headers = {}
-
-        # Try OpenTelemetry trace context first
-        if TELEMETRY_AVAILABLE:
-            trace_ctx = get_trace_context()
-            if trace_ctx.get("trace_id"):
-                headers["X-Trace-ID"] = trace_ctx["trace_id"]
-
-        # Fallback to logger trace_id
-        if not headers:
-            try:
-                logger = get_logger()
-                trace_id = getattr(logger, "current_trace_id", None)
-                if trace_id:
-                    headers["X-Trace-ID"] = trace_id
-            except Exception:
-                pass
-
-        return JSONResponse(status_code=200, content=response, headers=headers)
+        return JSONResponse(status_code=200, content=response, headers=_trace_headers())
+    except PoolOverloadedError as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e), "conversation_id": conversation_id},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except PoolTimeoutError as e:
+        return JSONResponse(
+            status_code=504,
+            content={
+                "detail": f"Agent did not respond within {e.timeout:g}s",
+                "conversation_id": conversation_id,
+            },
+        )
     except Exception:
         # Dernier repli : ne pas exposer les détails d'exception à l'utilisateur; journaliser l'erreur serveur uniquement
         logger = None
@@ -466,6 +653,55 @@ async def metrics():
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
+def _require_admin(authorization: Optional[str]) -> None:
+    """
+    Vérifier le jeton d'administration (Authorization: Bearer <jeton>)
+
+    Le jeton est lu dans la variable d'environnement ``profiling.admin_token_env``;
+    sans jeton configuré, les endpoints d'administration sont désactivés.
+    """
+    token = os.getenv(config.profiling.admin_token_env)
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, provided = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(provided.encode(), token.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Admin token required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@app.get("/debug/profile")
+async def debug_profile(
+    seconds: float = Query(10.0, gt=0, description="Durée du profilage (secondes)"),
+    authorization: Optional[str] = Header(None),
+):
+    """
+    Profiler le serveur par échantillonnage pendant ``seconds`` secondes (admin)
+
+    Returns:
+        Piles agrégées au format collapsed (flamegraph.pl, speedscope, inferno)
+    """
+    _require_admin(authorization)
+    if seconds > config.profiling.max_profile_seconds:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be <= {config.profiling.max_profile_seconds}",
+        )
+
+    try:
+        collapsed = await asyncio.to_thread(get_profiler().profile, seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    filename = f"filagent-profile-{datetime.now().strftime('%Y%m%dT%H%M%S')}.collapsed"
+    return PlainTextResponse(
+        content=collapsed,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,143 @@
+"""
+Chronométrage des étapes de la boucle agent
+
+Chaque étape d'Agent.chat (recherche dans le cache, routage, mémoire
+épisodique, construction du contexte, génération, outils, logs, provenance,
+signature des DR, conformité, étapes HTN) est délimitée par::
+
+    with self.stage_timer.stage("generation"):
+        ...
+
+Activé (``profiling.stage_timers`` dans config/agent.yaml), une étape crée
+un span OpenTelemetry ``agent.<étape>`` (enfant du span courant) et alimente
+l'histogramme Prometheus ``filagent_agent_stage_seconds{stage=...}``.
+Désactivé, ``stage()`` renvoie un gestionnaire de contexte vide partagé:
+le coût se limite à un appel de méthode.
+"""
+
+import time
+from contextlib import nullcontext
+from typing import Dict, Optional, Union
+
+STAGES = (
+    "cache_lookup",
+    "cache_store",
+    "routing",
+    "episodic_read",
+    "episodic_write",
+    "context_build",
+    "system_prompt",
+    "generation",
+    "tool_parsing",
+    "tool_execution",
+    "logging",
+    "provenance",
+    "dr_signing",
+    "compliance_audit",
+    "planning",
+    "htn_execution",
+    "verification",
+    "response_format",
+)
+
+StageAttribute = Union[str, int, float, bool]
+
+# Gestionnaire vide réutilisable (nullcontext est réentrant)
+_DISABLED = nullcontext()
+
+
+class _Stage:
+    """Span et mesure d'une étape en cours"""
+
+    __slots__ = ("_timer", "_name", "_span", "_started")
+
+    def __init__(self, timer: "StageTimer", name: str, attributes: Dict[str, StageAttribute]):
+        self._timer = timer
+        self._name = name
+        self._span = timer.tracer.start_as_current_span(
+            f"agent.{name}", attributes={"agent.stage": name, **attributes}
+        )
+        self._started = 0.0
+
+    def __enter__(self):
+        span = self._span.__enter__()
+        self._started = time.perf_counter()
+        return span
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._started
+        if self._timer.metrics is not None:
+            self._timer.metrics.record_stage_duration(self._name, duration)
+        return self._span.__exit__(exc_type, exc, tb)
+
+
+class StageTimer:
+    """
+    Fabrique de chronomètres d'étapes (spans OTel + histogramme Prometheus)
+
+    Args:
+        enabled: Instrumentation active
+        tracer: Tracer OpenTelemetry (``get_tracer("filagent.agent")`` par défaut)
+        metrics: AgentMetrics (``get_agent_metrics()`` par défaut)
+    """
+
+    def __init__(self, enabled: bool = False, tracer=None, metrics=None):
+        self.enabled = enabled
+        self.tracer = tracer
+        self.metrics = metrics
+        if enabled:
+            self._bind_defaults()
+
+    def _bind_defaults(self) -> None:
+        if self.tracer is None:
+            try:
+                from runtime.telemetry import get_tracer
+
+                self.tracer = get_tracer("filagent.agent")
+            except ImportError:
+                self.tracer = None
+        if self.tracer is None:
+            from runtime.telemetry import NoOpTracer
+
+            self.tracer = NoOpTracer()
+        if self.metrics is None:
+            try:
+                from runtime.metrics import get_agent_metrics
+
+                self.metrics = get_agent_metrics()
+            except ImportError:
+                self.metrics = None
+
+    def stage(self, name: str, **attributes: StageAttribute):
+        """Gestionnaire de contexte délimitant l'étape ``name``"""
+        if not self.enabled:
+            return _DISABLED
+        return _Stage(self, name, attributes)
+
+
+# Instance globale
+_stage_timer: Optional[StageTimer] = None
+
+
+def get_stage_timer() -> StageTimer:
+    """Récupérer le chronomètre global (activé selon ``profiling.stage_timers``)"""
+    global _stage_timer
+    if _stage_timer is None:
+        from runtime.config import get_config
+
+        profiling = getattr(get_config(), "profiling", None)
+        _stage_timer = StageTimer(enabled=bool(profiling and profiling.stage_timers))
+    return _stage_timer
+
+
+def init_stage_timer(enabled: bool = True, tracer=None, metrics=None) -> StageTimer:
+    """Initialiser le chronomètre global"""
+    global _stage_timer
+    _stage_timer = StageTimer(enabled=enabled, tracer=tracer, metrics=metrics)
+    return _stage_timer
+
+
+def reset_stage_timer() -> None:
+    """Réinitialiser le chronomètre global (principalement pour les tests)"""
+    global _stage_timer
+    _stage_timer = None
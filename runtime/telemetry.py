@@ -24,7 +24,9 @@ from pathlib import Path
 import yaml
 from pydantic import BaseModel, Field
 
-# OpenTelemetry imports with graceful degradation
+# OpenTelemetry imports with graceful degradation. Exporters (thrift, protobuf)
+# and the FastAPI instrumentation are imported when used: only the configured
+# exporter is loaded, and a missing optional exporter no longer disables tracing.
 try:
     from opentelemetry import trace
     from opentelemetry.sdk.trace import TracerProvider
@@ -34,11 +36,6 @@ try:
         SimpleSpanProcessor,
     )
     from opentelemetry.sdk.resources import Resource, SERVICE_NAME, SERVICE_VERSION
-    from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
-        OTLPSpanExporter as OTLPHTTPSpanExporter,
-    )
-    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
     OTEL_AVAILABLE = True
 except ImportError:
@@ -261,6 +258,8 @@ class TelemetryManager:
 
         try:
             if exporter_type == "jaeger":
+                from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+
                 jaeger_config = self._config.exporter.get("jaeger", {})
                 return JaegerExporter(
                     agent_host_name=jaeger_config.get("agent_host", "localhost"),
@@ -268,6 +267,10 @@ class TelemetryManager:
                 )
 
             elif exporter_type == "otlp_http":
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                    OTLPSpanExporter as OTLPHTTPSpanExporter,
+                )
+
                 otlp_config = self._config.exporter.get("otlp_http", {})
                 return OTLPHTTPSpanExporter(
                     endpoint=otlp_config.get("endpoint", "http://localhost:4318/v1/traces"),
@@ -282,6 +285,9 @@ class TelemetryManager:
                 print(f"⚠️ Unknown exporter type: {exporter_type}, using console")
                 return ConsoleSpanExporter()
 
+        except ImportError as e:
+            print(f"⚠️ {exporter_type} exporter not installed ({e}), spans not exported")
+            return None
         except Exception as e:
             print(f"❌ Failed to create {exporter_type} exporter: {e}")
             # Fallback to console exporter
@@ -321,6 +327,8 @@ class TelemetryManager:
             return
 
         try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
             FastAPIInstrumentor.instrument_app(app)
             print("✅ FastAPI instrumented with OpenTelemetry")
         except Exception as e:
@@ -18,12 +18,16 @@ Usage:
     prompt = loader.render('system_prompt', tools="...", semantic_context="...")
 """
 
+import itertools
 from pathlib import Path
 from typing import Optional, Dict, Any
 from functools import lru_cache
 
 from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, UndefinedError
 
+# Globally unique revisions: a new loader never reuses a previous loader's revision
+_revisions = itertools.count(1)
+
 
 class TemplateLoader:
     """
@@ -83,6 +87,9 @@ class TemplateLoader:
         # Cache for compiled templates
         self._template_cache: Dict[str, Template] = {}
 
+        # Bumped whenever templates may have changed (used by rendered-prompt caches)
+        self.revision = next(_revisions)
+
     def _list_available_versions(self) -> list:
         """List available template versions"""
         if not self.templates_dir.exists():
@@ -172,6 +179,7 @@ class TemplateLoader:
         Useful during development when templates are modified.
         """
         self._template_cache.clear()
+        self.revision = next(_revisions)
 
     def switch_version(self, version: str):
         """
@@ -203,6 +211,7 @@ class TemplateLoader:
             keep_trailing_newline=False,
         )
         self._template_cache.clear()
+        self.revision = next(_revisions)
 
 
 # Global singleton instance
@@ -0,0 +1,337 @@
+"""
+Comptage de tokens et budget de la fenêtre de contexte
+
+La boucle de raisonnement concatène prompt système (catalogue d'outils),
+contexte sémantique, historique et résultats d'outils. Limiter l'historique
+en nombre de messages ne protège pas de ``n_ctx``: une seule sortie d'outil
+volumineuse peut le dépasser, et des messages courts gaspillent la fenêtre.
+
+Ce module compte les tokens avec le tokenizer du backend (llama.cpp
+``tokenize``), ou, pour les backends distants, avec ``tiktoken`` s'il est
+installé et sinon une estimation locale de type BPE. Les comptes par
+message sont mémoïsés (un historique est recompté à chaque itération).
+
+``TokenBudgeter.allocate`` répartit ensuite la fenêtre disponible (contexte
+moins la réserve de génération) entre:
+
+1. le message courant (jamais omis, tronqué au-delà de la moitié du budget)
+2. le prompt système
+3. les résultats d'outils (part ``tool_share`` du reste)
+4. le contexte sémantique (part ``semantic_share`` du reste)
+5. l'historique, du plus récent au plus ancien; les messages plus anciens
+   sont remplacés par une note indiquant combien ont été omis
+
+Les textes trop longs sont tronqués en gardant le début et la fin.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+DEFAULT_CACHE_ENTRIES = 4096
+TRUNCATION_MARKER = "\n[... {count} tokens tronqués ...]\n"
+OMITTED_HISTORY_NOTE = "[{count} messages antérieurs omis]"
+
+# Pré-découpage proche des BPE GPT/Llama: mots, nombres, ponctuation
+_PRETOKEN_RE = re.compile(r"\w+|[^\w\s]+|\s+", re.UNICODE)
+_CHARS_PER_WORD_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimer le nombre de tokens sans tokenizer
+
+    Chaque mot compte pour un token par tranche de 4 caractères, chaque
+    groupe de ponctuation pour un token par caractère; les espaces sont
+    absorbés par le mot suivant comme dans les BPE usuels.
+    """
+    count = 0
+    for piece in _PRETOKEN_RE.findall(text):
+        if piece[0].isspace():
+            count += 1 if "\n" in piece else 0
+        elif piece[0].isalnum() or piece[0] == "_":
+            count += math.ceil(len(piece) / _CHARS_PER_WORD_TOKEN)
+        else:
+            count += len(piece)
+    return count
+
+
+_fallback_counter: Optional[Callable[[str], int]] = None
+_fallback_lock = threading.Lock()
+
+
+def get_fallback_tokenizer() -> Callable[[str], int]:
+    """
+    Compteur local pour les backends sans tokenizer exposé
+
+    ``tiktoken`` (cl100k_base) s'il est installé et son vocabulaire
+    disponible, sinon ``estimate_tokens``.
+    """
+    global _fallback_counter
+    with _fallback_lock:
+        if _fallback_counter is None:
+            _fallback_counter = estimate_tokens
+            if TIKTOKEN_AVAILABLE:
+                try:
+                    encoding = tiktoken.get_encoding("cl100k_base")
+                    _fallback_counter = lambda text: len(
+                        encoding.encode(text, disallowed_special=())
+                    )
+                except Exception:
+                    pass  # Vocabulaire non téléchargeable (hors ligne)
+        return _fallback_counter
+
+
+class TokenCounter:
+    """
+    Compteur de tokens mémoïsé (LRU par texte)
+
+    Thread-safe. Le tokenizer du backend est utilisé s'il est fourni; en cas
+    d'erreur, le compteur local prend le relais.
+    """
+
+    def __init__(
+        self,
+        tokenize: Optional[Callable[[str], int]] = None,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+    ) -> None:
+        self._tokenize = tokenize
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistiques
+        self.hits = 0
+        self.misses = 0
+
+    def _compute(self, text: str) -> int:
+        if self._tokenize is not None:
+            try:
+                return int(self._tokenize(text))
+            except Exception:
+                self._tokenize = None
+        return get_fallback_tokenizer()(text)
+
+    def count(self, text: str) -> int:
+        """Nombre de tokens de ``text``"""
+        if not text:
+            return 0
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        count = self._compute(text)
+        with self._lock:
+            self._cache[text] = count
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return count
+
+    def stats(self) -> Dict[str, float]:
+        """Taux de hit du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@dataclass
+class ContextAllocation:
+    """Contenu retenu pour un appel au modèle"""
+
+    system_prompt: str
+    message: str
+    history: List[Dict[str, Any]]
+    tool_results: List[str]
+    semantic_context: str = ""
+    omitted_messages: int = 0
+    tokens: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.tokens.values())
+
+
+class TokenBudgeter:
+    """
+    Répartit la fenêtre de contexte entre les composantes du prompt
+    """
+
+    def __init__(
+        self,
+        counter: TokenCounter,
+        context_window: int,
+        reserved_output_tokens: int,
+        tool_share: float = 0.5,
+        semantic_share: float = 0.5,
+        safety_margin: int = 32,
+    ) -> None:
+        """
+        Initialiser le budget
+
+        Args:
+            counter: Compteur de tokens du backend
+            context_window: Taille du contexte du modèle (n_ctx)
+            reserved_output_tokens: Tokens réservés à la génération (max_tokens)
+            tool_share: Part max du budget restant pour les résultats d'outils
+            semantic_share: Part max du budget restant pour le contexte sémantique
+            safety_margin: Tokens de marge (gabarit, séparateurs, BOS)
+        """
+        self.counter = counter
+        self.context_window = context_window
+        self.reserved_output_tokens = reserved_output_tokens
+        self.tool_share = tool_share
+        self.semantic_share = semantic_share
+        self.safety_margin = safety_margin
+
+    @property
+    def available_tokens(self) -> int:
+        """Tokens disponibles pour le prompt"""
+        return max(0, self.context_window - self.reserved_output_tokens - self.safety_margin)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Tronquer ``text`` à ``max_tokens`` en gardant le début et la fin
+
+        Le milieu est remplacé par un marqueur indiquant le nombre de tokens
+        retirés.
+        """
+        total = self.counter.count(text)
+        if total <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+
+        marker_tokens = self.counter.count(TRUNCATION_MARKER.format(count=total))
+        keep_tokens = max_tokens - marker_tokens
+        if keep_tokens <= 0:
+            return ""
+
+        # Coupe proportionnelle, resserrée jusqu'à tenir dans le budget
+        chars_per_token = len(text) / total
+        keep_chars = int(keep_tokens * chars_per_token)
+        while keep_chars > 0:
+            head = text[: keep_chars * 2 // 3]
+            tail = text[len(text) - keep_chars // 3 :] if keep_chars // 3 else ""
+            removed = total - self.counter.count(head) - self.counter.count(tail)
+            candidate = head + TRUNCATION_MARKER.format(count=removed) + tail
+            if self.counter.count(candidate) <= max_tokens:
+                return candidate
+            keep_chars = int(keep_chars * 0.9)
+        return ""
+
+    def _format_message(self, message: Dict[str, Any]) -> str:
+        return f"{message.get('role', 'assistant')}: {message.get('content', '')}"
+
+    def allocate(
+        self,
+        system_prompt: str,
+        message: str,
+        history: Sequence[Dict[str, Any]] = (),
+        tool_results: Sequence[str] = (),
+        semantic_context: str = "",
+    ) -> ContextAllocation:
+        """
+        Choisir ce qui entre dans la fenêtre de contexte
+
+        Args:
+            system_prompt: Prompt système (catalogue d'outils)
+            message: Message courant
+            history: Messages précédents (dicts role/content), du plus ancien au plus récent
+            tool_results: Blocs de résultats d'outils déjà formatés
+            semantic_context: Contexte récupéré en mémoire sémantique
+
+        Returns:
+            ContextAllocation avec les textes éventuellement tronqués
+        """
+        remaining = self.available_tokens
+        tokens: Dict[str, int] = {}
+
+        message = self.truncate(message, max(remaining // 2, 1))
+        tokens["message"] = self.counter.count(message)
+        remaining -= tokens["message"]
+
+        system_prompt = self.truncate(system_prompt, remaining)
+        tokens["system_prompt"] = self.counter.count(system_prompt)
+        remaining -= tokens["system_prompt"]
+
+        # Résultats d'outils: part égale par bloc, le reliquat passe au suivant
+        kept_results: List[str] = []
+        tool_budget = int(remaining * self.tool_share)
+        for index, block in enumerate(tool_results):
+            share = tool_budget // (len(tool_results) - index)
+            block = self.truncate(block, share)
+            used = self.counter.count(block)
+            tool_budget -= used
+            if block:
+                kept_results.append(block)
+        tokens["tool_results"] = sum(self.counter.count(block) for block in kept_results)
+        remaining -= tokens["tool_results"]
+
+        semantic_context = self.truncate(semantic_context, int(remaining * self.semantic_share))
+        tokens["semantic_context"] = self.counter.count(semantic_context)
+        remaining -= tokens["semantic_context"]
+
+        # Historique: du plus récent au plus ancien, tant que ça tient
+        kept_history: List[Dict[str, Any]] = []
+        history_tokens = 0
+        for position, past in enumerate(reversed(history)):
+            cost = self.counter.count(self._format_message(past))
+            if history_tokens + cost > remaining:
+                if position == 0:
+                    # Le dernier échange compte plus que tout le reste: le tronquer
+                    label_cost = self.counter.count(self._format_message({**past, "content": ""}))
+                    content = self.truncate(str(past.get("content", "")), remaining - label_cost)
+                    if content:
+                        past = {**past, "content": content}
+                        cost = self.counter.count(self._format_message(past))
+                        kept_history.append(past)
+                        history_tokens += cost
+                break
+            kept_history.append(past)
+            history_tokens += cost
+        kept_history.reverse()
+
+        omitted = len(history) - len(kept_history)
+        if omitted:
+            note = {"role": "system", "content": OMITTED_HISTORY_NOTE.format(count=omitted)}
+            note_cost = self.counter.count(self._format_message(note))
+            while kept_history and history_tokens + note_cost > remaining:
+                dropped = kept_history.pop(0)
+                history_tokens -= self.counter.count(self._format_message(dropped))
+                omitted += 1
+                note["content"] = OMITTED_HISTORY_NOTE.format(count=omitted)
+            if history_tokens + note_cost <= remaining:
+                kept_history.insert(0, note)
+                history_tokens += note_cost
+        tokens["history"] = history_tokens
+
+        return ContextAllocation(
+            system_prompt=system_prompt,
+            message=message,
+            history=kept_history,
+            tool_results=kept_results,
+            semantic_context=semantic_context,
+            omitted_messages=omitted,
+            tokens=tokens,
+        )
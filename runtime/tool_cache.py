@@ -0,0 +1,227 @@
+"""
+Mémoïsation des résultats d'outils déterministes
+
+Les agents rappellent souvent un outil déterministe avec les mêmes arguments
+(``math_calculator`` sur la même expression, ``file_read`` ou
+``document_analyzer_pme`` sur un fichier inchangé), dans une conversation
+comme d'une conversation à l'autre. Un outil se déclare mémoïsable avec
+``BaseTool.cacheable`` et liste dans ``BaseTool.file_arguments`` les
+arguments qui désignent des fichiers.
+
+La clé combine le nom de l'outil, les arguments canonisés (JSON trié) et,
+pour chaque fichier, son chemin résolu, son mtime, sa taille et son
+SHA-256: un fichier modifié produit une nouvelle clé. Le hash d'un fichier
+est lui-même mémoïsé par (chemin, mtime, taille).
+
+Seuls les résultats en succès sont conservés, avec une durée de vie (TTL)
+et un nombre maximal d'entrées (LRU).
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from tools.base import ToolResult
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 300.0
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_FileStat = Tuple[str, int, int]  # (chemin résolu, mtime_ns, taille)
+
+
+def file_fingerprint(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Empreinte d'un fichier: chemin résolu, mtime, taille et SHA-256
+
+    Returns:
+        Dict d'empreinte, ou None si le fichier est illisible
+    """
+    return _default_hasher.fingerprint(path)
+
+
+class _FileHasher:
+    """Hash de fichiers mémoïsé par (chemin, mtime, taille)"""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._hashes: "OrderedDict[_FileStat, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fingerprint(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            resolved = Path(path).resolve()
+            stat = resolved.stat()
+        except (OSError, ValueError):
+            return None
+        if not resolved.is_file():
+            return None
+
+        key = (str(resolved), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._hashes.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            try:
+                with open(resolved, "rb") as f:
+                    for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                        sha.update(chunk)
+            except OSError:
+                return None
+            digest = sha.hexdigest()
+            with self._lock:
+                self._hashes[key] = digest
+                while len(self._hashes) > self.max_entries:
+                    self._hashes.popitem(last=False)
+
+        return {
+            "path": key[0],
+            "mtime_ns": key[1],
+            "size": key[2],
+            "sha256": digest,
+        }
+
+
+_default_hasher = _FileHasher()
+
+
+class ToolResultCache:
+    """
+    Cache partagé des résultats d'outils (TTL + LRU)
+
+    Thread-safe; les résultats sont copiés à l'entrée et à la sortie pour
+    qu'un appelant ne puisse pas modifier l'entrée en cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        """
+        Initialiser le cache
+
+        Args:
+            max_entries: Nombre maximal de résultats conservés
+            ttl_seconds: Durée de vie d'un résultat
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, ToolResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistiques
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, tool_name: str, tool: Any, arguments: Mapping[str, Any]) -> Optional[str]:
+        """
+        Clé de cache d'un appel, ou None si l'appel n'est pas mémoïsable
+
+        L'appel n'est pas mémoïsable si l'outil ne le déclare pas, si les
+        arguments ne sont pas sérialisables ou si un fichier est illisible.
+        """
+        if getattr(tool, "cacheable", False) is not True:
+            return None
+
+        files: Dict[str, Any] = {}
+        file_arguments = getattr(tool, "file_arguments", ())
+        for name in file_arguments if isinstance(file_arguments, (tuple, list)) else ():
+            value = arguments.get(name)
+            if value is None:
+                continue
+            fingerprint = file_fingerprint(str(value))
+            if fingerprint is None:
+                return None
+            files[name] = fingerprint
+
+        try:
+            canonical = json.dumps(
+                {"tool": tool_name, "arguments": arguments, "files": files},
+                sort_keys=True,
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[ToolResult]:
+        """Résultat en cache et encore valide pour ``key``"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]  # Expiré
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: ToolResult) -> None:
+        """Mémoriser un résultat en succès"""
+        if not result.is_success() or self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Vider le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Taux de hit du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Instance globale (partagée entre conversations)
+_tool_result_cache: Optional[ToolResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Récupérer le cache global des résultats d'outils"""
+    global _tool_result_cache
+    with _cache_lock:
+        if _tool_result_cache is None:
+            _tool_result_cache = ToolResultCache()
+        return _tool_result_cache
+
+
+def init_tool_result_cache(
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+) -> ToolResultCache:
+    """Initialiser le cache global des résultats d'outils"""
+    global _tool_result_cache
+    with _cache_lock:
+        _tool_result_cache = ToolResultCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        return _tool_result_cache
+
+
+def reset_tool_result_cache() -> None:
+    """Réinitialiser le cache global (tests)"""
+    global _tool_result_cache
+    with _cache_lock:
+        _tool_result_cache = None
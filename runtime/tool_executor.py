@@ -7,6 +7,13 @@ This component is responsible for:
 2. Executing tools safely
 3. Handling errors and timeouts
 4. Logging execution details
+5. Running independent calls of a batch concurrently
+6. Serving deterministic tools from the shared result cache
+
+Concurrency limits are declared on each tool (``BaseTool.max_concurrency``,
+``timeout_seconds``, ``cpu_bound``). A timed-out call is reported as
+``ToolStatus.TIMEOUT``; Python threads cannot be interrupted, so the call
+keeps its concurrency slot until it actually returns.
 
 Key Principles:
 1. Single Responsibility: ONLY tool execution
@@ -15,14 +22,25 @@ Key Principles:
 4. Testability: All dependencies injected
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+)
 from datetime import datetime
+import contextvars
 import hashlib
+import multiprocessing
+import pickle
+import threading
 
 from pydantic import BaseModel, Field
 
-from tools.base import ToolStatus
+from tools.base import ToolResult, ToolStatus
 from tools.registry import ToolRegistry
+from runtime.tool_cache import ToolResultCache, get_tool_result_cache
 
 # Import metrics for observability
 try:
@@ -54,6 +72,23 @@ except ImportError:
         return {}
 
 
+DEFAULT_MAX_WORKERS = 4
+# Threads used to enforce per-call timeouts (a stuck tool holds one)
+TIMEOUT_POOL_WORKERS = 32
+
+
+def _tool_limits(tool: Any) -> Tuple[Optional[int], Optional[float], bool]:
+    """Concurrency limit, timeout and CPU-bound flag declared by a tool."""
+    max_concurrency = getattr(tool, "max_concurrency", None)
+    timeout = getattr(tool, "timeout_seconds", None)
+    cpu_bound = getattr(tool, "cpu_bound", False)
+    return (
+        max_concurrency if isinstance(max_concurrency, int) and max_concurrency > 0 else None,
+        float(timeout) if isinstance(timeout, (int, float)) and timeout > 0 else None,
+        cpu_bound is True,
+    )
+
+
 class ToolCall(BaseModel):
     """
     Structured tool call with Pydantic validation.
@@ -81,6 +116,7 @@ class ToolExecutionResult(BaseModel):
     duration_ms: float
     input_hash: str
     output_hash: str
+    cached: bool = False
 
 
 class ToolExecutor:
@@ -98,6 +134,9 @@ class ToolExecutor:
         tool_registry: ToolRegistry,
         logger: Optional[Any] = None,
         tracker: Optional[Any] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        result_cache: Optional[ToolResultCache] = None,
+        use_result_cache: bool = True,
     ):
         """
         Initialize tool executor with dependencies.
@@ -106,10 +145,25 @@ class ToolExecutor:
             tool_registry: Registry of available tools
             logger: Optional logger for tool execution events
             tracker: Optional provenance tracker
+            max_workers: Tool calls of a batch run concurrently
+            result_cache: Result cache (defaults to the shared global cache)
+            use_result_cache: False to always execute tools
         """
         self.tool_registry = tool_registry
         self.logger = logger
         self.tracker = tracker
+        self.max_workers = max(1, max_workers)
+        if use_result_cache:
+            self.result_cache = result_cache or get_tool_result_cache()
+        else:
+            self.result_cache = None
+
+        # Pools are created on first use
+        self._batch_pool: Optional[ThreadPoolExecutor] = None
+        self._timeout_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._pool_lock = threading.Lock()
 
         # Initialize metrics collector
         if METRICS_AVAILABLE:
@@ -217,11 +271,22 @@ class ToolExecutor:
             if span:
                 span.set_attribute("tool.validation.success", True)
 
-            # Get tool and execute
+            # Get tool and execute (or reuse a cached result)
             tool = self.tool_registry.get(tool_call.tool)
-            result = tool.execute(tool_call.arguments)
+            cache_key = None
+            result = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.make_key(tool_call.tool, tool, tool_call.arguments)
+                if cache_key is not None:
+                    result = self.result_cache.get(cache_key)
+            cached = result is not None
+            if result is None:
+                result = self._invoke(tool_call.tool, tool, tool_call.arguments)
+                if cache_key is not None:
+                    self.result_cache.put(cache_key, result)
 
             if span:
+                span.set_attribute("tool.cache_hit", cached)
                 span.set_attribute("tool.execution.success", result.is_success())
                 if not result.is_success() and result.error:
                     span.set_attribute("tool.error", result.error)
@@ -250,6 +315,7 @@ class ToolExecutor:
                         task_id=task_id,
                         success=result.is_success(),
                         output=output_payload,
+                        cached=cached,
                         **trace_ctx,  # Add trace_id and span_id to logs
                     )
                 except Exception as e:
@@ -265,6 +331,7 @@ class ToolExecutor:
                         task_id=task_id or conversation_id,
                         start_time=start_time_iso,
                         end_time=end_time_iso,
+                        cached=cached,
                     )
                 except Exception as e:
                     print(f"⚠ Failed to track tool execution for '{tool_call.tool}': {e}")
@@ -288,6 +355,81 @@ class ToolExecutor:
                 duration_ms=duration_ms,
                 input_hash=input_hash,
                 output_hash=output_hash,
+                cached=cached,
+            )
+
+    def _slot(self, tool_name: str, max_concurrency: Optional[int]):
+        """Semaphore bounding concurrent calls of one tool (None if unlimited)."""
+        if max_concurrency is None:
+            return None
+        with self._pool_lock:
+            slot = self._slots.get(tool_name)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max_concurrency)
+                self._slots[tool_name] = slot
+            return slot
+
+    def _submit_call(self, tool: Any, arguments: Dict[str, Any], cpu_bound: bool) -> Future:
+        """Run tool.execute in the process pool (CPU-bound) or a timeout thread."""
+        if cpu_bound:
+            try:
+                pickle.dumps(tool)
+            except Exception:
+                cpu_bound = False  # Not picklable: fall back to a thread
+
+        with self._pool_lock:
+            if cpu_bound:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                return self._process_pool.submit(tool.execute, arguments)
+
+            if self._timeout_pool is None:
+                self._timeout_pool = ThreadPoolExecutor(
+                    max_workers=TIMEOUT_POOL_WORKERS, thread_name_prefix="tool-call"
+                )
+            context = contextvars.copy_context()
+            return self._timeout_pool.submit(context.run, tool.execute, arguments)
+
+    def _invoke(self, tool_name: str, tool: Any, arguments: Dict[str, Any]) -> ToolResult:
+        """
+        Run a tool within its declared concurrency limit and timeout.
+
+        Returns:
+            The tool's ToolResult, or a TIMEOUT result
+        """
+        max_concurrency, timeout, cpu_bound = _tool_limits(tool)
+        slot = self._slot(tool_name, max_concurrency)
+        if slot is not None:
+            slot.acquire()
+
+        if timeout is None and not cpu_bound:
+            try:
+                return tool.execute(arguments)
+            finally:
+                if slot is not None:
+                    slot.release()
+
+        try:
+            future = self._submit_call(tool, arguments, cpu_bound)
+        except BaseException:
+            if slot is not None:
+                slot.release()
+            raise
+        if slot is not None:
+            # Released when the call really ends, even after a timeout
+            future.add_done_callback(lambda _: slot.release())
+
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            return ToolResult(
+                status=ToolStatus.TIMEOUT,
+                output="",
+                error=f"Tool '{tool_name}' timed out after {timeout:g}s",
             )
 
     def execute_batch(
@@ -295,24 +437,57 @@ class ToolExecutor:
         tool_calls: List[ToolCall],
         conversation_id: str,
         task_id: Optional[str] = None,
+        concurrent: bool = True,
     ) -> List[ToolExecutionResult]:
         """
-        Execute multiple tool calls in sequence.
+        Execute multiple tool calls, concurrently when they are independent.
+
+        Calls run on a thread pool of ``max_workers`` threads, each with its
+        own provenance record; results are returned in call order. If a tool
+        raises, the first exception in call order is re-raised.
 
         Args:
             tool_calls: List of tool calls to execute
             conversation_id: Conversation identifier
             task_id: Optional task identifier
+            concurrent: False to execute the calls one after the other
 
         Returns:
-            List of execution results
+            List of execution results, in the order of ``tool_calls``
         """
-        results = []
-        for tool_call in tool_calls:
-            result = self.execute_tool(tool_call, conversation_id, task_id)
-            results.append(result)
-
-        return results
+        if not concurrent or self.max_workers == 1 or len(tool_calls) < 2:
+            return [
+                self.execute_tool(tool_call, conversation_id, task_id) for tool_call in tool_calls
+            ]
+
+        with self._pool_lock:
+            if self._batch_pool is None:
+                self._batch_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="tool-batch"
+                )
+            pool = self._batch_pool
+
+        # Each call keeps the caller's context (trace span, inference priority)
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run,
+                self.execute_tool,
+                tool_call,
+                conversation_id,
+                task_id,
+            )
+            for tool_call in tool_calls
+        ]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        """Stop the worker pools (running calls are not interrupted)."""
+        with self._pool_lock:
+            pools = [self._batch_pool, self._timeout_pool, self._process_pool]
+            self._batch_pool = self._timeout_pool = self._process_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
 
     def format_results(self, results: List[ToolExecutionResult]) -> str:
         """
@@ -21,6 +21,8 @@ from pydantic import BaseModel, ValidationError
 
 from runtime.tool_executor import ToolCall
 
+TOOL_CALL_OPEN_TAG = "<tool_call>"
+
 
 class ParsingResult(BaseModel):
     """Result of tool call parsing"""
@@ -220,3 +222,80 @@ class ToolParser:
             True if tool call markers found
         """
         return "<tool_call>" in text or (text.strip().startswith("{") and '"tool"' in text)
+
+
+class StreamingToolCallFilter:
+    """
+    Incremental filter for streamed model output.
+
+    Forwards user-visible text as it arrives and stops forwarding as soon as
+    a <tool_call> tag opens: the rest of the generation is a tool call the
+    agent executes, not text for the user. A trailing fragment that could be
+    the beginning of the tag (e.g. "<tool") is held back until the next delta
+    disambiguates it. Output starting with "{" is buffered until the end of
+    the stream, since it may be a raw JSON tool call (see has_tool_calls).
+
+    Leading whitespace is dropped, matching the stripped non-streamed text.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._started = False
+        self._buffering_json = False
+        self.tool_call_started = False
+
+    def feed(self, delta: str) -> str:
+        """
+        Consume a delta and return the text safe to show to the user.
+
+        Args:
+            delta: New text from the model
+
+        Returns:
+            Visible text (possibly empty)
+        """
+        if self.tool_call_started:
+            return ""
+
+        buffer = self._pending + delta
+        if not self._started:
+            buffer = buffer.lstrip()
+            if not buffer:
+                self._pending = ""
+                return ""
+            self._started = True
+            self._buffering_json = buffer.startswith("{")
+
+        index = buffer.find(TOOL_CALL_OPEN_TAG)
+        if index != -1:
+            self.tool_call_started = True
+            self._pending = ""
+            return "" if self._buffering_json else buffer[:index]
+
+        if self._buffering_json:
+            self._pending = buffer
+            return ""
+
+        # Retenir le plus long suffixe qui pourrait commencer la balise
+        hold = 0
+        for size in range(min(len(TOOL_CALL_OPEN_TAG) - 1, len(buffer)), 0, -1):
+            if TOOL_CALL_OPEN_TAG.startswith(buffer[-size:]):
+                hold = size
+                break
+        self._pending = buffer[len(buffer) - hold :]
+        return buffer[: len(buffer) - hold]
+
+    def flush(self) -> str:
+        """
+        Release held-back text at the end of the stream.
+
+        Returns:
+            Remaining visible text (empty if it turned out to be a tool call)
+        """
+        text, self._pending = self._pending, ""
+        if self.tool_call_started:
+            return ""
+        if self._buffering_json and '"tool"' in text:
+            self.tool_call_started = True
+            return ""
+        return text
@@ -1,7 +1,40 @@
 """
 Runtime utilities for FilAgent
+
+Exports are resolved on first access (PEP 562) so that importing one
+submodule (e.g. ``runtime.utils.worker_pool`` from the server) does not
+import httpx through ``http_pool``.
 """
 
-from .rate_limiter import get_rate_limiter, RateLimiter
+import importlib
+
+_EXPORTS = {
+    "get_rate_limiter": "rate_limiter",
+    "RateLimiter": "rate_limiter",
+    "aclose_http_clients": "http_pool",
+    "get_async_http_client": "http_pool",
+    "HTTP2_AVAILABLE": "http_pool",
+    "get_worker_pool": "worker_pool",
+    "init_worker_pool": "worker_pool",
+    "reset_worker_pool": "worker_pool",
+    "PoolOverloadedError": "worker_pool",
+    "PoolTimeoutError": "worker_pool",
+    "WorkerPool": "worker_pool",
+    "lazy_import": "lazy",
+    "module_available": "lazy",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["get_rate_limiter", "RateLimiter"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,79 @@
+"""
+Shared connection-pooled async HTTP clients for remote model backends
+
+Creating an HTTP client per request pays a TCP + TLS handshake every time.
+The remote backends (OpenAI, Perplexity) instead share one
+``httpx.AsyncClient`` per event loop and pool settings, which keeps
+connections alive between calls and multiplexes them over HTTP/2 when the
+optional ``h2`` package is installed (HTTP/1.1 keep-alive otherwise).
+
+Clients are bound to the event loop that created them (httpx/anyio
+requirement), so they are cached per loop and dropped with it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Dict, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+_PoolKey = Tuple[int, int, float]
+_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_PoolKey, httpx.AsyncClient]]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client(
+    timeout: float = 60.0,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+) -> httpx.AsyncClient:
+    """
+    Get the shared pooled client for the running event loop
+
+    Args:
+        timeout: Read/write/pool timeout in seconds
+        max_connections: Maximum concurrent connections in the pool
+        max_keepalive_connections: Idle connections kept open for reuse
+
+    Returns:
+        httpx.AsyncClient shared by every caller with the same settings
+    """
+    loop = asyncio.get_running_loop()
+    key = (max_connections, max_keepalive_connections, timeout)
+    clients = _clients.setdefault(loop, {})
+
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(timeout, connect=min(timeout, DEFAULT_CONNECT_TIMEOUT)),
+        )
+        clients[key] = client
+    return client
+
+
+async def aclose_http_clients() -> None:
+    """Close the pooled clients of the running event loop (app shutdown)"""
+    loop = asyncio.get_running_loop()
+    for client in _clients.pop(loop, {}).values():
+        await client.aclose()
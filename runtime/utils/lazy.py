@@ -0,0 +1,79 @@
+"""
+Lazy imports for heavy optional dependencies
+
+``lazy_import("pandas")`` returns a proxy that imports the module on first
+attribute access (or call, for ``lazy_import("pkg", "Class")``). Modules
+keep their usual ``pd`` / ``faiss`` / ``SentenceTransformer`` globals, so
+call sites and ``unittest.mock.patch`` targets stay unchanged, while the
+import cost moves from process start to first use.
+
+``module_available`` answers the ``*_AVAILABLE`` flags without importing:
+it only locates the top-level package on ``sys.path``.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import threading
+from typing import Any, Optional
+
+
+def module_available(name: str) -> bool:
+    """True if the top-level package of ``name`` is installed (no import)"""
+    top_level = name.partition(".")[0]
+    if top_level in sys.modules:
+        return sys.modules[top_level] is not None
+    try:
+        return importlib.util.find_spec(top_level) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyImport:
+    """Proxy of a module (or of one of its attributes) imported on first use"""
+
+    __slots__ = ("_module_name", "_attribute", "_target", "_lock")
+
+    def __init__(self, module_name: str, attribute: Optional[str] = None) -> None:
+        object.__setattr__(self, "_module_name", module_name)
+        object.__setattr__(self, "_attribute", attribute)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        """Import (once) and return the module or attribute"""
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = importlib.import_module(self._module_name)
+                    if self._attribute is not None:
+                        target = getattr(target, self._attribute)
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        target = self._module_name + (f".{self._attribute}" if self._attribute else "")
+        state = "loaded" if self.is_loaded else "deferred"
+        return f"<LazyImport {target} ({state})>"
+
+
+def lazy_import(module_name: str, attribute: Optional[str] = None) -> LazyImport:
+    """Proxy importing ``module_name`` (and fetching ``attribute``) on first use"""
+    return LazyImport(module_name, attribute)
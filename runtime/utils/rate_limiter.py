@@ -7,28 +7,46 @@ and cost control.
 
 Security features:
 - Configurable rate limits per minute/hour
-- Exponential backoff on failures
-- Thread-safe implementation
-- Audit trail logging
+- Independent limits per key (backend, API key, tenant)
+- Exponential backoff on failures, honoring Retry-After
+- Thread-safe and asyncio-friendly (never sleeps while holding the lock)
+- Optional state shared between worker processes
+
+Limits use the Generic Cell Rate Algorithm (GCRA), a token bucket that
+stores a single "theoretical arrival time" per key and window: O(1) state
+and O(1) work per request, no timestamp history to clean up. A window of
+N requests per period allows bursts of up to N requests, then one request
+every period/N seconds.
 """
 
 from __future__ import annotations
 
-import time
-import threading
-from typing import Optional, Callable, TypeVar, ParamSpec
-from datetime import datetime, timedelta
-from collections import deque
+import asyncio
 import hashlib
 import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, ParamSpec, TypeVar
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
 
 # Type variables for generic callable typing
 P = ParamSpec("P")
 T = TypeVar("T")
 
-# TypeAlias for internal tracking
-FailureCount = int
-RequestTimestamp = datetime
+DEFAULT_KEY = "default"
+
+# Per-key GCRA state: theoretical arrival time of each window
+BucketState = List[float]
 
 
 class RateLimitError(Exception):
@@ -39,12 +57,107 @@ class RateLimitError(Exception):
         self.attempts = attempts
 
 
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Extract the server-requested delay from an API error
+
+    Looks for a ``retry_after`` attribute, then for ``Retry-After-Ms`` /
+    ``Retry-After`` headers on ``error.response`` (openai/httpx errors).
+    ``Retry-After`` may be a number of seconds or an HTTP date.
+
+    Returns:
+        Delay in seconds, or None if the error carries no hint
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if isinstance(retry_after, (int, float)):
+        return max(0.0, float(retry_after))
+
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return max(0.0, float(value) / 1000)
+
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    """Non-reversible rate limit key for an API key (the key itself is never stored)"""
+    return "key-" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class _LocalStateStore:
+    """In-process bucket state"""
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: Dict[str, BucketState] = {}
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, BucketState]]:
+        with self._lock:
+            yield self._state
+
+
+class SharedStateStore:
+    """
+    Bucket state shared by several processes (multi-worker uvicorn)
+
+    The state lives in a small JSON file updated under an exclusive
+    ``fcntl`` lock. Wall-clock time is used so that every process agrees
+    on arrival times.
+    """
+
+    clock = staticmethod(time.time)
+
+    def __init__(self, path: str | Path) -> None:
+        if not FCNTL_AVAILABLE:
+            raise RuntimeError("Shared rate limiter state requires fcntl (POSIX)")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()  # flock is per process, not per thread
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, BucketState]]:
+        with self._lock, open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                content = handle.read()
+                try:
+                    state = json.loads(content) if content else {}
+                except json.JSONDecodeError:
+                    state = {}
+                yield state
+                handle.seek(0)
+                handle.truncate()
+                json.dump(state, handle)
+                handle.flush()
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
 class RateLimiter:
     """
     Thread-safe rate limiter with exponential backoff
 
-    Implements token bucket algorithm with sliding window for rate limiting
-    and exponential backoff for retry logic.
+    Each key (backend, API key fingerprint, tenant...) has its own
+    per-minute and per-hour GCRA buckets. Callers reserve a slot under the
+    lock and sleep outside of it, so waiting never blocks other keys,
+    threads or coroutines.
     """
 
     def __init__(
@@ -55,17 +168,20 @@ class RateLimiter:
         initial_backoff: float = 1.0,
         max_backoff: float = 32.0,
         backoff_multiplier: float = 2.0,
+        shared_state_path: Optional[str | Path] = None,
     ) -> None:
         """
         Initialize rate limiter
 
         Args:
-            requests_per_minute: Maximum requests allowed per minute
-            requests_per_hour: Maximum requests allowed per hour
+            requests_per_minute: Maximum requests allowed per minute (per key)
+            requests_per_hour: Maximum requests allowed per hour (per key)
             max_retries: Maximum number of retry attempts
             initial_backoff: Initial backoff time in seconds
             max_backoff: Maximum backoff time in seconds
             backoff_multiplier: Multiplier for exponential backoff
+            shared_state_path: File holding the state shared between worker
+                processes (None = state local to this process)
         """
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
@@ -74,103 +190,150 @@ class RateLimiter:
         self.max_backoff = max_backoff
         self.backoff_multiplier = backoff_multiplier
 
-        # Thread safety
-        self.lock = threading.Lock()
-
-        # Request tracking (sliding window)
-        self.minute_requests: deque[RequestTimestamp] = deque()
-        self.hour_requests: deque[RequestTimestamp] = deque()
-
-        # Failure tracking for backoff
-        self.failure_counts: dict[str, FailureCount] = {}
-        self.last_failure_time: dict[str, RequestTimestamp] = {}
-
-    def _cleanup_old_requests(self) -> None:
-        """Remove expired requests from tracking queues"""
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        hour_ago = now - timedelta(hours=1)
-
-        # Clean minute window
-        while self.minute_requests and self.minute_requests[0] < minute_ago:
-            self.minute_requests.popleft()
-
-        # Clean hour window
-        while self.hour_requests and self.hour_requests[0] < hour_ago:
-            self.hour_requests.popleft()
-
-    def _get_request_id(
-        self, func: Callable[..., object], args: tuple[object, ...], kwargs: dict[str, object]
-    ) -> str:
-        """Generate unique ID for request based on function and arguments"""
-        # Create hash of function name and arguments for tracking
-        func_name: str = func.__name__ if hasattr(func, "__name__") else str(func)
-        data: dict[str, str] = {
-            "func": func_name,
-            "args": str(args),
-            "kwargs": str(sorted(kwargs.items())),
-        }
-        return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
-
-    def _calculate_backoff(self, request_id: str) -> float:
-        """Calculate exponential backoff time based on failure count"""
-        failure_count = self.failure_counts.get(request_id, 0)
-        if failure_count == 0:
-            return 0
+        # (emission interval, burst tolerance) per window
+        self._windows = [
+            (60.0 / requests_per_minute, 60.0 - 60.0 / requests_per_minute),
+            (3600.0 / requests_per_hour, 3600.0 - 3600.0 / requests_per_hour),
+        ]
 
-        backoff = min(
-            self.initial_backoff * (self.backoff_multiplier ** (failure_count - 1)),
-            self.max_backoff,
+        self._store = (
+            SharedStateStore(shared_state_path) if shared_state_path else _LocalStateStore()
         )
-        return backoff
 
-    def wait_if_needed(self) -> float:
+    def _bucket(self, state: Dict[str, BucketState], key: str, now: float) -> BucketState:
+        bucket = state.get(key)
+        if bucket is None:
+            bucket = state[key] = [now] * len(self._windows)
+        return bucket
+
+    def _reserve(self, key: str) -> float:
+        """
+        Reserve the next request slot for ``key``
+
+        Returns:
+            Time to wait before sending the request, in seconds
+        """
+        with self._store.transaction() as state:
+            now = self._store.clock()
+            bucket = self._bucket(state, key, now)
+
+            # Earliest time allowed by every window
+            send_at = now
+            for index, (_, tolerance) in enumerate(self._windows):
+                send_at = max(send_at, bucket[index] - tolerance)
+
+            for index, (interval, _) in enumerate(self._windows):
+                bucket[index] = max(bucket[index], send_at) + interval
+
+            return send_at - now
+
+    def defer(self, key: str, seconds: float) -> None:
+        """
+        Block ``key`` for ``seconds`` (e.g. server-side Retry-After)
+
+        Every caller sharing the key waits, not only the one that failed.
+        """
+        with self._store.transaction() as state:
+            now = self._store.clock()
+            bucket = self._bucket(state, key, now)
+            for index, (_, tolerance) in enumerate(self._windows):
+                bucket[index] = max(bucket[index], now + seconds + tolerance)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Forget the state of ``key`` (all keys if None)"""
+        with self._store.transaction() as state:
+            if key is None:
+                state.clear()
+            else:
+                state.pop(key, None)
+
+    def wait_if_needed(self, key: str = DEFAULT_KEY) -> float:
         """
         Check rate limits and wait if necessary
 
+        Args:
+            key: Bucket to draw from
+
         Returns:
             Time waited in seconds
         """
-        with self.lock:
-            self._cleanup_old_requests()
-
-            now = datetime.now()
-            wait_time = 0.0
-
-            # Check minute limit
-            if len(self.minute_requests) >= self.requests_per_minute:
-                # Calculate wait time until oldest request expires
-                oldest = self.minute_requests[0]
-                wait_until = oldest + timedelta(minutes=1)
-                if wait_until > now:
-                    wait_time = max(wait_time, (wait_until - now).total_seconds())
-
-            # Check hour limit
-            if len(self.hour_requests) >= self.requests_per_hour:
-                oldest = self.hour_requests[0]
-                wait_until = oldest + timedelta(hours=1)
-                if wait_until > now:
-                    wait_time = max(wait_time, (wait_until - now).total_seconds())
-
-            # Wait if necessary
-            if wait_time > 0:
-                print(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
-                time.sleep(wait_time)
-
-            # Record this request
-            now = datetime.now()
-            self.minute_requests.append(now)
-            self.hour_requests.append(now)
-
-            return wait_time
-
-    def execute_with_backoff(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        wait_time = self._reserve(key)
+        if wait_time > 0:
+            print(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
+            time.sleep(wait_time)
+        return wait_time
+
+    async def await_if_needed(self, key: str = DEFAULT_KEY) -> float:
+        """
+        Non-blocking variant of wait_if_needed() for asyncio callers
+
+        Args:
+            key: Bucket to draw from
+
+        Returns:
+            Time waited in seconds
+        """
+        wait_time = self._reserve(key)
+        if wait_time > 0:
+            print(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+    def _calculate_backoff(self, attempt: int) -> float:
+        """Calculate exponential backoff time for a retry attempt (1 = first retry)"""
+        if attempt <= 0:
+            return 0
+        return min(
+            self.initial_backoff * (self.backoff_multiplier ** (attempt - 1)),
+            self.max_backoff,
+        )
+
+    def _handle_failure(self, key: str, error: Exception, attempt: int) -> float:
+        """
+        Handle a failed call
+
+        Returns:
+            Backoff to apply before the next attempt (0 when the key was
+            deferred by a Retry-After hint: the next reservation waits)
+
+        Raises:
+            RateLimitError: If this was the last attempt
+        """
+        # Sanitize error message to prevent information leakage
+        error_str = str(error).lower()
+        if any(
+            sensitive in error_str for sensitive in ["api", "key", "token", "secret", "password"]
+        ):
+            safe_error = "Authentication or authorization error"
+        elif "rate" in error_str and "limit" in error_str:
+            safe_error = "Rate limit exceeded"
+        else:
+            safe_error = "API request failed"
+
+        # If this was the last attempt, raise
+        if attempt == self.max_retries - 1:
+            raise RateLimitError(
+                f"{safe_error} after {self.max_retries} attempts", attempts=self.max_retries
+            ) from error
+
+        print(f"Request failed: {safe_error}. Retrying...")
+
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            self.defer(key, retry_after)
+            return 0.0
+        return self._calculate_backoff(attempt + 1)
+
+    def execute_with_backoff(
+        self, func: Callable[P, T], *args: P.args, key: str = DEFAULT_KEY, **kwargs: P.kwargs
+    ) -> T:
         """
         Execute function with rate limiting and exponential backoff
 
         Args:
             func: Function to execute
             *args: Positional arguments for function
+            key: Rate limit bucket (backend, API key fingerprint, tenant)
             **kwargs: Keyword arguments for function
 
         Returns:
@@ -179,83 +342,93 @@ class RateLimiter:
         Raises:
             RateLimitError: If all retries are exhausted
         """
-        # Cast args/kwargs to tuple/dict for request ID generation
-        args_tuple: tuple[object, ...] = tuple(args) if args else ()
-        kwargs_dict: dict[str, object] = dict(kwargs) if kwargs else {}
-        request_id = self._get_request_id(func, args_tuple, kwargs_dict)
-
         for attempt in range(self.max_retries):
             # Wait for rate limit
-            self.wait_if_needed()
-
-            # Calculate and apply backoff if this is a retry
-            if attempt > 0:
-                backoff = self._calculate_backoff(request_id)
-                if backoff > 0:
-                    print(f"Retry {attempt}/{self.max_retries} after {backoff:.1f}s backoff...")
-                    time.sleep(backoff)
+            self.wait_if_needed(key)
 
             try:
-                # Execute the function
-                result = func(*args, **kwargs)
+                return func(*args, **kwargs)
+            except Exception as e:
+                backoff = self._handle_failure(key, e, attempt)
+
+            if backoff > 0:
+                print(f"Retry {attempt + 1}/{self.max_retries} after {backoff:.1f}s backoff...")
+                time.sleep(backoff)
+
+        # Should never reach here, but required for type checker
+        raise RateLimitError(f"Failed after {self.max_retries} attempts", attempts=self.max_retries)
+
+    async def aexecute_with_backoff(
+        self,
+        func: Callable[P, Awaitable[T]],
+        *args: P.args,
+        key: str = DEFAULT_KEY,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """
+        Async variant of execute_with_backoff(): waits with asyncio.sleep
+
+        Args:
+            func: Coroutine function to execute
+            *args: Positional arguments for function
+            key: Rate limit bucket (backend, API key fingerprint, tenant)
+            **kwargs: Keyword arguments for function
 
-                # Success - reset failure count
-                with self.lock:
-                    if request_id in self.failure_counts:
-                        del self.failure_counts[request_id]
-                    if request_id in self.last_failure_time:
-                        del self.last_failure_time[request_id]
+        Returns:
+            Result from function execution
 
-                return result
+        Raises:
+            RateLimitError: If all retries are exhausted
+        """
+        for attempt in range(self.max_retries):
+            await self.await_if_needed(key)
 
+            try:
+                return await func(*args, **kwargs)
             except Exception as e:
-                # Track failure
-                with self.lock:
-                    self.failure_counts[request_id] = self.failure_counts.get(request_id, 0) + 1
-                    self.last_failure_time[request_id] = datetime.now()
-
-                # Sanitize error message to prevent information leakage
-                error_str = str(e).lower()
-                if any(
-                    sensitive in error_str
-                    for sensitive in ["api", "key", "token", "secret", "password"]
-                ):
-                    safe_error = "Authentication or authorization error"
-                elif "rate" in error_str and "limit" in error_str:
-                    safe_error = "Rate limit exceeded"
-                else:
-                    safe_error = "API request failed"
-
-                # If this was the last attempt, raise
-                if attempt == self.max_retries - 1:
-                    raise RateLimitError(
-                        f"{safe_error} after {self.max_retries} attempts", attempts=self.max_retries
-                    ) from e
-
-                print(f"Request failed: {safe_error}. Retrying...")
+                backoff = self._handle_failure(key, e, attempt)
+
+            if backoff > 0:
+                print(f"Retry {attempt + 1}/{self.max_retries} after {backoff:.1f}s backoff...")
+                await asyncio.sleep(backoff)
 
-        # Should never reach here, but required for type checker
         raise RateLimitError(f"Failed after {self.max_retries} attempts", attempts=self.max_retries)
 
 
-# Global singleton instance
-_rate_limiter: Optional[RateLimiter] = None
+# Global instances, one per name (typically one per backend)
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
 
 
-def get_rate_limiter(requests_per_minute: int = 10, requests_per_hour: int = 500) -> RateLimiter:
+def get_rate_limiter(
+    requests_per_minute: int = 10,
+    requests_per_hour: int = 500,
+    name: str = DEFAULT_KEY,
+    shared_state_dir: Optional[str | Path] = None,
+) -> RateLimiter:
     """
-    Get or create the global rate limiter instance
+    Get or create the global rate limiter instance for ``name``
 
     Args:
         requests_per_minute: Max requests per minute (only used on first call)
         requests_per_hour: Max requests per hour (only used on first call)
+        name: Limiter name, e.g. the backend ("openai", "perplexity")
+        shared_state_dir: Directory for state shared between worker
+            processes (only used on first call; None = per process)
 
     Returns:
         RateLimiter instance
     """
-    global _rate_limiter
-    if _rate_limiter is None:
-        _rate_limiter = RateLimiter(
-            requests_per_minute=requests_per_minute, requests_per_hour=requests_per_hour
-        )
-    return _rate_limiter
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(name)
+        if limiter is None:
+            limiter = _rate_limiters[name] = RateLimiter(
+                requests_per_minute=requests_per_minute,
+                requests_per_hour=requests_per_hour,
+                shared_state_path=(
+                    os.path.join(shared_state_dir, f"rate_limit_{name}.json")
+                    if shared_state_dir
+                    else None
+                ),
+            )
+        return limiter
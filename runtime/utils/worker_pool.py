@@ -0,0 +1,229 @@
+"""
+Bounded worker pool for blocking agent work called from async endpoints
+
+The agent loop (llama.cpp generation, Docker sandbox runs, SQLite writes) is
+fully synchronous. Running it directly inside an ``async def`` endpoint blocks
+the uvicorn event loop, so ``/health`` and ``/metrics`` stall behind a single
+slow generation. This pool moves that work onto a fixed set of threads and
+applies admission control:
+
+- at most ``max_workers`` calls execute concurrently
+- at most ``max_queue`` further calls wait for a worker
+- anything beyond that is rejected immediately (``PoolOverloadedError``)
+- each call has a deadline (``PoolTimeoutError`` when exceeded)
+
+A call that times out keeps its worker until it actually returns (Python
+threads cannot be cancelled), and keeps counting against capacity until then,
+so overload is reported honestly instead of piling up hidden work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+from runtime.metrics import get_agent_metrics
+
+T = TypeVar("T")
+
+
+class PoolOverloadedError(Exception):
+    """Raised when the pool has no free worker and its queue is full."""
+
+    def __init__(self, message: str, retry_after: int = 1) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PoolTimeoutError(Exception):
+    """Raised when a call does not complete before its deadline."""
+
+    def __init__(self, message: str, timeout: float) -> None:
+        super().__init__(message)
+        self.timeout = timeout
+
+
+class WorkerPool:
+    """
+    Thread pool with bounded queue, per-call timeouts and queue metrics
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 16,
+        default_timeout: Optional[float] = 300.0,
+        name: str = "agent-worker",
+    ) -> None:
+        """
+        Initialize the worker pool
+
+        Args:
+            max_workers: Number of calls executing concurrently
+            max_queue: Number of calls allowed to wait for a worker
+            default_timeout: Deadline in seconds applied when run() gets none
+                (None disables the deadline)
+            name: Thread name prefix
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+        self._lock = threading.Lock()
+        self._in_flight = 0  # admitted and not finished (queued + running)
+        self._running = 0
+        self._metrics = get_agent_metrics()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of admitted calls (running + queued)."""
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        """Admitted calls that have not finished yet."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Admitted calls still waiting for a worker."""
+        return self._in_flight - self._running
+
+    def _publish(self) -> None:
+        self._metrics.set_request_pool_state(
+            in_flight=self._running, queue_depth=self._in_flight - self._running
+        )
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise PoolOverloadedError(
+                    f"Server overloaded: {self._in_flight} requests in flight "
+                    f"(capacity {self.capacity})"
+                )
+            self._in_flight += 1
+            self._publish()
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled():  # cancelled futures never reached a worker
+                self._running -= 1
+            self._publish()
+
+    def _run_tracked(self, fn: Callable[[], T], admitted_at: float) -> T:
+        with self._lock:
+            self._running += 1
+            self._publish()
+        self._metrics.record_request_queue_wait(time.monotonic() - admitted_at)
+        return fn()
+
+    def submit(self, fn: Callable[..., T], *args, **kwargs) -> Future:
+        """
+        Admit a call and schedule it on a worker thread
+
+        Raises:
+            PoolOverloadedError: If running + queued calls reached capacity
+        """
+        try:
+            self._admit()
+        except PoolOverloadedError:
+            self._metrics.record_request_rejected(reason="overload")
+            raise
+
+        # Propager les contextvars (contexte de trace OpenTelemetry) au worker
+        call = partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        try:
+            future = self._executor.submit(self._run_tracked, call, time.monotonic())
+        except RuntimeError:
+            # Executor shut down: undo admission
+            with self._lock:
+                self._in_flight -= 1
+                self._publish()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(
+        self, fn: Callable[..., T], *args, timeout: Optional[float] = None, **kwargs
+    ) -> T:
+        """
+        Run a blocking callable on the pool without blocking the event loop
+
+        Args:
+            fn: Blocking callable
+            timeout: Deadline in seconds (defaults to ``default_timeout``)
+
+        Raises:
+            PoolOverloadedError: If the pool is saturated
+            PoolTimeoutError: If the call does not finish in time
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._metrics.record_request_rejected(reason="timeout")
+            raise PoolTimeoutError(f"Request exceeded timeout of {timeout}s", timeout) from None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global pool used by the API server
+_worker_pool: Optional[WorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """
+    Get the global worker pool, sized from the ``server`` configuration section
+    """
+    global _worker_pool
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                from runtime.config import get_config
+
+                config = get_config()
+                _worker_pool = WorkerPool(
+                    max_workers=config.server.max_concurrent_requests,
+                    max_queue=config.server.max_queued_requests,
+                    default_timeout=float(config.timeouts.total_request),
+                )
+    return _worker_pool
+
+
+def init_worker_pool(
+    max_workers: int = 4, max_queue: int = 16, default_timeout: Optional[float] = 300.0
+) -> WorkerPool:
+    """Replace the global worker pool (used by tests and embedding apps)."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is not None:
+            _worker_pool.shutdown(wait=False)
+        _worker_pool = WorkerPool(
+            max_workers=max_workers, max_queue=max_queue, default_timeout=default_timeout
+        )
+    return _worker_pool
+
+
+def reset_worker_pool() -> None:
+    """Shut down and drop the global worker pool (next get re-reads config)."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is not None:
+            _worker_pool.shutdown(wait=False)
+        _worker_pool = None
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Benchmark de bout en bout d'Agent.chat avec répartition de la latence par étape
+
+Le modèle est le backend ``replay`` (runtime/model_replay.py): les
+générations sont rejouées depuis un enregistrement, sans réseau ni GPU, si
+bien que la latence mesurée est celle du framework. Les étapes sont celles
+des chronomètres de la boucle agent (runtime/stage_timer.py: cache_lookup,
+routing, episodic_read, generation, tool_execution, logging, dr_signing...),
+activés le temps de la mesure avec un collecteur en guise de tracer et de
+métriques. Une étape imbriquée a sa propre mesure mais n'est pas retranchée
+deux fois: ``framework_other`` est le reste de la requête, hors étapes de
+premier niveau.
+
+Charge: ``--conversations`` conversations de ``--turns`` messages, servies
+par ``--concurrency`` threads (une conversation reste séquentielle). Sans
+``--recording``, la charge est d'abord enregistrée avec un modèle scripté
+(réponses directes et appels de math_calculator), ou avec un vrai backend
+(``--record-backend``). Tout s'exécute dans un répertoire de travail
+temporaire (logs, DR, mémoire épisodique).
+
+Sortie JSON: histogrammes par étape (p50/p90/p99, buckets en ms), débit et
+latence des requêtes. ``--baseline`` compare à une référence versionnée et
+sort avec le code 1 en cas de régression.
+
+Usage:
+    python scripts/benchmark_agent_stages.py
+    python scripts/benchmark_agent_stages.py --concurrency 4 --latency fixed:50 --output stages.json
+    python scripts/benchmark_agent_stages.py --baseline eval/baselines/agent_stages.json
+    python scripts/benchmark_agent_stages.py --update-baseline eval/baselines/agent_stages.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(ROOT))
+
+from runtime.model_interface import (
+    GenerationConfig,
+    GenerationResult,
+    ModelFactory,
+    ModelInterface,
+)
+from runtime.model_replay import ModelRecorder, RecordingInterface, ReplayInterface
+from runtime.stage_timer import STAGES, init_stage_timer
+
+OTHER_STAGE = "framework_other"
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Répertoires lus par l'agent (liés dans le répertoire de travail temporaire)
+_READ_ONLY_DIRS = ("config", "prompts", "policy")
+# Singletons vidés dans le répertoire temporaire (module, variable globale): le
+# cache sémantique ne sert pas les réponses enregistrées, les outils sont reconstruits
+_SINGLETONS = (
+    ("runtime.middleware.logging", "_logger"),
+    ("runtime.middleware.audittrail", "_dr_manager"),
+    ("runtime.middleware.provenance", "_tracker"),
+    ("runtime.middleware.worm", "_worm_logger"),
+    ("runtime.stage_timer", "_stage_timer"),
+    ("memory.cache_manager", "_cache_manager"),
+    ("tools.registry", "_registry"),
+)
+
+
+# ----------------------------------------------------------------------
+# Chronométrage par étape
+# ----------------------------------------------------------------------
+
+
+class StageCollector:
+    """
+    Tracer et métriques du chronomètre d'étapes de l'agent: durées par étape (ms)
+
+    Passé à ``init_stage_timer(tracer=..., metrics=...)``: chaque étape ouvre
+    un « span » (profondeur d'imbrication par thread) puis rapporte sa durée.
+    ``request()`` délimite une requête: le temps hors étapes de premier niveau
+    y est compté dans ``framework_other``.
+    """
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES + (OTHER_STAGE,)}
+        self.requests: List[float] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[Dict] = None):
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield None
+        finally:
+            self._local.depth -= 1
+
+    def record_stage_duration(self, stage: str, duration_seconds: float) -> None:
+        elapsed = duration_seconds * 1000
+        # Appelé avant la fermeture du span: profondeur 1 pour une étape de premier niveau
+        if getattr(self._local, "depth", 0) == 1:
+            self._local.staged = getattr(self._local, "staged", 0.0) + elapsed
+        with self._lock:
+            self.samples.setdefault(stage, []).append(elapsed)
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        self._local.staged = 0.0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.requests.append(elapsed)
+                self.samples[OTHER_STAGE].append(max(0.0, elapsed - self._local.staged))
+
+
+def histogram(values: List[float]) -> Dict:
+    """Résumé d'une série de durées (ms)"""
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    buckets = {str(bound): sum(1 for v in ordered if v <= bound) for bound in BUCKETS_MS}
+    buckets["+Inf"] = len(ordered)
+    return {
+        "count": len(ordered),
+        "total_ms": sum(ordered),
+        "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50_ms": pct(0.50),
+        "p90_ms": pct(0.90),
+        "p99_ms": pct(0.99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+        "buckets": buckets,
+    }
+
+
+# ----------------------------------------------------------------------
+# Charge et modèle scripté
+# ----------------------------------------------------------------------
+
+
+def workload(conversations: int, turns: int) -> List[Tuple[str, List[str]]]:
+    """Conversations (id, messages); un message sur deux demande un calcul"""
+    plan = []
+    for c in range(conversations):
+        messages = []
+        for t in range(turns):
+            if t % 2:
+                messages.append(f"Calcule {c + 1} * {t + 7} + {t} pour le dossier {c}-{t}")
+            else:
+                messages.append(f"Explique la politique de conservation des logs, point {c}-{t}")
+        plan.append((f"bench-conv-{c:04d}", messages))
+    return plan
+
+
+class ScriptedModel(ModelInterface):
+    """
+    Modèle déterministe pour l'enregistrement de la charge
+
+    Un message « Calcule ... » produit d'abord un appel à math_calculator,
+    puis une réponse finale une fois le résultat de l'outil dans le prompt.
+    """
+
+    def load(self, model_path: str, config: Dict) -> bool:
+        return True
+
+    def generate(
+        self, prompt: str, config: GenerationConfig, system_prompt: Optional[str] = None
+    ) -> GenerationResult:
+        message = prompt.rsplit("Utilisateur:", 1)[-1]
+        if message.lstrip().startswith("Calcule "):
+            expression = message.split("Calcule ", 1)[1].split(" pour", 1)[0]
+            text = json.dumps({"tool": "math_calculator", "arguments": {"expression": expression}})
+            text = f"<tool_call>{text}</tool_call>"
+            finish_reason = "tool_calls"
+        else:
+            text = (
+                "Les journaux sont conservés selon la politique de rétention; "
+                "les Decision Records sont signés et archivés."
+            )
+            finish_reason = "stop"
+        prompt_tokens = len(prompt) // 4
+        return GenerationResult(
+            text=text,
+            finish_reason=finish_reason,
+            tokens_generated=len(text) // 4,
+            prompt_tokens=prompt_tokens,
+            total_tokens=prompt_tokens + len(text) // 4,
+        )
+
+    def unload(self):
+        pass
+
+    def is_loaded(self) -> bool:
+        return True
+
+
+# ----------------------------------------------------------------------
+# Agent isolé
+# ----------------------------------------------------------------------
+
+
+@contextmanager
+def isolated_workspace() -> Iterator[Path]:
+    """
+    Répertoire de travail temporaire (écritures de l'agent), config liée en lecture
+
+    Les singletons des middlewares sont vidés à l'entrée et restaurés à la sortie.
+    """
+    import importlib
+
+    previous = os.getcwd()
+    modules = [(importlib.import_module(name), attr) for name, attr in _SINGLETONS]
+    saved = [getattr(module, attr) for module, attr in modules]
+    for module, attr in modules:
+        setattr(module, attr, None)
+    with tempfile.TemporaryDirectory(prefix="filagent-bench-") as workdir:
+        for name in _READ_ONLY_DIRS:
+            if (ROOT / name).exists():
+                os.symlink(ROOT / name, Path(workdir) / name)
+        os.chdir(workdir)
+        try:
+            yield Path(workdir)
+        finally:
+            os.chdir(previous)
+            for (module, attr), value in zip(modules, saved):
+                setattr(module, attr, value)
+
+
+def build_agent(model: ModelInterface):
+    """Agent complet (middlewares réels réinitialisés dans le répertoire courant)"""
+    from memory.episodic import create_tables
+    from runtime.agent import Agent
+    from runtime.middleware.audittrail import init_dr_manager
+    from runtime.middleware.logging import init_logger
+    from runtime.middleware.provenance import init_tracker
+    from runtime.middleware.worm import init_worm_logger
+
+    Path("memory").mkdir(exist_ok=True)
+    create_tables()
+    init_worm_logger()
+    init_logger()
+    init_dr_manager()
+    init_tracker()
+
+    agent = Agent()
+    agent.model = model
+    return agent
+
+
+def _run_conversations(agent, plan, concurrency: int, collector: Optional[StageCollector]) -> float:
+    def converse(conversation: Tuple[str, List[str]]) -> None:
+        conversation_id, messages = conversation
+        for turn, message in enumerate(messages):
+            if collector is None:
+                agent.chat(message, conversation_id, task_id=f"{conversation_id}-{turn}")
+                continue
+            with collector.request():
+                agent.chat(message, conversation_id, task_id=f"{conversation_id}-{turn}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench-chat") as pool:
+        list(pool.map(converse, plan))
+    return time.perf_counter() - started
+
+
+def record_workload(recording: str, plan, backend: str = "scripted", model_path: str = "") -> None:
+    """Enregistrer les générations de la charge (modèle scripté ou backend réel)"""
+    if backend == "scripted":
+        model: ModelInterface = ScriptedModel()
+    else:
+        model = ModelFactory.create(backend)
+        model.load(model_path, {})
+    recorder = ModelRecorder(recording)
+    with isolated_workspace():
+        agent = build_agent(RecordingInterface(model, recorder))
+        # Séquentiel: l'enregistrement ne dépend pas de l'ordonnancement
+        _run_conversations(agent, plan, concurrency=1, collector=None)
+    recorder.close()
+
+
+def run_benchmark(
+    recording: str,
+    plan,
+    concurrency: int = 1,
+    latency: str = "none",
+    seed: int = 0,
+) -> Dict:
+    """Rejouer la charge et mesurer chaque étape"""
+    model = ReplayInterface()
+    model.load(recording, {"replay_latency": latency, "replay_seed": seed})
+    collector = StageCollector()
+    with isolated_workspace():
+        # Chronomètre global restauré par isolated_workspace
+        init_stage_timer(enabled=True, tracer=collector, metrics=collector)
+        agent = build_agent(model)
+        elapsed = _run_conversations(agent, plan, concurrency, collector)
+
+    requests = len(collector.requests)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "conversations": len(plan),
+            "turns": len(plan[0][1]) if plan else 0,
+            "concurrency": concurrency,
+            "latency": latency,
+        },
+        "requests": requests,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": requests / elapsed if elapsed > 0 else 0.0,
+        "request": histogram(collector.requests),
+        "stages": {stage: histogram(values) for stage, values in collector.samples.items()},
+    }
+
+
+# ----------------------------------------------------------------------
+# Comparaison à une référence
+# ----------------------------------------------------------------------
+
+
+def compare(
+    report: Dict,
+    baseline: Dict,
+    tolerance: float = 0.25,
+    min_delta_ms: float = 0.5,
+) -> List[str]:
+    """
+    Régressions de ``report`` par rapport à ``baseline``
+
+    Une étape régresse si son p50 ou son p90 dépasse la référence de plus de
+    ``tolerance`` (relatif) et de plus de ``min_delta_ms`` (bruit des petites
+    étapes). Le débit régresse s'il baisse de plus de ``tolerance``.
+    """
+    regressions = []
+    for stage, current in report["stages"].items():
+        reference = baseline.get("stages", {}).get(stage)
+        if not reference or not current["count"]:
+            continue
+        for key in ("p50_ms", "p90_ms"):
+            before, after = reference[key], current[key]
+            if after > before * (1 + tolerance) and after - before > min_delta_ms:
+                regressions.append(f"{stage} {key}: {before:.3f}ms -> {after:.3f}ms")
+
+    before_rps = baseline.get("throughput_rps", 0.0)
+    after_rps = report["throughput_rps"]
+    if before_rps and after_rps < before_rps * (1 - tolerance):
+        regressions.append(f"throughput: {before_rps:.1f} -> {after_rps:.1f} req/s")
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    config = report["config"]
+    print(f"{'='*72}")
+    print(
+        f"⏱️  Agent.chat: {report['requests']} requêtes, concurrence {config['concurrency']}, "
+        f"latence modèle {config['latency']}"
+    )
+    print(f"{'='*72}")
+    print(f"{'étape':>18} | {'n':>5} | {'p50':>9} | {'p90':>9} | {'p99':>9} | {'part':>6}")
+    total = report["request"]["total_ms"] or 1.0
+    for stage, h in report["stages"].items():
+        if not h["count"]:
+            continue
+        print(
+            f"{stage:>18} | {h['count']:>5} | {h['p50_ms']:>7.3f}ms | {h['p90_ms']:>7.3f}ms | "
+            f"{h['p99_ms']:>7.3f}ms | {h['total_ms'] / total * 100:>5.1f}%"
+        )
+    request = report["request"]
+    print(
+        f"\n  Requête: p50 {request['p50_ms']:.2f}ms, p99 {request['p99_ms']:.2f}ms; "
+        f"débit {report['throughput_rps']:.1f} req/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency", default="none", help="replay_latency (none, fixed:<ms>, ...)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--recording", help="Enregistrement existant de la même charge")
+    parser.add_argument("--record-backend", default="scripted")
+    parser.add_argument("--model-path", default="")
+    parser.add_argument("--output", help="Rapport JSON")
+    parser.add_argument("--baseline", help="Référence à comparer (code 1 si régression)")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", help="Écrire le rapport comme nouvelle référence")
+    args = parser.parse_args()
+
+    plan = workload(args.conversations, args.turns)
+    with tempfile.TemporaryDirectory(prefix="filagent-recording-") as tmp:
+        recording = args.recording
+        if recording is None:
+            recording = str(Path(tmp) / "workload.jsonl.gz")
+            record_workload(recording, plan, args.record_backend, args.model_path)
+        report = run_benchmark(recording, plan, args.concurrency, args.latency, args.seed)
+
+    print_report(report)
+    for path in (args.output, args.update_baseline):
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            print(f"  Rapport écrit: {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"  ❌ Régression {regression}")
+        if regressions:
+            sys.exit(1)
+        print("  ✓ Aucune régression par rapport à la référence")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de débit de l'exécution des programmes candidats (HumanEval/MBPP)
+
+Mesure le débit (programmes/s) de l'exécution isolée de programmes de type
+HumanEval (fonction + assertions):
+
+- unitaire: un interpréteur neuf par programme (``SandboxPool.run``)
+- lots: programmes envoyés par lots et exécutés dans des forks du worker
+  (``ProgramExecutor``), sur plusieurs workers
+
+Usage:
+    python scripts/benchmark_code_execution.py
+    python scripts/benchmark_code_execution.py --programs 500 --workers 8 --batch-size 32
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from eval.execution import ProgramExecutor, run_programs
+from tools.sandbox_pool import SandboxPool, SandboxPoolConfig, SandboxWorker, local_worker_command
+
+PROGRAM = """
+def candidate(numbers):
+    return sorted(set(numbers))[{index} % 3:]
+
+def check(candidate):
+    assert candidate([3, 1, 2, 3]) == [1, 2, 3][{index} % 3:]
+    assert candidate([]) == []
+
+check(candidate)
+"""
+
+
+def make_programs(count: int) -> List[str]:
+    """Programmes candidats synthétiques (tous corrects)"""
+    return [PROGRAM.format(index=i) for i in range(count)]
+
+
+def run_unbatched(programs: List[str], workers: int, timeout: float = 10.0) -> Dict:
+    """Un interpréteur neuf par programme (protocole ``run`` du pool)"""
+    pool = SandboxPool(
+        lambda: SandboxWorker(local_worker_command(memory_mb=512)),
+        SandboxPoolConfig(size=workers, min_warm=workers, max_runs_per_worker=10000),
+        name="bench-unbatched",
+    )
+    try:
+        pool.wait_warm()
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            runs = list(executor.map(lambda code: pool.run(code, timeout), programs))
+        elapsed = time.monotonic() - started
+    finally:
+        pool.shutdown()
+    return {
+        "programs": len(programs),
+        "passed": sum(1 for run in runs if run.exit_code == 0),
+        "elapsed_seconds": elapsed,
+        "programs_per_second": len(programs) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def run_batched(programs: List[str], workers: int, batch_size: int) -> Dict:
+    """Lots exécutés dans des forks des workers (ProgramExecutor)"""
+    with ProgramExecutor(workers=workers, batch_size=batch_size, backend="local") as executor:
+        # Démarrage des workers hors mesure, comme pour le mode unitaire
+        executor.run(programs[:workers])
+        report = run_programs(programs, executor)
+    return {
+        "programs": report["programs"],
+        "passed": sum(1 for result in report["results"] if result.passed),
+        "elapsed_seconds": report["elapsed_seconds"],
+        "programs_per_second": report["programs_per_second"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--programs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    programs = make_programs(args.programs)
+
+    print(f"{'='*60}")
+    print(f"🧪 Exécution de programmes ({args.programs} programmes, {args.workers} workers)")
+    print(f"{'='*60}")
+    print(f"{'mode':>10} | {'programmes/s':>12} | {'réussis':>8}")
+    for mode, report in (
+        ("unitaire", run_unbatched(programs, args.workers)),
+        ("lots", run_batched(programs, args.workers, args.batch_size)),
+    ):
+        print(
+            f"{mode:>10} | {report['programs_per_second']:>12.1f} | "
+            f"{report['passed']:>4}/{report['programs']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'ordonnancement parallele des graphes de taches HTN
+
+Compare le temps total (makespan) de deux ordonnanceurs sur des DAG
+synthetiques dont les durees de taches sont asymetriques (la plupart
+courtes, quelques-unes longues):
+
+- ``level``: execution niveau par niveau (get_parallelizable_tasks), chaque
+  niveau attend la fin de sa tache la plus lente (ancien comportement)
+- ``ready``: TaskExecutor en strategie PARALLEL, file de taches pretes
+  ordonnee par priorite puis chemin critique restant
+
+Formes de graphes:
+
+- ``chains``: chaines independantes, une tache lente par niveau dans une
+  chaine differente (pire cas des barrieres par niveau)
+- ``layered``: couches aleatoires, chaque tache depend de 1 a 3 taches des
+  couches precedentes
+- ``fanout``: une racine, un eventail de branches de longueurs variees, un
+  puits final
+
+Les actions dorment ``duration_ms`` (I/O simulee); ``estimated_duration_ms``
+est renseigne dans les metadonnees, comme le ferait le planificateur.
+
+Usage:
+    python scripts/benchmark_dag_scheduler.py
+    python scripts/benchmark_dag_scheduler.py --shapes layered --tasks 120 --workers 8
+    python scripts/benchmark_dag_scheduler.py --scale 0.5 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from planner.executor import ExecutionStrategy, MetadataDict, TaskExecutor, TaskResult
+from planner.task_graph import Task, TaskGraph, TaskStatus
+
+# (durée en ms, indices des dépendances)
+GraphSpec = List[Tuple[float, List[int]]]
+
+SHAPES = ("chains", "layered", "fanout")
+
+
+class LevelBarrierExecutor(TaskExecutor):
+    """Référence: exécution parallèle niveau par niveau (barrière entre niveaux)"""
+
+    def _execute_parallel(
+        self, graph: TaskGraph, metadata: MetadataDict
+    ) -> Dict[str, Union[Dict[str, TaskResult], Dict[str, str]]]:
+        task_results: Dict[str, TaskResult] = {}
+        errors: Dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for level_tasks in graph.get_parallelizable_tasks():
+                futures: Dict[Future[TaskResult], Task] = {}
+                for task in level_tasks:
+                    if not self._check_dependencies(task, graph):
+                        task.update_status(TaskStatus.SKIPPED, "Dependency failed")
+                        continue
+                    task.update_status(TaskStatus.RUNNING)
+                    futures[executor.submit(self._execute_task, task)] = task
+
+                for future in as_completed(futures):
+                    task = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        task.update_status(TaskStatus.FAILED, f"{type(e).__name__}: {e}")
+                        errors[task.task_id] = str(e)
+                        self._propagate_failure(task, graph)
+                        continue
+                    task.set_result(result)
+                    task.update_status(TaskStatus.COMPLETED)
+                    task_results[task.task_id] = result
+
+        return {"task_results": task_results, "errors": errors}
+
+
+def _skewed_duration(rng: random.Random, scale: float) -> float:
+    """Durée asymétrique: 85% de tâches courtes, 15% de tâches longues"""
+    if rng.random() < 0.15:
+        return rng.uniform(60, 120) * scale
+    return rng.uniform(2, 10) * scale
+
+
+def make_spec(shape: str, tasks: int, seed: int = 42, scale: float = 1.0) -> GraphSpec:
+    """
+    Génère la description d'un DAG synthétique
+
+    Args:
+        shape: Forme du graphe (voir SHAPES)
+        tasks: Nombre approximatif de tâches
+        seed: Graine du générateur
+        scale: Facteur appliqué à toutes les durées
+
+    Returns:
+        Liste (durée_ms, dépendances) dans un ordre topologique
+    """
+    rng = random.Random(seed)
+    spec: GraphSpec = []
+
+    if shape == "chains":
+        width = 4
+        depth = max(1, tasks // width)
+        previous: List[int] = [-1] * width
+        for level in range(depth):
+            slow = level % width
+            for chain in range(width):
+                duration = (80 if chain == slow else 5) * scale
+                deps = [previous[chain]] if previous[chain] >= 0 else []
+                previous[chain] = len(spec)
+                spec.append((duration, deps))
+
+    elif shape == "layered":
+        layers: List[List[int]] = []
+        while len(spec) < tasks:
+            layer = []
+            for _ in range(rng.randint(3, 8)):
+                candidates = [i for previous_layer in layers[-2:] for i in previous_layer]
+                count = min(len(candidates), rng.randint(1, 3))
+                layer.append(len(spec))
+                spec.append((_skewed_duration(rng, scale), sorted(rng.sample(candidates, count))))
+            layers.append(layer)
+
+    elif shape == "fanout":
+        spec.append((5 * scale, []))
+        leaves = []
+        while len(spec) < tasks - 1:
+            previous_index = 0
+            for _ in range(rng.randint(1, 6)):
+                spec.append((_skewed_duration(rng, scale), [previous_index]))
+                previous_index = len(spec) - 1
+            leaves.append(previous_index)
+        spec.append((5 * scale, leaves))
+
+    else:
+        raise ValueError(f"Forme inconnue: {shape} (attendu: {', '.join(SHAPES)})")
+
+    return spec
+
+
+def build_graph(spec: GraphSpec) -> TaskGraph:
+    """Matérialise une description en TaskGraph (tâches neuves à chaque appel)"""
+    graph = TaskGraph()
+    ids: List[str] = []
+    for index, (duration_ms, deps) in enumerate(spec):
+        task = Task(
+            name=f"t{index}",
+            action="sleep",
+            params={"duration_ms": duration_ms},
+            depends_on=[ids[d] for d in deps],
+            metadata={"estimated_duration_ms": duration_ms},
+        )
+        graph.add_task(task)
+        ids.append(task.task_id)
+    return graph
+
+
+def lower_bound_ms(spec: GraphSpec, workers: int) -> float:
+    """Borne inférieure du makespan: max(chemin critique, travail total / workers)"""
+    finish: List[float] = []
+    for duration_ms, deps in spec:
+        finish.append(duration_ms + max((finish[d] for d in deps), default=0.0))
+    return max(max(finish, default=0.0), sum(d for d, _ in spec) / workers)
+
+
+def _sleep_action(params: Dict[str, object]) -> None:
+    time.sleep(float(params["duration_ms"]) / 1000)
+
+
+def run_scheduler(kind: str, spec: GraphSpec, workers: int) -> float:
+    """
+    Exécute le graphe avec un ordonnanceur et retourne le makespan (ms)
+
+    Args:
+        kind: "level" (barrière par niveau) ou "ready" (file de tâches prêtes)
+        spec: Description du graphe
+        workers: Nombre maximal de tâches simultanées
+    """
+    executor_class = LevelBarrierExecutor if kind == "level" else TaskExecutor
+    executor = executor_class(
+        action_registry={"sleep": _sleep_action},
+        strategy=ExecutionStrategy.PARALLEL,
+        max_workers=workers,
+        enable_tracing=False,
+    )
+    graph = build_graph(spec)
+
+    start = time.perf_counter()
+    result = executor.execute(graph)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if result.completed_tasks != len(spec):
+        raise RuntimeError(f"{kind}: {result.completed_tasks}/{len(spec)} tâches complétées")
+    return elapsed_ms
+
+
+def run_benchmark(
+    shapes: List[str], tasks: int, workers: int, seed: int = 42, scale: float = 1.0
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compare les deux ordonnanceurs pour chaque forme de graphe
+
+    Returns:
+        Par forme: tasks, lower_bound_ms, level_ms, ready_ms, speedup
+    """
+    report: Dict[str, Dict[str, float]] = {}
+    for shape in shapes:
+        spec = make_spec(shape, tasks, seed=seed, scale=scale)
+        level_ms = run_scheduler("level", spec, workers)
+        ready_ms = run_scheduler("ready", spec, workers)
+        report[shape] = {
+            "tasks": len(spec),
+            "lower_bound_ms": lower_bound_ms(spec, workers),
+            "level_ms": level_ms,
+            "ready_ms": ready_ms,
+            "speedup": level_ms / ready_ms,
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--tasks", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--scale", type=float, default=1.0, help="Facteur sur les durées")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'='*80}")
+    print("🧮 Benchmark de l'ordonnancement des graphes de tâches")
+    print(f"Tâches: ~{args.tasks} | Workers: {args.workers} | Échelle: {args.scale}")
+    print(f"{'='*80}")
+    print(
+        f"{'forme':>8} | {'tâches':>6} | {'borne':>9} | {'niveaux':>9} | "
+        f"{'file prête':>10} | {'gain':>5}"
+    )
+
+    report = run_benchmark(args.shapes, args.tasks, args.workers, args.seed, args.scale)
+    for shape, row in report.items():
+        print(
+            f"{shape:>8} | {row['tasks']:>6} | {row['lower_bound_ms']:>7.0f}ms | "
+            f"{row['level_ms']:>7.0f}ms | {row['ready_ms']:>8.0f}ms | {row['speedup']:>4.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Générateur de charge pour l'ordonnanceur d'inférence locale
+
+Simule un trafic mixte (conversations interactives, sous-tâches HTN,
+campagne d'évaluation) contre un InferenceScheduler et rapporte, pour
+chaque nombre de répliques:
+
+- attente en file (p50/p95) par classe de priorité
+- occupation moyenne des répliques
+- débit agrégé (tokens/s)
+
+Fonctionne sur CPU seul. Par défaut, un modèle simulé (latence fixe par
+token) isole le comportement de l'ordonnanceur; --model charge un vrai
+fichier GGUF via llama.cpp.
+
+Usage:
+    python scripts/benchmark_inference_scheduler.py
+    python scripts/benchmark_inference_scheduler.py --replicas 1 2 4 --requests 60
+    python scripts/benchmark_inference_scheduler.py --model models/weights/base.gguf
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from runtime.inference_scheduler import InferenceScheduler, Priority
+from runtime.model_interface import (
+    GenerationConfig,
+    GenerationResult,
+    LlamaCppInterface,
+    ModelInterface,
+)
+
+# Répartition du trafic et longueur de génération (tokens) par classe
+TRAFFIC_MIX = {
+    Priority.INTERACTIVE: {"share": 0.5, "max_tokens": 64},
+    Priority.HTN: {"share": 0.2, "max_tokens": 128},
+    Priority.EVAL: {"share": 0.3, "max_tokens": 256},
+}
+
+
+class SimulatedModel(ModelInterface):
+    """Modèle factice: latence fixe par token, libère le GIL comme llama.cpp"""
+
+    def __init__(self, seconds_per_token: float):
+        self.seconds_per_token = seconds_per_token
+        self._loaded = False
+
+    def load(self, model_path: str, config: Dict) -> bool:
+        self._loaded = True
+        return True
+
+    def generate(self, prompt, config, system_prompt=None) -> GenerationResult:
+        time.sleep(config.max_tokens * self.seconds_per_token)
+        return GenerationResult(
+            text="x" * config.max_tokens,
+            finish_reason="length",
+            tokens_generated=config.max_tokens,
+            prompt_tokens=len(prompt.split()),
+            total_tokens=len(prompt.split()) + config.max_tokens,
+        )
+
+    def unload(self):
+        self._loaded = False
+
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def run_load(replicas: List[ModelInterface], requests: int, arrival_rate: float, seed: int) -> Dict:
+    """
+    Envoyer ``requests`` générations (arrivées de Poisson) et mesurer
+
+    Returns:
+        Dict avec attentes par priorité, occupation et débit
+    """
+    scheduler = InferenceScheduler(replicas)
+    rng = random.Random(seed)
+    waits: Dict[Priority, List[float]] = {p: [] for p in Priority}
+    occupancy_samples: List[float] = []
+    futures = []
+    stop_sampling = threading.Event()
+
+    def sample_occupancy():
+        while not stop_sampling.is_set():
+            occupancy_samples.append(scheduler.stats()["occupancy"])
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample_occupancy, daemon=True)
+    sampler.start()
+
+    classes = list(TRAFFIC_MIX)
+    shares = [TRAFFIC_MIX[p]["share"] for p in classes]
+    started = time.monotonic()
+
+    for index in range(requests):
+        priority = rng.choices(classes, weights=shares)[0]
+        config = GenerationConfig(max_tokens=TRAFFIC_MIX[priority]["max_tokens"])
+        enqueued = time.monotonic()
+
+        def run(replica, config=config, enqueued=enqueued, priority=priority, index=index):
+            waits[priority].append(time.monotonic() - enqueued)
+            return replica.generate(f"requête {index}", config)
+
+        futures.append(scheduler.submit(run, priority))
+        time.sleep(rng.expovariate(arrival_rate))
+
+    tokens = sum(f.result().tokens_generated for f in futures)
+    elapsed = time.monotonic() - started
+    stop_sampling.set()
+    sampler.join()
+    scheduler.shutdown()
+
+    return {
+        "replicas": len(replicas),
+        "elapsed_s": elapsed,
+        "tokens_per_second": tokens / elapsed,
+        "mean_occupancy": statistics.mean(occupancy_samples) if occupancy_samples else 0.0,
+        "wait_p50_ms": {p.value: _percentile(w, 0.50) * 1000 for p, w in waits.items()},
+        "wait_p95_ms": {p.value: _percentile(w, 0.95) * 1000 for p, w in waits.items()},
+    }
+
+
+def build_replicas(count: int, args: argparse.Namespace) -> List[ModelInterface]:
+    """Créer ``count`` répliques (simulées ou llama.cpp)"""
+    replicas: List[ModelInterface] = []
+    for _ in range(count):
+        if args.model:
+            replica = LlamaCppInterface()
+            replica.load(args.model, {"context_size": 2048, "n_gpu_layers": 0})
+        else:
+            replica = SimulatedModel(args.seconds_per_token)
+            replica.load("simulated", {})
+        replicas.append(replica)
+    return replicas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--rate", type=float, default=20.0, help="Arrivées par seconde")
+    parser.add_argument("--seconds-per-token", type=float, default=0.0005)
+    parser.add_argument("--model", help="Fichier GGUF (sinon modèle simulé)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'='*80}")
+    print("🚦 Benchmark de l'ordonnanceur d'inférence")
+    print(f"Requêtes: {args.requests} | Arrivées: {args.rate}/s | Modèle: {args.model or 'simulé'}")
+    print(f"{'='*80}")
+    print(
+        f"{'répliques':>9} | {'tokens/s':>9} | {'occupation':>10} | "
+        + " | ".join(f"p95 {p.value:>11}" for p in Priority)
+    )
+
+    for count in args.replicas:
+        report = run_load(build_replicas(count, args), args.requests, args.rate, args.seed)
+        print(
+            f"{report['replicas']:>9} | {report['tokens_per_second']:>9.1f} | "
+            f"{report['mean_occupancy']:>10.0%} | "
+            + " | ".join(f"{report['wait_p95_ms'][p.value]:>13.1f}ms" for p in Priority)
+        )
+
+
+if __name__ == "__main__":
+    main()
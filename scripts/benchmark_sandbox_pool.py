@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latence du sandbox Python: workers à froid vs pool préchauffé
+
+Mesure la latence (p50/p99) d'exécution d'un petit script:
+
+- à froid: un worker démarré puis arrêté pour chaque exécution (équivalent
+  du conteneur éphémère créé par exécution)
+- pool: workers préchauffés et réutilisés (tools/sandbox_pool.py)
+
+Le backend ``local`` fonctionne sans Docker (CI); ``docker`` utilise la CLI
+docker et l'image du sandbox.
+
+Usage:
+    python scripts/benchmark_sandbox_pool.py
+    python scripts/benchmark_sandbox_pool.py --backend docker --runs 50
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.sandbox_pool import (
+    SandboxPool,
+    SandboxPoolConfig,
+    SandboxWorker,
+    docker_worker_command,
+    local_worker_command,
+)
+
+SNIPPET = "print(sum(i * i for i in range(1000)))"
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def worker_factory(backend: str, image: str = "python:3.12-slim") -> Callable[[], SandboxWorker]:
+    """Fabrique de workers du backend"""
+    if backend == "docker":
+
+        def factory() -> SandboxWorker:
+            name = f"filagent-bench-{uuid.uuid4().hex[:12]}"
+            return SandboxWorker(
+                docker_worker_command(image, 512, 50000, 100000, name),
+                cleanup_command=["docker", "rm", "-f", name],
+            )
+
+        return factory
+    return lambda: SandboxWorker(local_worker_command(memory_mb=512))
+
+
+def _report(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "runs": len(latencies),
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def run_cold(factory: Callable[[], SandboxWorker], runs: int, timeout: float = 5.0) -> Dict:
+    """Un worker neuf par exécution (démarrage + exécution + arrêt)"""
+    latencies = []
+    for _ in range(runs):
+        started = time.monotonic()
+        pool = SandboxPool(factory, SandboxPoolConfig(size=1, min_warm=0), name="bench-cold")
+        try:
+            pool.run(SNIPPET, timeout)
+        finally:
+            pool.shutdown()
+        latencies.append(time.monotonic() - started)
+    return _report(latencies)
+
+
+def run_pooled(
+    factory: Callable[[], SandboxWorker], runs: int, size: int = 1, timeout: float = 5.0
+) -> Dict:
+    """Exécutions sur un pool préchauffé"""
+    pool = SandboxPool(factory, SandboxPoolConfig(size=size, min_warm=size), name="bench-pool")
+    latencies = []
+    try:
+        pool.wait_warm()
+        for _ in range(runs):
+            started = time.monotonic()
+            pool.run(SNIPPET, timeout)
+            latencies.append(time.monotonic() - started)
+        stats = pool.stats()
+    finally:
+        pool.shutdown()
+    return {**_report(latencies), "recycled": stats["recycled"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--backend", choices=["local", "docker"], default="local")
+    parser.add_argument("--image", default="python:3.12-slim")
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    factory = worker_factory(args.backend, args.image)
+
+    print(f"{'='*60}")
+    print(f"🧪 Benchmark sandbox Python ({args.backend}, {args.runs} exécutions)")
+    print(f"{'='*60}")
+    print(f"{'mode':>8} | {'p50':>10} | {'p99':>10}")
+    for mode, report in (
+        ("froid", run_cold(factory, args.runs)),
+        ("pool", run_pooled(factory, args.runs)),
+    ):
+        print(f"{mode:>8} | {report['p50_ms']:>8.1f}ms | {report['p99_ms']:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
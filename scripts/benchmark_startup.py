@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage à froid
+
+Chaque scénario est exécuté dans un interpréteur neuf (pas de cache de
+modules) et répété; le script rapporte la durée médiane et les modules
+lourds chargés.
+
+Scénarios:
+- registry: ``ToolRegistry()`` + catalogue des schémas (outils différés)
+- eager_tools: import de tous les modules d'outils (comportement avant
+  l'enregistrement différé: Docker SDK, pandas, pypdf, docx)
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --scenarios registry --repeat 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ("docker", "pandas", "pypdf", "docx", "llama_cpp", "torch", "sentence_transformers")
+
+SCENARIOS: Dict[str, str] = {
+    "registry": ("from tools.registry import ToolRegistry\n" "ToolRegistry().get_schemas()\n"),
+    "eager_tools": (
+        "import tools.python_sandbox, tools.file_reader, tools.calculator\n"
+        "import tools.document_analyzer_pme\n"
+    ),
+}
+
+_HARNESS = """
+import json, sys, time
+started = time.perf_counter()
+exec(compile({code!r}, "<scenario>", "exec"))
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "modules": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def measure(scenario: str, repeat: int = 5) -> Dict:
+    """
+    Exécuter un scénario ``repeat`` fois dans des interpréteurs neufs
+
+    Returns:
+        Dict avec durée médiane/min (ms) et modules lourds chargés
+    """
+    source = _HARNESS.format(code=SCENARIOS[scenario], heavy=HEAVY_MODULES)
+    timings: List[float] = []
+    modules: List[str] = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", source],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        report = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(report["seconds"])
+        modules = report["modules"]
+    return {
+        "scenario": scenario,
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "heavy_modules": modules,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'='*70}")
+    print(f"🚀 Démarrage à froid ({args.repeat} interpréteurs neufs par scénario)")
+    print(f"{'='*70}")
+    print(f"{'scénario':>12} | {'médiane':>10} | {'min':>10} | modules lourds")
+    for scenario in args.scenarios:
+        report = measure(scenario, args.repeat)
+        print(
+            f"{scenario:>12} | {report['median_ms']:>8.1f}ms | {report['min_ms']:>8.1f}ms | "
+            f"{', '.join(report['heavy_modules']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
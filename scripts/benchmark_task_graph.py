@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark de passage à l'échelle de TaskGraph (jusqu'à 100k tâches)
+
+Mesure, pour chaque taille et chaque forme de plan:
+
+- build: construction du graphe (add_task, détection de cycle incrémentale)
+- topo: tri topologique par priorité
+- levels: premier appel à get_parallelizable_tasks, puis appel en cache
+- skip: propagation de l'échec de la racine à tous ses dépendants
+
+Formes de plans:
+
+- ``llm``: réponse JSON d'une décomposition LLM (indices de dépendances,
+  priorités variées), passée par HierarchicalPlanner._parse_llm_response et
+  _build_graph_from_decomposition
+- ``chain``: chaîne séquentielle (profondeur = nombre de tâches)
+- ``layered``: couches de 50 tâches, chacune dépendant de 1 à 3 tâches de
+  la couche précédente (plans construits par programme)
+
+Le rapport donne le temps par tâche; un coût linéaire garde ce temps à peu
+près constant quand la taille est multipliée par 10.
+
+Usage:
+    python scripts/benchmark_task_graph.py
+    python scripts/benchmark_task_graph.py --sizes 1000 10000 --shapes chain
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from planner.executor import TaskExecutor
+from planner.planner import HierarchicalPlanner
+from planner.task_graph import Task, TaskGraph, TaskPriority
+
+SHAPES = ("llm", "chain", "layered")
+LAYER_WIDTH = 50
+
+
+def llm_response(size: int, seed: int = 42) -> str:
+    """Réponse JSON synthétique d'une décomposition LLM de ``size`` tâches"""
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(size):
+        window = range(max(0, index - 20), index)
+        tasks.append(
+            {
+                "name": f"step_{index}",
+                "action": "generic_execute",
+                "params": {"input": f"result_{index - 1}" if index else "query"},
+                "depends_on": sorted(rng.sample(window, min(len(window), rng.randint(1, 3)))),
+                "priority": rng.randint(1, 5),
+            }
+        )
+    return json.dumps({"tasks": tasks, "reasoning": "benchmark"})
+
+
+def build_llm(size: int, seed: int = 42) -> Callable[[], TaskGraph]:
+    """Construction depuis la réponse LLM (le JSON est généré hors mesure)"""
+    response = llm_response(size, seed)
+    planner = HierarchicalPlanner(enable_tracing=False)
+    return lambda: planner._build_graph_from_decomposition(planner._parse_llm_response(response))
+
+
+def build_chain(size: int, seed: int = 42) -> Callable[[], TaskGraph]:
+    """Construction d'une chaîne séquentielle"""
+
+    def build() -> TaskGraph:
+        graph = TaskGraph()
+        previous: List[str] = []
+        for index in range(size):
+            task = Task(name=f"step_{index}", action="process", depends_on=previous)
+            graph.add_task(task)
+            previous = [task.task_id]
+        return graph
+
+    return build
+
+
+def build_layered(size: int, seed: int = 42) -> Callable[[], TaskGraph]:
+    """Construction en couches avec dépendances aléatoires vers la couche précédente"""
+
+    def build() -> TaskGraph:
+        rng = random.Random(seed)
+        graph = TaskGraph()
+        previous: List[str] = []
+        layer: List[str] = []
+        for index in range(size):
+            if len(layer) == LAYER_WIDTH:
+                previous, layer = layer, []
+            deps = rng.sample(previous, min(len(previous), rng.randint(1, 3)))
+            task = Task(
+                name=f"step_{index}",
+                action="process",
+                depends_on=deps,
+                priority=TaskPriority(rng.randint(1, 5)),
+            )
+            graph.add_task(task)
+            layer.append(task.task_id)
+        return graph
+
+    return build
+
+
+BUILDERS = {"llm": build_llm, "chain": build_chain, "layered": build_layered}
+
+
+def _timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(
+    sizes: List[int], shapes: List[str], seed: int = 42
+) -> Dict[str, Dict[int, Dict[str, float]]]:
+    """
+    Mesure chaque opération pour chaque forme et chaque taille
+
+    Returns:
+        {forme: {taille: {build_ms, topo_ms, levels_ms, levels_cached_ms, skip_ms}}}
+    """
+    executor = TaskExecutor(enable_tracing=False)
+    report: Dict[str, Dict[int, Dict[str, float]]] = {}
+
+    for shape in shapes:
+        report[shape] = {}
+        for size in sizes:
+            build = BUILDERS[shape](size, seed)
+
+            start = time.perf_counter()
+            graph = build()
+            build_ms = (time.perf_counter() - start) * 1000
+
+            root = next(iter(graph.tasks.values()))
+            report[shape][size] = {
+                "build_ms": build_ms,
+                "topo_ms": _timed(graph.topological_sort),
+                "levels_ms": _timed(graph.get_parallelizable_tasks),
+                "levels_cached_ms": _timed(graph.get_parallelizable_tasks),
+                "skip_ms": _timed(lambda: executor._propagate_failure(root, graph)),
+            }
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'='*80}")
+    print("📈 Benchmark de passage à l'échelle de TaskGraph")
+    print(f"{'='*80}")
+    print(
+        f"{'forme':>8} | {'tâches':>7} | {'build µs/t':>10} | {'topo µs/t':>9} | "
+        f"{'levels µs/t':>11} | {'cache':>8} | {'skip µs/t':>9}"
+    )
+
+    report = run_benchmark(args.sizes, args.shapes, args.seed)
+    for shape, rows in report.items():
+        for size, row in rows.items():
+            per_task = {key: value * 1000 / size for key, value in row.items()}
+            print(
+                f"{shape:>8} | {size:>7} | {per_task['build_ms']:>10.1f} | "
+                f"{per_task['topo_ms']:>9.2f} | {per_task['levels_ms']:>11.2f} | "
+                f"{row['levels_cached_ms']:>6.1f}ms | {per_task['skip_ms']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Profil du démarrage à froid du serveur API, du serveur MCP et de l'app Gradio
+
+Chaque point d'entrée est exécuté dans un interpréteur neuf, phase par phase
+(durée murale de chaque phase d'initialisation). Avec ``-X importtime``, le
+script agrège aussi le temps d'import propre de chaque paquet de premier
+niveau et liste les modules les plus coûteux (temps cumulé).
+
+Les budgets (ms) viennent de la section ``startup.budgets_ms`` de
+config/agent.yaml; ``--check`` sort en erreur si un point d'entrée les dépasse.
+
+Usage:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --entrypoints server --repeat 5 --top 20
+    python scripts/profile_startup.py --check --no-importtime
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+# Phases (nom, code) exécutées dans l'ordre dans le même interpréteur
+ENTRYPOINTS: Dict[str, List[Tuple[str, str]]] = {
+    "server": [
+        ("config", "from runtime.config import get_config\nget_config()"),
+        ("agent_module", "import runtime.agent"),
+        # Application FastAPI, tables analytics, traçage OpenTelemetry
+        ("server_module", "import runtime.server"),
+        # Agent sans modèle (logger, DR, provenance, registre, planificateur)
+        ("agent_init", "from runtime.agent import Agent\nAgent()"),
+    ],
+    "mcp_server": [
+        ("mcp_module", "import mcp_server\nmcp_server.FilAgentMCPServer()"),
+        ("agent_module", "import runtime.agent"),
+        ("agent_init", "from runtime.agent import Agent\nAgent()"),
+        ("tool_catalog", "from tools.registry import get_registry\nget_registry().get_schemas()"),
+    ],
+    "gradio": [
+        ("gradio", "import gradio"),
+        ("app_module", "import gradio_app_production"),
+        (
+            "interface",
+            "import gradio_app_production\ngradio_app_production.create_gradio_interface()",
+        ),
+    ],
+}
+
+_MARKER = "STARTUP_PROFILE "
+
+_HARNESS = """
+import json, sys, time
+phases = []
+for name, code in {phases!r}:
+    started = time.perf_counter()
+    exec(compile(code, "<" + name + ">", "exec"), {{}})
+    phases.append((name, (time.perf_counter() - started) * 1000))
+sys.stdout.flush()
+print({marker!r} + json.dumps(phases))
+"""
+
+
+@dataclass
+class ImportRecord:
+    """Ligne de ``python -X importtime`` (durées en microsecondes)"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Extraire les lignes ``import time:`` de la sortie d'erreur"""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # en-tête "self [us] | cumulative | imported package"
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        records.append(
+            ImportRecord(
+                module=module,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(module)) // 2,
+            )
+        )
+    return records
+
+
+def aggregate_packages(records: List[ImportRecord]) -> Dict[str, float]:
+    """Temps d'import propre (ms) par paquet de premier niveau, décroissant"""
+    totals: Dict[str, float] = defaultdict(float)
+    for record in records:
+        totals[record.module.split(".")[0]] += record.self_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def slowest_imports(records: List[ImportRecord], top: int = 15) -> List[Tuple[str, float]]:
+    """Modules au temps d'import cumulé le plus élevé (ms)"""
+    ordered = sorted(records, key=lambda record: record.cumulative_us, reverse=True)
+    return [(record.module, record.cumulative_us / 1000) for record in ordered[:top]]
+
+
+def _run_once(entrypoint: str, importtime: bool) -> Tuple[List[Tuple[str, float]], str]:
+    source = _HARNESS.format(phases=ENTRYPOINTS[entrypoint], marker=_MARKER)
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", source]
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    reports = [line for line in completed.stdout.splitlines() if line.startswith(_MARKER)]
+    if completed.returncode != 0 or not reports:
+        raise RuntimeError(
+            f"Startup profile of '{entrypoint}' failed (exit {completed.returncode}):\n"
+            f"{completed.stderr[-2000:]}"
+        )
+    phases = [(name, ms) for name, ms in json.loads(reports[-1][len(_MARKER) :])]
+    return phases, completed.stderr
+
+
+def profile_entrypoint(
+    entrypoint: str, repeat: int = 1, importtime: bool = True, top: int = 15
+) -> Dict:
+    """
+    Profiler un point d'entrée dans ``repeat`` interpréteurs neufs
+
+    Returns:
+        Dict avec durée médiane par phase et totale (ms), et, avec
+        ``importtime``, temps propre par paquet et imports les plus lents
+        (dernier passage)
+    """
+    runs: List[List[Tuple[str, float]]] = []
+    stderr = ""
+    for _ in range(repeat):
+        phases, stderr = _run_once(entrypoint, importtime)
+        runs.append(phases)
+    names = [name for name, _ in runs[0]]
+    phases_ms = {
+        name: statistics.median(run[index][1] for run in runs) for index, name in enumerate(names)
+    }
+    report = {
+        "entrypoint": entrypoint,
+        "phases_ms": phases_ms,
+        "total_ms": statistics.median(sum(ms for _, ms in run) for run in runs),
+    }
+    if importtime:
+        records = parse_importtime(stderr)
+        report["packages_ms"] = aggregate_packages(records)
+        report["slowest_imports"] = slowest_imports(records, top)
+    return report
+
+
+def load_budgets(config_path: Optional[str] = None) -> Dict[str, float]:
+    """Budgets de démarrage (ms) de config/agent.yaml"""
+    sys.path.insert(0, str(ROOT))
+    from runtime.config import AgentConfig
+
+    return dict(AgentConfig.load(config_path or str(ROOT / "config")).startup.budgets_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--entrypoints", nargs="+", choices=sorted(ENTRYPOINTS), default=list(ENTRYPOINTS)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--no-importtime", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Échouer au-delà des budgets")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    budgets = load_budgets()
+    reports = [
+        profile_entrypoint(name, args.repeat, not args.no_importtime, args.top)
+        for name in args.entrypoints
+    ]
+    over_budget = [
+        report["entrypoint"]
+        for report in reports
+        if report["entrypoint"] in budgets and report["total_ms"] > budgets[report["entrypoint"]]
+    ]
+
+    if args.json:
+        print(json.dumps({"budgets_ms": budgets, "reports": reports}, indent=2))
+    else:
+        for report in reports:
+            budget = budgets.get(report["entrypoint"])
+            print(f"{'='*70}")
+            print(
+                f"🚀 {report['entrypoint']}: {report['total_ms']:.0f}ms"
+                + (f" (budget {budget:.0f}ms)" if budget is not None else "")
+            )
+            print(f"{'='*70}")
+            for name, ms in report["phases_ms"].items():
+                print(f"  {name:>16} | {ms:>8.1f}ms")
+            if "packages_ms" in report:
+                print("  Paquets (temps d'import propre):")
+                for package, ms in list(report["packages_ms"].items())[: args.top]:
+                    print(f"  {package:>24} | {ms:>8.1f}ms")
+                print("  Imports les plus lents (cumulé):")
+                for module, ms in report["slowest_imports"]:
+                    print(f"  {ms:>8.1f}ms  {module}")
+        if over_budget:
+            print(f"\n❌ Budget dépassé: {', '.join(over_budget)}")
+
+    if args.check and over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
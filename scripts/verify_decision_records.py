@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Vérification en masse des signatures des Decision Records
+
+Les fichiers DR sont répartis par lots sur un pool de processus; chaque
+processus charge les clés publiques du trousseau une seule fois (cache par
+key_id) et vérifie chaque DR avec la clé de son époque. Seules les clés
+publiques sont lues: aucune phrase de passe n'est nécessaire.
+
+Usage:
+    python scripts/verify_decision_records.py
+    python scripts/verify_decision_records.py --dr-dir logs/decisions --workers 8
+    python scripts/verify_decision_records.py --key-dir provenance/signatures --json
+
+Code de sortie: 0 si tous les DR sont valides, 1 sinon.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from runtime.middleware.audittrail import verify_dr_files
+from runtime.middleware.keystore import DEFAULT_KEY_DIR
+
+
+def _chunks(paths: List[str], size: int) -> List[List[str]]:
+    return [paths[i : i + size] for i in range(0, len(paths), size)]
+
+
+def verify_directory(
+    dr_dir: str,
+    key_dir: str = DEFAULT_KEY_DIR,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Dict:
+    """
+    Vérifier tous les DR (``*.json``) de ``dr_dir``
+
+    Args:
+        dr_dir: Répertoire des DR
+        key_dir: Répertoire du trousseau (FileKeyStore)
+        workers: Processus vérificateurs (défaut: nombre de CPU; 1 = séquentiel)
+        chunk_size: DR par lot envoyé à un processus
+
+    Returns:
+        Dict avec total, valides, échecs (chemin, raison) et débit
+    """
+    paths = sorted(str(path) for path in Path(dr_dir).glob("*.json"))
+    workers = workers or os.cpu_count() or 1
+    started = time.monotonic()
+
+    if workers == 1 or len(paths) <= chunk_size:
+        results = [verify_dr_files(paths, key_dir)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = _chunks(paths, chunk_size)
+            results = list(pool.map(verify_dr_files, batches, [key_dir] * len(batches)))
+
+    elapsed = time.monotonic() - started
+    failures = [failure for result in results for failure in result["failures"]]
+    return {
+        "total": len(paths),
+        "valid": len(paths) - len(failures),
+        "failures": failures,
+        "elapsed_seconds": elapsed,
+        "per_second": len(paths) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dr-dir", default="logs/decisions")
+    parser.add_argument("--key-dir", default=DEFAULT_KEY_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = verify_directory(args.dr_dir, args.key_dir, args.workers, args.chunk_size)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'='*60}")
+        print(f"🔏 Decision Records: {args.dr_dir} (trousseau {args.key_dir})")
+        print(f"{'='*60}")
+        print(
+            f"  {report['valid']}/{report['total']} valides "
+            f"({report['per_second']:.0f} DR/s, {report['elapsed_seconds']:.2f}s)"
+        )
+        for path, reason in report["failures"][:50]:
+            print(f"  ❌ {path}: {reason}")
+        if len(report["failures"]) > 50:
+            print(f"  ... {len(report['failures']) - 50} autres échecs")
+
+    sys.exit(1 if report["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1181,6 +1181,36 @@ def performance_tracker():
     return _track
 
 
+@pytest.fixture(scope="session")
+def load_script():
+    """
+    Fixture to import a script from scripts/ as a module
+
+    scripts/ is not a package: benchmarks and CLIs are loaded from their file.
+
+    Scope: session
+
+    Returns:
+        Callable: load_script(name) -> module for scripts/<name>.py
+
+    Example:
+        def test_benchmark(load_script):
+            bench = load_script("benchmark_startup")
+            report = bench.run_benchmark(...)
+    """
+    import importlib.util
+
+    scripts_dir = Path(__file__).parent.parent / "scripts"
+
+    def _load(name: str):
+        spec = importlib.util.spec_from_file_location(name, scripts_dir / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return _load
+
+
 # ============================================================================
 # FIXTURES: Markers & Configuration
 # ============================================================================
@@ -0,0 +1,313 @@
+"""
+Tests for the pooled async clients of the remote backends
+
+Runs OpenAIInterface / PerplexityInterface against a local stub of
+``/chat/completions`` (no network, no API key).
+
+Tests cover:
+- agenerate() result parsing (usage, citations)
+- Connection reuse through the shared keep-alive pool
+- Request hedging and per-request timeout
+- Non-blocking rate-limit waiting
+- Default agenerate() for local backends
+- Pooled clients closed on server shutdown
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from runtime.model_interface import (
+    GenerationConfig,
+    GenerationResult,
+    ModelInterface,
+    OpenAIInterface,
+    PerplexityInterface,
+)
+from runtime.utils.http_pool import aclose_http_clients, get_async_http_client
+from runtime.utils.rate_limiter import RateLimiter
+
+
+class StubCompletionsServer(ThreadingHTTPServer):
+    """Serveur chat.completions minimal qui compte connexions et requêtes"""
+
+    daemon_threads = True
+
+    def __init__(self, delays=()):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.delays = list(delays)  # délai de la n-ième requête (puis 0)
+        self.connections = 0
+        self.requests = 0
+        self.bodies = []
+        self._lock = threading.Lock()
+
+    def next_delay(self):
+        with self._lock:
+            index = self.requests
+            self.requests += 1
+        return self.delays[index] if index < len(self.delays) else 0.0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.bodies.append(body)
+        delay = self.server.next_delay()
+        time.sleep(delay)
+        payload = json.dumps(
+            {
+                "id": "cmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f" slept {delay} "},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+                "citations": ["https://example.org"],
+            }
+        ).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # requête annulée par le client (hedging, timeout)
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(delays=()):
+        server = StubCompletionsServer(delays)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _load(interface_cls, server, **config):
+    model = interface_cls()
+    assert model.load("stub-model", {"api_key": "sk-test", "base_url": server.base_url, **config})
+    model._rate_limiter = RateLimiter(requests_per_minute=1000, max_retries=1)
+    return model
+
+
+def _run(coro_fn):
+    """Exécuter dans une boucle neuve en fermant le pool à la fin"""
+
+    async def main():
+        try:
+            return await coro_fn()
+        finally:
+            await aclose_http_clients()
+
+    return asyncio.run(main())
+
+
+class TestAgenerate:
+    """Test agenerate() against the stub server"""
+
+    def test_perplexity_result_and_citations(self, stub_server):
+        """Test le parsing du résultat et des citations"""
+        server = stub_server()
+        model = _load(PerplexityInterface, server)
+
+        result = _run(lambda: model.agenerate("bonjour", GenerationConfig(), system_prompt="sys"))
+
+        assert result.text == "slept 0.0"
+        assert result.total_tokens == 5
+        assert result.citations == ["https://example.org"]
+        assert server.bodies[0]["messages"][0] == {"role": "system", "content": "sys"}
+        assert "frequency_penalty" not in server.bodies[0]
+
+    def test_concurrent_calls_reuse_connections(self, stub_server):
+        """Test que les appels successifs réutilisent les connexions du pool"""
+        server = stub_server()
+        model = _load(OpenAIInterface, server)
+
+        async def calls():
+            for _ in range(3):  # Trois vagues de 4 requêtes concurrentes
+                await asyncio.gather(
+                    *(model.agenerate(f"q{i}", GenerationConfig()) for i in range(4))
+                )
+
+        _run(calls)
+
+        assert server.requests == 12
+        assert server.connections <= 4
+
+    def test_error_result(self, stub_server):
+        """Test le résultat d'erreur quand le serveur est injoignable"""
+        server = stub_server()
+        model = _load(PerplexityInterface, server)
+        server.shutdown()
+        server.server_close()
+
+        result = _run(lambda: model.agenerate("bonjour", GenerationConfig()))
+
+        assert result.finish_reason == "error"
+        assert "sk-test" not in result.text
+
+
+class TestHedgingAndTimeout:
+    """Test hedged requests and per-request timeout"""
+
+    def test_hedged_request_wins(self, stub_server):
+        """Test qu'une requête doublée répond avant la requête lente"""
+        server = stub_server(delays=[2.0])
+        model = _load(OpenAIInterface, server, hedge_after=0.1)
+
+        started = time.monotonic()
+        result = _run(lambda: model.agenerate("bonjour", GenerationConfig()))
+
+        assert result.text == "slept 0.0"
+        assert time.monotonic() - started < 1.5
+        assert server.requests == 2
+
+    def test_no_hedge_when_fast(self, stub_server):
+        """Test qu'aucune requête doublée n'est envoyée si la réponse est rapide"""
+        server = stub_server()
+        model = _load(OpenAIInterface, server, hedge_after=1.0)
+
+        _run(lambda: model.agenerate("bonjour", GenerationConfig()))
+
+        assert server.requests == 1
+
+    def test_request_timeout(self, stub_server):
+        """Test le timeout par requête"""
+        server = stub_server(delays=[2.0])
+        model = _load(PerplexityInterface, server, request_timeout=0.2)
+
+        started = time.monotonic()
+        result = _run(lambda: model.agenerate("bonjour", GenerationConfig()))
+
+        assert result.finish_reason == "error"
+        assert time.monotonic() - started < 1.5
+
+
+class TestNonBlockingRateLimit:
+    """Test asyncio-friendly rate limiting"""
+
+    def test_wait_does_not_block_event_loop(self):
+        """Test que l'attente du rate limiter laisse tourner la boucle"""
+        limiter = RateLimiter(requests_per_minute=1)
+        limiter.wait_if_needed()  # Fenêtre pleine pour ~60 s
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            waiter = asyncio.ensure_future(limiter.await_if_needed())
+            await ticker()
+            assert not waiter.done()
+            waiter.cancel()
+
+        asyncio.run(main())
+
+        assert len(ticks) == 5
+
+    def test_aexecute_with_backoff_retries(self):
+        """Test les reprises asynchrones"""
+        limiter = RateLimiter(requests_per_minute=100, max_retries=2, initial_backoff=0.01)
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("boom")
+            return "ok"
+
+        assert asyncio.run(limiter.aexecute_with_backoff(flaky)) == "ok"
+        assert len(calls) == 2
+
+
+class TestSharedPool:
+    """Test the shared httpx client"""
+
+    def test_client_shared_per_loop(self):
+        """Test un client par boucle et par réglages"""
+
+        async def main():
+            a = get_async_http_client(timeout=5.0)
+            b = get_async_http_client(timeout=5.0)
+            c = get_async_http_client(timeout=9.0)
+            await aclose_http_clients()
+            return a, b, c
+
+        a, b, c = asyncio.run(main())
+
+        assert a is b
+        assert a is not c
+        assert a.is_closed
+
+    def test_clients_closed_on_server_shutdown(self):
+        """Test que l'arrêt du serveur ferme les clients de sa boucle"""
+        from runtime.server import app, lifespan
+
+        async def main():
+            async with lifespan(app):
+                client = get_async_http_client(timeout=5.0)
+                assert not client.is_closed
+            return client
+
+        assert asyncio.run(main()).is_closed
+
+
+def test_default_agenerate_runs_in_thread():
+    """Test l'implémentation par défaut (backends locaux)"""
+
+    class SyncModel(ModelInterface):
+        def load(self, model_path, config):
+            return True
+
+        def generate(self, prompt, config, system_prompt=None):
+            return GenerationResult(
+                text=threading.current_thread().name,
+                finish_reason="stop",
+                tokens_generated=1,
+                prompt_tokens=1,
+                total_tokens=2,
+            )
+
+        def unload(self):
+            pass
+
+        def is_loaded(self):
+            return True
+
+    result = asyncio.run(SyncModel().agenerate("p", GenerationConfig()))
+
+    assert result.text != threading.main_thread().name
@@ -5,11 +5,14 @@ Tests tous les composants du système de benchmarking:
 - Base harness
 - Individual benchmark harnesses
 - Benchmark runner
+- Parallel execution (workers, shards, checkpoints, timeouts)
 - Metrics aggregator
 """
 
 import pytest
 import json
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -21,6 +24,7 @@ from eval.benchmarks.custom.compliance.harness import ComplianceHarness
 from eval.benchmarks.custom.htn_planning.harness import HTNPlanningHarness
 from eval.benchmarks.custom.tool_orchestration.harness import ToolOrchestrationHarness
 from eval.runner import BenchmarkRunner
+from eval.parallel import parse_shard, select_shard
 from eval.metrics import MetricsAggregator
 
 
@@ -317,6 +321,168 @@ class TestBenchmarkRunner:
         assert "total_tasks" in result
 
 
+class EchoHarness(BenchmarkHarness):
+    """Harness minimal: la tache reussit si l'agent renvoie la reponse attendue"""
+
+    def __init__(self, num_tasks: int = 20):
+        super().__init__("Echo", "Echo test harness")
+        self.num_tasks = num_tasks
+
+    def load_tasks(self):
+        return [
+            BenchmarkTask(id=f"echo-{i:03d}", prompt=f"task {i}", ground_truth=str(i))
+            for i in range(self.num_tasks)
+        ]
+
+    def evaluate(self, task, response):
+        return BenchmarkResult(
+            task_id=task.id,
+            passed=response == task.ground_truth,
+            response=response,
+            ground_truth=task.ground_truth,
+            error=None if response == task.ground_truth else "mismatch",
+        )
+
+
+def echo_callback(prompt: str) -> str:
+    index = int(prompt.split()[1])
+    # Une tache sur trois echoue
+    return "wrong" if index % 3 == 0 else str(index)
+
+
+def _comparable(report):
+    """Rapport sans les champs dependant de l'horloge"""
+    stable = {
+        key: value
+        for key, value in report.items()
+        if key not in ("timestamp", "avg_latency_ms", "shard")
+    }
+    stable["results"] = [
+        {key: value for key, value in entry.items() if key != "latency_ms"}
+        for entry in report["results"]
+    ]
+    return stable
+
+
+class TestParallelBenchmark:
+    """Test parallel benchmark execution"""
+
+    def test_parallel_matches_sequential(self):
+        """Test que N appels en vol donnent le rapport sequentiel"""
+        harness = EchoHarness()
+        in_flight = []
+        active = [0]
+        lock = threading.Lock()
+
+        def slow_callback(prompt):
+            with lock:
+                active[0] += 1
+                in_flight.append(active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return echo_callback(prompt)
+
+        sequential = harness.run_benchmark(echo_callback, k=2)
+        parallel = harness.run_benchmark(slow_callback, k=2, workers=4)
+
+        assert _comparable(parallel) == _comparable(sequential)
+        assert max(in_flight) > 1
+        assert sequential["passed_at_k"] == 13
+
+    def test_shards_merge_to_sequential_report(self):
+        """Test que la fusion des shards egale l'execution sequentielle"""
+        harness = EchoHarness()
+        sequential = harness.run_benchmark(echo_callback)
+
+        shards = [harness.run_benchmark(echo_callback, shard=(i, 3)) for i in range(3)]
+        merged = harness.merge_reports(list(reversed(shards)))
+
+        assert sum(report["total_tasks"] for report in shards) == 20
+        assert shards[0]["shard"] == "0/3"
+        assert _comparable(merged) == _comparable(sequential)
+
+    def test_shard_assignment_is_deterministic(self):
+        """Test que l'affectation ne depend pas de l'ordre des taches"""
+        tasks = EchoHarness().load_tasks()
+        shard = select_shard(tasks, (1, 4), key=lambda task: task.id)
+        shuffled = select_shard(list(reversed(tasks)), (1, 4), key=lambda task: task.id)
+
+        assert {task.id for task in shard} == {task.id for task in shuffled}
+        assert parse_shard("1/4") == (1, 4)
+        for spec in ("4/4", "1", "a/b", "0/0"):
+            with pytest.raises(ValueError):
+                parse_shard(spec)
+
+    def test_checkpoint_resume_skips_finished_tasks(self, tmp_path):
+        """Test la reprise: les taches deja terminees ne sont pas rappelees"""
+        harness = EchoHarness(num_tasks=10)
+        checkpoint = str(tmp_path / "echo.jsonl")
+        calls = []
+
+        def crashing_callback(prompt):
+            if prompt == "task 6":
+                raise KeyboardInterrupt  # Interruption de l'execution
+            calls.append(prompt)
+            return echo_callback(prompt)
+
+        with pytest.raises(KeyboardInterrupt):
+            harness.run_benchmark(crashing_callback, checkpoint_path=checkpoint)
+        assert len(calls) == 6
+
+        calls.clear()
+        resumed = harness.run_benchmark(
+            lambda prompt: calls.append(prompt) or echo_callback(prompt),
+            checkpoint_path=checkpoint,
+        )
+
+        assert calls == [f"task {i}" for i in range(6, 10)]
+        assert _comparable(resumed) == _comparable(harness.run_benchmark(echo_callback))
+
+    def test_task_timeout(self):
+        """Test qu'une tache trop lente echoue sans bloquer les autres"""
+        harness = EchoHarness(num_tasks=4)
+
+        def hanging_callback(prompt):
+            if prompt == "task 2":
+                time.sleep(2)
+            return echo_callback(prompt)
+
+        started = time.monotonic()
+        report = harness.run_benchmark(hanging_callback, k=3, workers=2, task_timeout=0.2)
+
+        assert time.monotonic() - started < 1.5
+        timed_out = [r for r in report["results"] if r["task_id"] == "echo-002"]
+        assert len(timed_out) == 1
+        assert timed_out[0]["error"] == "Task timed out after 0.2s"
+        assert report["passed_at_k"] == 1  # echo-001 (echo-000 et echo-003 echouent)
+
+    def test_runner_shards_and_merge(self, tmp_path, temp_reports_dir):
+        """Test le runner: un point de reprise par shard, puis fusion des rapports"""
+        runner = BenchmarkRunner(reports_dir=str(temp_reports_dir))
+        runner.benchmarks["echo"] = EchoHarness
+        checkpoint_dir = tmp_path / "checkpoints"
+
+        shard_paths = []
+        for i in range(2):
+            result = runner.run_benchmark(
+                benchmark_name="echo",
+                agent_callback=echo_callback,
+                shard=(i, 2),
+                checkpoint_dir=str(checkpoint_dir),
+                workers=2,
+            )
+            checkpoint = checkpoint_dir / f"echo_shard{i}of2.jsonl"
+            assert len(checkpoint.read_text().splitlines()) == result["total_tasks"]
+            shard_paths.append(tmp_path / f"shard{i}.json")
+            shard_paths[-1].write_text(json.dumps(result))
+
+        merged = runner.merge_shard_reports("echo", [str(path) for path in shard_paths])
+
+        assert merged["total_tasks"] == 20
+        assert merged["passed_at_k"] == 13
+
+
 class TestMetricsAggregator:
     """Test metrics aggregation"""
 
@@ -397,3 +397,93 @@ class TestComplianceIntegration:
         # Query with forbidden keyword raises ComplianceError
         with pytest.raises(ComplianceError):
             guardian.validate_query("Show password")
+
+
+@pytest.mark.unit
+@pytest.mark.compliance
+class TestCompiledRuleset:
+    """Tests for compiled rules, hot reload and bounded audit log"""
+
+    def test_ruleset_compiled_once(self, guardian):
+        """Test that the ruleset is reused while rules are unchanged"""
+        first = guardian.ruleset
+        guardian.validate_query("Calculate the sum of numbers")
+
+        assert guardian.ruleset is first
+        assert all(hasattr(regex, "finditer") for _, regex in first.forbidden_patterns)
+
+    def test_ruleset_recompiled_on_in_place_change(self, guardian):
+        """Test that mutating guardian.rules invalidates the compiled ruleset"""
+        guardian.validate_query("Deploy the release")
+        guardian.rules["validation"]["forbidden_patterns"].append(r"(?i)deploy")
+
+        with pytest.raises(ComplianceError):
+            guardian.validate_query("Deploy the release")
+
+    def test_scan_results_cached_by_query_hash(self, guardian):
+        """Test that repeated queries reuse the cached scan"""
+        ruleset = guardian.ruleset
+        calls = []
+        real_scan = ruleset.scan_query
+
+        def counting_scan(query):
+            calls.append(query)
+            return real_scan(query)
+
+        ruleset.scan_query = counting_scan
+        guardian.validate_query("Contact john@example.com")
+        result = guardian.validate_query("Contact john@example.com")
+
+        assert len(calls) == 1
+        assert result.metadata.pii_detected is True
+
+    def test_scan_cache_concurrent_access(self, guardian):
+        """Test that the LRU scan cache survives concurrent validate_query calls"""
+        from concurrent.futures import ThreadPoolExecutor
+        import planner.compliance_guardian as cg
+
+        queries = [f"Summarize report {i % 40}" for i in range(2000)]
+        with patch.object(cg, "QUERY_SCAN_CACHE_SIZE", 8):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(guardian.validate_query, queries))
+
+        assert all(result.valid for result in results)
+        assert len(guardian._scan_cache) <= 8
+
+    def test_hot_reload_on_file_change(self, guardian, mock_compliance_rules):
+        """Test that compliance_rules.yaml changes are picked up"""
+        import os
+        import planner.compliance_guardian as cg
+
+        guardian.validate_query("Schedule a meeting")
+
+        mock_compliance_rules["validation"]["forbidden_patterns"].append(r"(?i)meeting")
+        with open(guardian.config_path, "w") as f:
+            yaml.dump(mock_compliance_rules, f)
+        stat = os.stat(guardian.config_path)
+        os.utime(guardian.config_path, (stat.st_atime, stat.st_mtime + 10))
+
+        with patch.object(cg, "RULES_RELOAD_CHECK_INTERVAL", 0):
+            with pytest.raises(ComplianceError):
+                guardian.validate_query("Schedule a meeting")
+
+    def test_audit_log_bounded_and_spilled(self, tmp_path):
+        """Test that the audit buffer stays bounded and spills to disk"""
+        from planner.compliance_guardian import AuditLogBuffer
+
+        spill_dir = tmp_path / "audit"
+        buffer = AuditLogBuffer(capacity=10, spill_dir=str(spill_dir))
+        for i in range(25):
+            buffer.append({"event_type": "query_validation", "data": {"i": i}})
+
+        assert isinstance(buffer, list)
+        assert len(buffer) < 10
+        assert buffer[-1]["data"]["i"] == 24
+
+        spilled = [
+            line
+            for spill_file in spill_dir.glob("compliance-audit-*.jsonl")
+            for line in spill_file.read_text().splitlines()
+        ]
+        assert len(spilled) == buffer.spilled_count
+        assert len(spilled) + len(buffer) == 25
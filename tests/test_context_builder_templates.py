@@ -7,7 +7,7 @@ Tests the refactored ContextBuilder that uses Jinja2 templates.
 import pytest
 from unittest.mock import Mock, MagicMock
 
-from runtime.context_builder import ContextBuilder
+from runtime.context_builder import ContextBuilder, PromptContext
 from runtime.template_loader import get_template_loader
 
 
@@ -289,5 +289,158 @@ class TestContextBuilderIntegration:
         assert "Loi 25" in result
 
 
+class _VersionedRegistry:
+    """Registre minimal versionné comme ToolRegistry"""
+
+    def __init__(self, tools):
+        self.tools = dict(tools)
+        self.version = 1
+
+    def list_all(self):
+        return dict(self.tools)
+
+    def register(self, name, tool):
+        self.tools[name] = tool
+        self.version += 1
+
+
+def _schema_tool(description):
+    tool = Mock()
+    tool.get_schema.return_value = {"description": description, "parameters": {"x": "int"}}
+    return tool
+
+
+class TestSystemPromptCache:
+    """Tests for the versioned system prompt cache"""
+
+    def test_prompt_cached_until_registry_changes(self):
+        """Test que le prompt n'est rendu qu'une fois par version du registre"""
+        builder = ContextBuilder()
+        tool = _schema_tool("Outil A")
+        registry = _VersionedRegistry({"a": tool})
+
+        first = builder.build_system_prompt(registry)
+        second = builder.build_system_prompt(registry)
+
+        assert first is second
+        assert tool.get_schema.call_count == 1
+
+        registry.register("b", _schema_tool("Outil B"))
+        third = builder.build_system_prompt(registry)
+
+        assert "Outil B" in third
+        assert tool.get_schema.call_count == 1  # Ligne de l'outil A précalculée
+
+    def test_template_reload_invalidates(self):
+        """Test l'invalidation par reload_templates"""
+        builder = ContextBuilder()
+        registry = _VersionedRegistry({"a": _schema_tool("Outil A")})
+        first = builder.build_system_prompt(registry)
+
+        builder.template_loader.reload_templates()
+
+        assert builder.build_system_prompt(registry) is not first
+
+    def test_semantic_context_in_key(self):
+        """Test qu'un contexte sémantique différent donne un autre prompt"""
+        builder = ContextBuilder()
+        registry = _VersionedRegistry({})
+
+        with_context = builder.build_system_prompt(registry, semantic_context="Doc 1")
+        without_context = builder.build_system_prompt(registry)
+
+        assert "Doc 1" in with_context
+        assert "Doc 1" not in without_context
+
+    def test_unversioned_registry_not_cached(self):
+        """Test qu'un registre sans version n'est jamais mis en cache"""
+        builder = ContextBuilder()
+        registry = Mock()
+        registry.list_all.return_value = {}
+
+        builder.build_system_prompt(registry)
+        builder.build_system_prompt(registry)
+
+        assert registry.list_all.call_count == 2
+
+    def test_tool_registry_version_bumps(self):
+        """Test que ToolRegistry.register change la version"""
+        from tools.registry import ToolRegistry
+
+        registry = ToolRegistry.__new__(ToolRegistry)  # Sans outils par défaut
+        registry._tools = {}
+        registry.register(_named_tool("x"))
+        first = registry.version
+        registry.register(_named_tool("y"))
+
+        assert registry.version > first
+
+
+def _named_tool(name):
+    tool = Mock()
+    tool.name = name
+    return tool
+
+
+class TestPromptContext:
+    """Tests for segment-based context and incremental prompt hashing"""
+
+    def test_digest_matches_string_scheme(self):
+        """Test des empreintes identiques au hash JSON complet (compatibilité audit)"""
+        builder = ContextBuilder()
+        text_context = 'Utilisateur: Salut "toi"\nAssistant: été\t✓'
+        segment_context = PromptContext(text_context)
+
+        for round_index in range(3):
+            results = f'Résultat {round_index}: {{"ok": true}}\n'
+            text_context = builder.format_tool_results_for_context(text_context, results)
+            builder.format_tool_results_for_context(segment_context, results)
+
+            assert str(segment_context) == text_context
+            assert builder.compute_prompt_hash(
+                segment_context, "suite", "conv-1", "task-1"
+            ) == builder.compute_prompt_hash(text_context, "suite", "conv-1", "task-1")
+
+        assert builder.compute_prompt_hash(
+            segment_context, "fin", "conv-1"
+        ) == builder.compute_prompt_hash(text_context, "fin", "conv-1")
+
+    def test_empty_context_stripping(self):
+        """Test le cas d'un contexte vide (même normalisation que strip())"""
+        builder = ContextBuilder()
+
+        text_context = builder.format_tool_results_for_context("", "résultats  ")
+        segment_context = builder.format_tool_results_for_context(PromptContext(), "résultats  ")
+
+        assert str(segment_context) == text_context
+        assert builder.compute_prompt_hash(segment_context, "m", "c") == (
+            builder.compute_prompt_hash(text_context, "m", "c")
+        )
+
+    def test_build_tool_context_reuses_prefix(self):
+        """Test que les segments communs ne sont pas rehachés"""
+        builder = ContextBuilder()
+        first = builder.build_tool_context("Historique", ["bloc 1"])
+        hasher = first._hashers[2]
+
+        second = builder.build_tool_context("Historique", ["bloc 1", "bloc 2"], reuse=first)
+
+        assert second is first
+        assert second._hashers[2] is hasher
+        assert str(second) == builder.format_tool_results_for_context(
+            builder.format_tool_results_for_context("Historique", "bloc 1"), "bloc 2"
+        )
+
+        builder.build_tool_context("Autre historique", ["bloc 1"], reuse=first)
+        assert str(first).startswith("Autre historique")
+
+    def test_compose_prompt_accepts_prompt_context(self):
+        builder = ContextBuilder()
+
+        assert builder.compose_prompt(PromptContext("Ctx"), "Q") == builder.compose_prompt(
+            "Ctx", "Q"
+        )
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
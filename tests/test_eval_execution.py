@@ -0,0 +1,145 @@
+"""
+Tests for isolated candidate program execution (HumanEval/MBPP)
+
+Tests cover:
+- Unbiased pass@k estimator
+- ProgramExecutor: pass/fail, timeouts, memory limit, no network, ordering
+- Sandbox failures raised instead of counted as failed programs
+- CodeGenerationHarness.evaluate_samples
+- MBPP program assembly
+"""
+
+from math import comb
+
+import pytest
+
+from eval.base import BenchmarkTask
+from eval.execution import CodeGenerationHarness, ProgramExecutor, estimate_pass_at_k
+from tools.sandbox_pool import SandboxPoolError
+
+
+@pytest.fixture(scope="module")
+def executor():
+    executor = ProgramExecutor(workers=2, batch_size=4, timeout=2.0, memory_mb=256, backend="local")
+    yield executor
+    executor.close()
+
+
+class AdditionHarness(CodeGenerationHarness):
+    """Harness minimal: ecrire add(a, b)"""
+
+    def __init__(self):
+        super().__init__("Addition", "Toy code generation harness")
+
+    def load_tasks(self):
+        return [
+            BenchmarkTask(
+                id=f"add-{i}",
+                prompt=f"def add(a, b): # task {i}",
+                ground_truth="return a + b",
+                metadata={"test": f"assert add({i}, 1) == {i + 1}"},
+            )
+            for i in range(3)
+        ]
+
+    def build_program(self, task, response):
+        return f"{response}\n{task.metadata['test']}\n"
+
+
+@pytest.mark.parametrize("n,c,k", [(10, 0, 1), (10, 10, 5), (5, 1, 1), (5, 1, 2), (20, 3, 10)])
+def test_estimate_pass_at_k_matches_combinatorial_formula(n, c, k):
+    """Test l'estimateur contre 1 - C(n-c, k) / C(n, k)"""
+    assert estimate_pass_at_k(n, c, k) == pytest.approx(1 - comb(n - c, k) / comb(n, k))
+
+
+def test_estimate_pass_at_k_rejects_k_above_samples():
+    with pytest.raises(ValueError):
+        estimate_pass_at_k(2, 1, 3)
+
+
+def test_executor_outcomes(executor):
+    """Test succes, echec, timeout, limite memoire et reseau coupe"""
+    results = executor.run(
+        [
+            "assert sum(range(10)) == 45",
+            "raise ValueError('wrong answer')",
+            "while True:\n    pass",
+            "x = bytearray(2 * 1024 ** 3)",
+            "import socket\nsocket.create_connection(('1.1.1.1', 80), timeout=1)",
+            "import sys\nsys.exit(0)",
+        ]
+    )
+
+    assert [result.passed for result in results] == [True, False, False, False, False, True]
+    assert results[1].error == "ValueError: wrong answer"
+    assert results[2].timed_out is True
+    assert results[3].error == "MemoryError"
+    assert "Error" in results[4].error
+
+
+def test_executor_preserves_order_across_batches(executor):
+    """Test l'ordre des resultats avec plusieurs lots sur plusieurs workers"""
+    programs = [f"assert {i} % 3 != 0" for i in range(25)]
+
+    results = executor.run(programs)
+
+    assert [result.passed for result in results] == [i % 3 != 0 for i in range(25)]
+
+
+def test_executor_raises_on_sandbox_failure(executor, monkeypatch):
+    """Test qu'une panne du sandbox est levee et non comptee comme un echec"""
+
+    def broken_run_batch(programs):
+        raise SandboxPoolError("No sandbox worker available")
+
+    monkeypatch.setattr(executor.pool, "run_batch", broken_run_batch)
+
+    with pytest.raises(SandboxPoolError, match="No sandbox worker"):
+        executor.run(["assert True"])
+
+
+def test_evaluate_samples_unbiased_pass_at_k(executor):
+    """Test pass@k non biaise sur n echantillons par tache"""
+    harness = AdditionHarness()
+    harness.executor = executor
+    answers = {}
+
+    def callback(prompt):
+        # Tache i: la premiere generation est fausse pour les taches impaires
+        answers[prompt] = answers.get(prompt, 0) + 1
+        task_index = int(prompt.rsplit(" ", 1)[1])
+        wrong = task_index % 2 == 1 and answers[prompt] == 1
+        return "def add(a, b):\n    return a - b" if wrong else "def add(a, b):\n    return a + b"
+
+    report = harness.evaluate_samples(callback, num_samples=4, ks=(1, 2))
+
+    # Taches 0 et 2: 4/4 correctes; tache 1: 3/4
+    assert report["programs"] == 12
+    assert report["pass_at_1"] == pytest.approx((1 + 0.75 + 1) / 3)
+    assert report["pass_at_2"] == pytest.approx(1.0)
+    assert report["programs_per_second"] > 0
+    assert sum(1 for r in report["results"] if not r["passed"]) == 1
+
+    with pytest.raises(ValueError):
+        harness.evaluate_samples(callback, num_samples=1, ks=(1, 2))
+
+
+def test_mbpp_program_runs(executor):
+    """Test le programme MBPP: setup, reponse puis une assertion par ligne"""
+    pytest.importorskip("datasets")
+    from eval.mbpp import MBPPHarness
+
+    task = BenchmarkTask(
+        id="mbpp-1",
+        prompt="Write add(a, b)",
+        ground_truth="",
+        metadata={
+            "test_setup_code": "OFFSET = 0",
+            "test_list": ["assert add(1, 2) == 3", "assert add(2, 2) == 4"],
+        },
+    )
+    # build_program ne depend pas du jeu de donnees charge par __init__
+    program = MBPPHarness.build_program(None, task, "def add(a, b):\n    return a + b + OFFSET")
+
+    assert program.endswith("assert add(1, 2) == 3\nassert add(2, 2) == 4\n")
+    assert executor.run([program])[0].passed
@@ -0,0 +1,175 @@
+"""
+Tests for the Decision Record signing key store
+
+Tests cover:
+- Keys loaded from disk across DRManager instances (no regeneration)
+- Encrypted private keys (passphrase)
+- Rotation epochs: records stay verifiable by key_id
+- Rotation by another process picked up without restart
+- Public key cache
+- Backends must implement the storage methods
+- Parallel verification CLI (scripts/verify_decision_records.py)
+"""
+
+import json
+import stat
+
+import pytest
+
+from runtime.middleware.audittrail import DRManager, verify_record_data
+from runtime.middleware.keystore import (
+    FileKeyStore,
+    KeyStore,
+    KeyStoreError,
+    MemoryKeyStore,
+    key_id_for,
+)
+
+
+@pytest.fixture
+def key_dir(tmp_path):
+    return tmp_path / "signatures"
+
+
+def _create_dr(manager, decision="execute_tool"):
+    return manager.create_dr(
+        actor="agent.core", task_id="task-1", decision=decision, prompt_hash="abc"
+    )
+
+
+def test_keys_persist_across_managers(tmp_path, key_dir):
+    """Test qu'un nouveau DRManager recharge la clé au lieu d'en générer une"""
+    first = DRManager(str(tmp_path / "dr"), key_store=FileKeyStore(str(key_dir)))
+    dr = _create_dr(first)
+
+    second = DRManager(str(tmp_path / "dr"), key_store=FileKeyStore(str(key_dir)))
+
+    assert second.key_id == first.key_id == dr.key_id
+    assert second.verify_dr(second.load_dr(dr.dr_id)) is True
+    assert stat.S_IMODE((key_dir / f"{dr.key_id}.key.pem").stat().st_mode) == 0o600
+
+
+def test_encrypted_private_key(key_dir):
+    """Test le chiffrement de la clé privée par phrase de passe"""
+    store = FileKeyStore(str(key_dir), passphrase="s3cret")
+    key_id, _ = store.signing_key()
+
+    assert b"ENCRYPTED" in (key_dir / f"{key_id}.key.pem").read_bytes()
+    assert FileKeyStore(str(key_dir), passphrase="s3cret").active_key_id == key_id
+    with pytest.raises(KeyStoreError):
+        FileKeyStore(str(key_dir), passphrase="wrong").signing_key()
+    # La vérification ne lit que les clés publiques
+    assert FileKeyStore(str(key_dir)).public_key(key_id) is not None
+
+
+def test_passphrase_from_environment(key_dir, monkeypatch):
+    """Test la phrase de passe lue dans FILAGENT_DR_KEY_PASSPHRASE"""
+    monkeypatch.setenv("FILAGENT_DR_KEY_PASSPHRASE", "from-env")
+
+    assert FileKeyStore(str(key_dir)).encrypted is True
+
+
+def test_rotation_keeps_old_records_verifiable(tmp_path, key_dir):
+    """Test qu'après rotation les DR des époques passées restent vérifiables"""
+    manager = DRManager(str(tmp_path / "dr"), key_store=FileKeyStore(str(key_dir)))
+    old_dr = _create_dr(manager, "before")
+
+    new_key_id = manager.rotate_keys()
+    new_dr = _create_dr(manager, "after")
+
+    assert new_dr.key_id == new_key_id != old_dr.key_id
+    assert [key.epoch for key in manager.key_store.keys()] == [0, 1]
+    reloaded = DRManager(str(tmp_path / "dr"), key_store=FileKeyStore(str(key_dir)))
+    assert reloaded.key_id == new_key_id
+    assert reloaded.verify_dr(reloaded.load_dr(old_dr.dr_id)) is True
+    assert reloaded.verify_dr(reloaded.load_dr(new_dr.dr_id)) is True
+
+
+def test_rotation_by_other_process_picked_up(key_dir):
+    """Test qu'une rotation faite par un autre worker change la clé de signature"""
+    worker = FileKeyStore(str(key_dir))
+    first_key_id = worker.active_key_id
+
+    rotated = FileKeyStore(str(key_dir)).rotate()
+
+    assert rotated.key_id != first_key_id
+    assert worker.signing_key()[0] == rotated.key_id
+    assert worker.keys()[-1] == rotated
+
+
+def test_key_id_is_signed(tmp_path):
+    """Test qu'un key_id altéré invalide la signature"""
+    store = MemoryKeyStore()
+    manager = DRManager(str(tmp_path / "dr"), key_store=store)
+    dr = _create_dr(manager)
+    data = dr.to_dict()
+    store.rotate()
+
+    assert verify_record_data(data, store) is None
+    data["key_id"] = store.active_key_id
+    assert verify_record_data(data, store) == "invalid signature"
+
+
+def test_create_record_format_verified(tmp_path):
+    """Test la vérification du format create_record (signature base64)"""
+    store = MemoryKeyStore()
+    manager = DRManager(str(tmp_path / "dr"), key_store=store)
+    decision_id = manager.create_record("conv-1", "tool_invocation", {"tool": "calc"}, "ok")
+
+    data = json.loads((tmp_path / "dr" / f"{decision_id}.json").read_text())
+
+    assert data["signature"]["key_id"] == store.active_key_id
+    assert verify_record_data(data, store) is None
+    data["rationale"] = "tampered"
+    assert verify_record_data(data, store) == "invalid signature"
+
+
+def test_public_keys_cached(key_dir, monkeypatch):
+    """Test que chaque clé publique n'est lue qu'une fois"""
+    key_id = FileKeyStore(str(key_dir)).active_key_id
+    store = FileKeyStore(str(key_dir))
+    reads = []
+    original = store._read_public_key
+    monkeypatch.setattr(store, "_read_public_key", lambda k: reads.append(k) or original(k))
+
+    for _ in range(5):
+        store.public_key(key_id)
+
+    assert reads == [key_id]
+    assert key_id_for(store.public_key(key_id)) == key_id
+    with pytest.raises(KeyStoreError):
+        store.public_key("ed25519-unknown")
+
+
+def test_backend_must_implement_storage():
+    """Test qu'un backend incomplet ne peut pas être instancié"""
+
+    class PartialKeyStore(KeyStore):
+        def _read_keyring(self):
+            return None, []
+
+    with pytest.raises(TypeError):
+        KeyStore()
+    with pytest.raises(TypeError, match="_write_key"):
+        PartialKeyStore()
+
+
+def test_verification_cli_parallel(tmp_path, key_dir, load_script):
+    """Test la vérification parallèle d'un répertoire de DR"""
+    cli = load_script("verify_decision_records")
+
+    dr_dir = tmp_path / "dr"
+    manager = DRManager(str(dr_dir), key_store=FileKeyStore(str(key_dir)))
+    drs = [_create_dr(manager, f"decision-{i}") for i in range(12)]
+    manager.rotate_keys()
+    drs += [_create_dr(manager, f"rotated-{i}") for i in range(12)]
+    tampered = dr_dir / f"{drs[3].dr_id}.json"
+    data = json.loads(tampered.read_text())
+    data["decision"] = "forged"
+    tampered.write_text(json.dumps(data))
+
+    report = cli.verify_directory(str(dr_dir), str(key_dir), workers=2, chunk_size=5)
+
+    assert report["total"] == len(list(dr_dir.glob("*.json")))
+    assert report["failures"] == [(str(tampered), "invalid signature")]
+    assert report["valid"] == report["total"] - 1
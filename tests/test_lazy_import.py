@@ -0,0 +1,106 @@
+"""
+Tests for deferred imports of heavy dependencies
+
+Tests cover:
+- LazyImport proxies (module, attribute, call) and module_available
+- runtime.agent import without pandas/httpx/torch/FAISS
+- scripts/profile_startup.py importtime parsing and aggregation
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from runtime.utils.lazy import LazyImport, lazy_import, module_available
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def probe_module(tmp_path, monkeypatch):
+    """Module jetable importable depuis tmp_path"""
+    (tmp_path / "lazy_probe_module.py").write_text(
+        "VALUE = 42\n\nclass Greeter:\n    def __init__(self, name):\n        self.name = name\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_probe_module"
+    sys.modules.pop("lazy_probe_module", None)
+
+
+def test_module_imported_on_first_attribute(probe_module):
+    """Test que le module n'est importé qu'au premier accès"""
+    proxy = lazy_import(probe_module)
+
+    assert probe_module not in sys.modules
+    assert not proxy.is_loaded
+    assert proxy.VALUE == 42
+    assert probe_module in sys.modules
+    assert proxy.is_loaded
+
+
+def test_attribute_proxy_is_callable(probe_module):
+    """Test le proxy d'un attribut (classe construite au premier appel)"""
+    Greeter = lazy_import(probe_module, "Greeter")
+
+    assert probe_module not in sys.modules
+    assert Greeter("filagent").name == "filagent"
+    assert isinstance(Greeter("x"), Greeter.resolve())
+
+
+def test_missing_module_fails_on_use():
+    """Test qu'un module absent échoue à l'usage, pas à la création du proxy"""
+    proxy = LazyImport("filagent_missing_module_xyz")
+
+    assert module_available("filagent_missing_module_xyz") is False
+    with pytest.raises(ModuleNotFoundError):
+        proxy.anything
+
+
+def test_module_available_does_not_import(probe_module):
+    """Test que module_available localise le paquet sans l'importer"""
+    assert module_available(probe_module) is True
+    assert probe_module not in sys.modules
+
+
+def test_agent_import_skips_heavy_modules():
+    """Test que runtime.agent s'importe sans pandas, httpx, torch ni FAISS"""
+    code = textwrap.dedent("""
+        import sys
+        import runtime.agent
+        heavy = ("pandas", "httpx", "torch", "faiss", "sentence_transformers", "docker")
+        print(sorted(m for m in heavy if m in sys.modules))
+        """)
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_importtime_aggregation(load_script):
+    """Test l'agrégation de -X importtime par paquet de premier niveau"""
+    profiler = load_script("profile_startup")
+    stderr = textwrap.dedent("""\
+        import time: self [us] | cumulative | imported package
+        import time:       100 |        100 |     pandas._libs
+        import time:       400 |        500 |   pandas
+        import time:        50 |         50 |   json.decoder
+        import time:        10 |        560 | runtime.agent
+        unrelated warning line
+        """)
+
+    records = profiler.parse_importtime(stderr)
+
+    assert [record.module for record in records] == [
+        "pandas._libs",
+        "pandas",
+        "json.decoder",
+        "runtime.agent",
+    ]
+    assert [record.depth for record in records] == [2, 1, 1, 0]
+    assert profiler.aggregate_packages(records) == {"pandas": 0.5, "json": 0.05, "runtime": 0.01}
+    assert profiler.slowest_imports(records, top=1) == [("runtime.agent", 0.56)]
@@ -0,0 +1,150 @@
+"""
+Tests for the MCP server tool path
+
+Tests cover:
+- tools/call through handle_request
+- JSON-RPC batches of independent tool calls (concurrent, ordered)
+- Per-tool concurrency limit and timeout declared on the backing BaseTool
+- Concurrency slot held until a timed-out call really ends
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_server import DEFAULT_TOOL_TIMEOUT, FilAgentMCPServer
+from tools.base import BaseTool, ToolResult, ToolStatus
+from tools.registry import ToolRegistry
+
+
+@pytest.fixture
+def server():
+    mcp = FilAgentMCPServer()
+    mcp._register_base_tools()
+    return mcp
+
+
+def _call(request_id, name, **arguments):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    }
+
+
+def test_tools_call(server):
+    """Test un appel d'outil simple"""
+    response = asyncio.run(server.respond(_call(1, "calculate_taxes_quebec", amount=100)))
+
+    assert response["id"] == 1
+    assert response["result"]["total"] == 114.97
+
+
+def test_batch_concurrent_and_ordered(server, monkeypatch):
+    """Test qu'un lot d'appels s'exécute en parallèle et garde l'ordre"""
+    original = server._run_tool
+
+    def slow_run_tool(name, arguments):
+        time.sleep(0.3)
+        return original(name, arguments)
+
+    monkeypatch.setattr(server, "_run_tool", slow_run_tool)
+    batch = [_call(i, "calculate_taxes_quebec", amount=i * 10) for i in range(4)]
+
+    started = time.monotonic()
+    responses = asyncio.run(server.respond_batch(batch))
+
+    assert time.monotonic() - started < 0.9
+    assert [r["id"] for r in responses] == [0, 1, 2, 3]
+    assert [r["result"]["subtotal"] for r in responses] == [0, 10, 20, 30]
+
+
+class LimitedAnalyzer(BaseTool):
+    """Outil FilAgent derrière analyze_document: un appel à la fois, 0.2 s max"""
+
+    max_concurrency = 1
+    timeout_seconds = 0.2
+
+    def __init__(self):
+        super().__init__("document_analyzer_pme", "Analyse limitée")
+
+    def execute(self, arguments):
+        return ToolResult(status=ToolStatus.SUCCESS, output="")
+
+    def validate_arguments(self, arguments):
+        return True, None
+
+    def _get_parameters_schema(self):
+        return {"type": "object", "properties": {}}
+
+
+@pytest.fixture
+def limited_server(server, monkeypatch):
+    """Serveur dont le registre FilAgent déclare des limites pour analyze_document"""
+    registry = ToolRegistry()
+    registry.register(LimitedAnalyzer())
+    server.tool_registry = registry
+    active = []
+    peak = []
+
+    def slow_run_tool(name, arguments):
+        active.append(name)
+        peak.append(active.count("analyze_document"))
+        time.sleep(float(arguments["delay"]))
+        active.remove(name)
+        return {"ok": True}
+
+    monkeypatch.setattr(server, "_run_tool", slow_run_tool)
+    server.peak = peak
+    return server
+
+
+def test_limits_follow_backing_tool(server):
+    """Test que les limites viennent de l'outil FilAgent associé à l'outil MCP"""
+    registry = ToolRegistry()
+    registry.register(LimitedAnalyzer())
+    server.tool_registry = registry
+
+    assert server._tool_limits("analyze_document") == (1, 0.2)
+    assert server._tool_limits("calculate_taxes_quebec") == (None, DEFAULT_TOOL_TIMEOUT)
+    assert server._tool_limits("audit_trail") == (None, DEFAULT_TOOL_TIMEOUT)
+
+
+def test_tool_limits_from_registry(limited_server):
+    """Test la limite de concurrence et le délai déclarés par l'outil"""
+
+    async def run():
+        return await asyncio.gather(
+            limited_server._execute_tool("analyze_document", {"delay": 0.05}),
+            limited_server._execute_tool("analyze_document", {"delay": 0.05}),
+            limited_server._execute_tool("analyze_document", {"delay": 1.0}),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert results[:2] == [{"ok": True}, {"ok": True}]
+    assert isinstance(results[2], TimeoutError)
+    assert "délai" in str(results[2])
+    assert max(limited_server.peak) == 1
+
+
+def test_slot_held_until_timed_out_call_ends(limited_server):
+    """Test qu'un appel hors délai garde sa place jusqu'à la fin du thread"""
+
+    async def run():
+        first = asyncio.ensure_future(
+            limited_server._execute_tool("analyze_document", {"delay": 0.5})
+        )
+        await asyncio.sleep(0.05)
+        second = limited_server._execute_tool("analyze_document", {"delay": 0.0})
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    first, second = asyncio.run(run())
+
+    assert isinstance(first, TimeoutError)
+    # Le second appel n'a démarré qu'à la fin réelle du premier thread
+    assert second == {"ok": True}
+    assert max(limited_server.peak) == 1
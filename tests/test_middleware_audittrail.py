@@ -295,6 +295,21 @@ class TestDRManagerInitialization:
         assert isinstance(manager.private_key, ed25519.Ed25519PrivateKey)
         assert isinstance(manager.public_key, ed25519.Ed25519PublicKey)
 
+    def test_keys_generated_on_first_signature(self, temp_dr_dir, tmp_path, monkeypatch):
+        """Test que la paire de clés n'est générée et écrite qu'à la première signature"""
+        monkeypatch.chdir(tmp_path)
+        key_file = tmp_path / "provenance" / "signatures" / "keyring.json"
+
+        manager = DRManager(output_dir=str(temp_dr_dir))
+        assert not key_file.exists()
+
+        dr = manager.create_dr(
+            actor="agent.core", task_id="task-1", decision="execute_tool", prompt_hash="abc"
+        )
+
+        assert key_file.exists()
+        assert dr.verify(manager.public_key) is True
+
     def test_saves_keys_to_filesystem(self, temp_dr_dir, tmp_path, monkeypatch):
         """Test sauvegarde des clés sur le filesystem"""
         # Set up signature directory
@@ -560,3 +560,93 @@ class TestComplianceRequirements:
         assert is_valid is False
         # Should report multiple violations
         assert len(errors) >= 2
+
+
+class TestCompiledGuardrails:
+    """Test guardrails compiled at load time"""
+
+    def test_max_length_enforced(self):
+        """Test que la longueur maximale est réellement appliquée"""
+        guardrail = Guardrail(name="max_response_length", max_length=10)
+
+        assert guardrail.validate("x" * 10) == (True, None)
+        is_valid, error = guardrail.validate("x" * 11)
+        assert is_valid is False
+        assert "exceeds maximum" in error
+
+    def test_max_length_multiline_text(self, tmp_path):
+        """Test que la longueur compte tous les caractères, retours de ligne inclus"""
+        config_file = tmp_path / "policies.yaml"
+        config_file.write_text(
+            yaml.dump({"policies": {"guardrails": {"enabled": True, "max_response_length": 20}}})
+        )
+        engine = ConstraintsEngine(config_path=str(config_file))
+
+        is_valid, errors = engine.validate_output("line\n" * 10)
+
+        assert is_valid is False
+        assert any("max_response_length" in err for err in errors)
+
+    def test_keyword_automaton_large_blocklist(self):
+        """Test l'automate Aho-Corasick sur une grande blocklist"""
+        from runtime.middleware.constraints import AHO_CORASICK_MIN_KEYWORDS, KeywordMatcher
+
+        keywords = [f"kw{i:04d}x" for i in range(AHO_CORASICK_MIN_KEYWORDS)]
+        keywords += ["he", "she", "hers"]
+        matcher = KeywordMatcher(keywords)
+        assert matcher._use_automaton is True
+
+        found = matcher.find_all("ushers and kw0042x")
+        assert {keywords[i] for i in found} == {"he", "she", "hers", "kw0042x"}
+        # L'ordre de la liste est conservé pour le message d'erreur
+        assert matcher.find_first("ushers and kw0042x") == "kw0042x"
+        assert matcher.find_first("aucun mot") is None
+
+    def test_keyword_automaton_matches_naive_scan(self):
+        """Test que l'automate donne les mêmes résultats que la recherche naïve"""
+        from runtime.middleware.constraints import AHO_CORASICK_MIN_KEYWORDS, KeywordMatcher
+
+        keywords = [f"Mot{i}" for i in range(AHO_CORASICK_MIN_KEYWORDS + 5)]
+        text = "texte mot7 et mot123 puis MOT19".lower()
+
+        automaton = KeywordMatcher(keywords)
+        naive = {i for i, kw in enumerate(keywords) if kw.lower() in text}
+
+        assert automaton.find_all(text) == naive
+
+    def test_json_parsed_once_for_all_schema_guardrails(self, monkeypatch):
+        """Test que le JSON n'est parsé qu'une fois par validation"""
+        import runtime.middleware.constraints as constraints
+
+        engine = ConstraintsEngine(config_path="/nonexistent/config.yaml")
+        engine.add_guardrail(Guardrail(name="s1", schema={"type": "object"}))
+        engine.add_guardrail(Guardrail(name="s2", schema={"type": "object", "required": ["name"]}))
+
+        calls = []
+        real_loads = json.loads
+
+        def counting_loads(text, *args, **kwargs):
+            calls.append(text)
+            return real_loads(text, *args, **kwargs)
+
+        monkeypatch.setattr(constraints.json, "loads", counting_loads)
+        is_valid, errors = engine.validate_output('{"age": 3}')
+
+        assert len(calls) == 1
+        assert is_valid is False
+        assert len(errors) == 1 and "[s2]" in errors[0]
+
+    def test_schema_validator_cached(self):
+        """Test que les validateurs JSONSchema compilés sont réutilisés"""
+        from runtime.middleware.constraints import get_schema_validator
+
+        schema = {"type": "object", "properties": {"n": {"type": "number"}}}
+
+        assert get_schema_validator(schema) is get_schema_validator(dict(schema))
+
+    def test_pattern_compiled_once(self):
+        """Test que la regex est compilée à la construction"""
+        guardrail = Guardrail(name="digits", pattern=r"^\d+$")
+
+        assert guardrail._compiled_pattern is not None
+        assert guardrail.validate("123") == (True, None)
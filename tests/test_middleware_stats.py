@@ -0,0 +1,147 @@
+"""
+Unit tests for the middleware statistics manager
+
+Tests cover:
+- In-memory counters (no disk write per operation)
+- Multi-threaded recording without lost increments
+- Periodic and on-close snapshots
+- Compact per-day persistence and reload
+- Corrupt file recovery
+"""
+
+import json
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from runtime.middleware.stats import (
+    GlobalMiddlewareMetrics,
+    MiddlewareStatsManager,
+)
+
+
+@pytest.fixture
+def stats_path(tmp_path):
+    """Temporary stats file path"""
+    return tmp_path / "data" / "middleware_stats.json"
+
+
+@pytest.fixture
+def manager(stats_path):
+    """Manager without background snapshotter"""
+    mgr = MiddlewareStatsManager(storage_path=stats_path, snapshot_interval=None)
+    yield mgr
+    mgr.close()
+
+
+class TestRecordOperation:
+    """Test the in-memory hot path"""
+
+    def test_record_does_not_write_to_disk(self, manager, stats_path):
+        """Test qu'une opération n'écrit pas sur disque"""
+        manager.record_operation("logging")
+
+        assert not stats_path.exists()
+
+    def test_counters_aggregated(self, manager):
+        """Test l'agrégation des compteurs par composant"""
+        manager.record_operation("logging")
+        manager.record_operation("logging")
+        manager.record_operation("worm", is_error=True)
+        manager.record_operation("unknown")
+
+        today = manager.get_summary()["today"]
+        assert today["total_operations"] == 4
+        assert today["total_errors"] == 1
+        assert today["logging_ops"] == 2
+        assert today["worm_writes"] == 1
+
+        component = manager.get_component_stats("logging")
+        assert component["operations_today"] == 2
+
+    def test_concurrent_recording(self, manager):
+        """Test qu'aucun incrément n'est perdu entre threads"""
+
+        def worker():
+            for _ in range(1000):
+                manager.record_operation("rbac")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert manager.get_component_stats("rbac")["operations_today"] == 8000
+        # Les shards des threads terminés sont intégrés à la base
+        assert manager._shards == []
+        assert manager.get_summary()["today"]["rbac_checks"] == 8000
+
+    def test_persist_flag_forces_snapshot(self, manager, stats_path):
+        """Test que persist=True force l'écriture immédiate"""
+        manager.record_operation("audit", persist=True)
+
+        assert stats_path.exists()
+
+
+class TestSnapshot:
+    """Test snapshot persistence"""
+
+    def test_snapshot_skipped_when_idle(self, manager, stats_path):
+        """Test qu'aucun fichier n'est écrit sans nouvelle opération"""
+        assert manager.snapshot() is False
+        manager.record_operation("pii")
+        assert manager.snapshot() is True
+        assert manager.snapshot() is False
+
+    def test_compact_format_and_reload(self, manager, stats_path):
+        """Test le format compact et le rechargement"""
+        manager.record_operation("provenance")
+        manager.snapshot()
+
+        raw = stats_path.read_text(encoding="utf-8")
+        assert "\n" not in raw
+        today = date.today().isoformat()
+        record = json.loads(raw)["history"][today]
+        assert record == {"date_ref": today, "total_operations": 1, "provenance_ops": 1}
+        GlobalMiddlewareMetrics(**json.loads(raw))
+
+        reloaded = MiddlewareStatsManager(storage_path=stats_path, snapshot_interval=None)
+        reloaded.record_operation("provenance")
+        assert reloaded.get_component_stats("provenance")["operations_today"] == 2
+        reloaded.close()
+
+    def test_background_snapshot(self, stats_path):
+        """Test le snapshot périodique en arrière-plan"""
+        mgr = MiddlewareStatsManager(storage_path=stats_path, snapshot_interval=0.05)
+        mgr.record_operation("constraints")
+
+        deadline = time.time() + 2
+        while not stats_path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        mgr.close()
+
+        assert stats_path.exists()
+        assert mgr._snapshot_thread is None
+
+    def test_close_flushes(self, stats_path):
+        """Test que close() écrit le dernier snapshot"""
+        mgr = MiddlewareStatsManager(storage_path=stats_path, snapshot_interval=60)
+        mgr.record_operation("retention")
+        mgr.close()
+
+        data = json.loads(stats_path.read_text(encoding="utf-8"))
+        assert data["history"][date.today().isoformat()]["retention_ops"] == 1
+
+    def test_corrupt_file_backed_up(self, stats_path):
+        """Test la sauvegarde d'un fichier corrompu"""
+        stats_path.parent.mkdir(parents=True)
+        stats_path.write_text("{not json", encoding="utf-8")
+
+        mgr = MiddlewareStatsManager(storage_path=stats_path, snapshot_interval=None)
+
+        assert mgr.get_summary()["days_tracked"] == 0
+        assert list(stats_path.parent.glob("*.corrupt.*.json"))
+        mgr.close()
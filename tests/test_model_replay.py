@@ -0,0 +1,176 @@
+"""
+Tests for the record/replay model backend (runtime/model_replay.py)
+
+Tests cover:
+- Recording a backend's generations (generate, stream, agenerate)
+- Replay in recorded order, tool_calls preserved, misses
+- Compact gzip recordings
+- Simulated latency modes
+- ModelFactory / init_model wiring
+"""
+
+import asyncio
+import gzip
+import json
+import time
+
+import pytest
+
+import runtime.model_interface as model_interface
+from runtime.model_interface import (
+    GenerationConfig,
+    GenerationResult,
+    ModelFactory,
+    ModelInterface,
+    init_model,
+)
+from runtime.model_replay import (
+    ModelRecorder,
+    RecordingInterface,
+    ReplayInterface,
+    ReplayMissError,
+    prompt_key,
+)
+
+
+class CountingModel(ModelInterface):
+    """Backend factice: réponse numérotée, avec tool_calls sur demande"""
+
+    def __init__(self):
+        self.calls = 0
+        self._loaded = False
+
+    def load(self, model_path, config):
+        self._loaded = True
+        return True
+
+    def generate(self, prompt, config, system_prompt=None):
+        self.calls += 1
+        time.sleep(0.01)
+        tool_calls = [{"name": "calculator", "arguments": {"expression": "2+2"}}]
+        return GenerationResult(
+            text=f"answer {self.calls} to {prompt}",
+            finish_reason="tool_calls" if "tool" in prompt else "stop",
+            tokens_generated=5,
+            prompt_tokens=3,
+            total_tokens=8,
+            tool_calls=tool_calls if "tool" in prompt else None,
+        )
+
+    def unload(self):
+        self._loaded = False
+
+    def is_loaded(self):
+        return self._loaded
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Enregistrement de quelques générations d'un vrai backend"""
+    path = tmp_path / "session.jsonl"
+    model = RecordingInterface(CountingModel(), ModelRecorder(str(path)))
+    model.load("unused", {})
+    config = GenerationConfig()
+    originals = [
+        model.generate("hello", config),
+        model.generate("hello", config),
+        model.generate("use a tool", config, system_prompt="system"),
+        next(c.result for c in model.generate_stream("stream", config) if c.result),
+        asyncio.run(model.agenerate("async", config)),
+    ]
+    model.unload()
+    return path, originals
+
+
+def _replay(path, **config):
+    model = ReplayInterface()
+    model.load(str(path), config)
+    return model
+
+
+def test_replay_returns_recorded_generations(recording):
+    """Test le rejeu dans l'ordre d'enregistrement, tool_calls compris"""
+    path, originals = recording
+    model = _replay(path)
+    config = GenerationConfig()
+
+    replayed = [
+        model.generate("hello", config),
+        model.generate("hello", config),
+        model.generate("use a tool", config, system_prompt="system"),
+        model.generate("stream", config),
+        asyncio.run(model.agenerate("async", config)),
+    ]
+
+    assert replayed == originals
+    assert replayed[2].tool_calls[0]["name"] == "calculator"
+    # Un prompt enregistré plusieurs fois est rejoué en boucle
+    assert model.generate("hello", config).text == originals[0].text
+
+
+def test_replay_miss_raises(recording):
+    path, _ = recording
+    model = _replay(path)
+
+    with pytest.raises(ReplayMissError):
+        model.generate("never recorded", GenerationConfig())
+    # Le prompt système fait partie de l'empreinte
+    with pytest.raises(ReplayMissError):
+        model.generate("use a tool", GenerationConfig())
+
+
+def test_recording_is_compact(tmp_path):
+    """Test l'enregistrement gzip: empreintes seulement, pas les prompts"""
+    path = tmp_path / "session.jsonl.gz"
+    model = RecordingInterface(CountingModel(), ModelRecorder(str(path)))
+    secret_prompt = "confidential prompt " * 50
+    model.generate(secret_prompt, GenerationConfig())
+    model.unload()
+
+    lines = gzip.decompress(path.read_bytes()).decode("utf-8").splitlines()
+    entry = json.loads(lines[1])
+
+    assert json.loads(lines[0]) == {"version": 1}
+    assert entry["key"] == prompt_key(secret_prompt)
+    assert "confidential" not in lines[1].split('"text"')[0]
+    assert _replay(path).generate(secret_prompt, GenerationConfig()).tokens_generated == 5
+
+
+@pytest.mark.parametrize(
+    "spec,low,high",
+    [("none", 0, 5), ("recorded", 8, 60), ("fixed:20", 18, 60), ("lognormal:20:0.01", 18, 60)],
+)
+def test_simulated_latency(recording, spec, low, high):
+    """Test les modes de latence simulée (en ms)"""
+    path, _ = recording
+    model = _replay(path, replay_latency=spec)
+
+    started = time.perf_counter()
+    model.generate("hello", GenerationConfig())
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert low <= elapsed_ms <= high
+
+
+def test_invalid_latency_spec(recording):
+    path, _ = recording
+    with pytest.raises(ValueError):
+        _replay(path, replay_latency="uniform:1:2")
+
+
+def test_factory_and_init_model_record(tmp_path, monkeypatch):
+    """Test le backend "replay" et l'enregistrement via init_model(record_path=...)"""
+    monkeypatch.setattr(model_interface, "_model_instance", None)
+    monkeypatch.setattr(ModelFactory, "create", staticmethod(lambda backend: CountingModel()))
+    path = tmp_path / "recorded.jsonl"
+
+    recorded = init_model("openai", "gpt", {"record_path": str(path)})
+    original = recorded.generate("hello", GenerationConfig())
+    recorded.unload()
+    monkeypatch.undo()
+
+    assert isinstance(ModelFactory.create("replay"), ReplayInterface)
+    monkeypatch.setattr(model_interface, "_model_instance", None)
+    replay = init_model("replay", str(path), {"replay_latency": "none"})
+
+    assert replay.generate("hello", GenerationConfig()) == original
@@ -239,6 +239,115 @@ class TestExecutionStrategyParallel:
         assert "action2" in results
         assert "action3" in results
 
+    def test_parallel_no_level_barrier(self):
+        """Test qu'une tâche lente ne bloque pas les branches indépendantes"""
+        graph = TaskGraph()
+        finished = []
+
+        def work(params):
+            time.sleep(params["seconds"])
+            finished.append(params["name"])
+            return params["name"]
+
+        slow = Task(name="slow", action="work", params={"name": "slow", "seconds": 0.3})
+        fast = Task(name="fast", action="work", params={"name": "fast", "seconds": 0.01})
+        after_fast = Task(
+            name="after_fast",
+            action="work",
+            params={"name": "after_fast", "seconds": 0.01},
+            depends_on=[fast.task_id],
+        )
+        for task in (slow, fast, after_fast):
+            graph.add_task(task)
+
+        executor = TaskExecutor(
+            action_registry={"work": work}, strategy=ExecutionStrategy.PARALLEL, max_workers=2
+        )
+        result = executor.execute(graph)
+
+        assert result.completed_tasks == 3
+        assert finished == ["fast", "after_fast", "slow"]
+
+    def test_parallel_tasks_inherit_inference_priority(self):
+        """Test que les tâches parallèles voient la priorité d'inférence HTN de l'appelant"""
+        from runtime.inference_scheduler import Priority, current_priority, inference_priority
+
+        graph = TaskGraph()
+        for i in range(4):
+            graph.add_task(Task(name=f"task{i}", action="priority"))
+
+        executor = TaskExecutor(
+            action_registry={"priority": lambda params: current_priority()},
+            strategy=ExecutionStrategy.PARALLEL,
+            max_workers=2,
+        )
+        with inference_priority(Priority.HTN):
+            result = executor.execute(graph)
+
+        assert result.completed_tasks == 4
+        assert set(result.task_results.values()) == {Priority.HTN}
+
+    def test_parallel_ready_order_priority_then_critical_path(self):
+        """Test l'ordre des tâches prêtes: priorité, puis chemin critique restant"""
+        graph = TaskGraph()
+        started = []
+
+        def work(params):
+            started.append(params["name"])
+
+        def add(name, priority=TaskPriority.NORMAL, depends_on=()):
+            task = Task(
+                name=name,
+                action="work",
+                params={"name": name},
+                priority=priority,
+                depends_on=list(depends_on),
+            )
+            graph.add_task(task)
+            return task
+
+        add("leaf")
+        head = add("chain_head")
+        middle = add("chain_middle", depends_on=[head.task_id])
+        add("chain_tail", depends_on=[middle.task_id])
+        add("urgent", priority=TaskPriority.HIGH)
+
+        executor = TaskExecutor(
+            action_registry={"work": work}, strategy=ExecutionStrategy.PARALLEL, max_workers=1
+        )
+        executor.execute(graph)
+
+        # À chemin restant égal (chain_tail/leaf), l'ordre topologique départage
+        assert started[:3] == ["urgent", "chain_head", "chain_middle"]
+        assert set(started[3:]) == {"chain_tail", "leaf"}
+
+    def test_parallel_failure_skips_only_dependents(self):
+        """Test qu'un échec saute ses dépendants sans arrêter les autres branches"""
+        graph = TaskGraph()
+
+        def work(params):
+            if params.get("fail"):
+                raise ValueError("boom")
+            time.sleep(0.05)
+            return "ok"
+
+        failing = Task(name="failing", action="work", params={"fail": True})
+        dependent = Task(name="dependent", action="work", depends_on=[failing.task_id])
+        other = Task(name="other", action="work")
+        after_other = Task(name="after_other", action="work", depends_on=[other.task_id])
+        for task in (failing, dependent, other, after_other):
+            graph.add_task(task)
+
+        executor = TaskExecutor(
+            action_registry={"work": work}, strategy=ExecutionStrategy.PARALLEL, max_workers=2
+        )
+        result = executor.execute(graph)
+
+        assert failing.status == TaskStatus.FAILED
+        assert dependent.status == TaskStatus.SKIPPED
+        assert other.status == after_other.status == TaskStatus.COMPLETED
+        assert (result.completed_tasks, result.failed_tasks, result.skipped_tasks) == (2, 1, 1)
+
 
 class TestExecutionStrategyAdaptive:
     """Tests pour stratégie ADAPTIVE"""
@@ -401,5 +401,90 @@ class TestComplexScenarios:
         assert "depends_on_failed" not in ready_names
 
 
+class TestGraphScaling:
+    """Tests des algorithmes linéaires (cycles incrémentaux, tas, niveaux en cache)"""
+
+    def test_incremental_cycle_check(self):
+        """Test détection d'un cycle passant par une tâche donnée"""
+        graph = TaskGraph()
+        task1 = Task(name="task1", action="a")
+        task2 = Task(name="task2", action="b", depends_on=[task1.task_id])
+        graph.add_task(task1)
+        graph.add_task(task2)
+
+        assert not graph._creates_cycle(task1.task_id)
+        assert not graph._has_cycle()
+
+        # Arc task2 -> task1 injecté hors add_task
+        graph.adjacency_list[task2.task_id].append(task1.task_id)
+
+        assert graph._creates_cycle(task1.task_id)
+        assert graph._has_cycle()
+
+    def test_deep_chain_without_recursion_limit(self):
+        """Test chaîne de 20000 tâches: construction, cycles, tri et niveaux"""
+        graph = TaskGraph()
+        previous = None
+        for i in range(20000):
+            task = Task(
+                name=f"task{i}", action="a", depends_on=[previous.task_id] if previous else []
+            )
+            graph.add_task(task)
+            previous = task
+
+        assert not graph._has_cycle()
+        assert graph.topological_sort()[-1] is previous
+        assert len(graph.get_parallelizable_tasks()) == 20000
+
+    def test_topological_sort_equal_priority_first_ready_first(self):
+        """Test qu'à priorité égale la première tâche devenue prête passe d'abord"""
+        graph = TaskGraph()
+        root = Task(name="root", action="a")
+        late = Task(name="late", action="b")
+        child = Task(name="child", action="c", depends_on=[root.task_id])
+        urgent = Task(
+            name="urgent", action="d", depends_on=[root.task_id], priority=TaskPriority.HIGH
+        )
+        for task in (root, late, child, urgent):
+            graph.add_task(task)
+
+        names = [t.name for t in graph.topological_sort()]
+
+        assert names == ["root", "urgent", "late", "child"]
+
+    def test_get_descendants(self):
+        """Test dépendants transitifs d'un losange (chaque tâche une seule fois)"""
+        graph = TaskGraph()
+        top = Task(name="top", action="a")
+        left = Task(name="left", action="b", depends_on=[top.task_id])
+        right = Task(name="right", action="c", depends_on=[top.task_id])
+        bottom = Task(name="bottom", action="d", depends_on=[left.task_id, right.task_id])
+        other = Task(name="other", action="e")
+        for task in (top, left, right, bottom, other):
+            graph.add_task(task)
+
+        assert [t.name for t in graph.get_descendants(top.task_id)] == ["left", "right", "bottom"]
+        assert [t.name for t in graph.get_descendants(left.task_id)] == ["bottom"]
+        assert graph.get_descendants(other.task_id) == []
+
+    def test_parallelizable_levels_cache_invalidated_on_add(self):
+        """Test que le cache des niveaux est protégé et invalidé par add_task"""
+        graph = TaskGraph()
+        task1 = Task(name="task1", action="a")
+        graph.add_task(task1)
+
+        levels = graph.get_parallelizable_tasks()
+        levels[0].clear()
+        assert len(graph.get_parallelizable_tasks()[0]) == 1
+
+        task2 = Task(name="task2", action="b", depends_on=[task1.task_id])
+        graph.add_task(task2)
+
+        assert [[t.name for t in level] for level in graph.get_parallelizable_tasks()] == [
+            ["task1"],
+            ["task2"],
+        ]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,169 @@
+"""
+Tests for the llama.cpp prompt prefix state cache
+
+Tests cover:
+- Longest-prefix lookup and LRU eviction (count and bytes)
+- System prompt state reused across generations (only the suffix is evaluated)
+- Hit rate / time saved statistics
+- Graceful disable when the backend has no state API
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from runtime.model_interface import GenerationConfig, LlamaCppInterface
+from runtime.prefix_cache import PrefixStateCache, common_prefix_length
+
+N_CTX = 512
+
+
+def _state(tokens, size=10):
+    return SimpleNamespace(input_ids=list(tokens), n_tokens=len(tokens), llama_state_size=size)
+
+
+class FakeLlama:
+    """Llama minimal: un token par caractère, réutilisation du préfixe comme llama.cpp
+
+    Comme llama.cpp, ``input_ids`` est un tampon de ``n_ctx`` tokens dont seuls
+    les ``n_tokens`` premiers ont été évalués; ``reset()`` laisse la fin périmée.
+    """
+
+    def __init__(self, n_ctx=N_CTX):
+        self.input_ids = [0] * n_ctx
+        self.n_tokens = 0
+        self.evaluated = 0  # tokens de prompt réellement évalués
+
+    def tokenize(self, text: bytes):
+        return [1] + list(text)  # BOS + octets
+
+    def reset(self):
+        self.n_tokens = 0
+
+    def eval(self, tokens):
+        self.evaluated += len(tokens)
+        self._append(tokens)
+
+    def _append(self, tokens):
+        self.input_ids[self.n_tokens : self.n_tokens + len(tokens)] = tokens
+        self.n_tokens += len(tokens)
+
+    def save_state(self):
+        return SimpleNamespace(
+            input_ids=list(self.input_ids),
+            n_tokens=self.n_tokens,
+            llama_state_size=self.n_tokens,
+        )
+
+    def load_state(self, state):
+        self.input_ids = list(state.input_ids)
+        self.n_tokens = state.n_tokens
+
+    def __call__(self, prompt, **kwargs):
+        tokens = self.tokenize(prompt.encode("utf-8"))
+        live = self.input_ids[: self.n_tokens]
+        self.n_tokens = min(common_prefix_length(live, tokens), len(tokens) - 1)
+        self.eval(tokens[self.n_tokens :])
+        self._append([ord("!")])
+        return {
+            "choices": [{"text": "!", "finish_reason": "stop"}],
+            "usage": {"completion_tokens": 1, "total_tokens": len(tokens) + 1},
+        }
+
+
+@pytest.fixture
+def llama():
+    model = LlamaCppInterface()
+    model.model = FakeLlama()
+    model.prefix_cache = PrefixStateCache(max_states=4)
+    model._loaded = True
+    return model
+
+
+class TestPrefixStateCache:
+    """Test the LRU itself"""
+
+    def test_longest_prefix_lookup(self):
+        """Test la sélection de l'état au plus long préfixe commun"""
+        cache = PrefixStateCache()
+        cache.store(_state([1, 2]))
+        cache.store(_state([1, 2, 3, 4]))
+        cache.store(_state([9]))
+
+        state, length = cache.lookup([1, 2, 3, 5])
+
+        assert state.input_ids == [1, 2, 3, 4]
+        assert length == 3
+        assert cache.lookup([7]) == (None, 0)
+
+    def test_eviction_by_count_and_bytes(self):
+        """Test l'éviction LRU par nombre d'états et par taille"""
+        cache = PrefixStateCache(max_states=2, max_bytes=25)
+        cache.store(_state([1]))
+        cache.store(_state([2]))
+        cache.lookup([1])  # [1] devient le plus récent
+        cache.store(_state([3]))
+
+        assert cache.lookup([2]) == (None, 0)
+        assert len(cache) == 2
+
+        cache.store(_state([4], size=20))
+        assert len(cache) == 1
+        assert cache.stats()["bytes"] == 20
+
+    def test_stats(self):
+        """Test le taux de hit et le temps économisé estimé"""
+        cache = PrefixStateCache()
+        cache.observe_eval(100, 1.0)
+        cache.record_lookup(0)
+        cache.record_lookup(50)
+
+        stats = cache.stats()
+        assert stats["hit_rate"] == 0.5
+        assert stats["tokens_reused"] == 50
+        assert stats["prompt_eval_seconds_saved"] == pytest.approx(0.5)
+
+
+class TestLlamaPrefixReuse:
+    """Test integration with LlamaCppInterface"""
+
+    def test_system_prompt_evaluated_once(self, llama):
+        """Test que le prompt système n'est évalué qu'une fois entre conversations"""
+        system = "Outils disponibles: " + "x" * 200
+        config = GenerationConfig()
+
+        llama.generate("Question A", config, system_prompt=system)
+        first = llama.model.evaluated
+        assert first == len(f"{system}\n\nQuestion A") + 1
+
+        # Autre conversation entre-temps: l'état vivant ne correspond plus
+        llama.model.reset()
+        llama.model.evaluated = 0
+        llama.generate("Question B", config, system_prompt=system)
+
+        assert llama.model.evaluated <= len("Question B") + 1
+        stats = llama.prefix_cache.stats()
+        assert stats["hits"] == 1
+        assert stats["tokens_reused"] >= len(system)
+
+    def test_followup_iteration_reuses_previous_turn(self, llama):
+        """Test qu'une itération de suivi réutilise l'état du tour précédent"""
+        config = GenerationConfig()
+        llama.generate("Contexte. Question", config, system_prompt="S" * 50)
+        llama.model.reset()
+        llama.model.evaluated = 0
+
+        llama.generate("Contexte. Question!Résultat outil", config, system_prompt="S" * 50)
+
+        assert llama.model.evaluated == len("Résultat outil".encode("utf-8"))
+
+    def test_disabled_without_state_api(self):
+        """Test la désactivation si le backend n'expose pas l'API d'état"""
+        model = LlamaCppInterface()
+        model._create_mock_model()
+        model.prefix_cache = PrefixStateCache()
+
+        result = model.generate("salut", GenerationConfig(), system_prompt="système")
+
+        assert result.finish_reason == "stop"
+        assert model.prefix_cache is None
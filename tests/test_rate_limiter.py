@@ -0,0 +1,179 @@
+"""
+Tests for the GCRA rate limiter
+
+Tests cover:
+- Burst then steady rate per window
+- Independent buckets per key
+- Waiting outside the lock (sync and asyncio)
+- Retry-After aware backoff
+- State shared between limiter instances (multi-worker mode)
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from runtime.utils.rate_limiter import (
+    FCNTL_AVAILABLE,
+    RateLimiter,
+    RateLimitError,
+    api_key_fingerprint,
+    get_rate_limiter,
+    retry_after_seconds,
+)
+
+
+class TestBuckets:
+    """Test GCRA accounting"""
+
+    def test_burst_then_wait(self):
+        """Test qu'une rafale de N passe puis que la suivante attend 60/N s"""
+        limiter = RateLimiter(requests_per_minute=3, requests_per_hour=100)
+
+        waits = [limiter._reserve("a") for _ in range(4)]
+
+        assert waits[:3] == [0, 0, 0]
+        assert waits[3] == pytest.approx(20.0, abs=0.1)
+
+    def test_hour_window(self):
+        """Test que la fenêtre horaire s'applique aussi"""
+        limiter = RateLimiter(requests_per_minute=100, requests_per_hour=2)
+
+        waits = [limiter._reserve("a") for _ in range(3)]
+
+        assert waits[2] == pytest.approx(1800.0, abs=0.1)
+
+    def test_keys_are_independent(self):
+        """Test l'isolation des clés (backend, clé API, tenant)"""
+        limiter = RateLimiter(requests_per_minute=1)
+
+        assert limiter._reserve("tenant-a") == 0
+        assert limiter._reserve("tenant-b") == 0
+        assert limiter._reserve("tenant-a") > 0
+
+        limiter.reset("tenant-a")
+        assert limiter._reserve("tenant-a") == 0
+
+    def test_api_key_fingerprint(self):
+        """Test que la clé API n'apparaît pas dans la clé de bucket"""
+        key = api_key_fingerprint("sk-secret")
+
+        assert "sk-secret" not in key
+        assert key == api_key_fingerprint("sk-secret")
+        assert key != api_key_fingerprint("sk-other")
+
+    def test_named_global_limiters(self):
+        """Test un limiteur global par nom"""
+        assert get_rate_limiter(name="test-a") is get_rate_limiter(name="test-a")
+        assert get_rate_limiter(name="test-a") is not get_rate_limiter(name="test-b")
+
+
+class TestNonBlocking:
+    """Test that waiting never holds the lock"""
+
+    def test_other_keys_not_blocked_while_waiting(self):
+        """Test qu'un thread en attente ne bloque pas les autres clés"""
+        limiter = RateLimiter(requests_per_minute=60)  # 1 s entre requêtes après la rafale
+        for _ in range(60):
+            limiter._reserve("slow")
+
+        waiter = threading.Thread(target=limiter.wait_if_needed, args=("slow",), daemon=True)
+        waiter.start()
+        time.sleep(0.05)
+
+        started = time.monotonic()
+        assert limiter.wait_if_needed("fast") == 0
+        assert time.monotonic() - started < 0.1
+        assert waiter.is_alive()
+        waiter.join()
+
+    def test_async_wait(self):
+        """Test l'attente asynchrone"""
+        limiter = RateLimiter(requests_per_minute=600, requests_per_hour=36000)
+        # Horloge figée: l'attente ne dépend pas de la durée des réservations
+        limiter._store.clock = lambda: 1000.0
+        for _ in range(600):
+            limiter._reserve("k")
+
+        async def main():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticker = asyncio.ensure_future(tick())
+            waited = await limiter.await_if_needed("k")
+            ticker.cancel()
+            return waited, ticks
+
+        waited, ticks = asyncio.run(main())
+
+        assert waited == pytest.approx(0.1)
+        assert ticks >= 3
+
+
+class TestBackoff:
+    """Test retries"""
+
+    def test_retry_after_parsing(self):
+        """Test la lecture de Retry-After (secondes, millisecondes, attribut)"""
+        assert retry_after_seconds(SimpleNamespace(retry_after=2)) == 2.0
+        response = SimpleNamespace(headers={"retry-after": "3"})
+        assert retry_after_seconds(SimpleNamespace(response=response)) == 3.0
+        response = SimpleNamespace(headers={"retry-after-ms": "250"})
+        assert retry_after_seconds(SimpleNamespace(response=response)) == 0.25
+        assert retry_after_seconds(ValueError("boom")) is None
+
+    def test_retry_after_defers_key(self):
+        """Test que Retry-After retarde toute la clé"""
+        limiter = RateLimiter(requests_per_minute=100, max_retries=2, initial_backoff=5.0)
+        calls = []
+
+        class Throttled(Exception):
+            retry_after = 0.05
+
+        def api_call():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise Throttled("rate limit")
+            return "ok"
+
+        started = time.monotonic()
+        assert limiter.execute_with_backoff(api_call, key="k") == "ok"
+
+        # Délai du serveur (0.05 s) plutôt que le backoff exponentiel (5 s)
+        assert 0.04 <= calls[1] - calls[0] < 1.0
+        assert time.monotonic() - started < 1.0
+
+    def test_async_retries_exhausted(self):
+        """Test l'échec après toutes les tentatives (message assaini)"""
+        limiter = RateLimiter(max_retries=2, initial_backoff=0.01)
+
+        async def failing():
+            raise ConnectionError("secret token abc")
+
+        with pytest.raises(RateLimitError, match="Authentication") as exc_info:
+            asyncio.run(limiter.aexecute_with_backoff(failing))
+
+        assert exc_info.value.attempts == 2
+
+
+@pytest.mark.skipif(not FCNTL_AVAILABLE, reason="fcntl required")
+class TestSharedState:
+    """Test the multi-worker mode"""
+
+    def test_state_shared_between_instances(self, tmp_path):
+        """Test que deux limiteurs (deux workers) partagent le même budget"""
+        path = tmp_path / "rate_limit.json"
+        worker_a = RateLimiter(requests_per_minute=2, shared_state_path=path)
+        worker_b = RateLimiter(requests_per_minute=2, shared_state_path=path)
+
+        assert worker_a._reserve("k") == 0
+        assert worker_b._reserve("k") == 0
+        assert worker_a._reserve("k") > 0
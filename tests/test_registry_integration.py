@@ -30,13 +30,13 @@ class TestDocumentAnalyzerRegistry:
         # Vérifier que l'outil est dans le registre
         tool = self.registry.get("document_analyzer_pme")
         assert tool is not None, "DocumentAnalyzerPME devrait être dans le registre"
-        assert isinstance(tool, DocumentAnalyzerPME)
+        assert isinstance(tool.resolve(), DocumentAnalyzerPME)
 
     def test_registry_lists_document_analyzer(self):
         """Test que l'outil apparaît dans la liste de tous les outils"""
         all_tools = self.registry.list_all()
         assert "document_analyzer_pme" in all_tools
-        assert isinstance(all_tools["document_analyzer_pme"], DocumentAnalyzerPME)
+        assert isinstance(all_tools["document_analyzer_pme"].resolve(), DocumentAnalyzerPME)
 
     def test_registry_get_all_includes_document_analyzer(self):
         """Test que get_all() inclut l'outil"""
@@ -112,7 +112,7 @@ class TestAgentWithDocumentAnalyzer:
         # Vérifier que l'outil est accessible
         tool = agent.tool_registry.get("document_analyzer_pme")
         assert tool is not None
-        assert isinstance(tool, DocumentAnalyzerPME)
+        assert isinstance(tool.resolve(), DocumentAnalyzerPME)
 
     def test_agent_tool_registry_consistency(self):
         """Test que le registre de l'agent est le même que le registre global"""
@@ -151,7 +151,7 @@ class TestRegistryReload:
 
         # Mais de la même classe
         assert type(tool1) == type(tool2)
-        assert isinstance(tool2, DocumentAnalyzerPME)
+        assert isinstance(tool2.resolve(), DocumentAnalyzerPME)
 
 
 if __name__ == "__main__":
@@ -4,9 +4,12 @@ Unit tests for runtime.tool_executor module
 Tests the ToolExecutor component with Pydantic V2 validation.
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, MagicMock
-from tools.base import ToolStatus, ToolResult
+from tools.base import BaseTool, ToolStatus, ToolResult
 from tools.registry import ToolRegistry
 from runtime.tool_executor import ToolExecutor, ToolCall, ToolExecutionResult
 
@@ -343,3 +346,125 @@ class TestToolExecutor:
         result = executor.execute_tool(tc, "conv123")
 
         assert result.status == ToolStatus.SUCCESS
+
+
+class SleepTool(BaseTool):
+    """Outil qui dort puis renvoie son argument, en comptant les appels simultanés"""
+
+    def __init__(self, name="sleep", delay=0.2, max_concurrency=None, timeout_seconds=None):
+        super().__init__(name, "Dort puis répond")
+        self.delay = delay
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def execute(self, arguments):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(arguments.get("delay", self.delay))
+        with self._lock:
+            self.active -= 1
+        return ToolResult(status=ToolStatus.SUCCESS, output=str(arguments.get("value")))
+
+    def validate_arguments(self, arguments):
+        return True, None
+
+    def _get_parameters_schema(self):
+        return {"type": "object", "properties": {}}
+
+
+@pytest.mark.unit
+class TestConcurrentBatch:
+    """Test concurrent execute_batch"""
+
+    def _executor(self, *tools, **kwargs):
+        registry = Mock(spec=ToolRegistry)
+        registry.get.side_effect = {tool.name: tool for tool in tools}.get
+        return ToolExecutor(tool_registry=registry, **kwargs)
+
+    def test_batch_runs_concurrently_in_order(self):
+        """Test que les appels indépendants se chevauchent et gardent leur ordre"""
+        tool = SleepTool()
+        tracker = Mock()
+        executor = self._executor(tool, tracker=tracker, max_workers=4)
+        calls = [
+            ToolCall(tool="sleep", arguments={"value": i, "delay": 0.3 - i * 0.05})
+            for i in range(4)
+        ]
+
+        started = time.monotonic()
+        results = executor.execute_batch(calls, "conv123", "task456")
+        elapsed = time.monotonic() - started
+        executor.shutdown()
+
+        assert [r.output for r in results] == ["0", "1", "2", "3"]
+        assert elapsed < 0.6
+        assert tool.max_active > 1
+        # Provenance enregistrée pour chaque appel
+        assert tracker.track_tool_execution.call_count == 4
+        assert len({r.input_hash for r in results}) == 4
+
+    def test_sequential_mode(self):
+        """Test concurrent=False"""
+        tool = SleepTool(delay=0.01)
+        executor = self._executor(tool)
+
+        results = executor.execute_batch(
+            [ToolCall(tool="sleep", arguments={"value": i}) for i in range(3)],
+            "conv123",
+            concurrent=False,
+        )
+
+        assert [r.output for r in results] == ["0", "1", "2"]
+        assert tool.max_active == 1
+
+    def test_per_tool_concurrency_limit(self):
+        """Test que max_concurrency borne les appels simultanés d'un outil"""
+        limited = SleepTool(name="limited", delay=0.05, max_concurrency=1)
+        executor = self._executor(limited, max_workers=4)
+
+        results = executor.execute_batch(
+            [ToolCall(tool="limited", arguments={"value": i}) for i in range(4)], "conv123"
+        )
+        executor.shutdown()
+
+        assert all(r.status == ToolStatus.SUCCESS for r in results)
+        assert limited.max_active == 1
+
+    def test_timeout(self):
+        """Test qu'un appel trop long est rapporté en TIMEOUT sans bloquer le lot"""
+        slow = SleepTool(name="slow", delay=1.0, timeout_seconds=0.1)
+        fast = SleepTool(name="fast", delay=0.0)
+        executor = self._executor(slow, fast)
+
+        started = time.monotonic()
+        results = executor.execute_batch(
+            [
+                ToolCall(tool="slow", arguments={"value": "s"}),
+                ToolCall(tool="fast", arguments={"value": "f"}),
+            ],
+            "conv123",
+        )
+        elapsed = time.monotonic() - started
+        executor.shutdown()
+
+        assert results[0].status == ToolStatus.TIMEOUT
+        assert "timed out" in results[0].error
+        assert results[1].output == "f"
+        assert elapsed < 0.8
+
+    def test_exception_reraised_in_order(self):
+        """Test qu'une exception d'outil remonte comme en mode séquentiel"""
+        tool = Mock()
+        tool.validate_arguments.return_value = (True, None)
+        tool.execute.side_effect = RuntimeError("boom")
+        registry = Mock(spec=ToolRegistry)
+        registry.get.return_value = tool
+        executor = ToolExecutor(tool_registry=registry)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            executor.execute_batch([ToolCall(tool="t"), ToolCall(tool="t")], "conv123")
+        executor.shutdown()
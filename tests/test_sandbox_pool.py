@@ -0,0 +1,279 @@
+"""
+Tests for the warm sandbox worker pool (local backend, no Docker)
+
+Tests cover:
+- Fresh subprocess per run inside a reused worker
+- Recycling after N runs and on anomalies (timeout, killed child, dead worker)
+- Idle reaping and health checks
+- Processes left behind by a program (double fork + setsid) killed, worker recycled
+- Files written outside the run directory wiped, never seen by the next run
+- Local backend refusing to run without namespaces unless explicitly allowed
+- PythonSandboxTool with the local backend
+"""
+
+import os
+import time
+
+import pytest
+
+from tools.base import ToolStatus
+from tools.python_sandbox import PythonSandboxTool
+import tools.sandbox_pool as sandbox_pool
+from tools.sandbox_pool import (
+    ALLOW_UNISOLATED_ENV,
+    SandboxPool,
+    SandboxPoolConfig,
+    SandboxPoolError,
+    SandboxWorker,
+    local_worker_command,
+    shutdown_sandbox_pools,
+)
+
+# Démon classique: double fork, setsid, stdio détachés; le parent sort avec 0
+DAEMON = """
+import os, time
+read_end, write_end = os.pipe()
+if os.fork() == 0:
+    os.setsid()
+    if os.fork() == 0:
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.write(write_end, str(os.getpid()).encode())
+        os.close(write_end)
+        time.sleep(60)
+    os._exit(0)
+os.close(write_end)
+os.wait()
+print(os.read(read_end, 32).decode())
+"""
+
+
+def _gone(pid, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _pool(**config):
+    config.setdefault("size", 1)
+    config.setdefault("min_warm", 1)
+    return SandboxPool(
+        lambda: SandboxWorker(local_worker_command(memory_mb=512)),
+        SandboxPoolConfig(**config),
+        name="test-sandbox",
+    )
+
+
+@pytest.fixture
+def pool_factory():
+    pools = []
+
+    def create(**config):
+        pool = _pool(**config)
+        pools.append(pool)
+        return pool
+
+    yield create
+    for pool in pools:
+        pool.shutdown()
+
+
+class TestSandboxPool:
+    """Test worker reuse and recycling"""
+
+    def test_runs_reuse_warm_worker(self, pool_factory):
+        """Test que les exécutions réutilisent le worker, chacune dans un processus neuf"""
+        pool = pool_factory()
+        assert pool.wait_warm(timeout=10)
+
+        first = pool.run("import os\nprint(os.getpid())", timeout=5)
+        second = pool.run("import os\nprint(os.getpid())", timeout=5)
+
+        assert first.exit_code == 0 and second.exit_code == 0
+        assert first.stdout != second.stdout  # Sous-processus neuf
+        assert second.worker_runs == 2
+        assert pool.stats()["started"] == 1
+
+    def test_state_not_shared_between_runs(self, pool_factory):
+        """Test qu'aucun état ne survit d'une exécution à l'autre"""
+        pool = pool_factory()
+
+        pool.run("open('leak.txt', 'w').write('x')", timeout=5)
+        result = pool.run("import os\nprint(os.listdir('.'))", timeout=5)
+
+        assert result.stdout.strip() == "[]"
+
+    def test_recycled_after_max_runs(self, pool_factory):
+        """Test le recyclage après max_runs_per_worker exécutions"""
+        pool = pool_factory(max_runs_per_worker=2)
+
+        runs = [pool.run("print(1)", timeout=5).worker_runs for _ in range(3)]
+
+        assert runs == [1, 2, 1]
+        assert pool.stats()["recycled"] >= 1
+
+    def test_timeout_recycles_worker(self, pool_factory):
+        """Test qu'un timeout tue le sous-processus et recycle le worker"""
+        pool = pool_factory()
+
+        result = pool.run("while True:\n    pass", timeout=0.5)
+        after = pool.run("print('ok')", timeout=5)
+
+        assert result.timed_out
+        assert after.stdout.strip() == "ok"
+        assert after.worker_runs == 1
+        assert pool.stats()["recycled"] == 1
+
+    def test_killed_child_recycles_worker(self, pool_factory):
+        """Test qu'un sous-processus tué par un signal est une anomalie"""
+        pool = pool_factory()
+
+        result = pool.run("import os, signal\nos.kill(os.getpid(), signal.SIGKILL)", timeout=5)
+
+        assert result.exit_code < 0
+        assert result.anomalous
+        assert pool.run("print(2)", timeout=5).worker_runs == 1
+
+    def test_run_batch_forks_isolated_programs(self, pool_factory):
+        """Test un lot: un fork par programme, anomalies sans recyclage du worker"""
+        pool = pool_factory()
+
+        runs = pool.run_batch(
+            [
+                ("open('leak.txt', 'w').write('x')\nprint('first')", 5),
+                ("while True:\n    pass", 0.3),
+                ("import os\nprint(os.listdir('.'))", 5),
+                ("import os, signal\nos.kill(os.getpid(), signal.SIGKILL)", 5),
+            ]
+        )
+
+        assert runs[0].stdout.strip() == "first"
+        assert runs[1].timed_out
+        assert runs[2].stdout.strip() == "[]"
+        assert runs[3].exit_code < 0
+        assert [run.worker_runs for run in runs] == [1, 2, 3, 4]
+        assert pool.stats()["recycled"] == 0
+        assert pool.run("print(5)", timeout=5).worker_runs == 5
+
+    def test_daemonized_process_killed_and_worker_recycled(self, pool_factory):
+        """Test qu'un processus détaché (double fork + setsid) est tué et le worker recyclé"""
+        pool = pool_factory()
+
+        result = pool.run(DAEMON, timeout=5)
+        after = pool.run("print('ok')", timeout=5)
+
+        assert result.exit_code == 0 and not result.timed_out
+        assert result.leftover_processes == 1
+        assert result.anomalous
+        assert _gone(int(result.stdout.strip()))
+        assert after.worker_runs == 1
+        assert pool.stats()["recycled"] == 1
+
+    def test_run_batch_daemon_recycles_worker(self, pool_factory):
+        """Test qu'un programme du lot laissant un processus recycle le worker après le lot"""
+        pool = pool_factory()
+
+        runs = pool.run_batch([(DAEMON, 5), ("print('next')", 5)])
+
+        assert runs[0].leftover_processes == 1
+        assert _gone(int(runs[0].stdout.strip()))
+        assert runs[1].leftover_processes == 0
+        assert runs[1].stdout.strip() == "next"
+        assert pool.stats()["recycled"] == 1
+
+    @pytest.mark.skipif(
+        not sandbox_pool.local_namespace_prefix(), reason="mount namespace unavailable"
+    )
+    def test_files_outside_run_dir_wiped(self, pool_factory):
+        """Test qu'un fichier écrit dans /tmp n'est lu ni par l'exécution suivante ni par l'hôte"""
+        pool = pool_factory()
+        path = f"/tmp/leak_from_run1_{os.getpid()}"
+
+        first = pool.run(f"open({path!r}, 'w').write('secret')", timeout=5)
+        second = pool.run(f"import os; print(os.path.exists({path!r}))", timeout=5)
+        batch = pool.run_batch(
+            [(f"open({path!r}, 'w').write('secret')", 5), (f"print(open({path!r}).read())", 5)]
+        )
+
+        assert first.leaked_files == 1 and first.anomalous
+        assert second.stdout.strip() == "False" and second.leaked_files == 0
+        assert batch[0].leaked_files == 1
+        assert batch[1].exit_code != 0 and "secret" not in batch[1].stdout
+        assert pool.stats()["recycled"] == 2
+        assert not os.path.exists(path)  # tmpfs privé au worker
+
+    def test_dead_worker_replaced(self, pool_factory):
+        """Test qu'un worker mort pendant l'inactivité est remplacé"""
+        pool = pool_factory()
+        assert pool.wait_warm(timeout=10)
+        pool._idle[0].process.kill()
+        pool._idle[0].process.wait()
+
+        result = pool.run("print(3)", timeout=5)
+
+        assert result.stdout.strip() == "3"
+
+    def test_idle_reaping(self, pool_factory):
+        """Test la fermeture des workers inactifs au-delà de min_warm"""
+        pool = pool_factory(size=2, min_warm=0, idle_timeout=0.1, health_check_interval=0.1)
+        pool.run("print(1)", timeout=5)
+        assert pool.stats()["workers"] == 1
+
+        time.sleep(0.5)
+
+        assert pool.stats()["workers"] == 0
+
+    def test_health_check_discards_unhealthy(self, pool_factory):
+        """Test que le contrôle de santé écarte un worker qui ne répond plus"""
+        pool = pool_factory(health_check_interval=0.05, idle_timeout=60, startup_timeout=2)
+        assert pool.wait_warm(timeout=10)
+        worker = pool._idle[0]
+        worker.process.stdin.close()  # Le worker sort à la fin de stdin
+
+        time.sleep(0.5)
+        pool.reap()
+
+        assert worker not in pool._idle
+        assert pool.run("print(4)", timeout=5).stdout.strip() == "4"
+
+
+class TestLocalBackendIsolation:
+    """Test the local backend refusal without namespaces"""
+
+    def test_refuses_without_namespaces(self, monkeypatch):
+        """Test le refus sans unshare, sauf accord explicite (CI)"""
+        monkeypatch.setattr(sandbox_pool, "_namespace_prefix", [])
+        monkeypatch.delenv(ALLOW_UNISOLATED_ENV, raising=False)
+
+        with pytest.raises(SandboxPoolError, match=ALLOW_UNISOLATED_ENV):
+            local_worker_command(memory_mb=512)
+
+        monkeypatch.setenv(ALLOW_UNISOLATED_ENV, "1")
+        command = local_worker_command(memory_mb=512)
+
+        assert command[0] != "unshare" and "-c" in command
+
+
+class TestLocalBackendTool:
+    """Test PythonSandboxTool with the local backend"""
+
+    def test_execute(self):
+        """Test l'exécution via l'outil (backend local)"""
+        try:
+            tool = PythonSandboxTool(backend="local")
+            tool.timeout = 0.5
+            result = tool.execute({"code": "print(sum(range(10)))"})
+            timeout = tool.execute({"code": "while True:\n    pass"})
+        finally:
+            shutdown_sandbox_pools()
+
+        assert result.status == ToolStatus.SUCCESS
+        assert result.output.strip() == "45"
+        assert result.metadata["isolation"] == "local"
+        assert timeout.status == ToolStatus.TIMEOUT
@@ -50,7 +50,7 @@ def test_health_endpoint_database_connection_properly_closed(test_client, temp_d
     # We can't directly test the connection leak, but we can verify the endpoint works
 
     with (
-        patch("runtime.server.get_agent") as mock_agent,
+        patch("runtime.server.get_loaded_agent") as mock_agent,
         patch("runtime.server.get_logger") as mock_logger,
         patch("runtime.server.get_worm_logger") as mock_worm_logger,
     ):
@@ -91,7 +91,7 @@ def test_health_endpoint_handles_database_error(test_client, temp_db):
 
     with (
         patch("runtime.server.get_connection") as mock_get_connection,
-        patch("runtime.server.get_agent") as mock_agent,
+        patch("runtime.server.get_loaded_agent") as mock_agent,
         patch("runtime.server.get_logger") as mock_logger,
         patch("runtime.server.get_worm_logger") as mock_worm_logger,
     ):
@@ -0,0 +1,228 @@
+"""
+Tests for agent stage timers and the sampling profiler endpoint
+
+Tests cover:
+- Disabled stage timer returns a shared no-op context manager
+- Enabled stage timer creates agent.<stage> spans and observes stage durations
+- Agent.chat stages (routing, memory, generation, tool execution, logging...)
+- Sampling profiler collapsed stacks
+- /debug/profile admin token checks
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from runtime.model_interface import GenerationResult
+from runtime.profiler import ProfilerBusyError, SamplingProfiler, format_collapsed
+from runtime.stage_timer import STAGES, StageTimer
+
+
+class _StageRecorder:
+    """AgentMetrics minimal: durées par étape"""
+
+    def __init__(self):
+        self.durations = []
+
+    def record_stage_duration(self, stage, duration_seconds):
+        self.durations.append((stage, duration_seconds))
+
+
+@pytest.fixture
+def traced_timer():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    recorder = _StageRecorder()
+    timer = StageTimer(enabled=True, tracer=provider.get_tracer("test"), metrics=recorder)
+    return timer, exporter, recorder
+
+
+class TestStageTimer:
+    """Test span and histogram emission"""
+
+    def test_disabled_is_shared_noop(self):
+        """Test qu'un chronomètre désactivé ne crée ni span ni mesure"""
+        timer = StageTimer(enabled=False)
+
+        with timer.stage("generation") as span:
+            assert span is None
+
+        assert timer.stage("routing") is timer.stage("logging")
+        assert timer.tracer is None and timer.metrics is None
+
+    def test_enabled_creates_spans_and_durations(self, traced_timer):
+        """Test les spans agent.<étape> imbriqués et les durées observées"""
+        timer, exporter, recorder = traced_timer
+
+        with timer.stage("generation", iteration=1):
+            with timer.stage("tool_parsing"):
+                time.sleep(0.01)
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert set(spans) == {"agent.generation", "agent.tool_parsing"}
+        assert spans["agent.generation"].attributes["iteration"] == 1
+        assert spans["agent.tool_parsing"].parent.span_id == (
+            spans["agent.generation"].context.span_id
+        )
+        assert [stage for stage, _ in recorder.durations] == ["tool_parsing", "generation"]
+        assert all(duration >= 0.01 for _, duration in recorder.durations)
+
+    def test_exception_recorded_and_propagated(self, traced_timer):
+        """Test qu'une exception traverse l'étape et marque le span en erreur"""
+        timer, exporter, recorder = traced_timer
+
+        with pytest.raises(ValueError):
+            with timer.stage("provenance"):
+                raise ValueError("boom")
+
+        (span,) = exporter.get_finished_spans()
+        assert not span.status.is_ok
+        assert recorder.durations[0][0] == "provenance"
+
+    def test_agent_chat_stages(self, traced_timer):
+        """Test les étapes mesurées par Agent.chat (mode simple, un appel d'outil)"""
+        from runtime.agent import Agent
+
+        timer, exporter, recorder = traced_timer
+        model = MagicMock()
+        model.generate.side_effect = [
+            GenerationResult(
+                text='<tool_call>{"tool": "math_calculator", "arguments": '
+                '{"expression": "2 + 2"}}</tool_call>',
+                finish_reason="tool_calls",
+                tokens_generated=5,
+                prompt_tokens=10,
+                total_tokens=15,
+            ),
+            GenerationResult(
+                text="Le résultat est 4",
+                finish_reason="stop",
+                tokens_generated=5,
+                prompt_tokens=20,
+                total_tokens=25,
+            ),
+        ]
+
+        with (
+            patch("runtime.agent.CACHE_AVAILABLE", False),
+            patch("runtime.agent.add_message"),
+            patch("runtime.agent.get_messages", return_value=[]),
+        ):
+            agent = Agent(
+                logger=MagicMock(),
+                dr_manager=MagicMock(),
+                tracker=MagicMock(),
+                compliance_guardian=MagicMock(),
+                stage_timer=timer,
+            )
+            agent.model = model
+            result = agent.chat("Calcule 2 + 2", "conv-stages", task_id="task-1")
+
+        assert result["tools_used"] == ["math_calculator"]
+        stages = {stage for stage, _ in recorder.durations}
+        assert {
+            "routing",
+            "compliance_audit",
+            "logging",
+            "episodic_write",
+            "episodic_read",
+            "context_build",
+            "system_prompt",
+            "generation",
+            "tool_parsing",
+            "tool_execution",
+            "provenance",
+            "dr_signing",
+        } <= stages
+        assert stages <= set(STAGES)
+        generations = [s for s in exporter.get_finished_spans() if s.name == "agent.generation"]
+        assert [s.attributes["iteration"] for s in generations] == [1, 2]
+
+
+def _busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """Test collapsed-stack sampling"""
+
+    def test_samples_other_threads(self):
+        """Test que les piles des autres threads sont échantillonnées (racine = thread)"""
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_worker, args=(stop,), name="busy-worker")
+        worker.start()
+        try:
+            stacks = SamplingProfiler(interval=0.001).sample(0.2)
+        finally:
+            stop.set()
+            worker.join()
+
+        busy = {stack: count for stack, count in stacks.items() if "_busy_worker" in stack}
+        assert busy
+        assert all(stack.startswith("busy-worker;") for stack in busy)
+        assert not any("sample (profiler.py" in stack for stack in stacks)
+
+    def test_format_collapsed(self):
+        """Test le format « pile nombre », piles les plus fréquentes d'abord"""
+        text = format_collapsed({"main;a (x.py:1)": 2, "main;a (x.py:1);b (x.py:5)": 7})
+
+        assert text == "main;a (x.py:1);b (x.py:5) 7\nmain;a (x.py:1) 2\n"
+
+    def test_single_profile_at_a_time(self):
+        """Test qu'un second profilage concurrent est refusé"""
+        profiler = SamplingProfiler(interval=0.001)
+        thread = threading.Thread(target=profiler.sample, args=(0.3,))
+        thread.start()
+        time.sleep(0.05)
+        try:
+            with pytest.raises(ProfilerBusyError):
+                profiler.sample(0.01)
+        finally:
+            thread.join()
+
+
+class TestProfileEndpoint:
+    """Test /debug/profile access control and output"""
+
+    @pytest.fixture
+    def client(self):
+        from runtime.server import app
+
+        return TestClient(app)
+
+    def test_disabled_without_admin_token(self, client, monkeypatch):
+        """Test que l'endpoint n'existe pas sans jeton configuré"""
+        monkeypatch.delenv("FILAGENT_ADMIN_TOKEN", raising=False)
+
+        assert client.get("/debug/profile?seconds=0.1").status_code == 404
+
+    def test_requires_admin_token(self, client, monkeypatch):
+        """Test le refus sans jeton ou avec un mauvais jeton"""
+        monkeypatch.setenv("FILAGENT_ADMIN_TOKEN", "s3cret")
+
+        missing = client.get("/debug/profile?seconds=0.1")
+        wrong = client.get("/debug/profile?seconds=0.1", headers={"Authorization": "Bearer nope"})
+
+        assert missing.status_code == wrong.status_code == 401
+
+    def test_returns_collapsed_profile(self, client, monkeypatch):
+        """Test le profil collapsed téléchargeable et la limite de durée"""
+        monkeypatch.setenv("FILAGENT_ADMIN_TOKEN", "s3cret")
+        headers = {"Authorization": "Bearer s3cret"}
+
+        response = client.get("/debug/profile?seconds=0.2", headers=headers)
+        too_long = client.get("/debug/profile?seconds=3600", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-disposition"].endswith('.collapsed"')
+        lines = response.text.splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert too_long.status_code == 400
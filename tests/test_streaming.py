@@ -0,0 +1,304 @@
+"""
+Tests for token streaming (model interface, tool-call filter, SSE endpoint)
+
+Tests cover:
+- StreamingToolCallFilter holds back text once <tool_call> opens
+- Default and llama.cpp generate_stream implementations
+- OpenAI-compatible stream conversion (usage, citations)
+- Agent streaming path and time-to-first-token metric
+- /chat with stream=true returning chat.completion.chunk events
+- Abandoned streams stopping the agent and freeing the worker pool slot
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+
+from runtime.model_interface import (
+    GenerationConfig,
+    GenerationResult,
+    LlamaCppInterface,
+    ModelInterface,
+    StreamChunk,
+    _stream_chat_completion,
+)
+from runtime.tool_parser import StreamingToolCallFilter
+
+
+def _feed_all(stream_filter, deltas):
+    visible = "".join(stream_filter.feed(d) for d in deltas)
+    return visible + stream_filter.flush()
+
+
+class TestStreamingToolCallFilter:
+    """Test incremental tool-call detection"""
+
+    def test_plain_text_forwarded(self):
+        """Test que le texte simple est relayé (sans espaces initiaux)"""
+        stream_filter = StreamingToolCallFilter()
+
+        assert _feed_all(stream_filter, ["  Bon", "jour ", "à tous"]) == "Bonjour à tous"
+        assert stream_filter.tool_call_started is False
+
+    def test_stops_at_tag_split_across_deltas(self):
+        """Test l'arrêt quand la balise est répartie sur plusieurs fragments"""
+        stream_filter = StreamingToolCallFilter()
+        deltas = ["Je calcule", " <to", "ol_c", 'all>{"tool": "calculator"', "}</tool_call>"]
+
+        assert stream_filter.feed(deltas[0]) == "Je calcule"
+        assert stream_filter.feed(deltas[1]) == " "  # "<to" retenu
+        assert stream_filter.feed(deltas[2]) == ""
+        assert stream_filter.feed(deltas[3]) == ""
+        assert stream_filter.tool_call_started is True
+        assert stream_filter.feed(deltas[4]) == ""
+        assert stream_filter.flush() == ""
+
+    def test_false_prefix_released(self):
+        """Test qu'un '<' qui n'ouvre pas la balise est finalement relayé"""
+        stream_filter = StreamingToolCallFilter()
+
+        assert _feed_all(stream_filter, ["a <", "b"]) == "a <b"
+        assert _feed_all(StreamingToolCallFilter(), ["x <tool"]) == "x <tool"
+
+    def test_raw_json_tool_call_suppressed(self):
+        """Test qu'un appel d'outil JSON brut n'est pas relayé"""
+        stream_filter = StreamingToolCallFilter()
+
+        visible = _feed_all(stream_filter, ['{"tool": "calc', 'ulator", "arguments": {}}'])
+
+        assert visible == ""
+        assert stream_filter.tool_call_started is True
+
+
+class _StaticModel(ModelInterface):
+    """Modèle sans streaming natif"""
+
+    def load(self, model_path, config):
+        return True
+
+    def generate(self, prompt, config, system_prompt=None):
+        return GenerationResult(
+            text="réponse",
+            finish_reason="stop",
+            tokens_generated=1,
+            prompt_tokens=1,
+            total_tokens=2,
+        )
+
+    def unload(self):
+        pass
+
+    def is_loaded(self):
+        return True
+
+
+class TestGenerateStream:
+    """Test backend streaming implementations"""
+
+    def test_default_single_chunk(self):
+        """Test l'implémentation par défaut (un seul fragment)"""
+        chunks = list(_StaticModel().generate_stream("p", GenerationConfig()))
+
+        assert [c.text for c in chunks] == ["réponse", ""]
+        assert chunks[-1].result.text == "réponse"
+
+    def test_llama_stream_tokens(self):
+        """Test le streaming llama.cpp token par token"""
+        model = LlamaCppInterface()
+        model._loaded = True
+        model.model = MagicMock(
+            return_value=iter(
+                [
+                    {"choices": [{"text": " Bon", "finish_reason": None}]},
+                    {"choices": [{"text": "jour", "finish_reason": None}]},
+                    {"choices": [{"text": "", "finish_reason": "stop"}]},
+                ]
+            )
+        )
+
+        chunks = list(model.generate_stream("salut", GenerationConfig()))
+
+        assert model.model.call_args.kwargs["stream"] is True
+        assert [c.text for c in chunks[:-1]] == [" Bon", "jour"]
+        result = chunks[-1].result
+        assert result.text == "Bonjour"
+        assert result.tokens_generated == 2
+        assert result.finish_reason == "stop"
+
+    def test_llama_mock_fallback_streams_once(self):
+        """Test le modèle mock (réponse complète non streamée)"""
+        model = LlamaCppInterface()
+        model._create_mock_model()
+
+        chunks = list(model.generate_stream("salut", GenerationConfig()))
+
+        assert len(chunks) == 2
+        assert chunks[-1].result.total_tokens == 30
+
+    def test_chat_completion_stream_conversion(self):
+        """Test la conversion d'un flux chat.completions"""
+
+        def delta(content, finish_reason=None):
+            return SimpleNamespace(
+                choices=[
+                    SimpleNamespace(
+                        delta=SimpleNamespace(content=content), finish_reason=finish_reason
+                    )
+                ],
+                usage=None,
+            )
+
+        usage = SimpleNamespace(prompt_tokens=5, completion_tokens=2, total_tokens=7)
+        stream = [
+            delta("Bon"),
+            delta("jour", "stop"),
+            SimpleNamespace(choices=[], usage=usage, citations=["https://example.com"]),
+        ]
+
+        chunks = list(_stream_chat_completion(stream))
+
+        assert [c.text for c in chunks[:-1]] == ["Bon", "jour"]
+        result = chunks[-1].result
+        assert (result.text, result.total_tokens) == ("Bonjour", 7)
+        assert result.citations == ["https://example.com"]
+
+
+class TestAgentStreaming:
+    """Test the agent streaming path"""
+
+    def test_generate_streaming_forwards_visible_text(self):
+        """Test que l'agent relaie le texte et enregistre le TTFT"""
+        from runtime.agent import Agent
+
+        agent = Agent.__new__(Agent)
+        agent.metrics = MagicMock()
+        result = GenerationResult(
+            text='Voici <tool_call>{"tool": "x", "arguments": {}}</tool_call>',
+            finish_reason="stop",
+            tokens_generated=3,
+            prompt_tokens=1,
+            total_tokens=4,
+        )
+        agent.model = MagicMock()
+        agent.model.generate_stream.return_value = iter(
+            [
+                StreamChunk(text="Voici "),
+                StreamChunk(text='<tool_call>{"tool": "x", "arguments": {}}</tool_call>'),
+                StreamChunk(text="", result=result),
+            ]
+        )
+        tokens = []
+
+        returned = agent._generate_streaming(
+            "prompt", GenerationConfig(), "system", tokens.append, start_time=0.0
+        )
+
+        assert returned is result
+        assert "".join(tokens) == "Voici "
+        agent.metrics.record_time_to_first_token.assert_called_once()
+
+
+class TestChatSSE:
+    """Test /chat with stream=true"""
+
+    @staticmethod
+    def _events(response):
+        return [
+            line[len("data: ") :] for line in response.text.split("\n") if line.startswith("data: ")
+        ]
+
+    def test_stream_chunks(self, monkeypatch):
+        """Test le flux SSE chat.completion.chunk"""
+        import runtime.server as server
+        from runtime.utils.worker_pool import reset_worker_pool
+
+        def fake_run(message, conversation_id, task_id, on_token=None):
+            on_token("Bon")
+            on_token("jour")
+            return {
+                "response": "Bonjour",
+                "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+            }
+
+        monkeypatch.setattr(server, "_run_agent_chat", fake_run)
+        reset_worker_pool()
+        try:
+            response = TestClient(server.app).post(
+                "/chat",
+                json={"messages": [{"role": "user", "content": "salut"}], "stream": True},
+            )
+        finally:
+            reset_worker_pool()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self._events(response)
+        assert events[-1] == "[DONE]"
+        chunks = [json.loads(e) for e in events[:-1]]
+        assert all(c["object"] == "chat.completion.chunk" for c in chunks)
+        assert chunks[0]["choices"][0]["delta"] == {"role": "assistant"}
+        content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+        assert content == "Bonjour"
+        assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+        assert chunks[-1]["usage"]["total_tokens"] == 5
+
+    def test_stream_without_tokens_sends_full_response(self, monkeypatch):
+        """Test le repli (HTN, cache, stub): réponse entière en un fragment"""
+        import runtime.server as server
+        from runtime.utils.worker_pool import reset_worker_pool
+
+        monkeypatch.setattr(server, "_run_agent_chat", lambda *args, **kwargs: None)
+        reset_worker_pool()
+        try:
+            response = TestClient(server.app).post(
+                "/chat",
+                json={"messages": [{"role": "user", "content": "salut"}], "stream": True},
+            )
+        finally:
+            reset_worker_pool()
+
+        chunks = [json.loads(e) for e in self._events(response)[:-1]]
+        content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+        assert content == server.STUB_RESPONSE
+
+    def test_stream_timeout_stops_agent_and_frees_slot(self, monkeypatch):
+        """Test qu'un flux expiré interrompt la génération et libère le pool"""
+        import runtime.server as server
+        from runtime.utils.worker_pool import init_worker_pool, reset_worker_pool
+
+        stopped = threading.Event()
+        raised = []
+
+        def endless_run(message, conversation_id, task_id, on_token=None):
+            try:
+                for _ in range(500):
+                    on_token("x")
+                    time.sleep(0.01)
+            except server.StreamCancelledError as e:
+                raised.append(e)
+                raise
+            finally:
+                stopped.set()
+
+        monkeypatch.setattr(server, "_run_agent_chat", endless_run)
+        pool = init_worker_pool(max_workers=1, max_queue=0, default_timeout=0.2)
+        try:
+            response = TestClient(server.app).post(
+                "/chat",
+                json={"messages": [{"role": "user", "content": "salut"}], "stream": True},
+            )
+
+            chunks = [json.loads(e) for e in self._events(response)[:-1]]
+            assert chunks[-1]["choices"][0]["finish_reason"] == "error"
+            assert stopped.wait(2)
+            assert len(raised) == 1
+            deadline = time.monotonic() + 2
+            while pool.in_flight and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert pool.in_flight == 0
+        finally:
+            reset_worker_pool()
@@ -0,0 +1,202 @@
+"""
+Tests for token counting and context-window budgeting
+
+Tests cover:
+- Memoized token counter with backend tokenizer and local fallback
+- Head/tail truncation within a token budget
+- Allocation across system prompt, tool results, semantic context and history
+- Agent loop keeps prompts inside the context window
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from runtime.agent import Agent
+from runtime.config import AgentConfig
+from runtime.model_interface import GenerationResult, LlamaCppInterface, ModelInterface
+from runtime.token_budget import TokenBudgeter, TokenCounter, estimate_tokens
+
+
+def word_count(text):
+    return len(text.split())
+
+
+@pytest.fixture
+def budgeter():
+    return TokenBudgeter(
+        TokenCounter(word_count), context_window=200, reserved_output_tokens=50, safety_margin=0
+    )
+
+
+class TestTokenCounter:
+    """Test the memoized counter"""
+
+    def test_memoized(self):
+        """Test que chaque texte n'est tokenisé qu'une fois"""
+        calls = []
+        counter = TokenCounter(lambda text: calls.append(text) or word_count(text))
+
+        assert counter.count("un deux trois") == 3
+        assert counter.count("un deux trois") == 3
+        assert calls == ["un deux trois"]
+        assert counter.stats()["hit_rate"] == 0.5
+
+    def test_lru_bound(self):
+        """Test la borne du cache"""
+        counter = TokenCounter(word_count, max_entries=2)
+        for text in ("a", "b", "c"):
+            counter.count(text)
+
+        assert counter.stats()["entries"] == 2
+
+    def test_fallback_on_tokenizer_error(self):
+        """Test le repli sur l'estimation locale"""
+
+        def broken(text):
+            raise RuntimeError("no tokenizer")
+
+        counter = TokenCounter(broken)
+
+        assert counter.count("bonjour le monde") == estimate_tokens("bonjour le monde")
+
+    def test_estimate_tokens(self):
+        """Test l'estimation locale (mots longs découpés, ponctuation)"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("chat") == 1
+        assert estimate_tokens("anticonstitutionnellement") == 7
+        assert estimate_tokens("a, b.") == 4
+
+
+class TestTruncate:
+    """Test head/tail truncation"""
+
+    def test_fits_unchanged(self, budgeter):
+        assert budgeter.truncate("un deux", 5) == "un deux"
+
+    def test_keeps_head_and_tail(self, budgeter):
+        """Test que le début et la fin sont conservés"""
+        text = " ".join(f"mot{i}" for i in range(100))
+
+        truncated = budgeter.truncate(text, 30)
+
+        assert word_count(truncated) <= 30
+        assert truncated.startswith("mot0 mot1")
+        assert truncated.endswith("mot99")
+        assert "tokens tronqués" in truncated
+
+
+class TestAllocate:
+    """Test budget allocation"""
+
+    def test_everything_fits(self, budgeter):
+        history = [{"role": "user", "content": "salut"}, {"role": "assistant", "content": "allo"}]
+
+        allocation = budgeter.allocate("système", "question", history)
+
+        assert allocation.history == history
+        assert allocation.omitted_messages == 0
+        assert allocation.total_tokens <= budgeter.available_tokens
+
+    def test_oldest_history_dropped(self, budgeter):
+        """Test que l'historique ancien est omis au profit du récent"""
+        history = [
+            {"role": "user", "content": " ".join(["vieux"] * 20) + f" {i}"} for i in range(20)
+        ]
+
+        allocation = budgeter.allocate("système court", "question", history)
+
+        assert allocation.total_tokens <= budgeter.available_tokens
+        assert allocation.history[-1] == history[-1]
+        assert allocation.omitted_messages > 0
+        assert "messages antérieurs omis" in allocation.history[0]["content"]
+
+    def test_large_tool_output_truncated(self, budgeter):
+        """Test qu'une sortie d'outil volumineuse ne déborde pas la fenêtre"""
+        tool_output = " ".join(f"ligne{i}" for i in range(1000))
+
+        allocation = budgeter.allocate(
+            "système", "question", [{"role": "user", "content": "avant"}], [tool_output]
+        )
+
+        assert allocation.total_tokens <= budgeter.available_tokens
+        assert allocation.tokens["tool_results"] <= budgeter.available_tokens * 0.5
+        assert allocation.tool_results[0].startswith("ligne0")
+        assert allocation.history  # L'historique garde de la place
+
+    def test_semantic_context_share(self, budgeter):
+        semantic = " ".join(["doc"] * 500)
+
+        allocation = budgeter.allocate("système", "question", semantic_context=semantic)
+
+        assert 0 < allocation.tokens["semantic_context"] <= budgeter.available_tokens // 2
+
+
+class RecordingModel(ModelInterface):
+    """Modèle qui retient les prompts reçus"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def load(self, model_path, config):
+        return True
+
+    def generate(self, prompt, config, system_prompt=None):
+        self.prompts.append((system_prompt or "") + prompt)
+        return GenerationResult(
+            text="réponse",
+            finish_reason="stop",
+            tokens_generated=1,
+            prompt_tokens=1,
+            total_tokens=2,
+        )
+
+    def count_tokens(self, text):
+        return word_count(text)
+
+    def unload(self):
+        pass
+
+    def is_loaded(self):
+        return True
+
+
+class TestAgentIntegration:
+    """Test the budget inside the agent loop"""
+
+    def test_long_history_fits_context(self):
+        """Test que le prompt reste dans n_ctx malgré un long historique"""
+        config = AgentConfig()
+        config.model.context_size = 600
+        config.generation.max_tokens = 100
+        config.htn_planning = None
+        registry = MagicMock()
+        registry.list_all.return_value = {}
+        agent = Agent(
+            config=config,
+            tool_registry=registry,
+            logger=MagicMock(),
+            dr_manager=MagicMock(),
+            tracker=MagicMock(),
+        )
+        agent.model = RecordingModel()
+        history = [{"role": "user", "content": " ".join(["bla"] * 100)} for _ in range(8)] + [
+            {"role": "user", "content": "question"}
+        ]
+
+        with (
+            patch("runtime.agent.get_messages", return_value=history),
+            patch("runtime.agent.add_message"),
+        ):
+            agent._run_simple("question", "conv-budget")
+
+        assert word_count(agent.model.prompts[0]) <= 500
+        assert "messages antérieurs omis" in agent.model.prompts[0]
+
+    def test_llama_prompt_tokens_from_tokenizer(self):
+        """Test que prompt_tokens vient du tokenizer et non du nombre de mots"""
+        model = LlamaCppInterface()
+        model._create_mock_model()
+        model.model.tokenize = lambda data: list(data)  # un token par octet
+
+        assert model.count_tokens("abc") == 3
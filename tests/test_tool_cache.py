@@ -0,0 +1,166 @@
+"""
+Unit tests for tool result memoization
+
+Tests cover:
+- Cache keys from canonical arguments and file fingerprints
+- TTL expiry and LRU bound
+- ToolExecutor cache hits with provenance and logs marked as cached
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from runtime.tool_cache import ToolResultCache, file_fingerprint
+from runtime.tool_executor import ToolCall, ToolExecutor
+from tools.base import BaseTool, ToolResult, ToolStatus
+from tools.registry import ToolRegistry
+
+
+class CountingTool(BaseTool):
+    """Outil déterministe qui compte ses exécutions"""
+
+    cacheable = True
+    file_arguments = ("file_path",)
+
+    def __init__(self, name="counting"):
+        super().__init__(name, "Compte les exécutions")
+        self.calls = 0
+
+    def execute(self, arguments):
+        self.calls += 1
+        if arguments.get("fail"):
+            return ToolResult(status=ToolStatus.ERROR, output="", error="échec")
+        return ToolResult(status=ToolStatus.SUCCESS, output=f"run {self.calls}")
+
+    def validate_arguments(self, arguments):
+        return True, None
+
+    def _get_parameters_schema(self):
+        return {"type": "object", "properties": {}}
+
+
+def _executor(tool, cache, **kwargs):
+    registry = Mock(spec=ToolRegistry)
+    registry.get.return_value = tool
+    return ToolExecutor(tool_registry=registry, result_cache=cache, **kwargs)
+
+
+class TestCacheKeys:
+    """Test cache key construction"""
+
+    def test_argument_order_irrelevant(self):
+        """Test que l'ordre des arguments ne change pas la clé"""
+        cache = ToolResultCache()
+        tool = CountingTool()
+
+        assert cache.make_key("t", tool, {"a": 1, "b": 2}) == cache.make_key(
+            "t", tool, {"b": 2, "a": 1}
+        )
+        assert cache.make_key("t", tool, {"a": 1}) != cache.make_key("t", tool, {"a": 2})
+
+    def test_not_cacheable(self):
+        """Test qu'un outil non déclaré n'est pas mémoïsé"""
+        tool = CountingTool()
+        tool.cacheable = False
+
+        assert ToolResultCache().make_key("t", tool, {}) is None
+
+    def test_file_change_changes_key(self, tmp_path):
+        """Test que la modification d'un fichier invalide la clé"""
+        path = tmp_path / "doc.txt"
+        path.write_text("version 1")
+        cache = ToolResultCache()
+        tool = CountingTool()
+
+        before = cache.make_key("t", tool, {"file_path": str(path)})
+        path.write_text("version 2 plus longue")
+        after = cache.make_key("t", tool, {"file_path": str(path)})
+
+        assert before != after
+        assert file_fingerprint(str(path))["size"] == len("version 2 plus longue")
+
+    def test_missing_file_not_cached(self, tmp_path):
+        """Test qu'un fichier absent rend l'appel non mémoïsable"""
+        key = ToolResultCache().make_key("t", CountingTool(), {"file_path": str(tmp_path / "x")})
+
+        assert key is None
+
+
+class TestCacheBounds:
+    """Test TTL and size bounds"""
+
+    def test_ttl_expiry(self):
+        """Test l'expiration d'une entrée"""
+        cache = ToolResultCache(ttl_seconds=0.05)
+        cache.put("k", ToolResult(status=ToolStatus.SUCCESS, output="ok"))
+
+        assert cache.get("k").output == "ok"
+        time.sleep(0.1)
+        assert cache.get("k") is None
+
+    def test_lru_bound(self):
+        """Test l'éviction LRU au-delà de max_entries"""
+        cache = ToolResultCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.put(key, ToolResult(status=ToolStatus.SUCCESS, output=key))
+        cache.get("a")
+        cache.put("c", ToolResult(status=ToolStatus.SUCCESS, output="c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a").output == "a"
+        assert cache.stats()["entries"] == 2
+
+    def test_errors_not_cached(self):
+        """Test que les échecs ne sont pas mémoïsés"""
+        cache = ToolResultCache()
+        cache.put("k", ToolResult(status=ToolStatus.ERROR, output="", error="x"))
+
+        assert cache.get("k") is None
+
+
+@pytest.mark.unit
+class TestExecutorCache:
+    """Test ToolExecutor with the result cache"""
+
+    def test_cache_hit_keeps_provenance(self):
+        """Test qu'un hit évite l'exécution mais émet logs et provenance marqués"""
+        tool = CountingTool()
+        logger = Mock()
+        tracker = Mock()
+        executor = _executor(tool, ToolResultCache(), logger=logger, tracker=tracker)
+        call = ToolCall(tool="counting", arguments={"expression": "2+2"})
+
+        first = executor.execute_tool(call, "conv1")
+        second = executor.execute_tool(call, "conv2")
+
+        assert tool.calls == 1
+        assert (first.cached, second.cached) == (False, True)
+        assert second.output == first.output
+        assert second.output_hash == first.output_hash
+        assert tracker.track_tool_execution.call_count == 2
+        assert tracker.track_tool_execution.call_args[1]["cached"] is True
+        assert logger.log_tool_call.call_args[1]["cached"] is True
+
+    def test_failure_reexecuted(self):
+        """Test qu'un échec est réexécuté au prochain appel"""
+        tool = CountingTool()
+        executor = _executor(tool, ToolResultCache())
+        call = ToolCall(tool="counting", arguments={"fail": True})
+
+        executor.execute_tool(call, "conv1")
+        executor.execute_tool(call, "conv1")
+
+        assert tool.calls == 2
+
+    def test_cache_disabled(self):
+        """Test use_result_cache=False"""
+        tool = CountingTool()
+        executor = _executor(tool, None, use_result_cache=False)
+        call = ToolCall(tool="counting", arguments={})
+
+        executor.execute_tool(call, "conv1")
+        executor.execute_tool(call, "conv1")
+
+        assert tool.calls == 2
@@ -0,0 +1,166 @@
+"""
+Tests for lazy tool descriptors and plugin discovery
+
+Tests cover:
+- Registry boot without constructing tools or importing heavy modules
+- Descriptor schemas identical to the constructed tools
+- Construction on first use, execution settings known before construction
+- Construction failure reported as a tool error and not retried
+- Entry-point plugin discovery (filagent.tools)
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from tools.base import ToolStatus
+from tools.calculator import CalculatorTool
+from tools.catalog import BUILTIN_TOOLS, CALCULATOR, FILE_READER
+from tools.file_reader import FileReaderTool
+from tools.lazy import TOOL_SETTINGS, LazyTool, ToolDescriptor
+from tools.registry import ToolRegistry
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_registry_boot_is_lazy():
+    """Test que le registre se construit sans Docker, pandas, pypdf ni docx"""
+    code = textwrap.dedent("""
+        import sys
+        from tools.registry import ToolRegistry
+        registry = ToolRegistry()
+        assert set(registry.get_schemas()) >= {"python_sandbox", "document_analyzer_pme"}
+        print(sorted(m for m in ("docker", "pandas", "pypdf", "docx") if m in sys.modules))
+        """)
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize(
+    "descriptor, tool_class", [(CALCULATOR, CalculatorTool), (FILE_READER, FileReaderTool)]
+)
+def test_descriptor_matches_tool(descriptor, tool_class):
+    """Test que le schéma publié sans construction est celui de l'outil"""
+    assert LazyTool(descriptor).get_schema() == tool_class().get_schema()
+
+
+def test_constructed_on_first_use():
+    """Test la construction au premier usage et le relais des réglages"""
+    tool = ToolRegistry(discover_plugins=False).get("math_calculator")
+
+    assert not tool.is_loaded
+    assert tool.cacheable is True  # Réglage du descripteur avant construction
+
+    result = tool.execute({"expression": "6 * 7"})
+
+    assert tool.is_loaded
+    assert result.status == ToolStatus.SUCCESS
+    assert result.output == "42"
+    assert tool.cacheable is True
+    assert "+" in tool.safe_operations  # Attributs propres à l'outil
+
+
+@pytest.mark.parametrize("descriptor", BUILTIN_TOOLS, ids=lambda d: d.name)
+def test_descriptor_settings_match_tool_class(descriptor):
+    """Test que les réglages publiés avant construction sont ceux de la classe"""
+    module_name, _, attribute = descriptor.factory.partition(":")
+    module = pytest.importorskip(module_name)
+    tool_class = getattr(module, attribute)
+
+    for setting in TOOL_SETTINGS:
+        assert getattr(tool_class, setting) == getattr(descriptor, setting), setting
+
+
+def test_factory_name_mismatch():
+    """Test qu'une fabrique qui construit un autre outil est refusée"""
+    bad = ToolDescriptor("other", "x", {}, factory="tools.calculator:CalculatorTool")
+
+    with pytest.raises(ValueError):
+        LazyTool(bad).resolve()
+
+
+def test_construction_failure_is_tool_error():
+    """Test qu'un outil impossible à construire répond par une erreur mémorisée"""
+    from runtime.tool_executor import ToolCall, ToolExecutor
+
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise RuntimeError("Docker daemon not accessible")
+
+    tool = LazyTool(ToolDescriptor("broken", "x", {}, factory=broken))
+    registry = ToolRegistry(discover_plugins=False)
+    registry.register(tool)
+    executor = ToolExecutor(tool_registry=registry, logger=None, tracker=None)
+
+    result = executor.execute_tool(ToolCall(tool="broken", arguments={}), "conv-1")
+
+    assert result.status == ToolStatus.ERROR
+    assert "Docker daemon not accessible" in result.error
+    assert tool.execute({}).status == ToolStatus.ERROR
+    assert tool.validate_arguments({}) == (False, tool.load_error)
+    assert len(attempts) == 1
+    with pytest.raises(RuntimeError):
+        tool.resolve()
+
+
+def test_register_descriptor():
+    """Test l'enregistrement direct d'un descripteur"""
+    registry = ToolRegistry(discover_plugins=False)
+    version = registry.version
+    registry.register(ToolDescriptor("calc2", "Copie", {}, factory=lambda: _Renamed()))
+
+    assert isinstance(registry.get("calc2"), LazyTool)
+    assert registry.version != version
+
+
+class _Renamed(CalculatorTool):
+    def __init__(self):
+        super().__init__()
+        self.name = "calc2"
+
+
+def test_entry_point_plugins(tmp_path, monkeypatch):
+    """Test la découverte des plugins via les entry points filagent.tools"""
+    (tmp_path / "filagent_demo_plugin.py").write_text(textwrap.dedent("""
+            from tools.lazy import ToolDescriptor
+
+            DEMO = ToolDescriptor(
+                name="demo_echo",
+                description="Outil de démonstration",
+                parameters={"type": "object", "properties": {}},
+                factory="filagent_demo_plugin:build",
+            )
+
+            def build():
+                raise AssertionError("construit trop tôt")
+
+            BROKEN = object()
+            """))
+    dist_info = tmp_path / "filagent_demo_plugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: filagent-demo-plugin\nVersion: 1.0\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[filagent.tools]\n"
+        "demo_echo = filagent_demo_plugin:DEMO\n"
+        "broken = filagent_demo_plugin:BROKEN\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    registry = ToolRegistry()
+
+    plugin = registry.get("demo_echo")
+    assert isinstance(plugin, LazyTool)
+    assert not plugin.is_loaded
+    assert registry.get("broken") is None
+    assert registry.get_schemas()["demo_echo"]["description"] == "Outil de démonstration"
@@ -19,7 +19,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from tools.registry import ToolRegistry, get_registry, reload_registry
 from tools.base import BaseTool, ToolResult, ToolStatus
 from tools.calculator import CalculatorTool
-from tools.python_sandbox import PythonSandboxTool
 from tools.file_reader import FileReaderTool
 
 # ============================================================================
@@ -170,10 +169,11 @@ def test_default_tools_registered():
     assert "file_read" in registry._tools
     assert "math_calculator" in registry._tools
 
-    # Vérifier qu'ils sont des instances correctes
-    assert isinstance(registry._tools["python_sandbox"], PythonSandboxTool)
-    assert isinstance(registry._tools["file_read"], FileReaderTool)
-    assert isinstance(registry._tools["math_calculator"], CalculatorTool)
+    # Vérifier qu'ils sont différés et construisent les bonnes classes
+    assert registry._tools["python_sandbox"].descriptor.factory.endswith(":PythonSandboxTool")
+    assert not registry._tools["python_sandbox"].is_loaded
+    assert isinstance(registry._tools["file_read"].resolve(), FileReaderTool)
+    assert isinstance(registry._tools["math_calculator"].resolve(), CalculatorTool)
 
 
 # ============================================================================
@@ -0,0 +1,187 @@
+"""
+Unit tests for the bounded worker pool used by the API server
+
+Tests cover:
+- Blocking calls run off the event loop
+- Admission control (overload rejection, queue depth)
+- Per-call timeouts
+- Context propagation to worker threads
+- /chat returning 429 while /health stays responsive
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from runtime.utils.worker_pool import (
+    PoolOverloadedError,
+    PoolTimeoutError,
+    WorkerPool,
+    init_worker_pool,
+    reset_worker_pool,
+)
+
+
+@pytest.fixture
+def pool():
+    """Small pool: 1 worker, 1 queued call"""
+    p = WorkerPool(max_workers=1, max_queue=1, default_timeout=5.0)
+    yield p
+    p.shutdown(wait=False)
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestAdmission:
+    """Test admission control"""
+
+    def test_run_returns_result(self, pool):
+        """Test qu'un appel bloquant renvoie son résultat"""
+        result = asyncio.run(pool.run(lambda a, b=0: a + b, 2, b=3))
+
+        assert result == 5
+        assert pool.in_flight == 0
+
+    def test_overload_rejected(self, pool):
+        """Test le rejet immédiat au-delà de workers + file"""
+        release = threading.Event()
+        first = pool.submit(release.wait)
+        second = pool.submit(release.wait)
+
+        assert _wait_until(lambda: pool.queue_depth == 1)
+        assert pool.in_flight == 2
+        with pytest.raises(PoolOverloadedError):
+            pool.submit(release.wait)
+
+        release.set()
+        first.result(timeout=2)
+        second.result(timeout=2)
+        assert _wait_until(lambda: pool.in_flight == 0)
+        assert pool.queue_depth == 0
+
+    def test_invalid_sizes(self):
+        """Test la validation des tailles"""
+        with pytest.raises(ValueError):
+            WorkerPool(max_workers=0)
+        with pytest.raises(ValueError):
+            WorkerPool(max_queue=-1)
+
+
+class TestTimeout:
+    """Test per-call deadlines"""
+
+    def test_timeout_raises(self, pool):
+        """Test qu'un appel trop long lève PoolTimeoutError"""
+        release = threading.Event()
+
+        with pytest.raises(PoolTimeoutError) as exc_info:
+            asyncio.run(pool.run(release.wait, timeout=0.05))
+        assert exc_info.value.timeout == 0.05
+
+        # Le worker reste compté jusqu'au retour effectif de l'appel
+        assert pool.in_flight == 1
+        release.set()
+        assert _wait_until(lambda: pool.in_flight == 0)
+
+
+class TestContext:
+    """Test context propagation"""
+
+    def test_contextvars_propagated(self, pool):
+        """Test que les contextvars (trace) sont visibles dans le worker"""
+        var = contextvars.ContextVar("trace_id", default=None)
+
+        async def scenario():
+            var.set("trace-123")
+            return await pool.run(var.get)
+
+        assert asyncio.run(scenario()) == "trace-123"
+
+
+class TestServerIntegration:
+    """Test /chat under saturation"""
+
+    def test_chat_overloaded_returns_429_and_health_responds(self, monkeypatch):
+        """Test que /chat renvoie 429 quand le pool est plein et /health reste disponible"""
+        import runtime.server as server
+
+        release = threading.Event()
+        monkeypatch.setattr(server, "_run_agent_chat", lambda *args: release.wait(5))
+        pool = init_worker_pool(max_workers=1, max_queue=0, default_timeout=5.0)
+        try:
+            client = TestClient(server.app)
+            busy = pool.submit(release.wait, 5)
+            assert _wait_until(lambda: pool.in_flight == 1)
+
+            response = client.post(
+                "/chat", json={"messages": [{"role": "user", "content": "bonjour"}]}
+            )
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == "1"
+            assert response.json()["conversation_id"].startswith("conv-")
+
+            assert client.get("/health").status_code == 200
+
+            release.set()
+            busy.result(timeout=2)
+        finally:
+            release.set()
+            reset_worker_pool()
+
+    def test_concurrent_first_requests_create_one_agent(self, monkeypatch):
+        """Test que des premiers appels concurrents ne créent qu'un agent"""
+        import runtime.agent as agent_module
+
+        created = []
+
+        class SlowAgent:
+            def __init__(self):
+                created.append(self)
+
+            def initialize_model(self):
+                time.sleep(0.05)
+
+        monkeypatch.setattr(agent_module, "Agent", SlowAgent)
+        manager = agent_module.AgentManager()
+        start = threading.Barrier(8)
+
+        def first_request():
+            start.wait()
+            return manager.get_agent()
+
+        threads_agents = []
+        threads = [
+            threading.Thread(target=lambda: threads_agents.append(first_request()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(created) == 1
+        assert all(agent is created[0] for agent in threads_agents)
+
+    def test_health_does_not_load_agent(self, monkeypatch):
+        """Test que /health signale un modèle non chargé sans créer l'agent"""
+        import runtime.server as server
+
+        def fail():
+            raise AssertionError("get_agent appelé par /health")
+
+        monkeypatch.setattr(server, "get_agent", fail)
+        monkeypatch.setattr(server, "get_loaded_agent", lambda: None)
+
+        response = TestClient(server.app).get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["components"]["model"] is False
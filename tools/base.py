@@ -6,7 +6,7 @@ Tous les outils doivent hériter de cette classe
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -54,6 +54,15 @@ class ToolResult:
 class BaseTool(ABC):
     """Classe de base pour tous les outils"""
 
+    # Exécution concurrente (ToolExecutor.execute_batch, serveur MCP)
+    max_concurrency: Optional[int] = None  # Appels simultanés max (None: illimité)
+    timeout_seconds: Optional[float] = None  # Durée max d'un appel (None: aucune)
+    cpu_bound: bool = False  # Exécuter dans un pool de processus (outil picklable)
+
+    # Mémoïsation des résultats (runtime.tool_cache)
+    cacheable: bool = False  # Résultat déterministe pour mêmes arguments et fichiers
+    file_arguments: Tuple[str, ...] = ()  # Arguments désignant des fichiers à empreinter
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -5,6 +5,7 @@ Evalue des expressions mathematiques sans risque d'execution arbitraire
 
 from __future__ import annotations
 
+import copy
 import math
 import operator
 from typing import Callable, Dict, List, Optional, Union
@@ -18,6 +19,7 @@ from .base import (
     ToolMetadataValue,
     ToolSchemaDict,
 )
+from .catalog import CALCULATOR
 
 # Types stricts pour le calculateur
 MathOperation = Callable[[float, float], float]
@@ -34,14 +36,13 @@ class CalculatorTool(BaseTool):
     Utilise seulement des operations mathematiques sures
     """
 
+    cacheable = CALCULATOR.cacheable
+
     safe_operations: Dict[str, MathOperation]
     safe_functions: Dict[str, SafeFunctionValue]
 
     def __init__(self) -> None:
-        super().__init__(
-            name="math_calculator",
-            description="Evaluer des expressions mathematiques de maniere securisee",
-        )
+        super().__init__(name=CALCULATOR.name, description=CALCULATOR.description)
 
         # Operations autorisees
         self.safe_operations = {
@@ -250,13 +251,4 @@ class CalculatorTool(BaseTool):
 
     def _get_parameters_schema(self) -> ToolSchemaDict:
         """Schema des parametres"""
-        return {
-            "type": "object",
-            "properties": {
-                "expression": {
-                    "type": "string",
-                    "description": "Expression mathematique a evaluer (ex: '2 + 3 * 4', 'sqrt(16)')",
-                }
-            },
-            "required": ["expression"],
-        }
+        return copy.deepcopy(CALCULATOR.parameters)
@@ -0,0 +1,82 @@
+"""
+Catalogue des outils intégrés
+
+Nom, description et schéma des paramètres de chaque outil, importables sans
+les dépendances des outils (Docker, pandas, pypdf, docx). Les classes
+d'outils reprennent ces valeurs; le registre s'en sert pour publier le
+catalogue sans construire les outils. Les réglages d'exécution (cache,
+fichiers empreintés) sont déclarés ici pour être connus avant construction.
+"""
+
+from __future__ import annotations
+
+from .lazy import ToolDescriptor
+
+PYTHON_SANDBOX = ToolDescriptor(
+    name="python_sandbox",
+    description="Exécuter du code Python de manière sécurisée dans un conteneur Docker isolé",
+    parameters={
+        "type": "object",
+        "properties": {"code": {"type": "string", "description": "Code Python a executer"}},
+        "required": ["code"],
+    },
+    factory="tools.python_sandbox:PythonSandboxTool",
+)
+
+FILE_READER = ToolDescriptor(
+    name="file_read",
+    description="Lire le contenu d'un fichier de maniere securisee",
+    parameters={
+        "type": "object",
+        "properties": {
+            "file_path": {
+                "type": "string",
+                "description": "Chemin du fichier a lire (doit etre dans les chemins autorises)",
+            }
+        },
+        "required": ["file_path"],
+    },
+    factory="tools.file_reader:FileReaderTool",
+    cacheable=True,
+    file_arguments=("file_path",),
+)
+
+CALCULATOR = ToolDescriptor(
+    name="math_calculator",
+    description="Evaluer des expressions mathematiques de maniere securisee",
+    parameters={
+        "type": "object",
+        "properties": {
+            "expression": {
+                "type": "string",
+                "description": "Expression mathematique a evaluer (ex: '2 + 3 * 4', 'sqrt(16)')",
+            }
+        },
+        "required": ["expression"],
+    },
+    factory="tools.calculator:CalculatorTool",
+    cacheable=True,
+)
+
+DOCUMENT_ANALYZER_PME = ToolDescriptor(
+    name="document_analyzer_pme",
+    description="Analyse de documents PME avec calculs TPS/TVQ (Quebec)",
+    parameters={
+        "type": "object",
+        "properties": {
+            "file_path": {"type": "string", "description": "Path to the document to analyze"},
+            "analysis_type": {
+                "type": "string",
+                "enum": ["invoice", "extract", "financial", "contract", "report"],
+                "description": "Type of analysis: invoice (TPS/TVQ), extract (raw data), financial (balance sheets/budgets), contract (legal clauses), report (general report)",
+            },
+        },
+        "required": ["file_path"],
+    },
+    factory="tools.document_analyzer_pme:DocumentAnalyzerPME",
+    cacheable=True,
+    file_arguments=("file_path",),
+)
+
+# Ordre d'enregistrement par défaut
+BUILTIN_TOOLS = (PYTHON_SANDBOX, FILE_READER, CALCULATOR, DOCUMENT_ANALYZER_PME)
@@ -5,6 +5,7 @@ Supporte: PDF, Excel, Word avec calculs TPS/TVQ
 
 from __future__ import annotations
 
+import copy
 import pandas as pd
 from typing import Callable, Dict, List, Optional, Union
 import pypdf
@@ -20,6 +21,7 @@ from .base import (
     ToolMetadataValue,
     ToolSchemaDict,
 )
+from .catalog import DOCUMENT_ANALYZER_PME
 
 # Setup standard Python logger for testing compatibility
 logger = logging.getLogger(__name__)
@@ -40,14 +42,16 @@ GetLoggerType = Optional[Callable[[], Optional[object]]]
 class DocumentAnalyzerPME(BaseTool):
     """Analyseur intelligent de documents PME avec conformite Loi 25"""
 
+    cacheable = DOCUMENT_ANALYZER_PME.cacheable
+    file_arguments = DOCUMENT_ANALYZER_PME.file_arguments
+
     tps_rate: float
     tvq_rate: float
     logger: Optional[object]
 
     def __init__(self) -> None:
         super().__init__(
-            name="document_analyzer_pme",
-            description="Analyse de documents PME avec calculs TPS/TVQ (Quebec)",
+            name=DOCUMENT_ANALYZER_PME.name, description=DOCUMENT_ANALYZER_PME.description
         )
         self.tps_rate = 0.05  # 5%
         self.tvq_rate = 0.09975  # 9.975%
@@ -375,18 +379,7 @@ class DocumentAnalyzerPME(BaseTool):
 
     def _get_parameters_schema(self) -> ToolSchemaDict:
         """Return parameter schema"""
-        return {
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string", "description": "Path to the document to analyze"},
-                "analysis_type": {
-                    "type": "string",
-                    "enum": ["invoice", "extract", "financial", "contract", "report"],
-                    "description": "Type of analysis: invoice (TPS/TVQ), extract (raw data), financial (balance sheets/budgets), contract (legal clauses), report (general report)",
-                },
-            },
-            "required": ["file_path"],
-        }
+        return copy.deepcopy(DOCUMENT_ANALYZER_PME.parameters)
 
     def analyze_invoice(self, file_path: str) -> Dict[str, AnalysisResultValue]:
         """Analyse facture avec calculs taxes quebecoises"""
@@ -5,6 +5,7 @@ Avec allowlist et validation de chemins
 
 from __future__ import annotations
 
+import copy
 from typing import Dict, List, Optional, Union
 from pathlib import Path
 
@@ -16,6 +17,7 @@ from .base import (
     ToolMetadataValue,
     ToolSchemaDict,
 )
+from .catalog import FILE_READER
 
 # Types stricts pour le lecteur de fichiers
 ParameterSchemaValue = Union[str, Dict[str, str], List[str]]
@@ -27,13 +29,14 @@ class FileReaderTool(BaseTool):
     Restrictions: allowlist de chemins, lecture seule
     """
 
+    cacheable = FILE_READER.cacheable
+    file_arguments = FILE_READER.file_arguments
+
     allowed_paths: List[str]
     max_file_size: int
 
     def __init__(self) -> None:
-        super().__init__(
-            name="file_read", description="Lire le contenu d'un fichier de maniere securisee"
-        )
+        super().__init__(name=FILE_READER.name, description=FILE_READER.description)
         # Chemins autorises (peuvent etre configures via policies.yaml)
         self.allowed_paths = [
             "working_set/",
@@ -182,13 +185,4 @@ class FileReaderTool(BaseTool):
 
     def _get_parameters_schema(self) -> ToolSchemaDict:
         """Schema des parametres"""
-        return {
-            "type": "object",
-            "properties": {
-                "file_path": {
-                    "type": "string",
-                    "description": "Chemin du fichier a lire (doit etre dans les chemins autorises)",
-                }
-            },
-            "required": ["file_path"],
-        }
+        return copy.deepcopy(FILE_READER.parameters)
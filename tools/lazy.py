@@ -0,0 +1,201 @@
+"""
+Outils instanciés au premier usage
+
+Un ``ToolDescriptor`` décrit un outil (nom, description, schéma des
+paramètres, classe à importer) sans importer son module: le registre peut
+publier le catalogue d'outils (prompt système, MCP, /tools) sans contacter
+Docker ni importer pandas/pypdf/docx. Le descripteur porte aussi les réglages
+d'exécution (cache, concurrence, timeout) lus avant le premier appel.
+
+``LazyTool`` importe et construit l'outil au premier appel de
+``validate_arguments`` ou ``execute``. Un outil impossible à construire (ex.
+démon Docker absent) répond par une erreur d'outil; l'échec est mémorisé
+pour ne pas être retenté à chaque appel.
+
+Des outils tiers sont découverts via le groupe d'entry points
+``filagent.tools``; un plugin expose un ``ToolDescriptor`` (recommandé,
+construction différée), une instance de ``BaseTool`` ou une classe/fabrique
+sans argument (construite à la découverte).
+"""
+
+from __future__ import annotations
+
+import copy
+import importlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .base import BaseTool, ToolParamValue, ToolResult, ToolSchemaDict, ToolStatus
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_ENTRY_POINT_GROUP = "filagent.tools"
+
+ToolFactory = Union[str, Callable[[], BaseTool]]
+
+# Réglages lus par l'exécuteur et le cache avant d'appeler l'outil
+TOOL_SETTINGS = ("cacheable", "file_arguments", "max_concurrency", "timeout_seconds", "cpu_bound")
+
+
+@dataclass(frozen=True)
+class ToolDescriptor:
+    """Métadonnées d'un outil disponibles sans le construire"""
+
+    name: str
+    description: str
+    parameters: ToolSchemaDict
+    factory: ToolFactory  # "module:Classe" ou fabrique sans argument
+    # Réglages d'exécution, mêmes défauts que BaseTool
+    cacheable: bool = False
+    file_arguments: Tuple[str, ...] = ()
+    max_concurrency: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    cpu_bound: bool = False
+
+    def load(self) -> BaseTool:
+        """Importer le module et construire l'outil"""
+        factory = self.factory
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(":")
+            factory = getattr(importlib.import_module(module_name), attribute)
+        tool = factory()
+        if tool.name != self.name:
+            raise ValueError(f"Tool factory for '{self.name}' built '{tool.name}'")
+        for setting in TOOL_SETTINGS:
+            if getattr(tool, setting) != getattr(self, setting):
+                logger.warning(
+                    f"Tool '{self.name}': descriptor {setting}={getattr(self, setting)!r} "
+                    f"differs from the tool ({getattr(tool, setting)!r})"
+                )
+        return tool
+
+
+class LazyTool(BaseTool):
+    """
+    Proxy d'outil construit au premier usage
+
+    Nom, description, schéma et réglages d'exécution (cache, concurrence,
+    timeout) viennent du descripteur tant que l'outil n'est pas construit,
+    puis de l'outil.
+    """
+
+    def __init__(self, descriptor: ToolDescriptor) -> None:
+        super().__init__(descriptor.name, descriptor.description)
+        self.descriptor = descriptor
+        self._instance: Optional[BaseTool] = None
+        self._load_error: Optional[Exception] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    @property
+    def load_error(self) -> Optional[str]:
+        """Raison de l'échec de construction (None tant qu'aucun échec)"""
+        error = self._load_error
+        return None if error is None else f"Tool '{self.name}' unavailable: {error}"
+
+    def resolve(self) -> BaseTool:
+        """Outil réel (construit au premier appel; un échec est relevé à chaque appel)"""
+        if self._instance is None:
+            with self._load_lock:
+                if self._load_error is not None:
+                    raise self._load_error
+                if self._instance is None:
+                    try:
+                        self._instance = self.descriptor.load()
+                    except Exception as e:
+                        self._load_error = e
+                        logger.warning(f"Failed to construct tool '{self.name}': {e}")
+                        raise
+        return self._instance
+
+    def _resolve_or_none(self) -> Optional[BaseTool]:
+        try:
+            return self.resolve()
+        except Exception:
+            return None
+
+    def execute(self, arguments: Dict[str, ToolParamValue]) -> ToolResult:
+        tool = self._resolve_or_none()
+        if tool is None:
+            return ToolResult(status=ToolStatus.ERROR, output="", error=self.load_error)
+        return tool.execute(arguments)
+
+    def validate_arguments(
+        self, arguments: Dict[str, ToolParamValue]
+    ) -> tuple[bool, Optional[str]]:
+        tool = self._resolve_or_none()
+        if tool is None:
+            return False, self.load_error
+        return tool.validate_arguments(arguments)
+
+    def _get_parameters_schema(self) -> ToolSchemaDict:
+        return copy.deepcopy(self.descriptor.parameters)
+
+    def _setting(self, name: str):
+        instance = self._instance
+        return getattr(instance if instance is not None else self.descriptor, name)
+
+    @property
+    def cacheable(self) -> bool:  # type: ignore[override]
+        return self._setting("cacheable")
+
+    @property
+    def file_arguments(self) -> Tuple[str, ...]:  # type: ignore[override]
+        return self._setting("file_arguments")
+
+    @property
+    def max_concurrency(self) -> Optional[int]:  # type: ignore[override]
+        return self._setting("max_concurrency")
+
+    @property
+    def timeout_seconds(self) -> Optional[float]:  # type: ignore[override]
+        return self._setting("timeout_seconds")
+
+    @property
+    def cpu_bound(self) -> bool:  # type: ignore[override]
+        return self._setting("cpu_bound")
+
+    def __getattr__(self, name: str):
+        # Attributs propres à l'outil (ex. allowed_paths): construire l'outil
+        if name.startswith("_") or name == "descriptor":
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "deferred"
+        return f"<LazyTool {self.name} ({state})>"
+
+
+def discover_plugin_tools(group: str = PLUGIN_ENTRY_POINT_GROUP) -> List[BaseTool]:
+    """
+    Outils déclarés par les paquets installés (entry points ``group``)
+
+    Un plugin défaillant est journalisé et ignoré.
+    """
+    # Import différé: importer le module reste léger (~40 ms d'importlib.metadata)
+    from importlib.metadata import entry_points
+
+    tools: List[BaseTool] = []
+    for entry_point in entry_points(group=group):
+        try:
+            target = entry_point.load()
+            if isinstance(target, ToolDescriptor):
+                tool: BaseTool = LazyTool(target)
+            elif isinstance(target, BaseTool):
+                tool = target
+            elif callable(target):
+                tool = target()
+                if not isinstance(tool, BaseTool):
+                    raise TypeError(f"{entry_point.value} did not build a BaseTool")
+            else:
+                raise TypeError(f"Unsupported tool plugin object: {entry_point.value}")
+        except Exception as e:
+            logger.warning(f"Failed to load tool plugin '{entry_point.name}': {e}")
+            continue
+        tools.append(tool)
+    return tools
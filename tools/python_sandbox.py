@@ -2,12 +2,19 @@
 Sandbox Python pour exécution sûre de code Python dans un conteneur Docker isolé
 Limites CPU, mémoire, réseau et filesystem
 Zero Trust: tout code est considéré comme potentiellement malveillant
+
+Les exécutions passent par un pool de conteneurs préchauffés
+(tools/sandbox_pool.py) quand la CLI docker est disponible; sinon, un
+conteneur éphémère est créé par exécution. Le backend ``local``
+(FILAGENT_SANDBOX_BACKEND=local) sert aux CI sans Docker.
 """
 
 from __future__ import annotations
 
+import copy
 import tempfile
 import os
+import shutil
 import time
 import ast
 from pathlib import Path
@@ -21,6 +28,8 @@ from .base import (
     ToolParamValue,
     ToolSchemaDict,
 )
+from .catalog import PYTHON_SANDBOX
+from .sandbox_pool import SandboxPool, SandboxPoolConfig, SandboxPoolError, get_sandbox_pool
 
 # Import Docker SDK
 try:
@@ -56,12 +65,21 @@ class PythonSandboxTool(BaseTool):
     """
 
     def __init__(
-        self, dangerous_patterns: Optional[List[str]] = None, docker_image: str = "python:3.12-slim"
+        self,
+        dangerous_patterns: Optional[List[str]] = None,
+        docker_image: str = "python:3.12-slim",
+        backend: Optional[str] = None,
+        pool_config: Optional[SandboxPoolConfig] = None,
     ) -> None:
-        super().__init__(
-            name="python_sandbox",
-            description="Exécuter du code Python de manière sécurisée dans un conteneur Docker isolé",
-        )
+        """
+        Args:
+            dangerous_patterns: Patterns bloqués (double validation)
+            docker_image: Image des conteneurs
+            backend: "docker" (défaut) ou "local" (CI sans Docker);
+                défaut: variable FILAGENT_SANDBOX_BACKEND
+            pool_config: Pool de workers préchauffés (size=0 pour le désactiver)
+        """
+        super().__init__(name=PYTHON_SANDBOX.name, description=PYTHON_SANDBOX.description)
 
         # Configuration Docker
         self.docker_image = docker_image
@@ -70,6 +88,17 @@ class PythonSandboxTool(BaseTool):
         self.cpu_period = 100000  # Période standard
         self.timeout = 5  # secondes (réduit à 5s pour sécurité)
 
+        self.backend = backend or os.environ.get("FILAGENT_SANDBOX_BACKEND", "docker")
+        self.pool_config = pool_config or SandboxPoolConfig()
+        self.pool: Optional[SandboxPool] = None
+        self._init_dangerous_patterns(dangerous_patterns)
+
+        if self.backend == "local":
+            self.pool = self._get_pool()
+            return
+        if self.backend != "docker":
+            raise ValueError(f"Unknown sandbox backend: {self.backend}")
+
         # Vérifier disponibilité Docker
         if not DOCKER_AVAILABLE:
             logger.error("Docker SDK not available. Install with: pip install docker")
@@ -84,7 +113,15 @@ class PythonSandboxTool(BaseTool):
             logger.error(f"Failed to connect to Docker daemon: {e}")
             raise RuntimeError(f"Docker daemon not accessible: {e}")
 
-        # Patterns dangereux configurables (pour double validation)
+        # Essayer de pull l'image si nécessaire
+        self._ensure_docker_image()
+
+        # Pool de conteneurs préchauffés (nécessite la CLI docker pour stdin)
+        if shutil.which("docker"):
+            self.pool = self._get_pool()
+
+    def _init_dangerous_patterns(self, dangerous_patterns: Optional[List[str]]) -> None:
+        """Patterns dangereux configurables (pour double validation)"""
         if dangerous_patterns is None:
             patterns = [
                 "__import__",
@@ -104,8 +141,20 @@ class PythonSandboxTool(BaseTool):
             self.dangerous_patterns = dangerous_patterns
             self.dangerous_patterns_lower = [p.lower() for p in dangerous_patterns]
 
-        # Essayer de pull l'image si nécessaire
-        self._ensure_docker_image()
+    def _get_pool(self) -> Optional[SandboxPool]:
+        """Pool partagé du backend (None si désactivé)"""
+        if self.pool_config.size <= 0:
+            if self.backend == "local":
+                raise ValueError("The local sandbox backend requires a pool (size > 0)")
+            return None
+        return get_sandbox_pool(
+            self.backend,
+            self.pool_config,
+            image=self.docker_image,
+            memory_mb=self.max_memory_mb,
+            cpu_quota=self.cpu_quota,
+            cpu_period=self.cpu_period,
+        )
 
     def _ensure_docker_image(self) -> None:
         """
@@ -144,6 +193,59 @@ class PythonSandboxTool(BaseTool):
 
         code = str(arguments["code"])
 
+        if self.pool is not None:
+            return self._execute_pooled(code)
+        return self._execute_ephemeral(code)
+
+    def _execute_pooled(self, code: str) -> ToolResult:
+        """Exécuter le code dans un worker préchauffé du pool"""
+        start_time = time.time()
+        try:
+            run = self.pool.run(code, self.timeout)
+        except SandboxPoolError as e:
+            return ToolResult(
+                status=ToolStatus.ERROR,
+                output="",
+                error=f"Sandbox pool error: {str(e)}",
+                metadata={"elapsed_time": time.time() - start_time},
+            )
+        elapsed_time = time.time() - start_time
+        isolation = "docker" if self.backend == "docker" else "local"
+
+        if run.timed_out:
+            return ToolResult(
+                status=ToolStatus.TIMEOUT,
+                output="",
+                error=f"Execution timeout after {self.timeout}s",
+                metadata={"timeout": True, "elapsed_time": elapsed_time},
+            )
+
+        if run.exit_code == 0:
+            output = run.stdout + run.stderr
+            if not output.strip():
+                output = "[Code exécuté avec succès, pas de sortie]"
+            return ToolResult(
+                status=ToolStatus.SUCCESS,
+                output=output,
+                metadata={
+                    "elapsed_time": elapsed_time,
+                    "timeout": False,
+                    "isolation": isolation,
+                    "memory_limit_mb": self.max_memory_mb,
+                    "pooled": True,
+                    "worker_runs": run.worker_runs,
+                },
+            )
+
+        return ToolResult(
+            status=ToolStatus.ERROR,
+            output="",
+            error=f"Container execution failed: {run.stdout + run.stderr}",
+            metadata={"exit_code": run.exit_code, "elapsed_time": elapsed_time},
+        )
+
+    def _execute_ephemeral(self, code: str) -> ToolResult:
+        """Exécuter le code dans un conteneur créé et détruit pour l'occasion"""
         # Créer un répertoire temporaire pour l'exécution
         temp_dir = None
         container = None
@@ -297,8 +399,6 @@ class PythonSandboxTool(BaseTool):
             # Nettoyer le répertoire temporaire
             if temp_dir and os.path.exists(temp_dir):
                 try:
-                    import shutil
-
                     shutil.rmtree(temp_dir)
                 except Exception as e:
                     logger.warning(f"Failed to clean up temp directory {temp_dir}: {e}")
@@ -429,8 +529,4 @@ class PythonSandboxTool(BaseTool):
 
     def _get_parameters_schema(self) -> ToolSchemaDict:
         """Schema des parametres"""
-        return {
-            "type": "object",
-            "properties": {"code": {"type": "string", "description": "Code Python a executer"}},
-            "required": ["code"],
-        }
+        return copy.deepcopy(PYTHON_SANDBOX.parameters)
@@ -1,38 +1,45 @@
 """
 Registre des outils disponibles
 Permet de gérer et récupérer les outils de manière centralisée
+
+Les outils intégrés et les plugins (entry points ``filagent.tools``) sont
+enregistrés comme ``LazyTool``: leur nom, description et schéma sont
+disponibles immédiatement, l'outil n'est construit (Docker, pandas...)
+qu'à sa première utilisation.
 """
 
-from typing import Dict, Optional
+import itertools
+from typing import Dict, Optional, Union
 from .base import BaseTool
-from .python_sandbox import PythonSandboxTool
-from .file_reader import FileReaderTool
-from .calculator import CalculatorTool
-from .document_analyzer_pme import DocumentAnalyzerPME
+from .catalog import BUILTIN_TOOLS
+from .lazy import LazyTool, ToolDescriptor, discover_plugin_tools
+
+# Versions uniques entre instances: un registre rechargé ne reprend jamais une ancienne version
+_versions = itertools.count(1)
 
 
 class ToolRegistry:
     """Registre centralisé pour tous les outils disponibles"""
 
-    def __init__(self):
+    def __init__(self, discover_plugins: bool = True):
         self._tools: Dict[str, BaseTool] = {}
+        self.version = next(_versions)  # Change à chaque enregistrement (caches de prompt)
         self._register_default_tools()
+        if discover_plugins:
+            for tool in discover_plugin_tools():
+                self.register(tool)
 
     def _register_default_tools(self):
-        """Enregistrer les outils par défaut"""
-        default_tools = [
-            PythonSandboxTool(),
-            FileReaderTool(),
-            CalculatorTool(),
-            DocumentAnalyzerPME(),  # Analyseur de documents pour PME québécoises
-        ]
-
-        for tool in default_tools:
-            self.register(tool)
-
-    def register(self, tool: BaseTool):
-        """Enregistrer un outil"""
+        """Enregistrer les outils par défaut (construits au premier usage)"""
+        for descriptor in BUILTIN_TOOLS:
+            self.register(descriptor)
+
+    def register(self, tool: Union[BaseTool, ToolDescriptor]):
+        """Enregistrer un outil (ou un descripteur, construit au premier usage)"""
+        if isinstance(tool, ToolDescriptor):
+            tool = LazyTool(tool)
         self._tools[tool.name] = tool
+        self.version = next(_versions)
 
     def get(self, tool_name: str) -> Optional[BaseTool]:
         """Récupérer un outil par son nom"""
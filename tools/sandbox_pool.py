@@ -0,0 +1,970 @@
+"""
+Pool de workers préchauffés pour le sandbox Python
+
+Démarrer un conteneur Docker par extrait de code coûte bien plus cher que
+l'exécution d'un petit script. Le pool garde des workers déjà démarrés
+(conteneurs verrouillés, sans réseau) qui reçoivent le code sur stdin et
+l'exécutent chacun dans un sous-processus neuf, dans un répertoire
+temporaire supprimé après l'exécution.
+
+Protocole (identique pour Docker et pour le repli local): une requête JSON
+par ligne sur stdin, une réponse JSON par ligne sur stdout.
+
+- ``{"op": "ping"}`` -> ``{"ok": true}`` (contrôle de santé)
+- ``{"op": "run", "code": "...", "timeout": 5}`` ->
+  ``{"exit_code": 0, "stdout": "...", "stderr": "...", "timeout": false, "elapsed": 0.01}``
+- ``{"op": "run_batch", "programs": [{"code": "...", "timeout": 5}, ...]}`` ->
+  ``{"results": [<réponse de run>, ...]}``: chaque programme s'exécute dans un
+  fork du worker (mêmes rlimits, sans redémarrer d'interpréteur), ce qui
+  amortit le démarrage sur le lot (évaluation de code en masse)
+
+Après chaque exécution, le worker (sous-reaper: les processus orphelins
+lui sont rattachés) cherche les processus laissés par le programme
+(double fork, ``setsid``), les tue et le signale par ``"leftover"`` dans
+la réponse. Il vide ensuite ses répertoires temporaires (``/tmp``,
+``/var/tmp``, ``/dev/shm``), privés au worker, de tout ce que le programme y
+a écrit hors de son répertoire d'exécution, et le signale par ``"leaked"``:
+une exécution ne lit jamais les fichiers d'une exécution précédente. Un
+worker est recyclé après ``max_runs_per_worker`` exécutions ou à la
+moindre anomalie (timeout, sous-processus tué par un signal, processus
+résiduels, fichiers résiduels, réponse invalide, worker mort). Les workers
+inactifs au-delà de ``min_warm`` sont fermés après ``idle_timeout`` et les
+workers inactifs sont vérifiés (ping) toutes les ``health_check_interval``
+secondes.
+
+Backends:
+- ``docker``: ``docker run -i`` avec les mêmes restrictions que le sandbox
+  éphémère (réseau coupé, rootfs en lecture seule, capabilities retirées,
+  utilisateur nobody, limites CPU/RAM/pids)
+- ``local``: interpréteur hôte (CI sans Docker); le sous-processus reçoit
+  des rlimits (mémoire, CPU, taille de fichiers) et le worker tourne dans
+  des namespaces utilisateur/réseau/montage via ``unshare``, avec un tmpfs
+  privé sur chaque répertoire temporaire. Sans ``unshare`` fonctionnel, le
+  code s'exécuterait sur l'hôte avec les seules rlimits (et des
+  répertoires temporaires partagés, jamais vidés): le backend refuse alors
+  de démarrer, sauf accord explicite (CI) via
+  ``FILAGENT_ALLOW_UNISOLATED_SANDBOX=1``
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import select
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+ALLOW_UNISOLATED_ENV = "FILAGENT_ALLOW_UNISOLATED_SANDBOX"
+_RESPONSE_GRACE_SECONDS = 5.0  # Délai accordé au worker au-delà du timeout d'exécution
+
+# Boucle exécutée dans chaque worker (conteneur ou processus local).
+# Arguments: limite mémoire (octets), taille max des sorties (octets), mode
+# des répertoires temporaires (SCRATCH_*).
+RUNNER_SOURCE = r"""
+import json, os, shutil, signal, subprocess, sys, tempfile, time, traceback
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MEMORY_BYTES = int(sys.argv[1])
+MAX_OUTPUT = int(sys.argv[2])
+SCRATCH_MODE = sys.argv[3] if len(sys.argv) > 3 else "none"
+RUNNER_PID = os.getpid()
+SCRATCH_CANDIDATES = ("/tmp", "/var/tmp", "/dev/shm")
+
+
+def mount_private_scratch():
+    # Namespace de montage propre au worker: un tmpfs neuf sur chaque
+    # repertoire temporaire. L'interpreteur peut vivre sous l'un d'eux
+    # (virtualenv dans /tmp): son repertoire est remonte depuis l'ancien
+    # contenu, via un descripteur ouvert avant le montage.
+    import ctypes
+    libc = ctypes.CDLL(None, use_errno=True)
+
+    def encode(value):
+        return value.encode() if value is not None else None
+
+    def mount(source, target, fstype, flags, data):
+        if libc.mount(encode(source), encode(target), encode(fstype), flags, encode(data)):
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), target)
+
+    needed = set()
+    for path in (sys.prefix, sys.base_prefix, sys.exec_prefix, os.path.dirname(sys.executable)):
+        needed.update((os.path.abspath(path), os.path.realpath(path)))
+    for directory in SCRATCH_CANDIDATES:
+        if not os.path.isdir(directory) or os.path.islink(directory):
+            continue
+        tops = {p[len(directory) + 1:].split("/", 1)[0] for p in needed
+                if p.startswith(directory + "/")}
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            mount("tmpfs", directory, "tmpfs", 0, "mode=1777")
+            for top in sorted(tops):
+                target = os.path.join(directory, top)
+                os.mkdir(target)
+                # MS_BIND | MS_REC
+                mount("/proc/self/fd/%d/%s" % (fd, top), target, None, 4096 | 16384, None)
+        finally:
+            os.close(fd)
+
+
+if SCRATCH_MODE == "mount":
+    mount_private_scratch()
+# Repertoires temporaires prives au worker: contenu de depart conserve, le reste
+# est efface apres chaque execution (mode "none": repertoires de l'hote, intouches)
+SCRATCH = {}
+if SCRATCH_MODE in ("mount", "scrub"):
+    for directory in SCRATCH_CANDIDATES:
+        if os.path.isdir(directory) and os.access(directory, os.W_OK):
+            SCRATCH[directory] = set(os.listdir(directory))
+
+
+def scrub():
+    # Effacer ce qu'un programme a ecrit hors de son repertoire; retourne le nombre d'entrees
+    removed = 0
+    for directory, baseline in SCRATCH.items():
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+        for name in entries:
+            if name in baseline:
+                continue
+            removed += 1
+            path = os.path.join(directory, name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+    return removed
+
+# Sous-reaper: les orphelins d'un programme (double fork, setsid) sont
+# rattaches au worker au lieu de init, ce qui permet de les retrouver
+try:
+    import ctypes
+    ctypes.CDLL(None, use_errno=True).prctl(36, 1, 0, 0, 0)  # PR_SET_CHILD_SUBREAPER
+except Exception:
+    pass
+
+
+def reap_zombies():
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+CHILDREN_FILES = os.path.exists("/proc/self/task/%d/children" % RUNNER_PID)
+
+
+def child_pids(pid):
+    children = []
+    if not CHILDREN_FILES:
+        # Noyau sans /proc/<pid>/task/<tid>/children: parcourir tous les processus
+        for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+            if not entry.isdigit():
+                continue
+            try:
+                with open("/proc/%s/stat" % entry) as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, ValueError, IndexError):
+                continue
+            if ppid == pid:
+                children.append(int(entry))
+        return children
+    try:
+        tasks = os.listdir("/proc/%d/task" % pid)
+    except OSError:
+        return children
+    for tid in tasks:
+        try:
+            with open("/proc/%d/task/%s/children" % (pid, tid)) as f:
+                children.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+    return children
+
+
+def descendants():
+    found, stack = [], [RUNNER_PID]
+    while stack:
+        for child in child_pids(stack.pop()):
+            if child not in found:
+                found.append(child)
+                stack.append(child)
+    return found
+
+
+def sweep():
+    # Tuer les processus laisses par le programme; retourne leur nombre
+    reap_zombies()
+    leftover = set()
+    for _ in range(20):
+        pids = descendants()
+        if not pids:
+            break
+        leftover.update(pids)
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        time.sleep(0.005)
+        reap_zombies()
+    return len(leftover)
+
+
+def limits(cpu_seconds):
+    def apply():
+        os.setsid()
+        if resource is None:
+            return
+        if MEMORY_BYTES > 0:
+            resource.setrlimit(resource.RLIMIT_AS, (MEMORY_BYTES, MEMORY_BYTES))
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (10 * 1024 * 1024, 10 * 1024 * 1024))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    return apply
+
+
+def reply(payload):
+    sys.stdout.write(json.dumps(payload) + "\n")
+    sys.stdout.flush()
+
+
+def result(exit_code, out, err, timed_out, started, leftover=0):
+    return {
+        "exit_code": exit_code,
+        "stdout": out[:MAX_OUTPUT].decode("utf-8", "replace"),
+        "stderr": err[:MAX_OUTPUT].decode("utf-8", "replace"),
+        "timeout": timed_out,
+        "elapsed": time.monotonic() - started,
+        "leftover": leftover + sweep(),
+        "leaked": scrub(),
+    }
+
+
+def run_subprocess(code, timeout):
+    # Interpreteur neuf par execution
+    workdir = tempfile.mkdtemp(prefix="run_")
+    started = time.monotonic()
+    timed_out = False
+    leftover = 0
+    try:
+        child = subprocess.Popen(
+            [sys.executable, "-I", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=workdir,
+            env={"PYTHONDONTWRITEBYTECODE": "1", "PYTHONUNBUFFERED": "1", "HOME": workdir,
+                 "TMPDIR": workdir, "PATH": "/usr/local/bin:/usr/bin:/bin"},
+            preexec_fn=limits(int(timeout) + 1),
+            close_fds=True,
+        )
+        try:
+            out, err = child.communicate(code.encode("utf-8"), timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            try:
+                os.killpg(child.pid, signal.SIGKILL)
+            except OSError:
+                child.kill()
+            # Un processus detache peut garder les pipes ouverts: le tuer avant de lire
+            leftover = sweep()
+            out, err = child.communicate()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return result(child.returncode, out, err, timed_out, started, leftover)
+
+
+def run_forked(code, timeout):
+    # Fork du worker: pas de demarrage d'interpreteur, memes rlimits
+    # Sorties capturees hors du repertoire de travail du programme
+    rundir = tempfile.mkdtemp(prefix="run_")
+    workdir = os.path.join(rundir, "work")
+    os.mkdir(workdir)
+    out_path = os.path.join(rundir, "stdout")
+    err_path = os.path.join(rundir, "stderr")
+    started = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            os.chdir(workdir)
+            os.environ.update({"HOME": workdir, "TMPDIR": workdir})
+            limits(int(timeout) + 1)()
+            os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+            os.dup2(os.open(out_path, os.O_WRONLY | os.O_CREAT, 0o600), 1)
+            os.dup2(os.open(err_path, os.O_WRONLY | os.O_CREAT, 0o600), 2)
+            try:
+                exec(compile(code, "<program>", "exec"), {"__name__": "__main__"})
+                status = 0
+            except SystemExit as e:
+                status = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except BaseException:
+                traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(status)
+    timed_out = False
+    delay = 0.0005
+    try:
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            if time.monotonic() - started >= timeout:
+                timed_out = True
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except OSError:
+                    os.kill(pid, signal.SIGKILL)
+                _, status = os.waitpid(pid, 0)
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.01)
+        exit_code = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+        outputs = []
+        for path in (out_path, err_path):
+            try:
+                with open(path, "rb") as f:
+                    outputs.append(f.read(MAX_OUTPUT))
+            except OSError:
+                outputs.append(b"")
+    finally:
+        shutil.rmtree(rundir, ignore_errors=True)
+    return result(exit_code, outputs[0], outputs[1], timed_out, started)
+
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if request.get("op") == "ping":
+        reply({"ok": True})
+        continue
+    if request.get("op") == "run_batch":
+        run = run_forked if hasattr(os, "fork") else run_subprocess
+        reply({"results": [
+            run(program["code"], float(program.get("timeout", 5)))
+            for program in request["programs"]
+        ]})
+        continue
+    reply(run_subprocess(request["code"], float(request.get("timeout", 5))))
+"""
+
+
+class SandboxPoolError(RuntimeError):
+    """Aucun worker disponible ou worker défaillant"""
+
+
+@dataclass
+class SandboxPoolConfig:
+    """Configuration du pool de workers"""
+
+    size: int = 2  # Workers simultanés max (0: pool désactivé)
+    min_warm: int = 1  # Workers gardés démarrés même inactifs
+    max_runs_per_worker: int = 50  # Recyclage après N exécutions
+    idle_timeout: float = 300.0  # Fermeture des workers inactifs au-delà de min_warm
+    health_check_interval: float = 30.0  # Ping des workers inactifs
+    acquire_timeout: float = 30.0  # Attente max d'un worker libre
+    startup_timeout: float = 30.0  # Démarrage d'un worker (premier ping)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "SandboxPoolConfig":
+        """Construire depuis une section de configuration (clés inconnues ignorées)"""
+        data = data or {}
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class SandboxRun:
+    """Résultat d'une exécution dans un worker"""
+
+    exit_code: int
+    stdout: str
+    stderr: str
+    timed_out: bool
+    elapsed: float
+    worker_runs: int
+    leftover_processes: int = 0  # Processus laissés par le programme (tués par le worker)
+    leaked_files: int = 0  # Entrées écrites hors du répertoire d'exécution (effacées)
+
+    @property
+    def anomalous(self) -> bool:
+        """Exécution qui impose de recycler le worker"""
+        return (
+            self.timed_out
+            or self.exit_code < 0
+            or self.leftover_processes > 0
+            or self.leaked_files > 0
+        )
+
+
+class SandboxWorker:
+    """Processus worker (conteneur ou interpréteur local) parlant le protocole JSON-lignes"""
+
+    def __init__(self, command: List[str], cleanup_command: Optional[List[str]] = None) -> None:
+        self.command = command
+        self.cleanup_command = cleanup_command
+        self.runs = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+        self._buffer = b""
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _read_line(self, deadline: float) -> bytes:
+        fd = self.process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SandboxPoolError("Worker response timeout")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise SandboxPoolError("Worker exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Envoyer une requête et attendre sa réponse (SandboxPoolError sinon)"""
+        try:
+            self.process.stdin.write(json.dumps(payload).encode("utf-8") + b"\n")
+            self.process.stdin.flush()
+            response = json.loads(self._read_line(time.monotonic() + timeout))
+        except (OSError, ValueError) as e:
+            raise SandboxPoolError(f"Worker protocol error: {e}") from e
+        if not isinstance(response, dict):
+            raise SandboxPoolError("Worker protocol error: unexpected response")
+        return response
+
+    def ping(self, timeout: float) -> bool:
+        try:
+            healthy = self.request({"op": "ping"}, timeout).get("ok") is True
+        except SandboxPoolError:
+            healthy = False
+        self.last_checked = time.monotonic()
+        return healthy
+
+    def close(self) -> None:
+        """Arrêter le worker (EOF sur stdin, puis kill)"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+        if self.cleanup_command:
+            subprocess.run(
+                self.cleanup_command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+
+
+_namespace_prefix: Optional[List[str]] = None
+_namespace_lock = threading.Lock()
+
+
+def local_namespace_prefix() -> List[str]:
+    """Préfixe ``unshare`` (namespaces utilisateur, réseau et montage) s'il fonctionne ici"""
+    global _namespace_prefix
+    with _namespace_lock:
+        if _namespace_prefix is None:
+            _namespace_prefix = []
+            unshare = shutil.which("unshare")
+            if unshare and sys.platform.startswith("linux"):
+                prefix = [unshare, "--user", "--map-root-user", "--net", "--mount", "--"]
+                try:
+                    probe = subprocess.run(
+                        prefix + ["true"],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        timeout=5,
+                    )
+                    if probe.returncode == 0:
+                        _namespace_prefix = prefix
+                except (OSError, subprocess.SubprocessError):
+                    pass
+        return list(_namespace_prefix)
+
+
+def local_worker_command(
+    memory_mb: int, max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES
+) -> List[str]:
+    """
+    Commande d'un worker local (repli CI sans Docker)
+
+    Raises:
+        SandboxPoolError: ``unshare`` indisponible et exécution non isolée
+            non autorisée (``FILAGENT_ALLOW_UNISOLATED_SANDBOX=1``)
+    """
+    prefix = local_namespace_prefix()
+    if not prefix:
+        if os.environ.get(ALLOW_UNISOLATED_ENV) != "1":
+            raise SandboxPoolError(
+                "Local sandbox backend requires user/network namespaces (unshare); "
+                f"set {ALLOW_UNISOLATED_ENV}=1 to run code on the host with rlimits only (CI)"
+            )
+        logger.warning(
+            "SECURITY: local sandbox running WITHOUT namespaces (%s=1): "
+            "untrusted code executes on the host with rlimits only",
+            ALLOW_UNISOLATED_ENV,
+        )
+    return prefix + [
+        sys.executable,
+        "-I",
+        "-u",
+        "-c",
+        RUNNER_SOURCE,
+        str(memory_mb * 1024 * 1024),
+        str(max_output_bytes),
+        # Sans namespace de montage, /tmp est celui de l'hôte: ne rien y effacer
+        "mount" if prefix else "none",
+    ]
+
+
+def docker_worker_command(
+    image: str,
+    memory_mb: int,
+    cpu_quota: int,
+    cpu_period: int,
+    name: str,
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+) -> List[str]:
+    """Commande ``docker run -i`` d'un worker conteneurisé verrouillé"""
+    return [
+        "docker",
+        "run",
+        "-i",
+        "--rm",
+        "--name",
+        name,
+        "--network",
+        "none",
+        "--read-only",
+        "--tmpfs",
+        "/tmp:size=10m,mode=1777",
+        "--cap-drop",
+        "ALL",
+        "--security-opt",
+        "no-new-privileges",
+        "--user",
+        "65534:65534",
+        "--memory",
+        f"{memory_mb}m",
+        "--cpu-quota",
+        str(cpu_quota),
+        "--cpu-period",
+        str(cpu_period),
+        "--pids-limit",
+        "64",
+        "--workdir",
+        "/tmp",
+        "-e",
+        "PYTHONDONTWRITEBYTECODE=1",
+        image,
+        "python3",
+        "-I",
+        "-u",
+        "-c",
+        RUNNER_SOURCE,
+        # Le conteneur est déjà borné en mémoire: pas de RLIMIT_AS en plus
+        "0",
+        str(max_output_bytes),
+        # /tmp et /dev/shm sont des tmpfs propres au conteneur
+        "scrub",
+    ]
+
+
+class SandboxPool:
+    """
+    Pool thread-safe de workers préchauffés
+
+    ``worker_factory`` crée un worker démarré (non encore vérifié); le pool
+    le considère prêt après un premier ping réussi.
+    """
+
+    def __init__(
+        self,
+        worker_factory: Any,
+        config: Optional[SandboxPoolConfig] = None,
+        name: str = "sandbox",
+    ) -> None:
+        self.worker_factory = worker_factory
+        self.config = config or SandboxPoolConfig()
+        self.name = name
+
+        self._idle: Deque[SandboxWorker] = deque()
+        self._total = 0  # Workers vivants ou en démarrage
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stop = threading.Event()
+
+        # Statistiques
+        self.started = 0
+        self.recycled = 0
+        self.runs = 0
+
+        self._reaper = threading.Thread(target=self._reap_loop, name=f"{name}-reaper", daemon=True)
+        self._reaper.start()
+        self._refill()
+
+    # ------------------------------------------------------------------
+    # Cycle de vie des workers
+    # ------------------------------------------------------------------
+
+    def _start_worker(self) -> Optional[SandboxWorker]:
+        """Démarrer un worker et attendre son premier ping (slot déjà réservé)"""
+        worker = None
+        try:
+            worker = self.worker_factory()
+            if worker.ping(self.config.startup_timeout):
+                with self._cond:
+                    self.started += 1
+                return worker
+            logger.warning(f"{self.name}: worker failed its startup health check")
+        except Exception as e:
+            logger.warning(f"{self.name}: failed to start worker: {e}")
+        if worker is not None:
+            worker.close()
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+        return None
+
+    def _discard(self, worker: SandboxWorker, recycled: bool = True) -> None:
+        worker.close()
+        with self._cond:
+            self._total -= 1
+            if recycled:
+                self.recycled += 1
+            self._cond.notify()
+
+    def _refill(self) -> None:
+        """Démarrer en arrière-plan les workers manquants jusqu'à min_warm"""
+        with self._cond:
+            if self._closed:
+                return
+            missing = min(self.config.min_warm, self.config.size) - self._total
+            if missing <= 0:
+                return
+            self._total += missing
+
+        def warm():
+            for _ in range(missing):
+                worker = self._start_worker()
+                if worker is not None:
+                    self._release_idle(worker)
+
+        threading.Thread(target=warm, name=f"{self.name}-warmup", daemon=True).start()
+
+    def _release_idle(self, worker: SandboxWorker) -> None:
+        with self._cond:
+            if not self._closed:
+                self._idle.append(worker)
+                self._cond.notify()
+                return
+        self._discard(worker)
+
+    def _reap_loop(self) -> None:
+        interval = max(0.05, min(self.config.idle_timeout, self.config.health_check_interval) / 2)
+        while not self._stop.wait(interval):
+            self.reap()
+
+    def reap(self) -> None:
+        """Fermer les workers inactifs expirés et vérifier la santé des autres"""
+        now = time.monotonic()
+        expired: List[SandboxWorker] = []
+        to_check: List[SandboxWorker] = []
+        with self._cond:
+            keep: Deque[SandboxWorker] = deque()
+            # Les plus anciens inactifs sont en tête de file
+            for worker in self._idle:
+                surplus = self._total - len(expired) > self.config.min_warm
+                if surplus and now - worker.last_used > self.config.idle_timeout:
+                    expired.append(worker)
+                elif now - worker.last_checked > self.config.health_check_interval:
+                    to_check.append(worker)
+                else:
+                    keep.append(worker)
+            self._idle = keep
+
+        for worker in expired:
+            self._discard(worker, recycled=False)
+        for worker in to_check:
+            if worker.alive() and worker.ping(self.config.startup_timeout):
+                self._release_idle(worker)
+            else:
+                self._discard(worker)
+        self._refill()
+
+    # ------------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------------
+
+    def _acquire(self) -> SandboxWorker:
+        deadline = time.monotonic() + self.config.acquire_timeout
+        while True:
+            spawn = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise SandboxPoolError("Sandbox pool is shut down")
+                    if self._idle:
+                        worker = self._idle.pop()  # Le plus récemment utilisé
+                        break
+                    if self._total < self.config.size:
+                        self._total += 1
+                        spawn = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SandboxPoolError("No sandbox worker available")
+                    self._cond.wait(remaining)
+
+            if spawn:
+                worker = self._start_worker()
+                if worker is None:
+                    raise SandboxPoolError("Failed to start a sandbox worker")
+                return worker
+            if not worker.alive():
+                self._discard(worker)
+                continue
+            return worker
+
+    def run(self, code: str, timeout: float) -> SandboxRun:
+        """
+        Exécuter ``code`` dans un worker du pool
+
+        Raises:
+            SandboxPoolError: pas de worker disponible, ou worker défaillant
+        """
+        worker = self._acquire()
+        try:
+            response = worker.request(
+                {"op": "run", "code": code, "timeout": timeout},
+                timeout + _RESPONSE_GRACE_SECONDS,
+            )
+            result = SandboxRun(
+                exit_code=int(response.get("exit_code", -1)),
+                stdout=str(response.get("stdout", "")),
+                stderr=str(response.get("stderr", "")),
+                timed_out=bool(response.get("timeout", False)),
+                elapsed=float(response.get("elapsed", 0.0)),
+                worker_runs=worker.runs + 1,
+                leftover_processes=int(response.get("leftover", 0)),
+                leaked_files=int(response.get("leaked", 0)),
+            )
+        except Exception:
+            self._discard(worker)
+            self._refill()
+            raise
+
+        worker.runs += 1
+        worker.last_used = worker.last_checked = time.monotonic()
+        with self._cond:
+            self.runs += 1
+        if result.anomalous or worker.runs >= self.config.max_runs_per_worker:
+            self._discard(worker)
+            self._refill()
+        else:
+            self._release_idle(worker)
+        return result
+
+    def run_batch(self, programs: List[Tuple[str, float]]) -> List[SandboxRun]:
+        """
+        Exécuter un lot de ``(code, timeout)`` dans un seul worker du pool
+
+        Chaque programme tourne dans un processus forké: un timeout ou un
+        signal n'affecte pas le worker, qui n'est recyclé que s'il est
+        défaillant, si un programme a laissé des processus ou des fichiers
+        derrière lui ou s'il a atteint ``max_runs_per_worker``.
+
+        Raises:
+            SandboxPoolError: pas de worker disponible, ou worker défaillant
+        """
+        if not programs:
+            return []
+        worker = self._acquire()
+        try:
+            response = worker.request(
+                {
+                    "op": "run_batch",
+                    "programs": [{"code": code, "timeout": timeout} for code, timeout in programs],
+                },
+                sum(timeout for _, timeout in programs) + _RESPONSE_GRACE_SECONDS,
+            )
+            entries = response.get("results")
+            if not isinstance(entries, list) or len(entries) != len(programs):
+                raise SandboxPoolError("Worker protocol error: unexpected batch response")
+            results = [
+                SandboxRun(
+                    exit_code=int(entry.get("exit_code", -1)),
+                    stdout=str(entry.get("stdout", "")),
+                    stderr=str(entry.get("stderr", "")),
+                    timed_out=bool(entry.get("timeout", False)),
+                    elapsed=float(entry.get("elapsed", 0.0)),
+                    worker_runs=worker.runs + i + 1,
+                    leftover_processes=int(entry.get("leftover", 0)),
+                    leaked_files=int(entry.get("leaked", 0)),
+                )
+                for i, entry in enumerate(entries)
+            ]
+        except Exception:
+            self._discard(worker)
+            self._refill()
+            raise
+
+        worker.runs += len(results)
+        worker.last_used = worker.last_checked = time.monotonic()
+        with self._cond:
+            self.runs += len(results)
+        residue = any(r.leftover_processes or r.leaked_files for r in results)
+        if residue or worker.runs >= self.config.max_runs_per_worker:
+            self._discard(worker)
+            self._refill()
+        else:
+            self._release_idle(worker)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """État du pool"""
+        with self._cond:
+            return {
+                "workers": self._total,
+                "idle": len(self._idle),
+                "busy": self._total - len(self._idle),
+                "started": self.started,
+                "recycled": self.recycled,
+                "runs": self.runs,
+            }
+
+    def wait_warm(self, timeout: float = 30.0) -> bool:
+        """Attendre que min_warm workers soient prêts (tests, benchmarks)"""
+        deadline = time.monotonic() + timeout
+        target = min(self.config.min_warm, self.config.size)
+        with self._cond:
+            while len(self._idle) < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self) -> None:
+        """Fermer tous les workers (les workers occupés sont fermés à leur retour)"""
+        self._stop.set()
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for worker in idle:
+            self._discard(worker, recycled=False)
+
+
+# Pools partagés entre instances de l'outil (un registre rechargé réutilise le pool)
+_pools: Dict[Tuple[Any, ...], SandboxPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sandbox_pool(
+    backend: str,
+    config: SandboxPoolConfig,
+    image: str = "python:3.12-slim",
+    memory_mb: int = 512,
+    cpu_quota: int = 50000,
+    cpu_period: int = 100000,
+) -> SandboxPool:
+    """
+    Récupérer (ou créer) le pool partagé d'un backend
+
+    Args:
+        backend: "docker" ou "local"
+        config: Taille, recyclage, reaping et contrôles de santé
+        image: Image Docker des workers
+        memory_mb: Limite mémoire par worker (conteneur) ou par exécution (local)
+        cpu_quota: Quota CPU Docker
+        cpu_period: Période CPU Docker
+    """
+    key = (backend, image, memory_mb, cpu_quota, cpu_period, tuple(vars(config).items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None:
+            return pool
+
+        if backend == "docker":
+
+            def factory() -> SandboxWorker:
+                name = f"filagent-sandbox-{uuid.uuid4().hex[:12]}"
+                return SandboxWorker(
+                    docker_worker_command(image, memory_mb, cpu_quota, cpu_period, name),
+                    cleanup_command=["docker", "rm", "-f", name],
+                )
+
+        elif backend == "local":
+            local_worker_command(memory_mb)  # Refuser tout de suite un hôte sans isolation
+
+            def factory() -> SandboxWorker:
+                return SandboxWorker(local_worker_command(memory_mb))
+
+        else:
+            raise ValueError(f"Unknown sandbox backend: {backend}")
+
+        pool = SandboxPool(factory, config, name=f"sandbox-{backend}")
+        _pools[key] = pool
+        return pool
+
+
+def shutdown_sandbox_pools() -> None:
+    """Fermer tous les pools partagés (arrêt de l'application, tests)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_sandbox_pools)